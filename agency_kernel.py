@@ -12,16 +12,24 @@ Features:
 - Local goals only (no central micromanaging)
 - Self-evaluation with evidence→claim→confidence chains
 - Continuity Index tracking for drift detection
+- Parallel plan-step scheduling under tool limits and lifecycle budgets
+- Per-plan indexed result and evaluation stores
 """
 
 import json
 import os
+import threading
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from enum import Enum
 import uuid
 
+# Token cost assumed for a step when reserving lifecycle budget
+STEP_TOKEN_ESTIMATE = 150
+
 class TaskStatus(Enum):
     """Task execution status"""
     PENDING = "pending"
@@ -101,6 +109,7 @@ class CriticEvaluation:
     recommendations: List[str]
     overall_confidence: float
     needs_revision: bool
+    plan_id: str = ""
 
 @dataclass
 class SelfEvaluation:
@@ -114,6 +123,69 @@ class SelfEvaluation:
     uncertainty_factors: List[str]  # What could be wrong
     timestamp: str
 
+class PlanRecordIndex:
+    """Append-only JSONL file with an in-memory offset index per plan.
+
+    The file is scanned once on open; afterwards appends record their
+    offset and reads seek straight to a plan's lines instead of re-reading
+    every record ever written.
+    """
+
+    def __init__(self, path: str, key_field: str = "plan_id"):
+        self.path = path
+        self.key_field = key_field
+        self.offsets: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+        self._build_index()
+
+    def _build_index(self):
+        """Index existing records and drop a torn trailing line"""
+        if not os.path.exists(self.path):
+            return
+
+        offset = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                if line.strip():
+                    try:
+                        key = json.loads(line).get(self.key_field)
+                    except json.JSONDecodeError:
+                        key = None
+                    if key:
+                        self.offsets.setdefault(key, []).append(offset)
+                offset += len(line)
+
+        if offset < os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(offset)
+
+    def append(self, record: Dict[str, Any]):
+        """Append a record and index it under its key"""
+        line = (json.dumps(record) + '\n').encode()
+        with self._lock:
+            with open(self.path, 'ab') as f:
+                offset = f.tell()
+                f.write(line)
+            key = record.get(self.key_field)
+            if key:
+                self.offsets.setdefault(key, []).append(offset)
+
+    def read(self, key: str) -> List[Dict[str, Any]]:
+        """Read all records for a key in write order"""
+        with self._lock:
+            offsets = list(self.offsets.get(key, ()))
+        if not offsets:
+            return []
+
+        records = []
+        with open(self.path, 'rb') as f:
+            for offset in offsets:
+                f.seek(offset)
+                records.append(json.loads(f.readline()))
+        return records
+
 class AgencyKernel:
     """Core reasoning engine for SINCOR agents"""
     
@@ -131,6 +203,8 @@ class AgencyKernel:
         self.plans_file = f"{kernel_dir}/{agent_id}_plans.json"
         self.results_file = f"{kernel_dir}/{agent_id}_results.jsonl"
         self.evaluations_file = f"{kernel_dir}/{agent_id}_evaluations.jsonl"
+        self.results_index = PlanRecordIndex(self.results_file)
+        self.evaluations_index = PlanRecordIndex(self.evaluations_file)
         
         # Active state
         self.current_goals = self._load_goals()
@@ -442,8 +516,14 @@ class AgencyKernel:
     # EXECUTOR COMPONENT
     
     def executor_run_step(self, plan_id: str, step_id: str, 
-                         tools_available: Dict[str, Any]) -> ExecutionResult:
-        """Executor runs a single plan step"""
+                         tools_available: Dict[str, Any], invoke_tools: bool = False) -> ExecutionResult:
+        """Executor runs a single plan step
+        
+        tools_available maps tool names to availability flags. With
+        invoke_tools=True, entries that are callables are also called with the
+        step and their return value is added to the step outputs; leave it off
+        unless every callable in the mapping is meant to run.
+        """
         
         if plan_id not in self.active_plans:
             raise ValueError(f"Plan {plan_id} not found")
@@ -454,16 +534,95 @@ class AgencyKernel:
         if not step:
             raise ValueError(f"Step {step_id} not found in plan {plan_id}")
         
+        exec_result = self._execute_step(plan_id, step, tools_available, invoke_tools)
+        self._record_step_result(exec_result)
+        return exec_result
+    
+    def executor_run_plan(self, plan_id: str, tools_available: Dict[str, Any],
+                          max_parallel: int = 4, tool_limits: Optional[Dict[str, int]] = None,
+                          lifecycle=None, invoke_tools: bool = False) -> Dict[str, ExecutionResult]:
+        """Executor runs every step of a plan, overlapping independent steps.
+
+        A step starts once all of its dependencies succeeded, a worker is
+        free and each of its tools is below its limit in tool_limits
+        (default max_parallel). With a LifecycleManager, each step's
+        estimated cost is reserved via consume_budget before it starts;
+        once that is refused no further steps are launched. Steps that
+        never ran (failed upstream, unmet dependency, budget) are absent
+        from the returned dict. invoke_tools is as for executor_run_step.
+        """
+        
+        if plan_id not in self.active_plans:
+            raise ValueError(f"Plan {plan_id} not found")
+            
+        plan = self.active_plans[plan_id]
+        tool_limits = tool_limits or {}
+        pending = list(plan.steps)
+        results: Dict[str, ExecutionResult] = {}
+        running = {}
+        tools_in_use = Counter()
+        budget_exhausted = False
+        
+        with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+            while True:
+                for step in list(pending):
+                    if budget_exhausted or len(running) >= max_parallel:
+                        break
+                    if not all(dep in results and results[dep].status == "success"
+                               for dep in step.dependencies):
+                        continue
+                    if any(tools_in_use[tool] >= tool_limits.get(tool, max_parallel)
+                           for tool in step.tools_required):
+                        continue
+                    if lifecycle is not None and not lifecycle.consume_budget(**self._estimate_step_cost(step)):
+                        budget_exhausted = True
+                        break
+                    
+                    pending.remove(step)
+                    tools_in_use.update(step.tools_required)
+                    future = pool.submit(self._execute_step, plan_id, step, tools_available, invoke_tools)
+                    running[future] = step
+                
+                if not running:
+                    break
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    tools_in_use.subtract(step.tools_required)
+                    results[step.step_id] = future.result()
+                    self._record_step_result(results[step.step_id])
+        
+        self.memory_system.record_episode(
+            event_type="plan_executed",
+            content={
+                "plan_id": plan_id,
+                "steps_run": len(results),
+                "steps_not_run": [step.step_id for step in pending],
+                "budget_exhausted": budget_exhausted
+            },
+            confidence=0.8
+        )
+        
+        return results
+    
+    def _estimate_step_cost(self, step: PlanStep) -> Dict[str, int]:
+        """Budget to reserve before running a step"""
+        return {"tokens": STEP_TOKEN_ESTIMATE, "tool_calls": len(step.tools_required)}
+    
+    def _execute_step(self, plan_id: str, step: PlanStep, tools_available: Dict[str, Any],
+                      invoke_tools: bool = False) -> ExecutionResult:
+        """Run a step and build its result (safe to call from worker threads)"""
+        
         start_time = datetime.now()
         
         # Simulate step execution (in real implementation, call actual tools)
-        result = self._simulate_step_execution(step, tools_available)
+        result = self._simulate_step_execution(step, tools_available, invoke_tools)
         
         execution_time = (datetime.now() - start_time).total_seconds()
         
-        # Create execution result
-        exec_result = ExecutionResult(
-            step_id=step_id,
+        return ExecutionResult(
+            step_id=step.step_id,
             plan_id=plan_id,
             status=result.get("status", "success"),
             outputs=result.get("outputs", {}),
@@ -474,6 +633,9 @@ class AgencyKernel:
             resource_usage=result.get("resource_usage", {"tool_calls": 1, "tokens": 100}),
             errors=result.get("errors", [])
         )
+    
+    def _record_step_result(self, exec_result: ExecutionResult):
+        """Log a step result, update memory and stats"""
         
         # Log result
         self._log_execution_result(exec_result)
@@ -482,8 +644,8 @@ class AgencyKernel:
         self.memory_system.record_episode(
             event_type="step_executed",
             content={
-                "step_id": step_id,
-                "plan_id": plan_id,
+                "step_id": exec_result.step_id,
+                "plan_id": exec_result.plan_id,
                 "status": exec_result.status,
                 "confidence": exec_result.confidence
             },
@@ -491,9 +653,9 @@ class AgencyKernel:
         )
         
         self.execution_stats["steps_executed"] += 1
-        return exec_result
     
-    def _simulate_step_execution(self, step: PlanStep, tools: Dict[str, Any]) -> Dict[str, Any]:
+    def _simulate_step_execution(self, step: PlanStep, tools: Dict[str, Any],
+                                 invoke_tools: bool = False) -> Dict[str, Any]:
         """Simulate step execution (placeholder for real tool calls)"""
         
         # Check if required tools are available
@@ -505,23 +667,36 @@ class AgencyKernel:
                 "confidence": 0.0
             }
         
+        outputs = {
+            f"{step.step_id}_output": f"Simulated output for {step.description}"
+        }
+        
+        # Call tools that are provided as callables, only when the caller opted in
+        for tool in step.tools_required:
+            if invoke_tools and callable(tools[tool]):
+                try:
+                    outputs[tool] = tools[tool](step)
+                except Exception as e:
+                    return {
+                        "status": "failed",
+                        "errors": [f"Tool {tool} failed: {e}"],
+                        "confidence": 0.0
+                    }
+        
         # Simulate successful execution
         return {
             "status": "success",
-            "outputs": {
-                f"{step.step_id}_output": f"Simulated output for {step.description}"
-            },
+            "outputs": outputs,
             "evidence": [f"Evidence from {step.action_type}"],
             "citations": [f"Source: {step.action_type}_data"],
             "confidence": step.confidence_estimate,
-            "resource_usage": {"tool_calls": len(step.tools_required), "tokens": 150}
+            "resource_usage": {"tool_calls": len(step.tools_required), "tokens": STEP_TOKEN_ESTIMATE}
         }
     
     def _log_execution_result(self, result: ExecutionResult):
-        """Log execution result to file"""
+        """Log execution result to the per-plan results store"""
         
-        with open(self.results_file, 'a') as f:
-            f.write(json.dumps(asdict(result)) + '\n')
+        self.results_index.append(asdict(result))
     
     # CRITIC COMPONENT
     
@@ -558,12 +733,12 @@ class AgencyKernel:
             issues_found=issues,
             recommendations=recommendations,
             overall_confidence=overall_confidence,
-            needs_revision=overall_confidence < 0.6
+            needs_revision=overall_confidence < 0.6,
+            plan_id=result.plan_id
         )
         
         # Log evaluation
-        with open(self.evaluations_file, 'a') as f:
-            f.write(json.dumps(asdict(evaluation)) + '\n')
+        self.evaluations_index.append(asdict(evaluation))
             
         # Update memory
         self.memory_system.record_episode(
@@ -700,28 +875,12 @@ class AgencyKernel:
     def _load_plan_results(self, plan_id: str) -> List[ExecutionResult]:
         """Load all execution results for a plan"""
         
-        results = []
-        if os.path.exists(self.results_file):
-            with open(self.results_file, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        data = json.loads(line)
-                        if data.get('plan_id') == plan_id:
-                            results.append(ExecutionResult(**data))
-        return results
+        return [ExecutionResult(**data) for data in self.results_index.read(plan_id)]
     
     def _load_plan_evaluations(self, plan_id: str) -> List[CriticEvaluation]:
         """Load all evaluations for a plan"""
         
-        evaluations = []
-        if os.path.exists(self.evaluations_file):
-            with open(self.evaluations_file, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        data = json.loads(line)
-                        # Match evaluations to plan results
-                        evaluations.append(CriticEvaluation(**data))
-        return evaluations
+        return [CriticEvaluation(**data) for data in self.evaluations_index.read(plan_id)]
     
     def _extract_learnings(self, results: List[ExecutionResult], 
                           evaluations: List[CriticEvaluation]) -> List[str]:
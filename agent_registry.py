@@ -0,0 +1,113 @@
+"""
+SINCOR Agent Registry
+Application-scoped pool of long-lived agent instances
+
+Agents are expensive to construct (database DDL, YAML loading, Jinja
+environments), so the web app builds each one once - at startup or on first
+use - and shares it across request and job threads. Each entry carries a
+config provider; when the config it returns changes, the agent is rebuilt on
+the next lookup.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+class _Entry:
+    """One registered agent and its current instance."""
+
+    def __init__(self, factory: Callable[[Dict[str, Any]], Any], config_provider: Callable[[], Dict[str, Any]]):
+        self.factory = factory
+        self.config_provider = config_provider
+        self.lock = threading.Lock()
+        self.instance = None
+        self.fingerprint = None
+        self.builds = 0
+        self.build_seconds = 0.0
+
+
+class AgentRegistry:
+    """Thread-safe registry that builds agents once and reuses them."""
+
+    def __init__(self):
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _fingerprint(config: Dict[str, Any]) -> str:
+        return hashlib.sha1(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+    def register(self, name: str, factory: Callable[[Dict[str, Any]], Any],
+                 config_provider: Optional[Callable[[], Dict[str, Any]]] = None):
+        """Register factory(config) under name. Replaces any previous registration."""
+        with self._lock:
+            self._entries[name] = _Entry(factory, config_provider or dict)
+
+    def get(self, name: str) -> Any:
+        """Return the shared instance, building or rebuilding it if needed."""
+        entry = self._entries.get(name)
+        if entry is None:
+            raise KeyError(f"No agent registered as '{name}'")
+
+        config = entry.config_provider()
+        fingerprint = self._fingerprint(config)
+        instance = entry.instance
+        if instance is not None and entry.fingerprint == fingerprint:
+            return instance
+
+        with entry.lock:
+            # Another thread may have built it while we waited
+            if entry.instance is None or entry.fingerprint != fingerprint:
+                start = time.perf_counter()
+                entry.instance = entry.factory(config)
+                entry.build_seconds = time.perf_counter() - start
+                entry.fingerprint = fingerprint
+                entry.builds += 1
+            return entry.instance
+
+    def warm(self, names: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """Build agents now instead of on first request. Returns status per agent."""
+        results = {}
+        for name in names or list(self._entries):
+            try:
+                self.get(name)
+                results[name] = "ready"
+            except Exception as e:
+                results[name] = f"error: {e}"
+        return results
+
+    def warm_in_background(self, names: Optional[Iterable[str]] = None) -> threading.Thread:
+        """Warm agents on a daemon thread so startup is not blocked."""
+        thread = threading.Thread(target=self.warm, args=(names,), name="agent-registry-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def reload(self, name: Optional[str] = None):
+        """Drop cached instances so they are rebuilt on next use."""
+        for entry_name in ([name] if name else list(self._entries)):
+            entry = self._entries[entry_name]
+            with entry.lock:
+                entry.instance = None
+                entry.fingerprint = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Build counts and last build time for each registered agent."""
+        return {
+            name: {
+                "loaded": entry.instance is not None,
+                "builds": entry.builds,
+                "last_build_seconds": round(entry.build_seconds, 4)
+            }
+            for name, entry in self._entries.items()
+        }
+
+
+_agent_registry = AgentRegistry()
+
+
+def get_agent_registry() -> AgentRegistry:
+    """Process-wide agent registry."""
+    return _agent_registry
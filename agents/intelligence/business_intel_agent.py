@@ -18,7 +18,7 @@ import sqlite3
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from urllib.parse import urljoin, urlparse
 import re
 
@@ -185,32 +185,27 @@ class BusinessIntelAgent(BaseAgent):
             self._log(f"Error searching businesses: {e}")
             return []
     
-    def search_multiple_directories(self, location: str, business_type: str = "auto detailing") -> List[Dict]:
-        """Search multiple business directories for comprehensive lead generation."""
+    def search_multiple_directories(self, location: str, business_type: str = "auto detailing",
+                                    progress_callback: Optional[Callable[[int, int, str], None]] = None) -> List[Dict]:
+        """Search multiple business directories for comprehensive lead generation.
+
+        progress_callback(completed, total, message) is called after each source.
+        """
         all_businesses = []
-        
-        # Google Places (primary source)
-        google_businesses = self.search_businesses_by_location(location, business_type)
-        all_businesses.extend(google_businesses)
-        self._log(f"Google Places: {len(google_businesses)} businesses found")
-        
-        # Yelp search if enabled
+        sources = [("Google Places", self.search_businesses_by_location)]
         if self.enable_yelp:
-            yelp_businesses = self._search_yelp(location, business_type)
-            all_businesses.extend(yelp_businesses)
-            self._log(f"Yelp: {len(yelp_businesses)} businesses found")
-        
-        # Yellow Pages search if enabled  
+            sources.append(("Yelp", self._search_yelp))
         if self.enable_yellowpages:
-            yp_businesses = self._search_yellowpages(location, business_type)
-            all_businesses.extend(yp_businesses)
-            self._log(f"Yellow Pages: {len(yp_businesses)} businesses found")
-        
-        # Better Business Bureau if enabled
+            sources.append(("Yellow Pages", self._search_yellowpages))
         if self.enable_bbbb:
-            bbb_businesses = self._search_bbb(location, business_type)
-            all_businesses.extend(bbb_businesses)
-            self._log(f"BBB: {len(bbb_businesses)} businesses found")
+            sources.append(("BBB", self._search_bbb))
+        
+        for completed, (source_name, search) in enumerate(sources, start=1):
+            source_businesses = search(location, business_type)
+            all_businesses.extend(source_businesses)
+            self._log(f"{source_name}: {len(source_businesses)} businesses found")
+            if progress_callback:
+                progress_callback(completed, len(sources), f"{source_name}: {len(source_businesses)} businesses found")
         
         # Remove duplicates based on name and address
         unique_businesses = self._deduplicate_businesses(all_businesses)
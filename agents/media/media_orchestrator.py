@@ -3,10 +3,13 @@ SINCOR Media Orchestrator Agent
 Coordinates video production and voiceover agents for complete media creation
 """
 
+import copy
 import json
+import threading
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 from ..base_agent import BaseAgent
 from .video_production_agent import VideoProductionAgent
@@ -15,6 +18,23 @@ from .voiceover_agent import VoiceoverAgent
 class MediaOrchestratorAgent(BaseAgent):
     """Orchestrates media production workflow for onboarding and marketing."""
     
+    # Media pipeline DAG: stage -> stages it depends on
+    PIPELINE = {
+        "generate_script": [],
+        "generate_video": ["generate_script"],
+        "generate_voiceover": ["generate_script"],
+        "synchronize_media": ["generate_video", "generate_voiceover"],
+        "create_deliverables": ["synchronize_media"]
+    }
+    
+    STAGE_STATUS = {
+        "generate_script": "generating_script",
+        "generate_video": "generating_video",
+        "generate_voiceover": "generating_voiceover",
+        "synchronize_media": "synchronizing",
+        "create_deliverables": "packaging"
+    }
+    
     def __init__(self, config: Dict = None):
         super().__init__("MediaOrchestratorAgent", "logs/media_orchestrator.log", config)
         
@@ -25,6 +45,20 @@ class MediaOrchestratorAgent(BaseAgent):
         # Media workflow tracking
         self.workflow_dir = Path("outputs/media_workflows")
         self.workflow_dir.mkdir(parents=True, exist_ok=True)
+        self.event_log_path = self.workflow_dir / "workflow_events.jsonl"
+        
+        # Worker pools - kept separate per level so a waiting parent never
+        # starves the work it is waiting on
+        self.max_workers = (config or {}).get("media_workers", 4)
+        self._workflow_pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="media-workflow")
+        self._stage_pool = ThreadPoolExecutor(max_workers=self.max_workers * 2, thread_name_prefix="media-stage")
+        self._render_pool = ThreadPoolExecutor(max_workers=self.max_workers * 2, thread_name_prefix="media-render")
+        
+        # Indexed workflow catalog, rebuilt from the append-only event log
+        self._catalog_lock = threading.Lock()
+        self._catalog: Dict[str, Dict] = {}
+        self._active_workflows: Dict[str, Dict] = {}
+        self._load_catalog()
         
         self._log("Media Orchestrator Agent initialized")
     
@@ -37,48 +71,27 @@ class MediaOrchestratorAgent(BaseAgent):
             # Create workflow tracking
             workflow_id = f"onboarding_{company.replace(' ', '_').lower()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
             workflow = self._initialize_workflow(workflow_id, user_data)
+            self._record_event(workflow, "created")
             
-            # Step 1: Generate video with script
-            self._log("Step 1: Generating onboarding video...")
-            workflow["status"] = "generating_video"
-            self._save_workflow(workflow)
-            
-            video_result = self.video_agent.create_onboarding_video(user_data)
-            if not video_result["success"]:
-                workflow["error"] = f"Video generation failed: {video_result['error']}"
-                workflow["status"] = "failed"
-                self._save_workflow(workflow)
-                return workflow
-            
-            workflow["video"] = video_result
-            workflow["script"] = video_result["script"]
-            
-            # Step 2: Generate synchronized voiceover
-            self._log("Step 2: Generating synchronized voiceover...")
-            workflow["status"] = "generating_voiceover"
-            self._save_workflow(workflow)
+            # Run the media DAG - video and voiceover both only need the script,
+            # so they render concurrently
+            stage_handlers = {
+                "generate_script": self._stage_generate_script,
+                "generate_video": self._stage_generate_video,
+                "generate_voiceover": self._stage_generate_voiceover,
+                "synchronize_media": self._stage_synchronize_media,
+                "create_deliverables": self._stage_create_deliverables
+            }
+            failure = self._run_pipeline(workflow, stage_handlers)
             
-            voiceover_result = self.voiceover_agent.create_onboarding_voiceover(
-                video_result["script"], 
-                user_data
-            )
-            if not voiceover_result["success"]:
-                workflow["error"] = f"Voiceover generation failed: {voiceover_result['error']}"
+            if failure:
+                workflow["error"] = failure
                 workflow["status"] = "failed"
-                self._save_workflow(workflow)
+                workflow["success"] = False
+                self._finalize_workflow(workflow)
                 return workflow
             
-            workflow["voiceover"] = voiceover_result
-            
-            # Step 3: Synchronize and finalize
-            self._log("Step 3: Synchronizing media components...")
-            workflow["status"] = "synchronizing"
-            self._save_workflow(workflow)
-            
-            sync_result = self._synchronize_media(workflow)
-            workflow["synchronized_media"] = sync_result
-            
-            # Step 4: Complete workflow
+            # Complete workflow
             workflow["status"] = "completed"
             workflow["completion_time"] = datetime.now().isoformat()
             workflow["total_duration_minutes"] = (
@@ -86,23 +99,108 @@ class MediaOrchestratorAgent(BaseAgent):
                 datetime.fromisoformat(workflow["start_time"])
             ).total_seconds() / 60
             
-            self._save_workflow(workflow)
-            
-            # Create final deliverables package
-            deliverables = self._create_deliverables_package(workflow)
-            workflow["deliverables"] = deliverables
+            self._finalize_workflow(workflow)
             
             self._log(f"Complete onboarding created successfully: {workflow_id}")
             return workflow
             
         except Exception as e:
             self._log(f"Error in complete onboarding creation: {str(e)}")
+            if 'workflow' in locals():
+                workflow["status"] = "failed"
+                workflow["error"] = str(e)
+                workflow["success"] = False
+                try:
+                    self._finalize_workflow(workflow)
+                except Exception as save_error:
+                    self._log(f"Error saving failed workflow: {save_error}")
             return {
                 "success": False,
+                "status": "failed",
                 "error": str(e),
                 "workflow_id": workflow_id if 'workflow_id' in locals() else "unknown"
             }
     
+    def create_onboarding_batch(self, users: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create onboarding media for a batch of customers in parallel.
+        
+        Results are returned in the same order as `users`.
+        """
+        self._log(f"Starting batch onboarding for {len(users)} customers")
+        futures = [self._workflow_pool.submit(self.create_complete_onboarding, user_data)
+                   for user_data in users]
+        return [future.result() for future in futures]
+    
+    def _run_pipeline(self, workflow: Dict, stage_handlers: Dict[str, Any]) -> Optional[str]:
+        """Run pipeline stages as a DAG, submitting each stage once its dependencies finish.
+        
+        Returns an error message for the first failing stage, or None on success.
+        """
+        remaining = {stage: set(deps) for stage, deps in self.PIPELINE.items()}
+        running = {}
+        done = set()
+        
+        while remaining or running:
+            ready = [stage for stage, deps in remaining.items() if deps <= done]
+            for stage in ready:
+                del remaining[stage]
+                self._set_status(workflow, self.STAGE_STATUS[stage])
+                running[self._stage_pool.submit(stage_handlers[stage], workflow)] = stage
+            
+            if not running:
+                return f"Unresolvable pipeline dependencies: {sorted(remaining)}"
+            
+            finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                try:
+                    error = future.result()
+                except Exception as e:
+                    error = f"{stage} failed: {e}"
+                
+                if error:
+                    # Let in-flight stages settle before reporting the failure
+                    wait(list(running))
+                    return error
+                
+                done.add(stage)
+                workflow["current_step"] = len(done)
+        
+        return None
+    
+    def _stage_generate_script(self, workflow: Dict) -> Optional[str]:
+        workflow["script"] = self.video_agent._generate_onboarding_script(workflow["user_data"])
+        return None
+    
+    def _stage_generate_video(self, workflow: Dict) -> Optional[str]:
+        self._log("Generating onboarding video...")
+        video_result = self.video_agent.create_onboarding_video(
+            workflow["user_data"], script=workflow["script"], executor=self._render_pool
+        )
+        if not video_result["success"]:
+            return f"Video generation failed: {video_result['error']}"
+        workflow["video"] = video_result
+        return None
+    
+    def _stage_generate_voiceover(self, workflow: Dict) -> Optional[str]:
+        self._log("Generating synchronized voiceover...")
+        voiceover_result = self.voiceover_agent.create_onboarding_voiceover(
+            workflow["script"], workflow["user_data"], executor=self._render_pool
+        )
+        if not voiceover_result["success"]:
+            return f"Voiceover generation failed: {voiceover_result['error']}"
+        workflow["voiceover"] = voiceover_result
+        return None
+    
+    def _stage_synchronize_media(self, workflow: Dict) -> Optional[str]:
+        self._log("Synchronizing media components...")
+        workflow["synchronized_media"] = self._synchronize_media(workflow)
+        return None
+    
+    def _stage_create_deliverables(self, workflow: Dict) -> Optional[str]:
+        workflow["deliverables"] = self._create_deliverables_package(workflow)
+        return None
+    
     def _initialize_workflow(self, workflow_id: str, user_data: Dict) -> Dict:
         """Initialize workflow tracking."""
         return {
@@ -111,12 +209,7 @@ class MediaOrchestratorAgent(BaseAgent):
             "user_data": user_data,
             "status": "initialized",
             "start_time": datetime.now().isoformat(),
-            "steps": [
-                "generate_video",
-                "generate_voiceover", 
-                "synchronize_media",
-                "create_deliverables"
-            ],
+            "steps": list(self.PIPELINE),
             "current_step": 0,
             "success": True
         }
@@ -225,55 +318,150 @@ class MediaOrchestratorAgent(BaseAgent):
             self._log(f"Error creating deliverables package: {str(e)}")
             return {"error": str(e)}
     
+    def _set_status(self, workflow: Dict, status: str):
+        """Update workflow status and append it to the event log."""
+        workflow["status"] = status
+        self._record_event(workflow, "status")
+    
+    def _finalize_workflow(self, workflow: Dict):
+        """Persist the final workflow document once and close it in the catalog."""
+        self._save_workflow(workflow)
+        self._record_event(workflow, "finished")
+        with self._catalog_lock:
+            self._active_workflows.pop(workflow["workflow_id"], None)
+    
     def _save_workflow(self, workflow: Dict):
         """Save workflow state to disk."""
         workflow_path = self.workflow_dir / f"{workflow['workflow_id']}.json"
         with open(workflow_path, 'w') as f:
             json.dump(workflow, f, indent=2)
     
-    def get_workflow_status(self, workflow_id: str) -> Dict:
-        """Get status of a media workflow."""
-        try:
-            workflow_path = self.workflow_dir / f"{workflow_id}.json"
-            if workflow_path.exists():
-                with open(workflow_path, 'r') as f:
-                    return json.load(f)
-            else:
-                return {"error": "Workflow not found"}
-        except Exception as e:
-            return {"error": str(e)}
+    def _record_event(self, workflow: Dict, event: str):
+        """Append a compact event line and apply it to the in-memory catalog."""
+        entry = {
+            "id": workflow["workflow_id"],
+            "event": event,
+            "status": workflow["status"],
+            "ts": datetime.now().isoformat()
+        }
+        if event == "created":
+            entry.update({
+                "type": workflow["type"],
+                "company": workflow["user_data"].get("company", "Unknown"),
+                "start_time": workflow["start_time"]
+            })
+        elif event == "finished":
+            entry.update({
+                "completion_time": workflow.get("completion_time"),
+                "success": workflow.get("success", False)
+            })
+        
+        with self._catalog_lock:
+            if event == "created":
+                self._active_workflows[workflow["workflow_id"]] = workflow
+            self._apply_event(entry)
+            with open(self.event_log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, separators=(',', ':')) + "\n")
     
-    def list_workflows(self, workflow_type: str = None) -> List[Dict]:
-        """List all media workflows."""
-        workflows = []
+    def _apply_event(self, entry: Dict):
+        """Fold one event into the workflow catalog."""
+        workflow_id = entry["id"]
+        
+        if entry["event"] in ("created", "snapshot"):
+            self._catalog[workflow_id] = {
+                "workflow_id": workflow_id,
+                "type": entry.get("type"),
+                "company": entry.get("company", "Unknown"),
+                "status": entry["status"],
+                "start_time": entry.get("start_time"),
+                "completion_time": entry.get("completion_time"),
+                "success": entry.get("success", True)
+            }
+            return
         
+        summary = self._catalog.get(workflow_id)
+        if summary is None:
+            return
+        summary["status"] = entry["status"]
+        if entry["event"] == "finished":
+            summary["completion_time"] = entry.get("completion_time")
+            summary["success"] = entry.get("success", False)
+    
+    def _load_catalog(self):
+        """Rebuild the workflow catalog by replaying the event log.
+        
+        Workflow files written before the event log existed are read once and
+        recorded as snapshot events so later startups skip them.
+        """
+        if self.event_log_path.exists():
+            with open(self.event_log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self._apply_event(json.loads(line))
+                    except (json.JSONDecodeError, KeyError):
+                        continue  # Skip torn or malformed lines
+        
+        legacy_snapshots = []
         for workflow_file in self.workflow_dir.glob("*.json"):
             if workflow_file.name.endswith("_deliverables.json"):
-                continue  # Skip deliverables files
-                
+                continue
+            if workflow_file.stem in self._catalog:
+                continue
+            
             try:
                 with open(workflow_file, 'r') as f:
                     workflow = json.load(f)
                 
-                if workflow_type and workflow.get("type") != workflow_type:
-                    continue
-                
-                summary = {
-                    "workflow_id": workflow["workflow_id"],
+                entry = {
+                    "id": workflow["workflow_id"],
+                    "event": "snapshot",
+                    "status": workflow["status"],
+                    "ts": datetime.now().isoformat(),
                     "type": workflow["type"],
                     "company": workflow["user_data"].get("company", "Unknown"),
-                    "status": workflow["status"],
                     "start_time": workflow["start_time"],
                     "completion_time": workflow.get("completion_time"),
                     "success": workflow.get("success", False)
                 }
-                
-                workflows.append(summary)
+                self._apply_event(entry)
+                legacy_snapshots.append(entry)
                 
             except Exception as e:
                 self._log(f"Error reading workflow {workflow_file}: {e}")
         
-        return sorted(workflows, key=lambda x: x["start_time"], reverse=True)
+        if legacy_snapshots:
+            with open(self.event_log_path, 'a', encoding='utf-8') as f:
+                for entry in legacy_snapshots:
+                    f.write(json.dumps(entry, separators=(',', ':')) + "\n")
+    
+    def get_workflow_status(self, workflow_id: str) -> Dict:
+        """Get status of a media workflow."""
+        try:
+            with self._catalog_lock:
+                active = self._active_workflows.get(workflow_id)
+                summary = dict(self._catalog.get(workflow_id) or {})
+            if active is not None:
+                # Stages keep writing to the live document; hand out a snapshot
+                return copy.deepcopy(dict(active))
+            
+            workflow_path = self.workflow_dir / f"{workflow_id}.json"
+            if workflow_path.exists():
+                with open(workflow_path, 'r') as f:
+                    return json.load(f)
+            elif summary:
+                return summary
+            else:
+                return {"error": "Workflow not found"}
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def list_workflows(self, workflow_type: str = None) -> List[Dict]:
+        """List all media workflows."""
+        with self._catalog_lock:
+            workflows = [dict(summary) for summary in self._catalog.values()
+                         if not workflow_type or summary["type"] == workflow_type]
+        
+        return sorted(workflows, key=lambda x: x["start_time"] or "", reverse=True)
     
     def create_custom_media(self, media_request: Dict[str, Any]) -> Dict[str, Any]:
         """Create custom media based on specific requirements."""
@@ -302,11 +490,24 @@ class MediaOrchestratorAgent(BaseAgent):
     def _run_custom_diagnostics(self) -> Dict[str, Any]:
         """Run custom diagnostics for media orchestrator agent."""
         workflow_files = list(self.workflow_dir.glob("*.json"))
+        with self._catalog_lock:
+            workflow_count = len(self._catalog)
+            active_count = len(self._active_workflows)
         return {
             "workflow_directory": str(self.workflow_dir),
             "directory_exists": self.workflow_dir.exists(),
-            "workflow_count": len([f for f in workflow_files if not f.name.endswith("_deliverables.json")]),
+            "workflow_count": workflow_count,
+            "active_workflows": active_count,
             "deliverables_count": len([f for f in workflow_files if f.name.endswith("_deliverables.json")]),
+            "worker_pool_size": self.max_workers,
             "video_agent_status": "initialized",
             "voiceover_agent_status": "initialized"
-        }
\ No newline at end of file
+        }
+    
+    def _custom_shutdown(self) -> None:
+        """Stop worker pools, letting queued work finish."""
+        self._workflow_pool.shutdown(wait=True)
+        self._stage_pool.shutdown(wait=True)
+        self._render_pool.shutdown(wait=True)
+        self.video_agent.shutdown()
+        self.voiceover_agent.shutdown()
\ No newline at end of file
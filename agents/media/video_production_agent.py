@@ -7,8 +7,9 @@ import os
 import json
 import requests
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
+from concurrent.futures import Executor
 import tempfile
 
 from ..base_agent import BaseAgent
@@ -27,16 +28,22 @@ class VideoProductionAgent(BaseAgent):
         
         self._log("Video Production Agent initialized")
     
-    def create_onboarding_video(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Create personalized onboarding video for new SINCOR user."""
+    def create_onboarding_video(self, user_data: Dict[str, Any], script: Optional[Dict] = None,
+                                executor: Optional[Executor] = None) -> Dict[str, Any]:
+        """Create personalized onboarding video for new SINCOR user.
+        
+        A pre-generated script can be passed in so other pipeline stages can
+        start from it, and an executor fans scene rendering out across workers.
+        """
         try:
             self._log(f"Creating onboarding video for: {user_data.get('company', 'User')}")
             
             # Generate video script
-            script = self._generate_onboarding_script(user_data)
+            if script is None:
+                script = self._generate_onboarding_script(user_data)
             
             # Create video scenes
-            video_scenes = self._create_video_scenes(script, user_data)
+            video_scenes = self._create_video_scenes(script, user_data, executor)
             
             # Generate final video
             video_path = self._assemble_video(video_scenes, user_data)
@@ -111,20 +118,23 @@ class VideoProductionAgent(BaseAgent):
         
         return script
     
-    def _create_video_scenes(self, script: Dict, user_data: Dict) -> List[Dict]:
+    def _create_video_scenes(self, script: Dict, user_data: Dict,
+                             executor: Optional[Executor] = None) -> List[Dict]:
         """Create visual scenes for each part of the script."""
-        scenes = []
+        if executor is None:
+            return [self._render_scene(scene, user_data) for scene in script["scenes"]]
         
-        for scene in script["scenes"]:
-            scene_data = {
-                "id": scene["id"],
-                "text": scene["text"],
-                "visuals": self._generate_scene_visuals(scene, user_data),
-                "duration": scene["duration"]
-            }
-            scenes.append(scene_data)
-            
-        return scenes
+        # Scenes are independent - render them concurrently, keep script order
+        return list(executor.map(lambda scene: self._render_scene(scene, user_data), script["scenes"]))
+    
+    def _render_scene(self, scene: Dict, user_data: Dict) -> Dict:
+        """Render a single script scene."""
+        return {
+            "id": scene["id"],
+            "text": scene["text"],
+            "visuals": self._generate_scene_visuals(scene, user_data),
+            "duration": scene["duration"]
+        }
     
     def _generate_scene_visuals(self, scene: Dict, user_data: Dict) -> str:
         """Generate or select visuals for a scene."""
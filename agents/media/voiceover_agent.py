@@ -4,15 +4,55 @@ Generates AI voiceovers for videos and presentations
 """
 
 import os
+import re
+import io
 import json
+import wave
+import hashlib
+import threading
 import requests
 import tempfile
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+from concurrent.futures import Executor, ThreadPoolExecutor, Future
 
 from ..base_agent import BaseAgent
 
+# Silence inserted for narration pause markers (seconds)
+PAUSE_SECONDS = {"[PAUSE]": 0.5, "[LONG_PAUSE]": 1.0}
+
+# ElevenLabs returns 128 kbps MP3 by default
+MP3_BYTES_PER_SECOND = 128000 / 8
+
+
+class FakeTTSBackend:
+    """Local TTS stand-in that renders silent 16-bit mono WAV at speech pace.
+    
+    Useful for tests and offline runs: durations follow the same
+    150 words-per-minute pace used for timing estimates.
+    """
+    
+    name = "fake"
+    audio_format = "wav"
+    
+    def __init__(self, sample_rate: int = 16000, words_per_minute: int = 150):
+        self.sample_rate = sample_rate
+        self.words_per_minute = words_per_minute
+        self.calls = 0
+    
+    def synthesize(self, text: str) -> bytes:
+        self.calls += 1
+        duration = max(0.25, len(text.split()) / self.words_per_minute * 60)
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(b"\x00\x00" * int(duration * self.sample_rate))
+        return buffer.getvalue()
+
+
 class VoiceoverAgent(BaseAgent):
     """Agent for creating AI-generated voiceovers."""
     
@@ -29,22 +69,54 @@ class VoiceoverAgent(BaseAgent):
         self.default_voice_id = "EXAVITQu4vr4xnSDxMaL"  # Bella (friendly female voice)
         self.professional_voice_id = "pNInz6obpgDQGcFmaJgB"  # Adam (professional male voice)
         
+        # Optional local backend (config "tts_backend" or TTS_BACKEND=fake)
+        backend_name = (config or {}).get("tts_backend") or os.getenv("TTS_BACKEND", "")
+        self.tts_backend = FakeTTSBackend() if backend_name == "fake" else None
+        
+        # Content-addressed segment cache: shared phrases are synthesized once
+        self.segment_dir = self.output_dir / "segments"
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        self._segment_lock = threading.Lock()
+        self._segment_index: Dict[str, Tuple[Path, float]] = {}  # key -> (path, duration)
+        self._segment_inflight: Dict[str, Future] = {}
+        self.segment_cache_hits = 0
+        self.segment_cache_misses = 0
+        
+        self._segment_pool = ThreadPoolExecutor(
+            max_workers=(config or {}).get("tts_workers", 4), thread_name_prefix="tts-segment"
+        )
+        
         self._log("Voiceover Agent initialized")
     
-    def create_onboarding_voiceover(self, script: Dict, user_data: Dict = None) -> Dict[str, Any]:
-        """Create voiceover for onboarding video script."""
+    def create_onboarding_voiceover(self, script: Dict, user_data: Dict = None,
+                                    executor: Optional[Executor] = None) -> Dict[str, Any]:
+        """Create voiceover for onboarding video script.
+        
+        With a TTS backend available the narration is split into sentence
+        segments that are synthesized concurrently (on `executor` if given),
+        served from the segment cache when already rendered, and streamed to
+        the output file in order as they finish.
+        """
         try:
             company = user_data.get('company', 'your business') if user_data else 'your business'
             self._log(f"Creating voiceover for: {company}")
             
             # Prepare the full narration text
-            narration = self._prepare_narration_text(script, user_data)
+            narration_parts = self._prepare_narration_parts(script, user_data)
+            narration = " [LONG_PAUSE] ".join(narration_parts)
             
-            # Generate voiceover audio
-            audio_path = self._generate_voiceover_audio(narration, user_data)
+            segment_durations = None
+            if self._has_tts_backend():
+                # Generate voiceover audio segment by segment
+                audio_path, segment_durations = self._generate_segmented_audio(
+                    script, narration_parts, user_data, executor or self._segment_pool
+                )
+            else:
+                # Generate voiceover audio
+                audio_path = self._generate_voiceover_audio(narration, user_data)
             
             # Create timing information for video sync
-            timing_data = self._create_timing_data(script, narration)
+            timing_data = self._create_timing_data(script, narration, segment_durations)
             
             result = {
                 "success": True,
@@ -65,6 +137,11 @@ class VoiceoverAgent(BaseAgent):
     
     def _prepare_narration_text(self, script: Dict, user_data: Dict = None) -> str:
         """Prepare the full narration text from script scenes."""
+        # Join with longer pauses between scenes
+        return " [LONG_PAUSE] ".join(self._prepare_narration_parts(script, user_data))
+    
+    def _prepare_narration_parts(self, script: Dict, user_data: Dict = None) -> List[str]:
+        """Prepare per-scene narration text from script scenes."""
         company = user_data.get('company', 'your business') if user_data else 'your business'
         industry = user_data.get('industry', 'business') if user_data else 'business'
         
@@ -90,10 +167,164 @@ class VoiceoverAgent(BaseAgent):
             
             narration_parts.append(text)
         
-        # Join with longer pauses between scenes
-        full_narration = " [LONG_PAUSE] ".join(narration_parts)
+        return narration_parts
+    
+    def _split_segments(self, scene_text: str) -> List[Tuple[str, float]]:
+        """Split scene narration into (sentence, pause_after_seconds) segments."""
+        segments = []
+        
+        for chunk in re.split(r"(\[PAUSE\]|\[LONG_PAUSE\])", scene_text):
+            if chunk in PAUSE_SECONDS:
+                if segments:
+                    text, pause = segments[-1]
+                    segments[-1] = (text, pause + PAUSE_SECONDS[chunk])
+                continue
+            
+            for sentence in re.split(r"(?<=[.!?])\s+", chunk.strip()):
+                sentence = sentence.strip(" .") if sentence.endswith("...") else sentence.strip()
+                if sentence:
+                    segments.append((sentence, 0.0))
+        
+        return segments
+    
+    def _has_tts_backend(self) -> bool:
+        return self.tts_backend is not None or bool(self.tts_api_key and self.tts_api_url)
+    
+    def _segment_format(self) -> str:
+        return self.tts_backend.audio_format if self.tts_backend else "mp3"
+    
+    def _segment_key(self, text: str) -> str:
+        """Content address for a synthesized segment (backend, voice, text)."""
+        backend = self.tts_backend.name if self.tts_backend else "elevenlabs"
+        blob = f"{backend}|{self.default_voice_id}|{text}"
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+    
+    def _get_segment(self, text: str, executor: Executor) -> Future:
+        """Return a future for (path, duration) of a segment, synthesizing at most once."""
+        key = self._segment_key(text)
         
-        return full_narration
+        with self._segment_lock:
+            cached = self._segment_index.get(key)
+            if cached is None:
+                segment_path = self.segment_dir / f"{key}.{self._segment_format()}"
+                if segment_path.exists():
+                    cached = (segment_path, self._audio_duration(segment_path.read_bytes()))
+                    self._segment_index[key] = cached
+            
+            if cached is not None:
+                self.segment_cache_hits += 1
+                done = Future()
+                done.set_result(cached)
+                return done
+            
+            inflight = self._segment_inflight.get(key)
+            if inflight is not None:
+                self.segment_cache_hits += 1
+                return inflight
+            
+            self.segment_cache_misses += 1
+            future = executor.submit(self._synthesize_segment, key, text)
+            self._segment_inflight[key] = future
+            return future
+    
+    def _synthesize_segment(self, key: str, text: str) -> Tuple[Path, float]:
+        """Synthesize one segment and store it under its content address."""
+        try:
+            if self.tts_backend:
+                audio = self.tts_backend.synthesize(text)
+            else:
+                audio = self._call_tts_api(text)
+            
+            segment_path = self.segment_dir / f"{key}.{self._segment_format()}"
+            tmp_path = segment_path.with_suffix(segment_path.suffix + ".tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(audio)
+            os.replace(tmp_path, segment_path)
+            
+            result = (segment_path, self._audio_duration(audio))
+            with self._segment_lock:
+                self._segment_index[key] = result
+            return result
+        finally:
+            with self._segment_lock:
+                self._segment_inflight.pop(key, None)
+    
+    def _audio_duration(self, audio: bytes) -> float:
+        """Duration of a segment in seconds."""
+        if self._segment_format() == "wav":
+            with wave.open(io.BytesIO(audio), 'rb') as wav:
+                return wav.getnframes() / float(wav.getframerate())
+        return len(audio) / MP3_BYTES_PER_SECOND
+    
+    def _generate_segmented_audio(self, script: Dict, narration_parts: List[str],
+                                  user_data: Dict, executor: Executor) -> Tuple[Path, Optional[Dict[int, float]]]:
+        """Synthesize narration segments concurrently and stream them to one file.
+        
+        Returns the audio path and the real spoken duration of each scene. If
+        any segment fails to synthesize, the narration is written out as a
+        text script for manual recording and no durations are returned, so
+        timing falls back to word-count estimates.
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        company_name = user_data.get('company', 'user').replace(' ', '_').lower() if user_data else 'user'
+        audio_format = self._segment_format()
+        audio_path = self.output_dir / f"voiceover_{company_name}_{timestamp}.{audio_format}"
+        
+        # (scene_id, future, pause_after) in narration order
+        scenes = script.get("scenes", [])
+        plan = []
+        for index, (scene, scene_text) in enumerate(zip(scenes, narration_parts)):
+            segments = self._split_segments(scene_text)
+            if index < len(narration_parts) - 1 and segments:
+                text, pause = segments[-1]
+                segments[-1] = (text, pause + PAUSE_SECONDS["[LONG_PAUSE]"])
+            for text, pause in segments:
+                plan.append((scene["id"], self._get_segment(text, executor), pause))
+        
+        try:
+            scene_durations = self._stream_segments(audio_path, audio_format, scenes, plan)
+        except Exception as e:
+            self._log(f"TTS segment synthesis failed, creating text file: {e}")
+            clean_text = " ".join(narration_parts).replace("[PAUSE]", "").replace("[LONG_PAUSE]", "")
+            self._create_text_audio_file(clean_text, audio_path)
+            return audio_path, None
+        
+        self._log(f"Voiceover streamed from {len(plan)} segments "
+                  f"(cache hits: {self.segment_cache_hits}, misses: {self.segment_cache_misses})")
+        return audio_path, scene_durations
+    
+    def _stream_segments(self, audio_path: Path, audio_format: str, scenes: List[Dict],
+                         plan: List[Tuple[int, Future, float]]) -> Dict[int, float]:
+        """Write segments in order, each as soon as it (and its predecessors) finish.
+        
+        Pauses are rendered as silence in WAV output only. MP3 segments are
+        concatenated frame for frame with no silence between them, so their
+        scene durations count spoken audio alone.
+        """
+        scene_durations: Dict[int, float] = {scene["id"]: 0.0 for scene in scenes}
+        
+        if audio_format == "wav":
+            with wave.open(str(audio_path), 'wb') as out:
+                params_set = False
+                for scene_id, future, pause in plan:
+                    segment_path, duration = future.result()
+                    with wave.open(str(segment_path), 'rb') as segment:
+                        if not params_set:
+                            out.setparams(segment.getparams())
+                            params_set = True
+                        out.writeframes(segment.readframes(segment.getnframes()))
+                        silence = int(pause * segment.getframerate()) * segment.getsampwidth() * segment.getnchannels()
+                        out.writeframes(b"\x00" * silence)
+                    scene_durations[scene_id] += duration + pause
+        else:
+            # MP3 frames can be concatenated directly; pauses are not rendered
+            with open(audio_path, 'wb') as out:
+                for scene_id, future, pause in plan:
+                    segment_path, duration = future.result()
+                    out.write(segment_path.read_bytes())
+                    scene_durations[scene_id] += duration
+        
+        return scene_durations
     
     def _generate_voiceover_audio(self, narration_text: str, user_data: Dict = None) -> Path:
         """Generate audio file from narration text."""
@@ -178,8 +409,13 @@ class VoiceoverAgent(BaseAgent):
             f.write("# Audio placeholder - TTS API not configured\n")
             f.write(f"# Script available at: {text_path}\n")
     
-    def _create_timing_data(self, script: Dict, narration: str) -> Dict:
-        """Create timing data for video synchronization."""
+    def _create_timing_data(self, script: Dict, narration: str,
+                            segment_durations: Optional[Dict[int, float]] = None) -> Dict:
+        """Create timing data for video synchronization.
+        
+        Uses real per-scene audio durations when the narration was synthesized,
+        otherwise estimates from word count.
+        """
         scenes = script.get("scenes", [])
         
         # Estimate timing based on text length and natural speech
@@ -195,10 +431,14 @@ class VoiceoverAgent(BaseAgent):
             # Estimate duration based on text length
             text = scene["text"]
             word_count = len(text.split())
-            estimated_duration = (word_count / words_per_minute) * 60
             
-            # Add buffer time for pauses
-            scene_duration = max(estimated_duration + 2, scene.get("duration", 30))
+            if segment_durations is not None and scene["id"] in segment_durations:
+                scene_duration = round(segment_durations[scene["id"]], 3)
+            else:
+                estimated_duration = (word_count / words_per_minute) * 60
+                
+                # Add buffer time for pauses
+                scene_duration = max(estimated_duration + 2, scene.get("duration", 30))
             
             scene_timing = {
                 "scene_id": scene["id"],
@@ -270,7 +510,8 @@ class VoiceoverAgent(BaseAgent):
         """List all generated voiceovers."""
         voiceovers = []
         
-        for audio_file in self.output_dir.glob("*.wav"):
+        audio_files = list(self.output_dir.glob("*.wav")) + list(self.output_dir.glob("*.mp3"))
+        for audio_file in audio_files:
             voiceover_info = {
                 "filename": audio_file.name,
                 "path": str(audio_file),
@@ -297,5 +538,13 @@ class VoiceoverAgent(BaseAgent):
             "directory_exists": self.output_dir.exists(),
             "audio_files_count": len(list(self.output_dir.glob("*.wav"))),
             "tts_api_configured": bool(self.tts_api_key),
+            "tts_backend": self.tts_backend.name if self.tts_backend else None,
+            "segment_cache_size": len(self._segment_index),
+            "segment_cache_hits": self.segment_cache_hits,
+            "segment_cache_misses": self.segment_cache_misses,
             "voice_id": self.default_voice_id
-        }
\ No newline at end of file
+        }
+    
+    def _custom_shutdown(self) -> None:
+        """Stop the segment synthesis pool."""
+        self._segment_pool.shutdown(wait=True)
\ No newline at end of file
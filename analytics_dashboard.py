@@ -8,15 +8,223 @@ with detailed analytics that justify the premium pricing.
 
 import sqlite3
 import json
+import csv
+import io
+import os
+import threading
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 import random
 
+
+class LeadsCsvAggregate:
+    """Lead counters for an append-only CSV, refreshed from the last byte offset."""
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        self._reset()
+    
+    def _reset(self):
+        self.offset = 0
+        self.fieldnames = None
+        self.file_id = None
+        self.leads_count = 0
+        self.service_counts = {}
+    
+    def refresh(self):
+        """Fold in rows appended since the last refresh."""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            self._reset()
+            return
+        
+        # Rewritten or truncated file - start over
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self.file_id or stat.st_size < self.offset:
+            self._reset()
+            self.file_id = file_id
+        
+        if stat.st_size == self.offset:
+            return
+        
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read(stat.st_size - self.offset)
+        
+        # Only consume complete records; a quoted field may span lines, so let the
+        # csv parser find record boundaries and leave a partially written row
+        # for the next refresh
+        consumed = 0
+        exhausted = False
+        
+        def complete_lines():
+            nonlocal consumed, exhausted
+            for line in io.BytesIO(chunk):
+                if not line.endswith(b"\n"):
+                    break
+                consumed += len(line)
+                yield line.decode('utf-8', errors='replace')
+            exhausted = True
+        
+        reader = csv.reader(complete_lines(), strict=True)
+        record_end = 0
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                break
+            except csv.Error:
+                if exhausted:
+                    break  # quoted field still open at the end of the written data
+                record_end = consumed  # malformed record - skip it
+                continue
+            record_end = consumed
+            self._add_row(row)
+        self.offset += record_end
+    
+    def _add_row(self, row):
+        if not row:
+            return
+        if self.fieldnames is None:
+            self.fieldnames = row
+            return
+        lead = dict(zip(self.fieldnames, row))
+        service = lead.get('service', 'Unknown')
+        self.service_counts[service] = self.service_counts.get(service, 0) + 1
+        self.leads_count += 1
+
+
+class TableCountCache:
+    """COUNT(*) of a SQLite table, recomputed only when the database files change."""
+    
+    def __init__(self, db_path, table):
+        self.db_path = Path(db_path)
+        self.table = table
+        self._signature = None
+        self.count = 0
+    
+    def _file_signature(self):
+        signature = []
+        for suffix in ("", "-wal"):
+            try:
+                stat = os.stat(f"{self.db_path}{suffix}")
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+    
+    def refresh(self, conn):
+        signature = self._file_signature()
+        if signature == self._signature:
+            return
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM {self.table}")
+        self.count = cursor.fetchone()[0]
+        self._signature = signature
+
+
+class SystemMetricsStore:
+    """Materialized dashboard metrics shared by every analytics request.
+    
+    Leads are folded in incrementally from the CSV byte offset, table counts
+    are only recomputed when their database changes, and the combined
+    snapshot is cached for `ttl_seconds` so one dashboard request (and any
+    burst of them) computes it once.
+    """
+    
+    def __init__(self, root, ttl_seconds=30.0):
+        root = Path(root)
+        self.ttl_seconds = ttl_seconds
+        self.db_path = root / "data" / "business_intelligence.db"
+        self.main_db = root / "data" / "sincor_main.db"
+        
+        self.leads = LeadsCsvAggregate(root / "outputs" / "leads.csv")
+        self.businesses = TableCountCache(self.db_path, "businesses")
+        self.campaigns = TableCountCache(self.db_path, "campaigns")
+        self.emails = TableCountCache(self.main_db, "email_tracking")
+        
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._snapshot_time = 0.0
+    
+    def get_snapshot(self):
+        """Return cached metrics, refreshing them once the TTL has passed."""
+        with self._lock:
+            now = time.monotonic()
+            if self._snapshot is None or now - self._snapshot_time >= self.ttl_seconds:
+                self._snapshot = self._refresh()
+                self._snapshot_time = now
+            return self._snapshot
+    
+    def invalidate(self):
+        """Force the next snapshot to refresh (e.g. right after a write)."""
+        with self._lock:
+            self._snapshot = None
+    
+    def _refresh(self):
+        data = {
+            "businesses_count": 0,
+            "campaigns_count": 0,
+            "emails_sent": 0,
+            "leads_count": 0,
+            "service_counts": {}
+        }
+        
+        try:
+            # Get leads from CSV
+            self.leads.refresh()
+            data["leads_count"] = self.leads.leads_count
+            data["service_counts"] = dict(self.leads.service_counts)
+            
+            # Get business intelligence data
+            if self.db_path.exists():
+                conn = sqlite3.connect(self.db_path)
+                try:
+                    self.businesses.refresh(conn)
+                    self.campaigns.refresh(conn)
+                finally:
+                    conn.close()
+                data["businesses_count"] = self.businesses.count
+                data["campaigns_count"] = self.campaigns.count
+            
+            # Get email tracking data
+            if self.main_db.exists():
+                conn = sqlite3.connect(self.main_db)
+                try:
+                    self.emails.refresh(conn)
+                finally:
+                    conn.close()
+                data["emails_sent"] = self.emails.count
+                
+        except Exception as e:
+            print(f"Error getting real data: {e}")
+        
+        return data
+
+
+_metrics_stores = {}
+_metrics_stores_lock = threading.Lock()
+
+
+def get_metrics_store(root=None):
+    """Process-wide metrics store for a project root."""
+    root = Path(root or Path(__file__).parent).resolve()
+    with _metrics_stores_lock:
+        store = _metrics_stores.get(root)
+        if store is None:
+            store = SystemMetricsStore(root)
+            _metrics_stores[root] = store
+        return store
+
+
 class SINCORAnalytics:
     """Advanced analytics engine with revenue tracking and ROI calculations."""
     
-    def __init__(self):
+    def __init__(self, metrics_store=None):
         self.db_path = Path(__file__).parent / "data" / "business_intelligence.db"
+        self.metrics_store = metrics_store or get_metrics_store()
     
     def get_customer_dashboard_data(self, customer_id="demo"):
         """Get comprehensive dashboard data for a customer."""
@@ -53,61 +261,14 @@ class SINCORAnalytics:
         }
     
     def _get_real_system_data(self):
-        """Get real data from SINCOR databases and files."""
-        import csv
-        
-        data = {
-            "businesses_count": 0,
-            "campaigns_count": 0,
-            "emails_sent": 0,
-            "leads_count": 0,
-            "leads_data": []
-        }
-        
-        try:
-            # Get leads from CSV
-            leads_file = Path(__file__).parent / "outputs" / "leads.csv"
-            if leads_file.exists():
-                with open(leads_file, 'r') as f:
-                    reader = csv.DictReader(f)
-                    leads_list = list(reader)
-                    data["leads_count"] = len(leads_list)
-                    data["leads_data"] = leads_list
-            
-            # Get business intelligence data
-            if self.db_path.exists():
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                
-                cursor.execute("SELECT COUNT(*) FROM businesses")
-                data["businesses_count"] = cursor.fetchone()[0]
-                
-                cursor.execute("SELECT COUNT(*) FROM campaigns")
-                data["campaigns_count"] = cursor.fetchone()[0]
-                
-                conn.close()
-            
-            # Get email tracking data
-            main_db = Path(__file__).parent / "data" / "sincor_main.db"
-            if main_db.exists():
-                conn = sqlite3.connect(main_db)
-                cursor = conn.cursor()
-                
-                cursor.execute("SELECT COUNT(*) FROM email_tracking")
-                data["emails_sent"] = cursor.fetchone()[0]
-                
-                conn.close()
-                
-        except Exception as e:
-            print(f"Error getting real data: {e}")
-        
-        return data
+        """Get real data from SINCOR databases and files (cached snapshot)."""
+        return self.metrics_store.get_snapshot()
     
     def _get_lead_metrics(self):
         """Lead generation and conversion metrics using real data."""
         real_data = self._get_real_system_data()
         leads_count = real_data["leads_count"]
-        leads_data = real_data["leads_data"]
+        services = real_data["service_counts"]
         
         # Generate weekly data based on real leads
         weeks = []
@@ -125,13 +286,8 @@ class SINCORAnalytics:
         
         # Analyze lead sources from real data
         lead_sources = []
-        if leads_data:
-            services = {}
-            for lead in leads_data:
-                service = lead.get('service', 'Unknown')
-                services[service] = services.get(service, 0) + 1
-            
-            total = len(leads_data)
+        if leads_count:
+            total = leads_count
             for service, count in services.items():
                 percentage = round((count / total) * 100) if total > 0 else 0
                 lead_sources.append({
@@ -203,12 +359,9 @@ class SINCORAnalytics:
         
         # Analyze real lead data for insights
         insights = []
-        if real_data["leads_data"]:
+        if real_data["leads_count"]:
             # Analyze services from real leads
-            services = {}
-            for lead in real_data["leads_data"]:
-                service = lead.get('service', 'Unknown')
-                services[service] = services.get(service, 0) + 1
+            services = real_data["service_counts"]
             
             if services:
                 top_service = max(services.items(), key=lambda x: x[1])
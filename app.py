@@ -3,46 +3,60 @@
 SINCOR Main Flask Application with Product Showcase and Waitlist System
 """
 
+import sys
+if __name__ == "__main__" and "--profile-startup" in sys.argv:
+    from startup_profiler import main as profile_startup
+    sys.exit(profile_startup(sys.argv[1:], entry_module="app"))
+
 import os
+import threading
 from flask import Flask, render_template, request, jsonify
 
-# Import waitlist system with error handling
-try:
+# Waitlist, PayPal and monetization are imported on first use, not at boot
+class OptionalService:
+    """Optional subsystem that is imported and built the first time it is used."""
+
+    def __init__(self, label, factory):
+        self.label = label
+        self.factory = factory
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._instance = None
+
+    def get(self):
+        """The service instance, or None if it could not be loaded."""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    try:
+                        self._instance = self.factory()
+                        print(f"✅ {self.label} Loaded Successfully")
+                    except ImportError as e:
+                        print(f"{self.label} not available: {e}")
+                    except Exception as e:
+                        print(f"{self.label} error: {e}")
+                    self._loaded = True
+        return self._instance
+
+    @property
+    def available(self):
+        return self.get() is not None
+
+def _load_waitlist():
     from waitlist_system import waitlist_manager
-    WAITLIST_AVAILABLE = True
-except ImportError as e:
-    print(f"Waitlist system not available: {e}")
-    WAITLIST_AVAILABLE = False
-
-# Import PayPal integration with error handling
-try:
-    from paypal_integration import PayPalIntegration, PaymentRequest
-    paypal_processor = PayPalIntegration()
-    PAYPAL_AVAILABLE = True
-    print("✅ PayPal Integration Loaded Successfully")
-except ImportError as e:
-    print(f"PayPal integration not available: {e}")
-    PAYPAL_AVAILABLE = False
-    paypal_processor = None
-except Exception as e:
-    print(f"PayPal configuration error: {e}")
-    PAYPAL_AVAILABLE = False
-    paypal_processor = None
-
-# Import monetization engine with error handling
-try:
+    return waitlist_manager
+
+def _load_paypal():
+    from paypal_integration import PayPalIntegration
+    return PayPalIntegration()
+
+def _load_monetization():
     from monetization_engine import MonetizationEngine
-    monetization_engine = MonetizationEngine()
-    MONETIZATION_AVAILABLE = True
-    print("✅ Monetization Engine Loaded Successfully")
-except ImportError as e:
-    print(f"Monetization engine not available: {e}")
-    MONETIZATION_AVAILABLE = False
-    monetization_engine = None
-except Exception as e:
-    print(f"Monetization engine error: {e}")
-    MONETIZATION_AVAILABLE = False
-    monetization_engine = None
+    return MonetizationEngine()
+
+waitlist = OptionalService("Waitlist System", _load_waitlist)
+paypal = OptionalService("PayPal Integration", _load_paypal)
+monetization = OptionalService("Monetization Engine", _load_monetization)
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -60,7 +74,7 @@ def index():
 def join_waitlist():
     """Handle waitlist signups"""
     try:
-        if not WAITLIST_AVAILABLE:
+        if not waitlist.available:
             return jsonify({'success': False, 'error': 'Waitlist system temporarily unavailable'})
             
         signup_data = request.get_json()
@@ -70,7 +84,7 @@ def join_waitlist():
             return jsonify({'success': False, 'error': 'Email address is required'})
         
         # Add to waitlist using the waitlist manager
-        result = waitlist_manager.add_to_waitlist(signup_data)
+        result = waitlist.get().add_to_waitlist(signup_data)
         
         return jsonify(result)
         
@@ -121,10 +135,10 @@ def get_products():
 def waitlist_analytics():
     """Get waitlist analytics (admin endpoint)"""
     try:
-        if not WAITLIST_AVAILABLE:
+        if not waitlist.available:
             return jsonify({'success': False, 'error': 'Analytics temporarily unavailable'})
             
-        analytics = waitlist_manager.get_analytics()
+        analytics = waitlist.get().get_analytics()
         return jsonify({
             'success': True,
             'analytics': analytics
@@ -136,7 +150,7 @@ def waitlist_analytics():
 def admin_panel():
     """Simple admin panel to view waitlist analytics"""
     try:
-        if not WAITLIST_AVAILABLE:
+        if not waitlist.available:
             return """
             <!DOCTYPE html>
             <html>
@@ -149,7 +163,7 @@ def admin_panel():
             </html>
             """
             
-        analytics = waitlist_manager.get_analytics()
+        analytics = waitlist.get().get_analytics()
         return f"""
         <!DOCTYPE html>
         <html>
@@ -193,13 +207,13 @@ def health_check():
     import datetime
 
     # Check if monetization is available based on loaded systems
-    monetization_available = bool(PAYPAL_AVAILABLE and MONETIZATION_AVAILABLE)
+    monetization_available = paypal.available and monetization.available
 
     return jsonify({
         'status': 'healthy',
         'service': 'SINCOR Master Platform',
         'ai_agents': 42,
-        'waitlist_available': WAITLIST_AVAILABLE,
+        'waitlist_available': waitlist.available,
         'monetization_available': monetization_available,
         'google_api_available': bool(os.environ.get('GOOGLE_API_KEY')),
         'email_available': bool(os.environ.get('SMTP_HOST') and os.environ.get('SMTP_USER')),
@@ -352,7 +366,7 @@ def test_environment():
 @app.route('/api/payment/create', methods=['POST'])
 async def create_payment():
     """Create a PayPal payment"""
-    if not PAYPAL_AVAILABLE:
+    if not paypal.available:
         return jsonify({'error': 'PayPal integration not available'}), 503
 
     try:
@@ -365,6 +379,7 @@ async def create_payment():
                 return jsonify({'error': f'Missing required field: {field}'}), 400
 
         # Create payment request
+        from paypal_integration import PaymentRequest
         payment_request = PaymentRequest(
             amount=float(payment_data['amount']),
             currency=payment_data.get('currency', 'USD'),
@@ -376,7 +391,7 @@ async def create_payment():
         )
 
         # Process payment
-        result = await paypal_processor.create_payment(payment_request)
+        result = await paypal.get().create_payment(payment_request)
 
         return jsonify({
             'success': result.success,
@@ -392,7 +407,7 @@ async def create_payment():
 @app.route('/api/payment/execute', methods=['POST'])
 async def execute_payment():
     """Execute a PayPal payment after approval"""
-    if not PAYPAL_AVAILABLE:
+    if not paypal.available:
         return jsonify({'error': 'PayPal integration not available'}), 503
 
     try:
@@ -404,7 +419,7 @@ async def execute_payment():
             return jsonify({'error': 'Missing payment_id or payer_id'}), 400
 
         # Execute payment
-        result = await paypal_processor.execute_payment(payment_id, payer_id)
+        result = await paypal.get().execute_payment(payment_id, payer_id)
 
         return jsonify({
             'success': result.success,
@@ -421,12 +436,12 @@ async def execute_payment():
 @app.route('/api/monetization/start', methods=['POST'])
 async def start_monetization():
     """Start the monetization engine"""
-    if not MONETIZATION_AVAILABLE:
+    if not monetization.available:
         return jsonify({'error': 'Monetization engine not available'}), 503
 
     try:
         # Execute monetization strategy
-        strategy_report = await monetization_engine.execute_monetization_strategy(
+        strategy_report = await monetization.get().execute_monetization_strategy(
             max_concurrent_opportunities=10
         )
 
@@ -443,9 +458,9 @@ async def start_monetization():
 def monetization_status():
     """Get monetization engine status"""
     return jsonify({
-        'paypal_available': PAYPAL_AVAILABLE,
-        'monetization_available': MONETIZATION_AVAILABLE,
-        'waitlist_available': WAITLIST_AVAILABLE,
+        'paypal_available': paypal.available,
+        'monetization_available': monetization.available,
+        'waitlist_available': waitlist.available,
         'environment_configured': bool(os.environ.get('PAYPAL_REST_API_ID')),
         'production_mode': os.environ.get('PAYPAL_ENV', 'sandbox') == 'live'
     })
@@ -465,7 +480,7 @@ if __name__ == '__main__':
     
     print(f"Starting SINCOR Product Platform on port {port}")
     print(f"Debug mode: {debug_mode}")
-    if WAITLIST_AVAILABLE:
-        print(f"Database: {waitlist_manager.db_path}")
+    if waitlist.available:
+        print(f"Database: {waitlist.get().db_path}")
     
     app.run(host='0.0.0.0', port=port, debug=debug_mode)
\ No newline at end of file
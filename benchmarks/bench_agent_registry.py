@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark: agent construction cost, cold vs pooled
+
+Measures startup (building every registered agent once) and per-request
+agent acquisition, comparing construction on every request (the old route
+behaviour) against lookups in the shared AgentRegistry.
+
+Runs in a temporary working directory because agents create their
+databases and logs relative to the current directory.
+
+Usage:
+    python benchmarks/bench_agent_registry.py [--requests 50]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent_registry import AgentRegistry
+import sincor_app
+
+AGENTS = {
+    "business_intel": (sincor_app._build_business_intel, sincor_app._business_intel_config),
+    "campaign_automation": (sincor_app._build_campaign_automation, sincor_app._campaign_automation_config),
+}
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+
+        registry = AgentRegistry()
+        for name, (factory, config_provider) in AGENTS.items():
+            registry.register(name, factory, config_provider)
+
+        start = time.perf_counter()
+        registry.warm()
+        print(f"Startup warm of {len(AGENTS)} agents: {(time.perf_counter() - start) * 1000:8.1f} ms\n")
+
+        print(f"{'agent':<22} {'cold/request':>14} {'pooled/request':>16} {'speedup':>10}")
+        for name, (factory, config_provider) in AGENTS.items():
+            cold = timed(lambda: factory(config_provider()), args.requests)
+            warm = timed(lambda: registry.get(name), args.requests)
+            print(f"{name:<22} {cold * 1000:11.2f} ms {warm * 1e6:13.1f} us {cold / warm:9.0f}x")
+
+        print(f"\nRegistry: {registry.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark: email compliance validation throughput
+
+Compares the original per-term substring scan against the compiled
+ComplianceScanner on a synthetic campaign (default 100k emails).
+
+Usage:
+    python benchmarks/bench_legal_guardrails.py [--emails 100000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import legal_guardrails
+from legal_guardrails import LegalGuardrailEngine
+
+FILLER = (
+    "Hi there, we help local businesses grow with automated lead generation "
+    "and customer outreach. Our team reviewed your listing and found several "
+    "opportunities to improve bookings this quarter."
+).split()
+
+FOOTERS = [
+    "SINCOR Inc, 123 Main Street, Clinton IA. Reply STOP or click unsubscribe to opt out.",
+    "Sent by SINCOR. To unsubscribe, visit our preferences page.",
+    "Questions? Reply to this email.",
+]
+
+
+def build_campaign(count: int, seed: int = 42):
+    """Build a deterministic synthetic campaign."""
+    rng = random.Random(seed)
+    engine = LegalGuardrailEngine()
+    risky = [term for terms in engine.prohibited_terms.values() for term in terms]
+    risky += ["earn $5,000 per month", "300% ROI", "results may vary"]
+
+    emails = []
+    for _ in range(count):
+        words = rng.choices(FILLER, k=rng.randint(40, 120))
+        if rng.random() < 0.2:
+            words.insert(rng.randrange(len(words)), rng.choice(risky))
+        emails.append({
+            "subject": " ".join(rng.choices(FILLER, k=6)),
+            "body": " ".join(words) + "\n\n" + rng.choice(FOOTERS),
+        })
+    return emails
+
+
+def legacy_validate(engine: LegalGuardrailEngine, email_content):
+    """The original per-term scan, kept here as the baseline."""
+    import re
+
+    violations = []
+    subject = email_content.get("subject", "").lower()
+    body = email_content.get("body", "").lower()
+    for category, terms in engine.prohibited_terms.items():
+        for term in terms:
+            if term in subject or term in body:
+                violations.append({"type": "prohibited_term", "category": category, "term": term})
+
+    raw_body = email_content.get("body", "")
+    address_patterns = [r'\d+\s+\w+\s+(street|avenue|road|st|ave|rd)', r'p\.?o\.?\s+box\s+\d+']
+    any(re.search(pattern, raw_body, re.IGNORECASE) for pattern in address_patterns)
+    any(term in raw_body.lower() for term in ["unsubscribe", "opt-out", "opt out", "remove"])
+
+    earnings_patterns = [
+        r'\$[\d,]+\s*(per|/)\s*(month|year|week)',
+        r'[\d,]+%\s*(roi|return|profit)',
+        r'make\s+\$[\d,]+',
+        r'earn\s+\$[\d,]+',
+        r'[\d,]+x\s*(return|roi)'
+    ]
+    any(re.search(pattern, body, re.IGNORECASE) for pattern in earnings_patterns)
+    return violations
+
+
+def run(label, func, emails):
+    start = time.perf_counter()
+    func(emails)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:8.2f}s  {len(emails) / elapsed:12,.0f} emails/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--emails", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"Building campaign of {args.emails:,} emails...")
+    emails = build_campaign(args.emails)
+    engine = LegalGuardrailEngine()
+    backend = "pyahocorasick" if legal_guardrails.ahocorasick is not None else "substring probes"
+    print(f"Scanner backend: {backend}\n")
+
+    baseline = run("legacy per-term scan", lambda batch: [legacy_validate(engine, e) for e in batch], emails)
+    scanner = run("compiled scanner (batch API)", engine.validate_email_batch, emails)
+    print(f"\nSpeedup: {baseline / scanner:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark: LifecycleManager hot-path costs
+
+Times consume_budget (the per-step call agents make in their inner
+loop), a shift/off-duty transition pair and get_health_metrics after
+an agent has accumulated N activities spread over the past week.
+
+Usage:
+    python benchmarks/bench_lifecycle_budget.py [--history 1000 10000] [--calls 20000]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lifecycle_system import LifecycleManager, LifecycleState
+
+
+def run(history, calls):
+    with tempfile.TemporaryDirectory() as lifecycle_dir:
+        manager = LifecycleManager("E-bench-01", "Director", lifecycle_dir)
+        manager.transition_state(LifecycleState.ONBOARD, "bench")
+        manager.start_shift()
+        manager.current_budget.daily_tokens = manager.current_budget.daily_tool_calls = 10 ** 12
+
+        # History spread over the past week, as a long-running agent accumulates it
+        now = datetime.now()
+        for i in range(history):
+            manager._log_activity("work", duration_mins=1)
+            manager.journal.recent_activities[-1]["timestamp"] = (now - timedelta(days=7) * (1 - i / history)).isoformat()
+
+        start = time.perf_counter()
+        for _ in range(calls):
+            manager.consume_budget(tokens=10, tool_calls=1)
+        consume = (time.perf_counter() - start) / calls
+
+        start = time.perf_counter()
+        for _ in range(100):
+            manager.transition_state(LifecycleState.OFF_DUTY, "bench")
+            manager.transition_state(LifecycleState.SHIFT, "bench")
+        transition = (time.perf_counter() - start) / 200
+
+        start = time.perf_counter()
+        for _ in range(20):
+            manager.get_health_metrics()
+        health = (time.perf_counter() - start) / 20
+        manager.close()
+    return consume, transition, health
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--history", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'activities':>10} {'consume_budget':>16} {'transition':>12} {'health_metrics':>16}")
+    for history in args.history:
+        consume, transition, health = run(history, args.calls)
+        print(f"{history:>10} {consume * 1e6:13.1f} us {transition * 1e6:9.1f} us {health * 1000:13.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: one LifecycleSupervisor driving thousands of simulated agents
+
+Adds N agents (archetypes round-robin) and simulates several days of
+rhythms. Every simulated hour each on-shift agent consumes some budget,
+so fatigue builds and dream/play cycles fire. Reports setup time, timer
+throughput, journal flush cost, fleet health query time and peak RSS.
+
+Usage:
+    python benchmarks/bench_lifecycle_supervisor.py [--agents 1000 5000] [--days 3]
+"""
+
+import argparse
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lifecycle_supervisor import LifecycleSupervisor
+from lifecycle_system import LifecycleState
+
+ARCHETYPES = ["Scout", "Synthesizer", "Builder", "Negotiator", "Caretaker", "Auditor", "Director"]
+
+
+def run(agents, days):
+    with tempfile.TemporaryDirectory() as lifecycle_dir:
+        start_clock = time.time()
+        supervisor = LifecycleSupervisor(lifecycle_dir, clock=lambda: start_clock, flush_interval=600)
+
+        start = time.perf_counter()
+        for i in range(agents):
+            supervisor.add_agent(f"E-sim-{i:05d}", ARCHETYPES[i % len(ARCHETYPES)])
+        supervisor.flush()
+        setup = time.perf_counter() - start
+
+        events = work = 0
+        timer_time = flush_time = 0.0
+        for hour in range(1, days * 24 + 1):
+            start = time.perf_counter()
+            events += supervisor.run_until(start_clock + hour * 3600)
+            timer_time += time.perf_counter() - start
+
+            for manager in supervisor.managers.values():
+                if manager.current_state == LifecycleState.SHIFT:
+                    manager.consume_budget(tokens=800, tool_calls=12)
+                    work += 1
+
+            start = time.perf_counter()
+            supervisor.flush()
+            flush_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        summary = supervisor.get_fleet_health()["summary"]
+        health = time.perf_counter() - start
+        supervisor.close()
+
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return setup, events, timer_time, work, flush_time, health, peak_rss_mb, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--agents", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--days", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'agents':>7} {'setup':>9} {'events':>8} {'events/s':>10} {'work calls':>11} "
+          f"{'flush/hr':>10} {'health':>9} {'peak RSS':>9}")
+    for agents in args.agents:
+        setup, events, timer_time, work, flush_time, health, rss, summary = run(agents, args.days)
+        print(f"{agents:>7} {setup:7.2f} s {events:>8} {events / timer_time:10.0f} {work:>11} "
+              f"{flush_time / (args.days * 24) * 1000:7.1f} ms {health * 1000:6.1f} ms {rss:6.0f} MB")
+        print(f"        states after {args.days} days: {summary['states']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-task awards vs batch market clearing
+
+Posts N open tasks with several bids each, then compares:
+- sequential evaluate_and_award_task (logging off) for every task
+- award_open_tasks with greedy and (if scipy is installed) Hungarian
+  assignment under a per-agent capacity limit
+
+"decide" is vectorized scoring plus assignment; "total" also includes
+reading bids from the journal and persisting the awards.
+
+Usage:
+    python benchmarks/bench_market_clearing.py [--tasks 1000 5000] [--bids-per-task 5]
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import swarm_coordination
+from swarm_coordination import TaskMarket
+from bench_market_journal import make_bid, make_task
+
+SKILLS = ["prospect", "research", "summarize", "analyze", "deploy", "verify"]
+ARCHETYPES = list(swarm_coordination.ARCHETYPE_SKILL_AFFINITY)
+
+
+def build_market(market_dir, tasks, bids_per_task, seed=7):
+    rng = random.Random(seed)
+    market = TaskMarket(market_dir)
+    agents = [f"E-bench-{i:04d}" for i in range(max(bids_per_task, tasks // 4))]
+    for agent in agents:
+        market.agent_reputation[agent] = {"tasks_completed": 1, "success_rate": rng.random(), "average_quality": 0.8,
+                                          "competencies": SKILLS, "specializations": {}}
+    market._save_reputation()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(tasks):
+            task = make_task()
+            task.skills_required = rng.sample(SKILLS, 3)
+            task_id = market.post_task(task)
+            for agent in rng.sample(agents, bids_per_task):
+                bid = make_bid(task_id, agent)
+                bid.confidence = rng.random()
+                bid.archetype = rng.choice(ARCHETYPES)
+                bid.plan = ["step"] * rng.randint(1, 7)
+                market.submit_bid(bid)
+    return market
+
+
+def time_decision(market, method):
+    tasks = list(market.active_tasks.values())
+    bids = [bid for task in tasks for bid in market.get_task_bids(task.task_id)]
+    remaining = {bid.agent_id: 2 for bid in bids}
+    agents = sorted(remaining)
+
+    start = time.perf_counter()
+    scores = market.score_bids_batch(tasks, bids)
+    if method == "greedy":
+        winners = market._assign_greedy(bids, scores, remaining)
+    else:
+        winners = market._assign_hungarian(tasks, bids, scores, agents, remaining)
+    return time.perf_counter() - start, len(winners)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--bids-per-task", type=int, default=5)
+    args = parser.parse_args()
+
+    methods = ["greedy"] + (["hungarian"] if swarm_coordination.linear_sum_assignment is not None else [])
+
+    print(f"{'tasks':>6} {'mode':<12} {'awards':>7} {'decide':>10} {'total':>10}")
+    for tasks in args.tasks:
+        with tempfile.TemporaryDirectory() as market_dir:
+            market = build_market(market_dir, tasks, args.bids_per_task)
+            start = time.perf_counter()
+            awards = sum(market.evaluate_and_award_task(task_id, verbose=False) is not None
+                         for task_id in list(market.active_tasks))
+            print(f"{tasks:>6} {'sequential':<12} {awards:>7} {'':>10} {(time.perf_counter() - start) * 1000:7.1f} ms")
+            market.journal.close()
+
+        for method in methods:
+            with tempfile.TemporaryDirectory() as market_dir:
+                market = build_market(market_dir, tasks, args.bids_per_task)
+                decide, _ = time_decision(market, method)
+                start = time.perf_counter()
+                awards = market.award_open_tasks(agent_capacity=2, method=method)
+                total = time.perf_counter() - start
+                print(f"{tasks:>6} {method:<12} {len(awards):>7} {decide * 1000:7.1f} ms {total * 1000:7.1f} ms")
+                market.journal.close()
+
+
+if __name__ == "__main__":
+    main()
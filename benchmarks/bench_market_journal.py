@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: TaskMarket award and profile latency as market history grows
+
+Fills a fresh market with N historical bids spread over many tasks, then
+times get_task_bids / evaluate_and_award_task for a new task and
+get_agent_profile for a busy agent. With the indexed journal these stay
+flat as N grows; the old JSONL scans grew linearly.
+
+Usage:
+    python benchmarks/bench_market_journal.py [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from swarm_coordination import AgentBid, BidStatus, TaskContract, TaskMarket, TaskStatus
+
+SKILLS = ["prospect", "research", "summarize"]
+
+
+def make_task():
+    return TaskContract(task_id="", goal="Benchmark task", description="", skills_required=SKILLS,
+                        priority=0.5, reward=100, deadline="", budget_tokens=8000, budget_tool_calls=25,
+                        created_by="bench", created_at="", status=TaskStatus.BROADCAST,
+                        success_criteria=[], context={})
+
+
+def make_bid(task_id, agent_id):
+    return AgentBid(bid_id="", task_id=task_id, agent_id=agent_id, archetype="Scout", confidence=0.8,
+                    estimated_cost_tokens=5000, estimated_cost_calls=10, estimated_duration=60,
+                    plan=["research", "report"], unique_value="", agent_track_record={},
+                    submitted_at="", status=BidStatus.SUBMITTED)
+
+
+def timed(func, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def run(history):
+    with tempfile.TemporaryDirectory() as market_dir, contextlib.redirect_stdout(io.StringIO()):
+        market = TaskMarket(market_dir)
+        for agent in ("E-bench-01", "E-bench-02"):
+            market.agent_reputation[agent] = {"tasks_completed": 1, "success_rate": 0.9, "average_quality": 0.9,
+                                              "competencies": SKILLS, "specializations": {}}
+        market._save_reputation()
+
+        # Historical bids go straight to the journal to keep setup fast
+        for i in range(history):
+            bid = asdict(make_bid(f"T-old-{i % 500}", f"E-bench-0{i % 2 + 1}"))
+            bid["bid_id"], bid["status"] = f"B-old-{i}", BidStatus.SUBMITTED.value
+            market.journal.append("bid", bid["bid_id"], bid)
+
+        task_id = market.post_task(make_task())
+        for agent in ("E-bench-01", "E-bench-02"):
+            market.submit_bid(make_bid(task_id, agent))
+
+        lookup = timed(lambda: market.get_task_bids(task_id))
+        profile = timed(lambda: market.get_agent_profile("E-bench-01"))
+        award = timed(lambda: market.evaluate_and_award_task(task_id), repeat=5)
+        market.journal.close()
+        size = os.path.getsize(market.journal.journal_path)
+    return lookup, profile, award, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'history bids':>12} {'get_task_bids':>15} {'agent_profile':>15} {'award':>12} {'journal':>10}")
+    for size in args.sizes:
+        lookup, profile, award, journal_bytes = run(size)
+        print(f"{size:>12} {lookup * 1e6:12.1f} us {profile * 1e6:12.1f} us {award * 1000:9.2f} ms "
+              f"{journal_bytes / 1e6:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Benchmark: marketplace /catalog browse latency on a large catalog
+
+Seeds a scratch Postgres schema with N catalog items, M purchases (skewed
+towards popular items) and R reviews, then drives a mixed browse workload
+(plain pages, category/type filters, featured, searches) from concurrent
+clients against:
+- the old query: correlated COUNT(*) subqueries per row, LIKE search
+- the read model: precomputed counters, GIN-indexed ranked search
+- the read model behind the browse response cache
+
+While the read model runs, --writers clients complete purchases and add
+reviews so counter maintenance is part of the measurement.
+
+Needs a Postgres 12+ server and asyncpg; the scratch schema is dropped at
+the end unless --keep is given. Seeding 10M purchases takes a few minutes.
+
+Usage:
+    DB_DSN=postgresql://... python benchmarks/bench_marketplace_catalog.py
+        [--items 100000] [--purchases 10000000] [--reviews 500000]
+        [--clients 32] [--writers 4] [--duration 20]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import asyncpg
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "services" / "marketplace"))
+
+from catalog_view import ADD_REVIEW_SQL, COMPLETE_PURCHASE_SQL, BrowseCache, build_browse_query, ensure_read_model
+
+SCHEMA = "bench_marketplace"
+WORDS = ["growth", "email", "template", "launch", "video", "social", "agency", "local", "seo", "ads",
+         "funnel", "podcast", "brand", "sales", "script", "outreach", "newsletter", "landing", "booking", "review"]
+CATEGORIES = ["general", "marketing", "sales", "operations", "creative"]
+TYPES = ["template", "mediapax_pack", "script_bundle"]
+
+SCHEMA_SQL = f"""
+    DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;
+    CREATE SCHEMA {SCHEMA};
+    CREATE TABLE catalog (
+        id uuid PRIMARY KEY, title text, description text, price_cents integer, type text,
+        category text, payload_ref text, tags text[], featured boolean DEFAULT false,
+        active boolean DEFAULT true, rating decimal(2,1), download_count integer DEFAULT 0,
+        preview_url text, created_at timestamptz DEFAULT now(), updated_at timestamptz DEFAULT now()
+    );
+    CREATE TABLE purchases (
+        id bigserial PRIMARY KEY, tenant_id text, customer_email text, item_id uuid,
+        amount_cents integer, payment_ref text, status text, created_at timestamptz DEFAULT now()
+    );
+    CREATE TABLE reviews (
+        id bigserial PRIMARY KEY, item_id uuid, tenant_id text, rating integer,
+        review_text text, created_at timestamptz DEFAULT now()
+    );
+"""
+
+# Item ids are md5(n)::uuid so purchases/reviews can pick items without a lookup;
+# popularity is skewed with random()^3 towards low n
+SEED_CATALOG_SQL = """
+    INSERT INTO catalog (id, title, description, price_cents, type, category, tags, featured, active,
+                         rating, download_count)
+    SELECT md5(n::text)::uuid,
+           initcap(w[1 + (n * 7) % 20] || ' ' || w[1 + (n * 13) % 20] || ' ' || w[1 + (n * 3) % 20]),
+           'A ' || w[1 + (n * 11) % 20] || ' kit for ' || w[1 + (n * 17) % 20] || ' and '
+               || w[1 + (n * 19) % 20] || ' teams',
+           500 + n % 9500, t[1 + n % 3], c[1 + n % 5], ARRAY[w[1 + n % 20]],
+           n % 200 = 0, n % 50 <> 0, NULL, (random() * 1000)::int
+    FROM generate_series(1, $1) n,
+         (SELECT $2::text[] AS w, $3::text[] AS t, $4::text[] AS c) v
+"""
+
+SEED_PURCHASES_SQL = """
+    INSERT INTO purchases (customer_email, item_id, amount_cents, payment_ref, status)
+    SELECT 'buyer' || n || '@example.com', md5((1 + floor(random() ^ 3 * $1))::int::text)::uuid, 1000,
+           'pi_seed_' || n, CASE WHEN n % 10 < 8 THEN 'completed' ELSE 'pending' END
+    FROM generate_series($2::bigint, $3::bigint) n
+"""
+
+SEED_REVIEWS_SQL = """
+    INSERT INTO reviews (item_id, rating, review_text)
+    SELECT md5((1 + floor(random() ^ 3 * $2))::int::text)::uuid, 1 + (random() * 4)::int, 'seeded'
+    FROM generate_series(1, $1) n
+"""
+
+LEGACY_RATING_SQL = """
+    UPDATE catalog c SET rating = r.avg
+    FROM (SELECT item_id, AVG(rating)::decimal(2,1) AS avg FROM reviews GROUP BY item_id) r
+    WHERE c.id = r.item_id
+"""
+
+
+def item_id(n):
+    return uuid.UUID(hashlib.md5(str(n).encode()).hexdigest())
+
+
+def legacy_browse_query(category=None, type=None, featured=None, search=None, limit=20, offset=0):
+    """The /catalog query before the read model"""
+    query = """
+        SELECT c.*,
+               (SELECT COUNT(*) FROM purchases p WHERE p.item_id = c.id AND p.status = 'completed') as sales_count,
+               (SELECT COUNT(*) FROM reviews r WHERE r.item_id = c.id) as review_count
+        FROM catalog c
+        WHERE c.active = true
+    """
+    params = []
+    if category:
+        params.append(category)
+        query += f" AND c.category = ${len(params)}"
+    if type:
+        params.append(type)
+        query += f" AND c.type = ${len(params)}"
+    if featured is not None:
+        params.append(featured)
+        query += f" AND c.featured = ${len(params)}"
+    if search:
+        params.append(f"%{search.lower()}%")
+        query += f" AND (LOWER(c.title) LIKE ${len(params)} OR LOWER(c.description) LIKE ${len(params)})"
+    query += " ORDER BY c.featured DESC, c.rating DESC, c.download_count DESC"
+    params.extend([limit, offset])
+    query += f" LIMIT ${len(params)-1} OFFSET ${len(params)}"
+    return query, params
+
+
+def browse_request(rng):
+    """One browse request; a few pages and filters are much hotter than the rest"""
+    roll = rng.random()
+    offset = 20 * min(int(rng.expovariate(1.0)), 10)
+    if roll < 0.3:
+        return {"offset": offset}
+    if roll < 0.55:
+        return {"category": rng.choice(CATEGORIES), "offset": offset}
+    if roll < 0.7:
+        return {"type": rng.choice(TYPES), "category": rng.choice(CATEGORIES)}
+    if roll < 0.75:
+        return {"featured": True}
+    return {"search": " ".join(rng.sample(WORDS[:8] if rng.random() < 0.7 else WORDS, rng.choice([1, 1, 2])))}
+
+
+async def seed(pool, items, purchases, reviews):
+    async with pool.acquire() as conn:
+        await conn.execute(SCHEMA_SQL)
+        await conn.execute(SEED_CATALOG_SQL, items, WORDS, TYPES, CATEGORIES)
+        chunk = 1_000_000
+        for start in range(1, purchases + 1, chunk):
+            await conn.execute(SEED_PURCHASES_SQL, items, start, min(purchases, start + chunk - 1))
+        await conn.execute(SEED_REVIEWS_SQL, reviews, items)
+        await conn.execute(LEGACY_RATING_SQL)
+        # plain item_id indexes so the baseline measures the query shape, not a missing index
+        await conn.execute("CREATE INDEX ON purchases (item_id)")
+        await conn.execute("CREATE INDEX ON reviews (item_id)")
+        await conn.execute("ANALYZE")
+
+
+async def browse_load(pool, build_query, clients, duration, cache=None, seed_value=7):
+    latencies = []
+    deadline = time.perf_counter() + duration
+
+    async def client(index):
+        rng = random.Random(seed_value + index)
+        while time.perf_counter() < deadline:
+            request = browse_request(rng)
+            start = time.perf_counter()
+            key = None
+            if cache is not None:
+                key = BrowseCache.key(request.get("category"), request.get("type"), request.get("featured"),
+                                      request.get("search"), 20, request.get("offset", 0))
+                if cache.get(key) is not None:
+                    latencies.append(time.perf_counter() - start)
+                    continue
+            query, params = build_query(limit=20, **request)
+            rows = await pool.fetch(query, *params)
+            if cache is not None:
+                cache.set(key, [dict(row) for row in rows])
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    return latencies
+
+
+async def write_load(pool, writers, duration, items):
+    """Complete pending purchases and add reviews while browse traffic runs"""
+    events = 0
+    deadline = time.perf_counter() + duration
+    payment_refs = [r["payment_ref"] for r in await pool.fetch(
+        "SELECT payment_ref FROM purchases WHERE status = 'pending' LIMIT 100000")]
+    random.Random(3).shuffle(payment_refs)
+
+    async def writer(index):
+        nonlocal events
+        rng = random.Random(100 + index)
+        while time.perf_counter() < deadline:
+            if rng.random() < 0.8 and payment_refs:
+                await pool.execute(COMPLETE_PURCHASE_SQL, payment_refs.pop())
+            else:
+                item = item_id(1 + int(rng.random() ** 3 * items))
+                await pool.execute(ADD_REVIEW_SQL, item, None, rng.randint(1, 5), "bench")
+            events += 1
+
+    await asyncio.gather(*(writer(i) for i in range(writers)))
+    return events
+
+
+async def verify_counters(pool):
+    """Counters maintained by events must equal a fresh count"""
+    drift = await pool.fetchval("""
+        SELECT count(*) FROM catalog c
+        WHERE c.sales_count <> (SELECT count(*) FROM purchases p WHERE p.item_id = c.id AND p.status = 'completed')
+           OR c.review_count <> (SELECT count(*) FROM reviews r WHERE r.item_id = c.id)
+    """)
+    return drift
+
+
+def report(name, latencies, duration):
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95)] if ordered else 0.0
+    p99 = ordered[int(len(ordered) * 0.99)] if ordered else 0.0
+    median = statistics.median(ordered) if ordered else 0.0
+    print(f"{name:<24} {len(latencies) / duration:10.0f} {median * 1000:9.2f} {p95 * 1000:9.2f} {p99 * 1000:9.2f}")
+
+
+async def main_async(args):
+    pool = await asyncpg.create_pool(args.dsn, min_size=args.clients, max_size=args.clients + args.writers,
+                                     server_settings={"search_path": SCHEMA}, command_timeout=None)
+    try:
+        start = time.perf_counter()
+        await seed(pool, args.items, args.purchases, args.reviews)
+        print(f"Seeded {args.items} items, {args.purchases} purchases, {args.reviews} reviews "
+              f"in {time.perf_counter() - start:.0f}s")
+
+        print(f"\n{'mode':<24} {'req/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        report("legacy query", await browse_load(pool, legacy_browse_query, args.clients, args.duration),
+               args.duration)
+
+        start = time.perf_counter()
+        await ensure_read_model(pool)
+        await pool.execute("ANALYZE")
+        migrate = time.perf_counter() - start
+
+        browse, events = await asyncio.gather(
+            browse_load(pool, build_browse_query, args.clients, args.duration),
+            write_load(pool, args.writers, args.duration, args.items))
+        report("read model", browse, args.duration)
+
+        cache = BrowseCache(ttl=args.cache_ttl)
+        report("read model + cache", await browse_load(pool, build_browse_query, args.clients, args.duration, cache),
+               args.duration)
+
+        print(f"\nRead model migration and backfill: {migrate:.1f}s")
+        print(f"Purchase/review events during read-model run: {events} ({events / args.duration:.0f}/s)")
+        print(f"Cache hit rate: {cache.stats['hits'] / max(1, cache.stats['hits'] + cache.stats['misses']):.1%}")
+        print(f"Items whose counters drifted from a fresh count: {await verify_counters(pool)}")
+    finally:
+        if not args.keep:
+            await pool.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dsn", default=os.getenv("DB_DSN"))
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--purchases", type=int, default=10_000_000)
+    parser.add_argument("--reviews", type=int, default=500_000)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--cache-ttl", type=float, default=5.0)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    args = parser.parse_args()
+    if not args.dsn:
+        parser.error("set DB_DSN or pass --dsn")
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
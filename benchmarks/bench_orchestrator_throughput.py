@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: MasterOrchestrator task throughput, single loop vs worker pool
+
+Pushes N synthetic tasks (default 100k) spread over the orchestrator's
+agents with mixed priorities, and compares:
+- the old single processor loop (one deque, one task at a time)
+- AgentTaskExecutor with thread workers, and optionally process workers
+
+The synthetic handler sleeps --work-ms to stand in for an agent's I/O wait.
+Reports throughput and execution / queue-wait latency percentiles.
+
+Usage:
+    python benchmarks/bench_orchestrator_throughput.py [--tasks 100000] [--work-ms 0.2]
+        [--workers 8 32] [--process]
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from master_agent_orchestrator import AgentTask, AgentTaskExecutor
+
+AGENTS = [f"agent_{i:02d}" for i in range(27)]
+WORK_SECONDS = 0.0
+
+
+def synthetic_task(task):
+    if WORK_SECONDS:
+        time.sleep(WORK_SECONDS)
+    return task.task_id
+
+
+def make_tasks(count, seed=11):
+    rng = random.Random(seed)
+    return [AgentTask(task_id=f"T{i}", agent_name=rng.choice(AGENTS), task_type="synthetic",
+                      payload={}, priority=rng.randint(1, 10))
+            for i in range(count)]
+
+
+def run_single_loop(tasks):
+    queue = deque(tasks)
+    start = time.perf_counter()
+    while queue:
+        synthetic_task(queue.popleft())
+    return time.perf_counter() - start
+
+
+def run_executor(tasks, workers, mode):
+    executor = AgentTaskExecutor(handler=synthetic_task, max_workers=workers, mode=mode,
+                                 default_agent_limit=max(1, workers // 4), max_completed=10000)
+    executor.start()
+    start = time.perf_counter()
+    executor.submit_many(tasks)
+    executor.wait_idle()
+    elapsed = time.perf_counter() - start
+    stats = executor.get_stats()
+    executor.shutdown()
+    return elapsed, stats
+
+
+def main():
+    global WORK_SECONDS
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--work-ms", type=float, default=0.2)
+    parser.add_argument("--workers", type=int, nargs="+", default=[8, 32])
+    parser.add_argument("--process", action="store_true", help="Also run process workers")
+    args = parser.parse_args()
+    WORK_SECONDS = args.work_ms / 1000
+
+    tasks = make_tasks(args.tasks)
+    print(f"{args.tasks} tasks, {args.work_ms} ms synthetic work, {len(AGENTS)} agents\n")
+    print(f"{'mode':<16} {'seconds':>8} {'tasks/s':>10} {'exec p50/p99 ms':>18} {'wait p99 ms':>12} {'retained':>9}")
+
+    elapsed = run_single_loop(tasks)
+    print(f"{'single loop':<16} {elapsed:8.2f} {args.tasks / elapsed:10.0f}")
+
+    modes = [("thread", workers) for workers in args.workers]
+    if args.process:
+        modes += [("process", workers) for workers in args.workers]
+    for mode, workers in modes:
+        elapsed, stats = run_executor(make_tasks(args.tasks), workers, mode)
+        execution, wait = stats["execution"], stats["queue_wait"]
+        label = f"{mode} x{workers}"
+        print(f"{label:<16} {elapsed:8.2f} {args.tasks / elapsed:10.0f} "
+              f"{execution['p50_ms']:8.2f}/{execution['p99_ms']:<8.2f} {wait['p99_ms']:12.0f} "
+              f"{stats['retained_results']:9d}")
+
+
+if __name__ == "__main__":
+    main()
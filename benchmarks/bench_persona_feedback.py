@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: PersonaEngine feedback throughput
+
+Feeds N feedback events to one agent with a 30-entry checkpoint history
+(one of them older than the continuity window) and reports events/s for:
+- per-event record_interaction_feedback with write-through (write_interval=0)
+- per-event record_interaction_feedback with coalesced writes
+- record_feedback_batch in chunks of --batch-size
+
+Usage:
+    python benchmarks/bench_persona_feedback.py [--events 5000] [--batch-size 100]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from persona_engine import InteractionFeedback, PersonaEngine
+
+LABELS = ["helpful", "harmful", "unique", "derivative"]
+
+
+def make_events(count, seed=11):
+    rng = random.Random(seed)
+    return [InteractionFeedback(timestamp=datetime.now().isoformat(), agent_id="E-bench-01",
+                                interaction_type="chat", feedback_labels=rng.sample(LABELS, rng.randint(0, 2)),
+                                quality_score=rng.random(), novelty_score=rng.random(), context={"i": i})
+            for i in range(count)]
+
+
+def make_engine(persona_dir, **kwargs):
+    engine = PersonaEngine("E-bench-01", "Scout", persona_dir, **kwargs)
+    base = datetime.now() - timedelta(days=10)
+    checkpoints = [{"timestamp": (base + timedelta(hours=8 * i)).isoformat(),
+                    "persona": asdict(engine.current_persona), "continuity_index": 1.0,
+                    "checkpoint_type": "scheduled"} for i in range(30)]
+    Path(engine.checkpoint_history).write_text(json.dumps(checkpoints, indent=2))
+    return engine
+
+
+def run(mode, events, batch_size):
+    with tempfile.TemporaryDirectory() as persona_dir:
+        if mode == "per-event write-through":
+            engine = make_engine(persona_dir, write_interval=0)
+        else:
+            engine = make_engine(persona_dir)
+
+        start = time.perf_counter()
+        if mode == "batched":
+            for i in range(0, len(events), batch_size):
+                engine.record_feedback_batch(events[i:i + batch_size])
+        else:
+            for event in events:
+                engine.record_interaction_feedback(event)
+        engine.flush()
+        return len(events) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    events = make_events(args.events)
+    print(f"{'mode':<26} {'events/s':>10}")
+    for mode in ("per-event write-through", "per-event coalesced", "batched"):
+        print(f"{mode:<26} {run(mode, events, args.batch_size):10.0f}")
+
+
+if __name__ == "__main__":
+    main()
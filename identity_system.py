@@ -8,13 +8,18 @@ for the 43-agent swarm architecture.
 
 import hashlib
 import json
+import os
 import secrets
 import base64
-from typing import Dict, List, Optional, Any
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 import yaml
 
+# Canonical JSON for signing; reusing one encoder avoids rebuilding it per action
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True)
+
 @dataclass
 class SBTRole:
     """Soulbound Token Role Definition"""
@@ -38,10 +43,47 @@ class IdentityRecord:
 class IdentitySystem:
     """Manages cryptographic identities and authority for SINCOR agents"""
     
-    def __init__(self, constitution_path: str = "constitution/global.md"):
+    def __init__(self, constitution_path: str = "constitution/global.md",
+                 ledger_cache_path: str = "data/identity_ledger_cache.json"):
         self.constitution_path = constitution_path
+        self.ledger_cache_path = ledger_cache_path
         self.identity_registry = {}
         
+        # agent_id -> frozenset of competencies, kept in step with identity_registry
+        self._competency_index: Dict[str, frozenset] = {}
+        # Constitution hashes keyed by the (path, mtime, size) of every input file
+        self._constitution_hashes: Dict[Tuple, str] = {}
+    
+    @staticmethod
+    def _file_signature(path: str) -> Tuple:
+        try:
+            stat = os.stat(path)
+            return (path, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return (path, None, None)
+    
+    def _index_identity(self, identity: IdentityRecord):
+        self.identity_registry[identity.id] = identity
+        self._competency_index[identity.id] = frozenset(identity.sbt_role.competencies)
+    
+    def get_constitution_hash(self, constitution_refs: Optional[List[str]] = None) -> str:
+        """Constitution hash for the global constitution plus archetype refs, computed once per version."""
+        delta_paths = sorted(ref for ref in (constitution_refs or []) if ref != self.constitution_path)
+        key = tuple(self._file_signature(path) for path in [self.constitution_path] + delta_paths)
+        
+        if key not in self._constitution_hashes:
+            def read(path, default=""):
+                try:
+                    return Path(path).read_text(encoding="utf-8")
+                except OSError:
+                    return default
+            
+            self._constitution_hashes[key] = self.compute_constitution_hash(
+                global_constitution=read(self.constitution_path, "SINCOR Global Constitution v1.0"),
+                archetype_deltas=[read(path) for path in delta_paths]
+            )
+        return self._constitution_hashes[key]
+        
     def generate_did_key(self, agent_name: str) -> str:
         """Generate a DID key for an agent (simplified implementation)"""
         
@@ -77,12 +119,11 @@ class IdentitySystem:
                                  archetype_deltas: List[str] = None) -> str:
         """Compute Merkle root hash of constitution + archetype deltas"""
         
-        # Create constitution document
+        # Create constitution document (content only, so a version always hashes the same)
         constitution_doc = {
             "global": global_constitution,
             "deltas": archetype_deltas or [],
-            "version": "1.0",
-            "timestamp": datetime.now().isoformat()
+            "version": "1.0"
         }
         
         # Serialize and hash
@@ -106,11 +147,8 @@ class IdentitySystem:
             competencies=sbt_data["competencies"]
         )
         
-        # Load constitution and compute hash
-        constitution_hash = self.compute_constitution_hash(
-            global_constitution="SINCOR Global Constitution v1.0",  # Placeholder
-            archetype_deltas=[]  # Will load from archetype files
-        )
+        # Constitution hash (cached per constitution version)
+        constitution_hash = self.get_constitution_hash(agent_config.get("constitution_refs"))
         
         # Create identity record
         identity = IdentityRecord(
@@ -122,7 +160,7 @@ class IdentitySystem:
         )
         
         # Register in system
-        self.identity_registry[agent_id] = identity
+        self._index_identity(identity)
         
         return identity
     
@@ -147,16 +185,14 @@ class IdentitySystem:
         )
         
         identity.sbt_role = new_sbt
+        self._index_identity(identity)
         return True
     
     def verify_authority(self, agent_id: str, required_competency: str) -> bool:
         """Verify an agent has authority for a specific competency"""
         
-        if agent_id not in self.identity_registry:
-            return False
-            
-        identity = self.identity_registry[agent_id]
-        return required_competency in identity.sbt_role.competencies
+        competencies = self._competency_index.get(agent_id)
+        return competencies is not None and required_competency in competencies
     
     def export_identity_record(self, agent_id: str) -> Dict[str, Any]:
         """Export identity record for agent configuration"""
@@ -170,37 +206,94 @@ class IdentitySystem:
     def sign_action(self, agent_id: str, action_data: Dict[str, Any]) -> Dict[str, Any]:
         """Sign an action/artifact with agent's DID key (simplified)"""
         
+        return self.sign_actions(agent_id, [action_data])[0]
+    
+    def sign_actions(self, agent_id: str, actions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Sign a batch of actions with one identity lookup and one timestamp"""
+        
         if agent_id not in self.identity_registry:
             raise ValueError(f"Agent {agent_id} not registered")
             
-        identity = self.identity_registry[agent_id]
+        signer = self.identity_registry[agent_id].sigil_key
+        timestamp = datetime.now().isoformat()
+        encode = _CANONICAL_ENCODER.encode
+        sha256 = hashlib.sha256
         
-        # Create signed artifact (simplified - real implementation would use proper crypto)
-        signed_artifact = {
-            "data": action_data,
-            "signature": {
-                "signer": identity.sigil_key,
-                "timestamp": datetime.now().isoformat(),
-                "hash": hashlib.sha256(json.dumps(action_data, sort_keys=True).encode()).hexdigest()
+        # Create signed artifacts (simplified - real implementation would use proper crypto)
+        return [
+            {
+                "data": action_data,
+                "signature": {
+                    "signer": signer,
+                    "timestamp": timestamp,
+                    "hash": sha256(encode(action_data).encode()).hexdigest()
+                }
             }
-        }
-        
-        return signed_artifact
+            for action_data in actions
+        ]
+    
+    def _load_ledger_cache(self) -> Dict[str, Any]:
+        try:
+            with open(self.ledger_cache_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"agents": {}}
+    
+    def _save_ledger_cache(self, cache: Dict[str, Any]):
+        cache_dir = os.path.dirname(self.ledger_cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{self.ledger_cache_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, self.ledger_cache_path)
     
     def load_all_agents(self, agents_dir: str = "agents"):
-        """Load and register all agent identities from agent configs"""
+        """Load and register all agent identities from agent configs
+        
+        Parsed configs and identity records are kept in a compiled ledger cache.
+        A file is re-parsed only when its mtime/size changes and its content hash
+        differs; an identity is re-issued only when its config or constitution changes.
+        """
         
-        import os
         import glob
         
-        agent_files = glob.glob(os.path.join(agents_dir, "E-*.yaml"))
+        cache = self._load_ledger_cache()
+        cached_agents = cache.get("agents", {})
+        compiled = {}
+        changed = False
         
-        for agent_file in agent_files:
-            with open(agent_file, 'r') as f:
-                agent_config = yaml.safe_load(f)
+        for agent_file in sorted(glob.glob(os.path.join(agents_dir, "E-*.yaml"))):
+            _, mtime_ns, size = self._file_signature(agent_file)
+            entry = cached_agents.get(agent_file)
+            
+            if not entry or entry["mtime_ns"] != mtime_ns or entry["size"] != size:
+                with open(agent_file, 'rb') as f:
+                    raw = f.read()
+                content_sha256 = hashlib.sha256(raw).hexdigest()
                 
-            identity = self.register_identity(agent_config)
-            print(f"Registered identity: {identity.id} -> {identity.sigil_key}")
+                if not entry or entry["sha256"] != content_sha256:
+                    entry = {"sha256": content_sha256, "config": yaml.safe_load(raw), "identity": None}
+                entry.update(mtime_ns=mtime_ns, size=size)
+                changed = True
+            
+            agent_config = entry["config"]
+            constitution_hash = self.get_constitution_hash(agent_config.get("constitution_refs"))
+            record = entry.get("identity")
+            
+            if record and record["constitution_sha256"] == constitution_hash:
+                identity = IdentityRecord(**{**record, "sbt_role": SBTRole(**record["sbt_role"])})
+                self._index_identity(identity)
+            else:
+                identity = self.register_identity(agent_config)
+                entry["identity"] = asdict(identity)
+                changed = True
+                print(f"Registered identity: {identity.id} -> {identity.sigil_key}")
+            
+            compiled[agent_file] = entry
+        
+        if changed or compiled.keys() != cached_agents.keys():
+            self._save_ledger_cache({"version": 1, "agents": compiled})
     
     def generate_identity_ledger(self) -> Dict[str, Any]:
         """Generate complete identity ledger for the swarm"""
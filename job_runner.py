@@ -0,0 +1,224 @@
+"""
+SINCOR Background Job Runner
+Runs long operations (lead generation, campaigns, analysis) off the web workers
+
+Submitting a job returns its id immediately; a bounded worker pool executes
+the work, progress is persisted to SQLite, and clients follow along by
+polling or Server-Sent Events.
+"""
+
+import os
+import json
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+
+def public_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Job state safe to send to clients: without the owner id or session updates."""
+    public = {name: value for name, value in job.items() if name != "owner"}
+    if isinstance(public.get("result"), dict):
+        public["result"] = {name: value for name, value in public["result"].items()
+                            if name != "session_updates"}
+    return public
+
+
+class JobQueueFull(Exception):
+    """Raised when the job runner already has its maximum of pending jobs."""
+
+
+class JobContext:
+    """Handle passed to a running job for reporting progress."""
+
+    def __init__(self, runner: "JobRunner", job_id: str):
+        self._runner = runner
+        self.job_id = job_id
+
+    def report(self, progress: int, message: str = ""):
+        """Record progress (0-100) with a short status message."""
+        self._runner._update(self.job_id, progress=max(0, min(100, int(progress))), message=message)
+
+
+class JobRunner:
+    """Bounded worker pool with persisted job state."""
+
+    def __init__(self, db_path: Optional[Path] = None, max_workers: Optional[int] = None,
+                 max_pending: Optional[int] = None):
+        self.db_path = Path(db_path or Path(__file__).parent / "data" / "jobs.db")
+        self.max_workers = max_workers or int(os.getenv("SINCOR_JOB_WORKERS", "4"))
+        self.max_pending = max_pending or int(os.getenv("SINCOR_JOB_MAX_PENDING", "64"))
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sincor-job")
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._db_lock = threading.Lock()
+        self._changed = threading.Condition()
+        self._version = 0  # bumped on every job update, guarded by _changed
+
+        self.init_db()
+
+    def init_db(self):
+        """Initialize jobs database."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                owner TEXT,
+                status TEXT NOT NULL,
+                progress INTEGER DEFAULT 0,
+                message TEXT,
+                result TEXT,
+                error TEXT,
+                created_at TEXT,
+                updated_at TEXT
+            )
+        """)
+
+        # Jobs left running by a previous process will never finish
+        cursor.execute("""
+            UPDATE jobs SET status = 'failed', error = 'Interrupted by restart', updated_at = ?
+            WHERE status IN ('queued', 'running')
+        """, (datetime.now().isoformat(),))
+
+        conn.commit()
+        conn.close()
+
+    def submit(self, kind: str, func: Callable[..., Dict[str, Any]], *args,
+               owner: Optional[str] = None, **kwargs) -> str:
+        """Queue func(job_context, *args, **kwargs) and return the job id.
+
+        Raises JobQueueFull when max_pending jobs are already queued or running.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise JobQueueFull(f"{self.max_pending} jobs already pending")
+
+        job_id = uuid.uuid4().hex
+        now = datetime.now().isoformat()
+        with self._db_lock:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute(
+                "INSERT INTO jobs (id, kind, owner, status, progress, message, created_at, updated_at) "
+                "VALUES (?, ?, ?, 'queued', 0, 'Queued', ?, ?)",
+                (job_id, kind, owner, now, now)
+            )
+            conn.commit()
+            conn.close()
+
+        try:
+            self._executor.submit(self._run, job_id, func, args, kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+        return job_id
+
+    def _run(self, job_id: str, func: Callable, args: tuple, kwargs: dict):
+        try:
+            self._update(job_id, status="running", message="Running")
+            result = func(JobContext(self, job_id), *args, **kwargs)
+            self._update(job_id, status="succeeded", progress=100, message="Completed",
+                         result=json.dumps(result, default=str))
+        except Exception as e:
+            self._update(job_id, status="failed", message="Failed", error=str(e))
+        finally:
+            self._slots.release()
+
+    def _update(self, job_id: str, **fields):
+        fields["updated_at"] = datetime.now().isoformat()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._db_lock:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+            conn.commit()
+            conn.close()
+
+        with self._changed:
+            self._version += 1
+            self._changed.notify_all()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get job state, including the result once it has succeeded."""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        conn.close()
+
+        if row is None:
+            return None
+
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Block until the job finishes (or timeout) and return its state."""
+        with self._changed:
+            self._changed.wait_for(
+                lambda: (self.get(job_id) or {}).get("status") in TERMINAL_STATUSES + (None,),
+                timeout=timeout
+            )
+        return self.get(job_id)
+
+    def stream(self, job_id: str, heartbeat_seconds: float = 15.0) -> Iterator[str]:
+        """Yield Server-Sent Events for a job until it finishes."""
+        last_seen = None
+        while True:
+            # Note the version before reading so an update that lands between
+            # the read and the wait below is not missed
+            with self._changed:
+                version = self._version
+            job = self.get(job_id)
+            if job is None:
+                yield f"event: error\ndata: {json.dumps({'error': 'Job not found'})}\n\n"
+                return
+
+            snapshot = (job["status"], job["progress"], job["message"])
+            if snapshot != last_seen:
+                last_seen = snapshot
+                event = "done" if job["status"] in TERMINAL_STATUSES else "progress"
+                yield f"event: {event}\ndata: {json.dumps(public_job(job), default=str)}\n\n"
+
+            if job["status"] in TERMINAL_STATUSES:
+                return
+
+            with self._changed:
+                notified = self._changed.wait_for(lambda: self._version != version, timeout=heartbeat_seconds)
+            if not notified:
+                yield ": keep-alive\n\n"
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get counts of jobs by status."""
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        conn.close()
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "jobs_by_status": dict(rows)
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting jobs and optionally wait for running ones."""
+        self._executor.shutdown(wait=wait)
+
+
+_job_runner = None
+_job_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> JobRunner:
+    """Process-wide job runner."""
+    global _job_runner
+    with _job_runner_lock:
+        if _job_runner is None:
+            _job_runner = JobRunner()
+        return _job_runner
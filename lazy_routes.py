@@ -0,0 +1,170 @@
+"""
+SINCOR Lazy Route Providers
+Registers feature route modules without importing them at startup
+
+Feature modules (SEO pages, value calculators, enterprise dashboards, admin
+control, ...) expose an ``add_*_routes(app)`` function and build large
+in-module tables when imported. Instead of importing them all while the
+app boots, each provider declares the URL rules it serves. The first request
+that matches one of those rules imports the module, registers its routes on
+a dedicated Flask app sharing the main app's config, and dispatches to it.
+Routes defined directly on the main app always take precedence.
+
+No provider is enabled unless it is named explicitly. Several of them serve
+unauthenticated endpoints that send email or run campaigns, and ``admin``
+ships hardcoded credentials, so each one is an opt-in decision.
+"""
+
+import importlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from flask import Flask
+from werkzeug.exceptions import HTTPException, MethodNotAllowed, NotFound
+from werkzeug.routing import Map, Rule
+
+
+@dataclass
+class RouteProvider:
+    """A module whose add_*_routes(app) registers the declared URL rules."""
+    module: str
+    function: str
+    rules: List[str]
+
+
+ROUTE_PROVIDERS: Dict[str, RouteProvider] = {
+    "dashboard": RouteProvider("dashboard_routes", "add_dashboard_routes", [
+        "/api/dashboard/data", "/api/campaign/run", "/dashboard/live"]),
+    "media_packs": RouteProvider("media_pack_routes", "add_media_pack_routes", [
+        "/media-packs", "/media-pack/<pack_id>", "/media-pack/<pack_id>/customize",
+        "/api/media-pack/purchase", "/media-pack/success"]),
+    "auto_detailing": RouteProvider("auto_detailing_routes", "add_auto_detailing_routes", [
+        "/auto-detailing-authority", "/auto-detailing/checkout/<plan_id>", "/get-free-book",
+        "/api/book-download", "/book-download-success"]),
+    "authority": RouteProvider("authority_expansion", "add_authority_expansion_routes", [
+        "/authority-hub", "/industry/<industry_id>/authority", "/polymath-story",
+        "/api/authority/book-series"]),
+    "discovery": RouteProvider("business_discovery", "add_discovery_routes", [
+        "/api/discover-businesses", "/discovery-dashboard"]),
+    "email_automation": RouteProvider("email_automation", "add_automation_routes", [
+        "/api/create-campaign", "/api/send-campaigns", "/campaign-dashboard"]),
+    "analytics": RouteProvider("analytics_dashboard", "add_analytics_routes", [
+        "/analytics-dashboard", "/api/dashboard-data"]),
+    "enterprise": RouteProvider("enterprise_domination", "add_enterprise_routes", [
+        "/franchise-empire", "/affiliate-program", "/enterprise-dashboard",
+        "/api/franchise-roi/<tier_id>", "/api/competitive-intelligence"]),
+    "compliance": RouteProvider("security_compliance", "add_compliance_routes", [
+        "/compliance-dashboard", "/privacy-policy", "/data-deletion-request", "/api/compliance-report"]),
+    "value": RouteProvider("value_maximization", "add_value_routes", [
+        "/value-dashboard", "/polymath-university", "/success-roadmap",
+        "/api/calculate-value/<tier>/<industry>", "/api/generate-roadmap"]),
+    "conversion": RouteProvider("conversion_optimization", "add_conversion_routes", [
+        "/optimized-homepage", "/api/conversion-data/<plan>/<industry>"]),
+    "seo": RouteProvider("seo_domination", "add_seo_routes", [
+        "/sitemap.xml", "/robots.txt", "/auto-detailing-leads", "/hvac-leads", "/pest-control-leads",
+        "/plumbing-leads", "/electrical-leads", "/chiropractor-leads", "/dog-grooming-leads",
+        "/api/seo-data/<page_type>"]),
+    "admin": RouteProvider("admin_control", "add_admin_routes", [
+        "/admin", "/admin/login", "/admin/logout", "/admin/dashboard", "/admin/content-settings",
+        "/admin/promo-codes", "/admin/create-promo", "/admin/system-health", "/api/admin/overview",
+        "/api/agent-activity", "/api/admin/settings", "/api/admin/update-setting"]),
+}
+
+
+class LazyRouteDispatcher:
+    """WSGI middleware that imports route providers on first matching request."""
+
+    def __init__(self, app: Flask, providers: Optional[Dict[str, RouteProvider]] = None,
+                 names: Optional[Iterable[str]] = None):
+        self.app = app
+        self.providers = providers or ROUTE_PROVIDERS
+        self.names = list(names or [])
+        unknown = [name for name in self.names if name not in self.providers]
+        if unknown:
+            raise ValueError(f"Unknown route providers: {', '.join(unknown)}")
+        self.main_wsgi_app = app.wsgi_app
+
+        self.url_map = Map([
+            Rule(rule, endpoint=name)
+            for name in self.names
+            for rule in self.providers[name].rules
+        ])
+        self._apps: Dict[str, Flask] = {}
+        self._load_errors: Dict[str, str] = {}
+        self._load_seconds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _served_by_main_app(self, environ) -> bool:
+        """True if the main app has a non-static route for this request."""
+        try:
+            rule, _ = self.app.url_map.bind_to_environ(environ).match(return_rule=True)
+            return rule.endpoint != "static"
+        except MethodNotAllowed:
+            return True
+        except HTTPException:
+            return False
+
+    def _provider_for(self, environ) -> Optional[str]:
+        try:
+            name, _ = self.url_map.bind_to_environ(environ).match()
+            return name
+        except (NotFound, MethodNotAllowed):
+            # Let the provider's own app answer method errors
+            return None
+        except HTTPException:
+            return None
+
+    def load(self, name: str) -> Optional[Flask]:
+        """Import a provider and build its app (once). Returns None if it fails to load."""
+        if name in self._apps:
+            return self._apps[name]
+
+        with self._lock:
+            if name in self._apps or name in self._load_errors:
+                return self._apps.get(name)
+
+            provider = self.providers[name]
+            start = time.perf_counter()
+            try:
+                module = importlib.import_module(provider.module)
+                sub_app = Flask(provider.module, root_path=self.app.root_path,
+                                template_folder=self.app.template_folder, static_folder=None)
+                sub_app.config.update(self.app.config)
+                sub_app.secret_key = self.app.secret_key
+                getattr(module, provider.function)(sub_app)
+                self._apps[name] = sub_app
+            except Exception as e:
+                self._load_errors[name] = str(e)
+            self._load_seconds[name] = time.perf_counter() - start
+            return self._apps.get(name)
+
+    def __call__(self, environ, start_response):
+        if not self._served_by_main_app(environ):
+            name = self._provider_for(environ)
+            if name is not None:
+                sub_app = self.load(name)
+                if sub_app is not None:
+                    return sub_app(environ, start_response)
+        return self.main_wsgi_app(environ, start_response)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Load state of each enabled provider."""
+        return {
+            name: {
+                "module": self.providers[name].module,
+                "loaded": name in self._apps,
+                "load_seconds": round(self._load_seconds.get(name, 0.0), 4),
+                "error": self._load_errors.get(name)
+            }
+            for name in self.names
+        }
+
+
+def install_lazy_routes(app: Flask, names: Optional[Iterable[str]] = None) -> LazyRouteDispatcher:
+    """Wrap app.wsgi_app so the given providers (default: none) load on first hit."""
+    dispatcher = LazyRouteDispatcher(app, names=names)
+    app.wsgi_app = dispatcher
+    app.extensions["lazy_routes"] = dispatcher
+    return dispatcher
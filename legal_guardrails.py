@@ -9,9 +9,192 @@ checks for all SINCOR operations, especially critical for AI agents.
 import re
 import json
 from datetime import datetime
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Iterable
 import logging
 
+try:
+    import ahocorasick  # pyahocorasick - optional C automaton
+except ImportError:
+    ahocorasick = None
+
+# Precompiled CAN-SPAM / earnings patterns (combined into single alternations)
+ADDRESS_PATTERN = re.compile(
+    r'\d+\s+\w+\s+(?:street|avenue|road|st|ave|rd)|p\.?o\.?\s+box\s+\d+',
+    re.IGNORECASE
+)
+EARNINGS_CLAIM_PATTERN = re.compile(
+    r'\$[\d,]+\s*(?:per|/)\s*(?:month|year|week)'
+    r'|[\d,]+%\s*(?:roi|return|profit)'
+    r'|make\s+\$[\d,]+'
+    r'|earn\s+\$[\d,]+'
+    r'|[\d,]+x\s*(?:return|roi)',
+    re.IGNORECASE
+)
+
+# Every address pattern needs a digit, so texts without one skip the address regex
+DIGIT_PATTERN = re.compile(r'\d')
+# Every earnings pattern needs a digit or a comma ([\d,]+ matches "," alone)...
+AMOUNT_PATTERN = re.compile(r'[\d,]')
+# ...and also '$', '%' or one of these words
+EARNINGS_HINT_TERMS = ["return", "roi"]
+
+SENDER_ID_TERMS = ["sincor"]
+UNSUBSCRIBE_TERMS = ["unsubscribe", "opt-out", "opt out", "remove"]
+DISCLAIMER_INDICATORS = [
+    "results may vary", "not typical", "disclaimer", "past performance",
+    "no guarantee", "individual results", "may not achieve"
+]
+
+
+class ComplianceScanner:
+    """Email compliance scanner compiled once from the prohibited term lists.
+    
+    All literal checks (prohibited terms, sender id, unsubscribe and
+    disclaimer wording) share one multi-pattern automaton, so each text is
+    walked once; regex checks use precompiled combined alternations.
+    Produces the same violation structure as the per-term checks did.
+    
+    Without pyahocorasick the scanner falls back to one flat table of
+    substring probes - in CPython that beats a pure-Python automaton.
+    """
+    
+    def __init__(self, prohibited_terms: Dict[str, List[str]]):
+        # Flatten terms in category order - violations are reported in this order
+        self._terms: List[Tuple[str, str]] = [
+            (category, term)
+            for category, terms in prohibited_terms.items()
+            for term in terms
+        ]
+        
+        patterns: Dict[str, List[Tuple[str, int]]] = {}
+        for index, (_, term) in enumerate(self._terms):
+            patterns.setdefault(term, []).append(("term", index))
+        for kind, terms in (("sender", SENDER_ID_TERMS),
+                            ("unsubscribe", UNSUBSCRIBE_TERMS),
+                            ("disclaimer", DISCLAIMER_INDICATORS),
+                            ("earnings_hint", EARNINGS_HINT_TERMS)):
+            for term in terms:
+                patterns.setdefault(term, []).append((kind, -1))
+        
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for pattern, tags in patterns.items():
+                self._automaton.add_word(pattern, tags)
+            self._automaton.make_automaton()
+        else:
+            self._automaton = None
+            self._literals = list(patterns.items())
+    
+    def _scan(self, text: str) -> Tuple[set, set]:
+        """Return (matched term indexes, matched literal kinds) for text."""
+        term_hits = set()
+        kinds = set()
+        if not text:
+            return term_hits, kinds
+        
+        if self._automaton is not None:
+            matches = (tags for _, tags in self._automaton.iter(text))
+        else:
+            matches = (tags for pattern, tags in self._literals if pattern in text)
+        
+        for tags in matches:
+            for kind, index in tags:
+                if kind == "term":
+                    term_hits.add(index)
+                else:
+                    kinds.add(kind)
+        return term_hits, kinds
+    
+    def scan_email(self, email_content: Dict[str, str]) -> Tuple[List[Dict[str, Any]], int]:
+        """Return (violations, raw risk score) for one email."""
+        violations = []
+        
+        body = email_content.get("body", "")
+        body_lower = body.lower()
+        subject_terms, _ = self._scan(email_content.get("subject", "").lower())
+        body_terms, body_kinds = self._scan(body_lower)
+        
+        # Prohibited terms in subject or body
+        for index in sorted(subject_terms | body_terms):
+            category, term = self._terms[index]
+            violations.append({
+                "type": "prohibited_term",
+                "category": category,
+                "term": term,
+                "severity": "high",
+                "description": f"Use of prohibited term '{term}' may violate advertising regulations"
+            })
+        risk_score = len(violations) * 20
+        
+        has_digits = DIGIT_PATTERN.search(body_lower) is not None
+        
+        # CAN-SPAM compliance
+        can_spam_violations = _can_spam_violations(
+            email_content,
+            has_sender_id="sender" in body_kinds,
+            has_address=has_digits and ADDRESS_PATTERN.search(body) is not None,
+            has_unsubscribe="unsubscribe" in body_kinds
+        )
+        violations.extend(can_spam_violations)
+        risk_score += len(can_spam_violations) * 25
+        
+        # Earnings claims without disclaimers
+        may_claim_earnings = AMOUNT_PATTERN.search(body_lower) is not None and (
+            "$" in body_lower or "%" in body_lower or "earnings_hint" in body_kinds
+        )
+        earnings_violations = _earnings_violations(
+            has_earnings_claim=may_claim_earnings and EARNINGS_CLAIM_PATTERN.search(body_lower) is not None,
+            has_disclaimer="disclaimer" in body_kinds
+        )
+        violations.extend(earnings_violations)
+        risk_score += len(earnings_violations) * 30
+        
+        return violations, risk_score
+
+
+def _can_spam_violations(email_content: Dict[str, str], has_sender_id: bool,
+                         has_address: bool, has_unsubscribe: bool) -> List[Dict[str, Any]]:
+    """Build CAN-SPAM violations from precomputed checks."""
+    violations = []
+    
+    # Check for sender identification
+    if not has_sender_id and "from:" not in email_content:
+        violations.append({
+            "type": "missing_sender_id",
+            "severity": "high",
+            "description": "Email must clearly identify the sender"
+        })
+    
+    # Check for physical address
+    if not has_address:
+        violations.append({
+            "type": "missing_physical_address", 
+            "severity": "high",
+            "description": "Email must include sender's physical address"
+        })
+    
+    # Check for unsubscribe mechanism
+    if not has_unsubscribe:
+        violations.append({
+            "type": "missing_unsubscribe",
+            "severity": "critical",
+            "description": "Email must include clear unsubscribe mechanism"
+        })
+    
+    return violations
+
+
+def _earnings_violations(has_earnings_claim: bool, has_disclaimer: bool) -> List[Dict[str, Any]]:
+    """Build earnings-claim violations from precomputed checks."""
+    if has_earnings_claim and not has_disclaimer:
+        return [{
+            "type": "unsubstantiated_earnings_claim",
+            "severity": "critical",
+            "description": "Earnings claims require appropriate disclaimers and substantiation"
+        }]
+    return []
+
+
 class LegalGuardrailEngine:
     """Legal oversight system for SINCOR operations."""
     
@@ -19,6 +202,7 @@ class LegalGuardrailEngine:
         self.prohibited_terms = self._load_prohibited_terms()
         self.compliance_rules = self._load_compliance_rules()
         self.risk_thresholds = self._load_risk_thresholds()
+        self.scanner = ComplianceScanner(self.prohibited_terms)
         
     def _load_prohibited_terms(self) -> Dict[str, List[str]]:
         """Load terms that are legally prohibited in marketing/communications."""
@@ -114,35 +298,7 @@ class LegalGuardrailEngine:
     
     def validate_email_content(self, email_content: Dict[str, str]) -> Dict[str, Any]:
         """Validate email content for legal compliance."""
-        violations = []
-        risk_score = 0
-        
-        subject = email_content.get("subject", "").lower()
-        body = email_content.get("body", "").lower()
-        sender = email_content.get("from", "")
-        
-        # Check for prohibited terms
-        for category, terms in self.prohibited_terms.items():
-            for term in terms:
-                if term in subject or term in body:
-                    violations.append({
-                        "type": "prohibited_term",
-                        "category": category,
-                        "term": term,
-                        "severity": "high",
-                        "description": f"Use of prohibited term '{term}' may violate advertising regulations"
-                    })
-                    risk_score += 20
-        
-        # Check CAN-SPAM compliance
-        can_spam_violations = self._check_can_spam_compliance(email_content)
-        violations.extend(can_spam_violations)
-        risk_score += len(can_spam_violations) * 25
-        
-        # Check for earnings claims without disclaimers
-        earnings_violations = self._check_earnings_claims(body)
-        violations.extend(earnings_violations)
-        risk_score += len(earnings_violations) * 30
+        violations, risk_score = self.scanner.scan_email(email_content)
         
         return {
             "compliant": len(violations) == 0,
@@ -153,6 +309,30 @@ class LegalGuardrailEngine:
             "legal_review_required": risk_score >= self.risk_thresholds["high_risk"]
         }
     
+    def validate_email_batch(self, emails: Iterable[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Validate every email of a campaign, in order."""
+        return [self.validate_email_content(email_content) for email_content in emails]
+    
+    def validate_campaign(self, emails: Iterable[Dict[str, str]]) -> Dict[str, Any]:
+        """Validate a whole email campaign and summarize the results."""
+        results = self.validate_email_batch(emails)
+        
+        violation_counts: Dict[str, int] = {}
+        for result in results:
+            for violation in result["violations"]:
+                violation_counts[violation["type"]] = violation_counts.get(violation["type"], 0) + 1
+        
+        non_compliant = [index for index, result in enumerate(results) if not result["compliant"]]
+        return {
+            "compliant": not non_compliant,
+            "emails_checked": len(results),
+            "non_compliant_emails": non_compliant,
+            "violation_counts": violation_counts,
+            "max_risk_score": max((result["risk_score"] for result in results), default=0),
+            "legal_review_required": any(result["legal_review_required"] for result in results),
+            "results": results
+        }
+    
     def validate_franchise_content(self, franchise_content: Dict[str, Any]) -> Dict[str, Any]:
         """Validate franchise offering content for FTC compliance."""
         violations = []
@@ -253,69 +433,22 @@ class LegalGuardrailEngine:
     
     def _check_can_spam_compliance(self, email_content: Dict[str, str]) -> List[Dict[str, Any]]:
         """Check email for CAN-SPAM Act compliance."""
-        violations = []
         body = email_content.get("body", "")
+        body_lower = body.lower()
         
-        # Check for sender identification
-        if "sincor" not in body.lower() and "from:" not in email_content:
-            violations.append({
-                "type": "missing_sender_id",
-                "severity": "high",
-                "description": "Email must clearly identify the sender"
-            })
-        
-        # Check for physical address
-        address_patterns = [r'\d+\s+\w+\s+(street|avenue|road|st|ave|rd)', r'p\.?o\.?\s+box\s+\d+']
-        has_address = any(re.search(pattern, body, re.IGNORECASE) for pattern in address_patterns)
-        
-        if not has_address:
-            violations.append({
-                "type": "missing_physical_address", 
-                "severity": "high",
-                "description": "Email must include sender's physical address"
-            })
-        
-        # Check for unsubscribe mechanism
-        unsubscribe_terms = ["unsubscribe", "opt-out", "opt out", "remove"]
-        has_unsubscribe = any(term in body.lower() for term in unsubscribe_terms)
-        
-        if not has_unsubscribe:
-            violations.append({
-                "type": "missing_unsubscribe",
-                "severity": "critical",
-                "description": "Email must include clear unsubscribe mechanism"
-            })
-        
-        return violations
+        return _can_spam_violations(
+            email_content,
+            has_sender_id=any(term in body_lower for term in SENDER_ID_TERMS),
+            has_address=ADDRESS_PATTERN.search(body) is not None,
+            has_unsubscribe=any(term in body_lower for term in UNSUBSCRIBE_TERMS)
+        )
     
     def _check_earnings_claims(self, content: str) -> List[Dict[str, Any]]:
         """Check for earnings claims that need disclaimers."""
-        violations = []
-        
-        earnings_patterns = [
-            r'\$[\d,]+\s*(per|/)\s*(month|year|week)',
-            r'[\d,]+%\s*(roi|return|profit)',
-            r'make\s+\$[\d,]+',
-            r'earn\s+\$[\d,]+',
-            r'[\d,]+x\s*(return|roi)'
-        ]
-        
-        disclaimer_indicators = [
-            "results may vary", "not typical", "disclaimer", "past performance",
-            "no guarantee", "individual results", "may not achieve"
-        ]
-        
-        has_earnings_claim = any(re.search(pattern, content, re.IGNORECASE) for pattern in earnings_patterns)
-        has_disclaimer = any(indicator in content.lower() for indicator in disclaimer_indicators)
-        
-        if has_earnings_claim and not has_disclaimer:
-            violations.append({
-                "type": "unsubstantiated_earnings_claim",
-                "severity": "critical",
-                "description": "Earnings claims require appropriate disclaimers and substantiation"
-            })
-        
-        return violations
+        return _earnings_violations(
+            has_earnings_claim=EARNINGS_CLAIM_PATTERN.search(content) is not None,
+            has_disclaimer=any(indicator in content.lower() for indicator in DISCLAIMER_INDICATORS)
+        )
     
     def _validate_earnings_claims(self, earnings_claims: Dict[str, Any]) -> Dict[str, Any]:
         """Validate franchise earnings claims for FTC compliance."""
@@ -417,10 +550,20 @@ class LegalGuardrailEngine:
             }
         }
 
+_default_engine = None
+
+
+def get_guardrail_engine() -> LegalGuardrailEngine:
+    """Shared engine, so the scanner is compiled once per process."""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = LegalGuardrailEngine()
+    return _default_engine
+
 # Integration with SINCOR systems
 def validate_sincor_operation(operation_type: str, content: Any) -> Dict[str, Any]:
     """Main validation function for SINCOR operations."""
-    guardrails = LegalGuardrailEngine()
+    guardrails = get_guardrail_engine()
     
     if operation_type == "email_campaign":
         return guardrails.validate_email_content(content)
@@ -0,0 +1 @@
+# In-process cache package
@@ -0,0 +1,87 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+_MISSING = object()
+
+class TTLCache:
+    """Bounded in-process LRU cache with per-entry expiry and single-flight loads.
+
+    A None value (nothing found) is kept for negative_ttl instead of ttl; a
+    TTL of 0 disables caching. A key invalidated while its load is in flight
+    is not cached from that load, since the rows may predate the change.
+    """
+
+    def __init__(self, ttl: float, negative_ttl: Optional[float] = None, maxsize: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.maxsize = maxsize
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._stale: Set[Hashable] = set()
+        self.stats = {"hits": 0, "misses": 0, "loads": 0, "invalidations": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self.clock():
+            if entry is not None:
+                del self._entries[key]
+            self.stats["misses"] += 1
+            return default
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        ttl = self.negative_ttl if value is None else self.ttl
+        if ttl <= 0:
+            return
+        self._entries[key] = (self.clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable = _MISSING):
+        """Drop one key, or every key"""
+        self.stats["invalidations"] += 1
+        if key is _MISSING:
+            self._entries.clear()
+            self._stale.update(self._inflight)
+        else:
+            self._entries.pop(key, None)
+            if key in self._inflight:
+                self._stale.add(key)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Cached value, or load it once even if many requests miss at the same time"""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.stats["loads"] += 1
+        try:
+            value = await loader()
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            del self._inflight[key]
+            stale = key in self._stale
+            self._stale.discard(key)
+        if not stale:
+            self.set(key, value)
+        future.set_result(value)
+        return value
@@ -0,0 +1 @@
+# Streaming export package
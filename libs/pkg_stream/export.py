@@ -0,0 +1,140 @@
+import base64
+import json
+from typing import Any, AsyncIterator, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+Row = Mapping[str, Any]
+
+def wants_ndjson(format: Optional[str], accept: Optional[str]) -> bool:
+    """?format=ndjson or an Accept header asking for NDJSON"""
+    if format:
+        return format.lower() == "ndjson"
+    return bool(accept) and NDJSON_MEDIA_TYPE in accept
+
+class Fields:
+    """Named row serializers; a projection builds only the fields asked for"""
+
+    def __init__(self, serializers: Dict[str, Callable[[Row], Any]]):
+        self.serializers = serializers
+
+    def project(self, fields: Optional[str] = None) -> Callable[[Row], Dict[str, Any]]:
+        """Serializer for a comma-separated field list (all fields when empty)"""
+        names = [name.strip() for name in fields.split(",") if name.strip()] if fields else list(self.serializers)
+        unknown = [name for name in names if name not in self.serializers]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        selected = [(name, self.serializers[name]) for name in names]
+        return lambda row: {name: serialize(row) for name, serialize in selected}
+
+class Keyset:
+    """Keyset pagination over an ordered, unique column tuple.
+
+    columns are (sql expression, postgres type); the row key is the column
+    name after the last dot. Tokens are opaque base64 of the last row's keys.
+    """
+
+    def __init__(self, columns: Sequence[Tuple[str, str]], descending: bool = False):
+        self.columns = list(columns)
+        self.descending = descending
+        self.keys = [expr.rsplit(".", 1)[-1] for expr, _ in self.columns]
+
+    def order_by(self) -> str:
+        direction = " DESC" if self.descending else ""
+        return " ORDER BY " + ", ".join(f"{expr}{direction}" for expr, _ in self.columns)
+
+    def after(self, token: Optional[str], params: List[Any]) -> str:
+        """WHERE fragment for rows after the token, appending its values to params"""
+        if not token:
+            return ""
+        values = self.decode(token)
+        placeholders = []
+        for value, (_, pg_type) in zip(values, self.columns):
+            params.append(value)
+            placeholders.append(f"${len(params)}::text::{pg_type}")
+        op = "<" if self.descending else ">"
+        columns = ", ".join(expr for expr, _ in self.columns)
+        return f" AND ({columns}) {op} ({', '.join(placeholders)})"
+
+    def token(self, row: Row) -> str:
+        values = [row[key].isoformat() if hasattr(row[key], "isoformat") else str(row[key]) for key in self.keys]
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+    def decode(self, token: str) -> List[str]:
+        try:
+            values = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        except ValueError:
+            raise ValueError("Invalid cursor")
+        if not isinstance(values, list) or len(values) != len(self.columns) or \
+                not all(isinstance(value, str) for value in values):
+            raise ValueError("Invalid cursor")
+        return values
+
+async def fetch_page(db, query: str, params: List[Any], keyset: Keyset, limit: int,
+                     serialize: Callable[[Row], Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One page of a keyset-ordered query plus the token for the next page"""
+    rows = await db.fetch(f"{query} LIMIT {int(limit) + 1}", *params)
+    next_token = keyset.token(rows[limit - 1]) if len(rows) > limit else None
+    return [serialize(row) for row in rows[:limit]], next_token
+
+async def stream_ndjson(pool, query: str, params: List[Any], serialize: Callable[[Row], Dict[str, Any]],
+                        prefetch: int = 500, lines_per_chunk: int = 200) -> AsyncIterator[bytes]:
+    """Rows of a query as NDJSON, read through a server-side cursor.
+
+    Memory stays at one prefetch batch on the server side and one chunk of
+    lines here, however many rows match. Holds a pool connection until the
+    stream ends or the client goes away.
+    """
+    dumps = json.JSONEncoder(separators=(",", ":"), default=str).encode
+    async with pool.acquire() as conn:
+        async with conn.transaction(readonly=True):
+            lines = []
+            async for row in conn.cursor(query, *params, prefetch=prefetch):
+                lines.append(dumps(serialize(row)))
+                if len(lines) >= lines_per_chunk:
+                    yield ("\n".join(lines) + "\n").encode()
+                    lines = []
+            if lines:
+                yield ("\n".join(lines) + "\n").encode()
+
+class Listing:
+    """A list endpoint's result: an NDJSON stream, one keyset page, or every row"""
+
+    def __init__(self, stream: Optional[AsyncIterator[bytes]] = None, items: Optional[List[Dict[str, Any]]] = None,
+                 next_cursor: Optional[str] = None, paged: bool = False):
+        self.stream = stream
+        self.items = items
+        self.next_cursor = next_cursor
+        self.paged = paged
+
+    def response(self, key: str):
+        """Streaming response, or the JSON body with items under key"""
+        if self.stream is not None:
+            from fastapi.responses import StreamingResponse
+            return StreamingResponse(self.stream, media_type=NDJSON_MEDIA_TYPE)
+        if self.paged:
+            return {key: self.items, "next_cursor": self.next_cursor}
+        return {key: self.items}
+
+async def list_rows(db, export_pool, query: str, params: List[Any], keyset: Keyset, serializers: Fields,
+                    fields: Optional[str] = None, cursor: Optional[str] = None, limit: Optional[int] = None,
+                    ndjson: bool = False) -> Listing:
+    """Project fields, apply the cursor and keyset order, then stream, page or fetch every row.
+
+    Streams go through export_pool, not db: each holds a connection for its
+    whole run, so a few slow exports must not starve request traffic. Raises
+    ValueError for unknown fields or a bad cursor, before touching either pool.
+    """
+    serialize = serializers.project(fields)
+    params = list(params)
+    query += keyset.after(cursor, params) + keyset.order_by()
+
+    if ndjson:
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        return Listing(stream=stream_ndjson(export_pool, query, params, serialize))
+    if limit:
+        items, next_cursor = await fetch_page(db, query, params, keyset, limit, serialize)
+        return Listing(items=items, next_cursor=next_cursor, paged=True)
+    rows = await db.fetch(query, *params)
+    return Listing(items=[serialize(row) for row in rows])
@@ -0,0 +1 @@
+# Pipeline tracing package
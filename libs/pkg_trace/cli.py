@@ -0,0 +1,111 @@
+"""
+Reconstruct a lead's path through the pipeline from its trace spans.
+
+Usage:
+    python -m libs.pkg_trace.cli LEAD_ID [--redis-url redis://...] [--file spans.jsonl] [--json]
+
+Spans come from the lead's Redis list (see SPANS_KEY), or from a JSONL
+file of spans for offline use. Prints the critical path: the chain of
+stages ending at the last span to finish, with each stage's queue wait and
+processing time and its share of the end-to-end latency.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import Any, Dict, List
+
+from libs.pkg_trace.trace import SPANS_KEY
+
+Span = Dict[str, Any]
+
+async def load_from_redis(lead_id: str, redis_url: str) -> List[Span]:
+    import aioredis
+    r = await aioredis.from_url(redis_url)
+    try:
+        return [json.loads(raw) for raw in await r.lrange(SPANS_KEY.format(lead_id=lead_id), 0, -1)]
+    finally:
+        await r.close()
+
+def load_from_file(lead_id: str, path: str) -> List[Span]:
+    spans = []
+    with open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                span = json.loads(line)
+                if span.get("lead_id") == lead_id:
+                    spans.append(span)
+    return spans
+
+def critical_path(spans: List[Span]) -> List[Span]:
+    """Root-to-leaf chain ending at the last span to finish"""
+    if not spans:
+        return []
+    by_id = {span["span_id"]: span for span in spans}
+    path = [max(spans, key=lambda span: span["ended_at"])]
+    seen = {path[0]["span_id"]}
+    while path[-1].get("parent_id") in by_id and path[-1]["parent_id"] not in seen:
+        parent = by_id[path[-1]["parent_id"]]
+        seen.add(parent["span_id"])
+        path.append(parent)
+    return list(reversed(path))
+
+def summarize(spans: List[Span]) -> Dict[str, Any]:
+    path = critical_path(spans)
+    if not path:
+        return {"stages": [], "total": 0.0, "spans": 0, "traces": 0}
+    start = (path[0].get("sent_at") or path[0]["started_at"])
+    total = max(1e-9, path[-1]["ended_at"] - start)
+    stages = [{
+        "stage": span["stage"],
+        "status": span["status"],
+        "queue_wait": span["queue_wait"],
+        "processing": span["processing"],
+        "share": (span["queue_wait"] + span["processing"]) / total,
+        "ended_at_offset": span["ended_at"] - start
+    } for span in path]
+    return {
+        "stages": stages,
+        "total": total,
+        "bottleneck": max(stages, key=lambda s: s["queue_wait"] + s["processing"])["stage"],
+        # a missing parent means a stage's span was dropped or unsampled upstream
+        "complete": path[0].get("parent_id") is None,
+        "spans": len(spans),
+        "traces": len({span["trace_id"] for span in spans})
+    }
+
+def format_summary(lead_id: str, summary: Dict[str, Any]) -> str:
+    if not summary["stages"]:
+        return f"No spans for lead {lead_id}"
+    lines = [f"Lead {lead_id}: {summary['total'] * 1000:.1f} ms end to end "
+             f"({summary['spans']} spans, {summary['traces']} trace(s))",
+             f"{'stage':<16} {'queue ms':>10} {'work ms':>10} {'share':>7} {'at ms':>10}  status"]
+    for stage in summary["stages"]:
+        lines.append(f"{stage['stage']:<16} {stage['queue_wait'] * 1000:10.1f} {stage['processing'] * 1000:10.1f} "
+                     f"{stage['share']:7.1%} {stage['ended_at_offset'] * 1000:10.1f}  {stage['status']}")
+    lines.append(f"Bottleneck: {summary['bottleneck']}")
+    if not summary["complete"]:
+        lines.append("Path is incomplete: the earliest stage's parent span is missing")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show a lead's critical path through the pipeline")
+    parser.add_argument("lead_id")
+    parser.add_argument("--redis-url", default=os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    parser.add_argument("--file", help="JSONL file of spans instead of Redis")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    if args.file:
+        spans = load_from_file(args.lead_id, args.file)
+    else:
+        spans = asyncio.run(load_from_redis(args.lead_id, args.redis_url))
+
+    summary = summarize(spans)
+    print(json.dumps(summary, indent=2) if args.json else format_summary(args.lead_id, summary))
+    return 0 if summary["stages"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
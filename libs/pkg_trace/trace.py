@@ -0,0 +1,198 @@
+import asyncio
+import contextvars
+import json
+import os
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+from uuid import uuid4
+
+try:
+    from prometheus_client import Counter, Histogram
+except ImportError:
+    Counter = Histogram = None
+
+SAMPLE_RATE = float(os.getenv("PIPELINE_TRACE_SAMPLE", "1.0"))
+SPAN_TTL = int(os.getenv("PIPELINE_TRACE_TTL_SECONDS", str(3 * 24 * 3600)))
+FLUSH_INTERVAL = int(os.getenv("PIPELINE_TRACE_FLUSH_MS", "500")) / 1000
+BUFFER_MAX = int(os.getenv("PIPELINE_TRACE_BUFFER_MAX", "10000"))
+
+SPANS_KEY = "trace:lead:{lead_id}"
+
+if Histogram is not None:
+    BUCKETS = (.001, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60, 300, 900)
+    QUEUE_WAIT = Histogram("pipeline_stage_queue_wait_seconds",
+                           "Time a lead waited in a stage's input stream", ["stage"], buckets=BUCKETS)
+    PROCESSING = Histogram("pipeline_stage_processing_seconds",
+                           "Time a stage spent handling a lead", ["stage"], buckets=BUCKETS)
+    LEAD_AGE = Histogram("pipeline_lead_age_seconds",
+                         "Time since ingest when a stage finished with a lead", ["stage"], buckets=BUCKETS)
+    STAGE_ERRORS = Counter("pipeline_stage_errors_total", "Stage handler failures", ["stage"])
+    SPANS_DROPPED = Counter("pipeline_trace_spans_dropped_total", "Spans dropped by the exporter")
+
+# Trace context of the span the current task is running in
+_current: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar("pipeline_trace", default=None)
+
+def current_trace() -> Optional[Dict[str, Any]]:
+    """Context to hand to the next stage, stamped with the send time"""
+    ctx = _current.get()
+    if ctx is None:
+        return None
+    return dict(ctx, sent_at=time.time())
+
+def inject(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the current trace context to a stream message payload"""
+    ctx = current_trace()
+    if ctx is not None:
+        payload["trace"] = ctx
+    return payload
+
+def _new_trace(lead_id: Any, now: float) -> Dict[str, Any]:
+    return {"trace_id": uuid4().hex, "lead_id": str(lead_id or ""), "parent_id": None,
+            "started_at": now, "sent_at": None, "sampled": random.random() < SAMPLE_RATE}
+
+def record_span(stage: str, trace: Optional[Dict[str, Any]], started_at: float, ended_at: float,
+                status: str = "ok", span_id: Optional[str] = None, lead_id: Any = None) -> Dict[str, Any]:
+    """Observe stage metrics and export a span; returns the context for downstream stages"""
+    if not trace:
+        trace = _new_trace(lead_id, started_at)
+    span_id = span_id or uuid4().hex[:16]
+    sent_at = trace.get("sent_at")
+    queue_wait = max(0.0, started_at - sent_at) if sent_at else 0.0
+    processing = max(0.0, ended_at - started_at)
+
+    if Histogram is not None:
+        QUEUE_WAIT.labels(stage).observe(queue_wait)
+        PROCESSING.labels(stage).observe(processing)
+        LEAD_AGE.labels(stage).observe(max(0.0, ended_at - trace["started_at"]))
+        if status != "ok":
+            STAGE_ERRORS.labels(stage).inc()
+
+    if trace.get("sampled"):
+        exporter.record({
+            "trace_id": trace["trace_id"], "lead_id": trace["lead_id"], "span_id": span_id,
+            "parent_id": trace.get("parent_id"), "stage": stage, "sent_at": sent_at,
+            "started_at": started_at, "ended_at": ended_at, "queue_wait": queue_wait,
+            "processing": processing, "status": status
+        })
+    return {"trace_id": trace["trace_id"], "lead_id": trace["lead_id"], "parent_id": span_id,
+            "started_at": trace["started_at"], "sampled": trace.get("sampled", False)}
+
+@contextmanager
+def stage_span(stage: str, trace: Optional[Dict[str, Any]] = None, lead_id: Any = None) -> Iterator[Dict[str, Any]]:
+    """Time one stage's handling of a lead.
+
+    trace is the context from the incoming message; without one (the first
+    stage, or a producer that predates tracing) a new trace is started.
+    Messages sent with inject() inside the block continue this trace.
+    """
+    started_at = time.time()
+    if not trace:
+        trace = _new_trace(lead_id, started_at)
+    span_id = uuid4().hex[:16]
+    token = _current.set({"trace_id": trace["trace_id"], "lead_id": trace["lead_id"], "parent_id": span_id,
+                          "started_at": trace["started_at"], "sampled": trace.get("sampled", False)})
+    status = "ok"
+    try:
+        yield _current.get()
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        _current.reset(token)
+        record_span(stage, trace, started_at, time.time(), status, span_id)
+
+def traced(stage: str) -> Callable[[Callable[[dict], Awaitable[Any]]], Callable[[dict], Awaitable[Any]]]:
+    """Wrap a stream consumer handler in a stage span"""
+    def decorate(handler):
+        @wraps(handler)
+        async def wrapper(msg: dict):
+            lead = msg.get("lead") or {}
+            with stage_span(stage, msg.get("trace"), lead.get("lead_id") or msg.get("lead_id")):
+                return await handler(msg)
+        return wrapper
+    return decorate
+
+class SpanExporter:
+    """Buffers spans in memory and writes them to per-lead Redis lists in the background.
+
+    Handlers only append to a deque; one pipelined round trip per flush
+    interval carries every span. When Redis is slow or down the buffer is
+    capped and the overflow is dropped (and counted) rather than applying
+    backpressure to the pipeline.
+    """
+
+    def __init__(self, flush_interval: float = FLUSH_INTERVAL, buffer_max: int = BUFFER_MAX, ttl: int = SPAN_TTL,
+                 redis_factory: Optional[Callable[[], Awaitable[Any]]] = None):
+        self.flush_interval = flush_interval
+        self.buffer_max = buffer_max
+        self.ttl = ttl
+        self.redis_factory = redis_factory
+        self._buffer: deque = deque()
+        self._redis = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"recorded": 0, "exported": 0, "dropped": 0}
+
+    def record(self, span: Dict[str, Any]):
+        if len(self._buffer) >= self.buffer_max:
+            self._drop(1)
+            return
+        self._buffer.append(span)
+        self.stats["recorded"] += 1
+        if self._task is None or self._task.done():
+            try:
+                self._task = asyncio.get_running_loop().create_task(self._run())
+            except RuntimeError:
+                pass  # no loop yet; the next span recorded inside one starts the flusher
+
+    def _drop(self, count: int):
+        self.stats["dropped"] += count
+        if Counter is not None:
+            SPANS_DROPPED.inc(count)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def _client(self):
+        if self._redis is None:
+            if self.redis_factory is None:
+                from libs.pkg_bus.bus import redis
+                self.redis_factory = redis
+            self._redis = await self.redis_factory()
+        return self._redis
+
+    async def flush(self) -> int:
+        if not self._buffer:
+            return 0
+        spans = list(self._buffer)
+        self._buffer.clear()
+        try:
+            r = await self._client()
+            pipe = r.pipeline(transaction=False)
+            for span in spans:
+                key = SPANS_KEY.format(lead_id=span["lead_id"])
+                pipe.rpush(key, json.dumps(span, separators=(",", ":")))
+                pipe.expire(key, self.ttl)
+            await pipe.execute()
+        except Exception:
+            self._drop(len(spans))
+            return 0
+        self.stats["exported"] += len(spans)
+        return len(spans)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+exporter = SpanExporter()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+SINCOR Lifecycle Journal
+
+In-memory lifecycle state for one agent, persisted through an append-only log:
+- Budget consumption is a small delta record, not a rewrite of the budget file
+- State transitions update the current state; only the last N are kept in
+  memory, every transition is appended to a transitions history file
+- Activities are appended to the activity history log and kept in a
+  time-bounded in-memory window for health checks
+- Periodic snapshots truncate the journal; records carry sequence numbers
+  so a crash between snapshot and truncation never double-applies deltas
+- With autoflush=False writes are buffered until flush(), so a supervisor
+  can persist many agents per tick without holding their files open
+"""
+
+import json
+import os
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+BUDGET_COUNTERS = ("tokens_used", "tool_calls_used", "play_time_used")
+
+
+class LifecycleJournal:
+    """Append-only journal holding an agent's lifecycle state, budget and recent activities"""
+
+    def __init__(self, lifecycle_dir: str, agent_id: str, snapshot_interval: int = 1000,
+                 max_transitions: int = 100, activity_window_hours: int = 24, fsync: bool = False,
+                 autoflush: bool = True):
+        self.journal_path = f"{lifecycle_dir}/{agent_id}_lifecycle.journal"
+        self.snapshot_path = f"{lifecycle_dir}/{agent_id}_lifecycle_snapshot.json"
+        self.transitions_path = f"{lifecycle_dir}/{agent_id}_transitions.jsonl"
+        self.activity_path = f"{lifecycle_dir}/{agent_id}_activities.jsonl"
+        self.snapshot_interval = snapshot_interval
+        self.max_transitions = max_transitions
+        self.activity_window = timedelta(hours=activity_window_hours)
+        self.fsync = fsync
+        self.autoflush = autoflush
+
+        os.makedirs(lifecycle_dir, exist_ok=True)
+        self._lock = threading.RLock()
+        self.state: Optional[Dict[str, Any]] = None
+        self.budget: Optional[Dict[str, Any]] = None
+        self.recent_activities: deque = deque()
+        self.seq = 0
+        self.records_since_snapshot = 0
+        self._handles: Dict[str, Any] = {}  # path -> open file (autoflush only)
+        self._pending: Dict[str, List[bytes]] = {}  # path -> buffered lines
+        self.closed = False
+
+        self._recover()
+
+    # FILE I/O
+
+    def _write(self, path: str, data: bytes):
+        if not self.autoflush:
+            self._pending.setdefault(path, []).append(data)
+            return
+
+        f = self._handles.get(path)
+        if f is None:
+            f = self._handles[path] = open(path, "ab")
+        f.write(data)
+        f.flush()
+        if self.fsync:
+            os.fsync(f.fileno())
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._pending)
+
+    def flush(self):
+        """Write buffered records, one append per file"""
+        with self._lock:
+            for path, chunks in self._pending.items():
+                with open(path, "ab") as f:
+                    f.write(b"".join(chunks))
+                    if self.fsync:
+                        f.flush()
+                        os.fsync(f.fileno())
+            self._pending.clear()
+
+    # RECORDS
+
+    def _append(self, record: Dict[str, Any]):
+        with self._lock:
+            self.seq += 1
+            record["s"] = self.seq
+            self._write(self.journal_path, json.dumps(record, separators=(",", ":")).encode() + b"\n")
+            self._apply(record)
+
+            self.records_since_snapshot += 1
+            # Snapshot cost grows with the activity window, so space snapshots proportionally
+            if self.records_since_snapshot >= max(self.snapshot_interval, len(self.recent_activities)):
+                self.snapshot()
+
+    def _apply(self, record: Dict[str, Any]):
+        kind = record["t"]
+        if kind == "consume":
+            for field, amount in zip(BUDGET_COUNTERS, record["v"]):
+                self.budget[field] += amount
+        elif kind == "budget":
+            self.budget = record["v"]
+        elif kind == "transition":
+            transition = record["v"]
+            self.state["current_state"] = transition["to_state"]
+            self.state["state_entered"] = transition["timestamp"]
+            self.state["transitions"].append(transition)
+            del self.state["transitions"][:-self.max_transitions]
+        elif kind == "state":
+            self.state = record["v"]
+            self.state.setdefault("transitions", [])
+            del self.state["transitions"][:-self.max_transitions]
+
+    def record_consumption(self, tokens: int = 0, tool_calls: int = 0, play_time: int = 0):
+        """Journal a budget consumption delta"""
+        self._append({"t": "consume", "v": [tokens, tool_calls, play_time]})
+
+    def record_budget(self, budget: Dict[str, Any]):
+        """Journal a full budget (new day or migration)"""
+        self._append({"t": "budget", "v": dict(budget)})
+
+    def record_state(self, state: Dict[str, Any]):
+        """Journal a full lifecycle state (new agent or migration)"""
+        self._append({"t": "state", "v": dict(state)})
+
+    def record_transition(self, from_state: str, to_state: str, reason: str = ""):
+        """Journal a state transition and append it to the transitions history"""
+        transition = {
+            "from_state": from_state,
+            "to_state": to_state,
+            "timestamp": datetime.now().isoformat(),
+            "reason": reason
+        }
+        with self._lock:
+            self._write(self.transitions_path, (json.dumps(transition) + "\n").encode())
+            self._append({"t": "transition", "v": transition})
+
+    # ACTIVITIES
+
+    def log_activity(self, activity: Dict[str, Any]):
+        """Append an activity to the history log and the recent window"""
+        with self._lock:
+            self._write(self.activity_path, (json.dumps(activity) + "\n").encode())
+            self.recent_activities.append(activity)
+            self._trim_activities()
+
+    def _trim_activities(self):
+        cutoff = (datetime.now() - self.activity_window).isoformat()
+        while self.recent_activities and self.recent_activities[0]["timestamp"] < cutoff:
+            self.recent_activities.popleft()
+
+    def get_recent_activities(self, hours: int = 24) -> List[Dict[str, Any]]:
+        """Activities newer than `hours`; windows beyond the in-memory one read the history log"""
+        cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
+        with self._lock:
+            if timedelta(hours=hours) > self.activity_window:
+                self.flush()
+                return [a for a in self._read_activities(0) if a["timestamp"] >= cutoff]
+            self._trim_activities()
+            return [a for a in self.recent_activities if a["timestamp"] >= cutoff]
+
+    def _read_activities(self, start: int) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.activity_path):
+            return []
+        with open(self.activity_path, "rb") as f:
+            f.seek(start)
+            return [json.loads(line) for line in f if line.strip()]
+
+    # SNAPSHOT / RECOVERY
+
+    def snapshot(self):
+        """Persist in-memory state and reset the journal"""
+        with self._lock:
+            self.flush()
+            snapshot = {
+                "version": 1,
+                "seq": self.seq,
+                "state": self.state,
+                "budget": self.budget,
+                "recent_activities": list(self.recent_activities),
+                "activity_offset": os.path.getsize(self.activity_path) if os.path.exists(self.activity_path) else 0
+            }
+            tmp_path = f"{self.snapshot_path}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(json.dumps(snapshot, separators=(",", ":")))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+
+            # Records up to seq are now in the snapshot; replay skips them if
+            # we crash before the truncate below
+            if self.journal_path in self._handles:
+                self._handles[self.journal_path].truncate(0)
+            else:
+                open(self.journal_path, "wb").close()
+            self.records_since_snapshot = 0
+
+    def _recover(self):
+        snapshot = None
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r") as f:
+                snapshot = json.load(f)
+            self.seq = snapshot["seq"]
+            self.state = snapshot["state"]
+            self.budget = snapshot["budget"]
+            self.recent_activities.extend(snapshot["recent_activities"])
+
+        self._truncate_torn_tail(self.journal_path)
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    record = json.loads(line)
+                    if record["s"] > self.seq:
+                        self.seq = record["s"]
+                        self._apply(record)
+                        self.records_since_snapshot += 1
+
+        # Activities written after the snapshot (or all of them, on first open)
+        self._truncate_torn_tail(self.activity_path)
+        self.recent_activities.extend(self._read_activities(snapshot["activity_offset"] if snapshot else 0))
+        self._trim_activities()
+
+    @staticmethod
+    def _truncate_torn_tail(path: str):
+        """Drop a partial last line left by a crash mid-write"""
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return
+        with open(path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) == b"\n":
+                return
+            f.seek(0)
+            end = f.read().rfind(b"\n") + 1
+            f.truncate(end)
+
+    def close(self):
+        with self._lock:
+            if not self.closed:
+                self.snapshot()
+                for f in self._handles.values():
+                    f.close()
+                self._handles.clear()
+                self.closed = True
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+SINCOR Lifecycle Supervisor
+
+Runs the rhythms of the whole agent roster in one process:
+- One timer heap drives every agent's work blocks, dream/play cycles,
+  weekly sabbatical and daily budget reset (no per-agent scheduler loop)
+- Agent journals run with autoflush off; the supervisor flushes all dirty
+  journals together once per flush interval
+- Fleet-wide health in one call
+"""
+
+import glob
+import heapq
+import itertools
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+from lifecycle_system import LifecycleManager, LifecycleState
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+class LifecycleSupervisor:
+    """Drives every agent's lifecycle rhythm from a single timer heap"""
+
+    def __init__(self, lifecycle_dir: str = "lifecycles", clock: Callable[[], float] = time.time,
+                 flush_interval: float = 1.0, snapshot_interval: int = 1000):
+        self.lifecycle_dir = lifecycle_dir
+        self.clock = clock
+        self.flush_interval = flush_interval
+        self.snapshot_interval = snapshot_interval
+
+        self.managers: Dict[str, LifecycleManager] = {}
+        self._heap: List[Tuple[float, int, str, str, int]] = []  # (due, seq, agent_id, event, arg)
+        self._seq = itertools.count()
+        self._lock = threading.RLock()
+        self._last_flush = clock()
+        self.stats = {"events_run": 0, "flushes": 0, "agents_flushed": 0}
+
+    # ROSTER
+
+    def add_agent(self, agent_id: str, archetype: str, budgets: Optional[Dict[str, int]] = None) -> LifecycleManager:
+        """Start supervising an agent; new agents are onboarded immediately"""
+        with self._lock:
+            if agent_id in self.managers:
+                return self.managers[agent_id]
+
+            manager = LifecycleManager(agent_id, archetype, self.lifecycle_dir,
+                                       snapshot_interval=self.snapshot_interval, autoflush=False)
+            # Budget days follow the supervisor's clock, which may be simulated
+            manager.current_budget = manager._load_or_create_budget(self._date(self.clock()))
+            if budgets:
+                self._apply_roster_budgets(manager, budgets)
+            if manager.current_state == LifecycleState.HATCH:
+                manager.transition_state(LifecycleState.ONBOARD, "supervisor_onboarding")
+
+            self.managers[agent_id] = manager
+            self._schedule_agent(manager, self.clock())
+            return manager
+
+    def _apply_roster_budgets(self, manager: LifecycleManager, budgets: Dict[str, int]):
+        """Use daily limits from the agent's YAML config instead of the archetype defaults
+        
+        The limits are kept on the manager so each new day's budget starts from them too.
+        """
+        budget = manager.current_budget
+        fields = {"daily_tokens": "daily_tokens", "tool_calls": "daily_tool_calls",
+                  "play_time_mins": "daily_play_time_mins"}
+        manager.budget_limits = {field: budgets[key] for key, field in fields.items() if key in budgets}
+        limits = {field: manager.budget_limits.get(field, getattr(budget, field)) for field in fields.values()}
+        if any(getattr(budget, field) != value for field, value in limits.items()):
+            for field, value in limits.items():
+                setattr(budget, field, value)
+            manager._save_budget(budget)
+
+    def load_roster(self, agents_dir: str = "agents") -> int:
+        """Add every agents/E-*.yaml agent; returns the number supervised"""
+        if yaml is None:
+            raise ImportError("PyYAML is required to load the agent roster")
+
+        for agent_file in sorted(glob.glob(os.path.join(agents_dir, "E-*.yaml"))):
+            with open(agent_file, "r") as f:
+                config = yaml.safe_load(f)
+            self.add_agent(config["id"], config["archetype"], config.get("budgets"))
+        return len(self.managers)
+
+    def remove_agent(self, agent_id: str):
+        """Stop supervising an agent; its pending timers are dropped lazily"""
+        with self._lock:
+            manager = self.managers.pop(agent_id, None)
+            if manager:
+                manager.close()
+
+    # TIMERS
+
+    def _push(self, due: float, agent_id: str, event: str, arg: int = 0):
+        heapq.heappush(self._heap, (due, next(self._seq), agent_id, event, arg))
+
+    def _schedule_agent(self, manager: LifecycleManager, now: float):
+        config = manager.rhythm_config
+        agent_id = manager.agent_id
+        for block_index in range(len(config.work_blocks)):
+            self._push(self._next_work_block(config.work_blocks[block_index], now), agent_id, "work_start", block_index)
+        self._push(now + config.dream_frequency * 60, agent_id, "dream")
+        self._push(now + config.play_frequency * 60, agent_id, "play")
+        self._push(self._next_sabbatical(config.sabbatical_day, now), agent_id, "sabbatical")
+        self._push(self._next_midnight(now), agent_id, "new_day")
+
+    @staticmethod
+    def _next_work_block(block: Tuple[int, int], now: float) -> float:
+        start_hour = block[0]
+        current = datetime.fromtimestamp(now)
+        start = current.replace(hour=start_hour, minute=0, second=0, microsecond=0)
+        if start.timestamp() <= now:
+            start += timedelta(days=1)
+        return start.timestamp()
+
+    @staticmethod
+    def _date(now: float) -> str:
+        return datetime.fromtimestamp(now).strftime("%Y-%m-%d")
+
+    @staticmethod
+    def _next_midnight(now: float) -> float:
+        today = datetime.fromtimestamp(now).replace(hour=0, minute=0, second=0, microsecond=0)
+        return (today + timedelta(days=1)).timestamp()
+
+    @classmethod
+    def _next_sabbatical(cls, day_name: str, now: float) -> float:
+        midnight = datetime.fromtimestamp(cls._next_midnight(now))
+        days_ahead = (WEEKDAYS.index(day_name) - midnight.weekday()) % 7
+        return (midnight + timedelta(days=days_ahead)).timestamp()
+
+    def _run_event(self, manager: LifecycleManager, due: float, event: str, arg: int):
+        config = manager.rhythm_config
+        agent_id = manager.agent_id
+
+        if event == "work_start":
+            duration_mins = config.work_blocks[arg][1]
+            if manager.current_state == LifecycleState.ONBOARD:
+                manager.start_shift()
+            else:
+                manager._start_work_block(duration_mins)
+            self._push(due + duration_mins * 60, agent_id, "work_end", arg)
+            self._push(self._next_work_block(config.work_blocks[arg], due), agent_id, "work_start", arg)
+        elif event == "work_end":
+            if manager.current_state == LifecycleState.SHIFT:
+                manager.transition_state(LifecycleState.OFF_DUTY, "work_block_ended")
+        elif event == "dream":
+            manager._trigger_dream_cycle()
+            self._push(due + config.dream_frequency * 60, agent_id, "dream")
+        elif event == "play":
+            manager._trigger_play_cycle()
+            self._push(due + config.play_frequency * 60, agent_id, "play")
+        elif event == "sabbatical":
+            if manager.current_state == LifecycleState.SHIFT:
+                manager._trigger_sabbatical()
+            self._push(self._next_sabbatical(config.sabbatical_day, due + 1), agent_id, "sabbatical")
+        elif event == "new_day":
+            manager.current_budget = manager._load_or_create_budget(self._date(due))
+            self._push(self._next_midnight(due), agent_id, "new_day")
+
+    def next_due(self) -> Optional[float]:
+        with self._lock:
+            return self._heap[0][0] if self._heap else None
+
+    def run_pending(self, now: Optional[float] = None) -> int:
+        """Run every timer due at or before now; returns the number of events run"""
+        now = self.clock() if now is None else now
+        ran = 0
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due, _, agent_id, event, arg = heapq.heappop(self._heap)
+                manager = self.managers.get(agent_id)
+                if manager is None:
+                    continue
+                self._run_event(manager, due, event, arg)
+                ran += 1
+            self.stats["events_run"] += ran
+
+            if now - self._last_flush >= self.flush_interval:
+                self.flush()
+                self._last_flush = now
+        return ran
+
+    def run_until(self, end: float) -> int:
+        """Simulate the fleet up to `end`, running timers at their due times"""
+        ran = 0
+        while True:
+            due = self.next_due()
+            if due is None or due > end:
+                break
+            ran += self.run_pending(due)
+        self.flush()
+        return ran
+
+    def run_forever(self, stop_event: Optional[threading.Event] = None):
+        """Sleep until the next timer (or flush) is due and run it"""
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            self.run_pending()
+            due = self.next_due()
+            wait = self.flush_interval if due is None else min(self.flush_interval, due - self.clock())
+            stop_event.wait(max(0.0, wait))
+        self.flush()
+
+    # PERSISTENCE
+
+    def flush(self) -> int:
+        """Write every agent's buffered journal records; returns agents flushed"""
+        with self._lock:
+            flushed = 0
+            for manager in self.managers.values():
+                if manager.journal.dirty:
+                    manager.journal.flush()
+                    flushed += 1
+            self.stats["flushes"] += 1
+            self.stats["agents_flushed"] += flushed
+            return flushed
+
+    def close(self):
+        with self._lock:
+            for manager in self.managers.values():
+                manager.close()
+            self.managers.clear()
+            self._heap.clear()
+
+    # HEALTH
+
+    def get_fleet_health(self, include_activities: bool = False) -> Dict[str, Any]:
+        """Health of every supervised agent plus fleet-wide aggregates"""
+        with self._lock:
+            agents = {}
+            states: Dict[str, int] = {}
+            for agent_id, manager in self.managers.items():
+                if include_activities:
+                    agents[agent_id] = manager.get_health_metrics()
+                else:
+                    budget = manager.current_budget
+                    agents[agent_id] = {
+                        "current_state": manager.current_state.value,
+                        "fatigue_level": round(manager.fatigue_level, 2),
+                        "creativity_level": round(manager.creativity_level, 2),
+                        "budget_remaining": budget.remaining_budget(),
+                        "budget_exhausted": budget.is_exhausted()
+                    }
+                states[manager.current_state.value] = states.get(manager.current_state.value, 0) + 1
+
+            count = max(1, len(self.managers))
+            return {
+                "agents": agents,
+                "summary": {
+                    "agents": len(self.managers),
+                    "states": states,
+                    "average_fatigue": round(sum(m.fatigue_level for m in self.managers.values()) / count, 3),
+                    "average_creativity": round(sum(m.creativity_level for m in self.managers.values()) / count, 3),
+                    "budget_exhausted": sum(m.current_budget.is_exhausted() for m in self.managers.values()),
+                    "pending_timers": len(self._heap)
+                }
+            }
+
+
+def main():
+    """Run the agent roster under one supervisor"""
+
+    print("SINCOR Lifecycle Supervisor")
+    print("=" * 30)
+
+    supervisor = LifecycleSupervisor()
+    count = supervisor.load_roster()
+    print(f"Supervising {count} agents")
+
+    # Simulate one day of rhythms
+    ran = supervisor.run_until(time.time() + 24 * 3600)
+    summary = supervisor.get_fleet_health()["summary"]
+    print(f"Ran {ran} rhythm events")
+    print(f"States: {summary['states']}")
+    print(f"Average fatigue: {summary['average_fatigue']}, creativity: {summary['average_creativity']}")
+    supervisor.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,9 @@ Lifecycle States: Hatch → Onboard → Shift → Off-duty → Review → Promot
 Off-duty Modes: Dream (memory consolidation) / Play (creative exploration)  
 Shift Budgets: Token limits to protect the commons
 Return-to-work Boost: Freshness weights to avoid ruts
+
+State, budget and recent activities live in memory and are persisted
+through a LifecycleJournal (see lifecycle_journal.py).
 """
 
 import json
@@ -19,6 +22,8 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import time
 
+from lifecycle_journal import LifecycleJournal
+
 # Note: schedule module not available, using simple time-based scheduling
 class SimpleScheduler:
     """Simple scheduler replacement"""
@@ -124,18 +129,24 @@ class ActivityLog:
 class LifecycleManager:
     """Manages agent lifecycles and rhythm enforcement"""
     
-    def __init__(self, agent_id: str, archetype: str, lifecycle_dir: str = "lifecycles"):
+    def __init__(self, agent_id: str, archetype: str, lifecycle_dir: str = "lifecycles",
+                 snapshot_interval: int = 1000, max_transitions: int = 100, autoflush: bool = True):
         self.agent_id = agent_id
         self.archetype = archetype
         
         os.makedirs(lifecycle_dir, exist_ok=True)
         self.lifecycle_dir = lifecycle_dir
         
-        # State files
+        # State files (state_file / budget_file are only read to migrate older agents)
         self.state_file = f"{lifecycle_dir}/{agent_id}_state.json"
         self.budget_file = f"{lifecycle_dir}/{agent_id}_budget.json"
         self.activity_log = f"{lifecycle_dir}/{agent_id}_activities.jsonl"
         self.rhythm_config_file = f"{lifecycle_dir}/{agent_id}_rhythm.json"
+        self.journal = LifecycleJournal(lifecycle_dir, agent_id, snapshot_interval=snapshot_interval,
+                                        max_transitions=max_transitions, autoflush=autoflush)
+        
+        # Per-agent daily limits that replace the archetype defaults (e.g. from the agent's YAML)
+        self.budget_limits: Dict[str, int] = {}
         
         # Initialize state
         self.current_state = self._load_or_initialize_state()
@@ -154,33 +165,38 @@ class LifecycleManager:
     def _load_or_initialize_state(self) -> LifecycleState:
         """Load current lifecycle state or initialize new agent"""
         
-        if os.path.exists(self.state_file):
-            with open(self.state_file, 'r') as f:
-                data = json.load(f)
-                return LifecycleState(data["current_state"])
-        else:
-            # New agent starts in HATCH state
-            initial_state = {
-                "current_state": LifecycleState.HATCH.value,
-                "state_entered": datetime.now().isoformat(),
-                "transitions": [],
-                "created": datetime.now().isoformat()
-            }
-            
-            with open(self.state_file, 'w') as f:
-                json.dump(initial_state, f, indent=2)
+        if self.journal.state is None:
+            if os.path.exists(self.state_file):
+                # Migrate state written before the journal existed
+                with open(self.state_file, 'r') as f:
+                    self.journal.record_state(json.load(f))
+            else:
+                # New agent starts in HATCH state
+                self.journal.record_state({
+                    "current_state": LifecycleState.HATCH.value,
+                    "state_entered": datetime.now().isoformat(),
+                    "transitions": [],
+                    "created": datetime.now().isoformat()
+                })
                 
-            return LifecycleState.HATCH
+        return LifecycleState(self.journal.state["current_state"])
     
-    def _load_or_create_budget(self) -> ShiftBudget:
-        """Load current shift budget or create new daily budget"""
+    def _load_or_create_budget(self, today: Optional[str] = None) -> ShiftBudget:
+        """Load current shift budget or create new daily budget
         
-        today = datetime.now().strftime("%Y-%m-%d")
+        today (YYYY-MM-DD) defaults to the wall-clock date; a scheduler on a
+        simulated clock passes its own.
+        """
         
-        if os.path.exists(self.budget_file):
+        today = today or datetime.now().strftime("%Y-%m-%d")
+        
+        data = self.journal.budget
+        if data is None and os.path.exists(self.budget_file):
             with open(self.budget_file, 'r') as f:
                 data = json.load(f)
-                
+            self.journal.record_budget(data)
+            
+        if data is not None:
             budget = ShiftBudget(**data)
             
             # Reset budget if it's a new day
@@ -205,7 +221,7 @@ class LifecycleManager:
             "Director": {"daily_tokens": 25000, "daily_tool_calls": 400, "daily_play_time_mins": 45}
         }
         
-        budget_config = archetype_budgets.get(self.archetype, archetype_budgets["Scout"])
+        budget_config = {**archetype_budgets.get(self.archetype, archetype_budgets["Scout"]), **self.budget_limits}
         
         budget = ShiftBudget(
             daily_tokens=budget_config["daily_tokens"],
@@ -218,10 +234,9 @@ class LifecycleManager:
         return budget
     
     def _save_budget(self, budget: ShiftBudget):
-        """Save current budget to file"""
+        """Journal the full budget"""
         
-        with open(self.budget_file, 'w') as f:
-            json.dump(asdict(budget), f, indent=2)
+        self.journal.record_budget(asdict(budget))
     
     def _load_or_create_rhythm_config(self) -> RhythmConfig:
         """Load or create rhythm configuration"""
@@ -348,21 +363,8 @@ class LifecycleManager:
             outputs={"from_state": self.current_state.value, "to_state": new_state.value, "reason": reason}
         )
         
-        # Update state file
-        with open(self.state_file, 'r') as f:
-            state_data = json.load(f)
-            
-        state_data["transitions"].append({
-            "from_state": self.current_state.value,
-            "to_state": new_state.value,
-            "timestamp": datetime.now().isoformat(),
-            "reason": reason
-        })
-        state_data["current_state"] = new_state.value
-        state_data["state_entered"] = datetime.now().isoformat()
-        
-        with open(self.state_file, 'w') as f:
-            json.dump(state_data, f, indent=2)
+        # Journal transition (full history goes to the transitions file)
+        self.journal.record_transition(self.current_state.value, new_state.value, reason)
             
         self.current_state = new_state
         return True
@@ -434,7 +436,7 @@ class LifecycleManager:
         if self.fatigue_level > 0.7:
             self.creativity_level = max(0.3, self.creativity_level - 0.05)
             
-        self._save_budget(self.current_budget)
+        self.journal.record_consumption(tokens=tokens, tool_calls=tool_calls)
         return True
     
     def _apply_return_to_work_boost(self):
@@ -478,7 +480,7 @@ class LifecycleManager:
         
         # Update play time budget
         self.current_budget.play_time_used += duration_mins
-        self._save_budget(self.current_budget)
+        self.journal.record_consumption(play_time=duration_mins)
         
         return {"success": True, "results": dream_results}
     
@@ -502,7 +504,7 @@ class LifecycleManager:
         
         # Update play time budget
         self.current_budget.play_time_used += duration_mins
-        self._save_budget(self.current_budget)
+        self.journal.record_consumption(play_time=duration_mins)
         
         return {"success": True, "results": play_results}
     
@@ -626,27 +628,15 @@ class LifecycleManager:
         activity_dict = asdict(activity)
         activity_dict['state'] = activity.state.value
         
-        with open(self.activity_log, 'a') as f:
-            f.write(json.dumps(activity_dict) + '\n')
+        self.journal.log_activity(activity_dict)
     
     def _get_recent_activities(self, hours: int = 24) -> List[ActivityLog]:
         """Get recent activities for analysis"""
         
-        if not os.path.exists(self.activity_log):
-            return []
-            
-        cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
         activities = []
-        
-        with open(self.activity_log, 'r') as f:
-            for line in f:
-                if line.strip():
-                    data = json.loads(line)
-                    if data["timestamp"] >= cutoff:
-                        # Convert state string back to enum
-                        data['state'] = LifecycleState(data['state'])
-                        activity = ActivityLog(**data)
-                        activities.append(activity)
+        for data in self.journal.get_recent_activities(hours):
+            # Convert state string back to enum
+            activities.append(ActivityLog(**{**data, 'state': LifecycleState(data['state'])}))
                         
         return activities
     
@@ -669,12 +659,21 @@ class LifecycleManager:
                 }
             },
             "rhythm_pattern": self.rhythm_config.pattern.value,
-            "last_activities": [asdict(a) for a in self._get_recent_activities(4)]
+            "last_activities": [{**a, "state": LifecycleState(a["state"])}
+                                for a in self.journal.get_recent_activities(4)]
         }
     
+    def get_transitions(self) -> List[Dict[str, Any]]:
+        """Most recent state transitions (full history is in the transitions file)"""
+        return list(self.journal.state["transitions"])
+    
     def run_scheduler(self):
-        """Run the rhythm scheduler (call periodically)"""
+        """Run the rhythm scheduler (call periodically; LifecycleSupervisor drives many agents at once)"""
         self.scheduler.run_pending()
+    
+    def close(self):
+        """Snapshot lifecycle state and close the journal"""
+        self.journal.close()
 
 def main():
     """Demo the lifecycle and rhythm system"""
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+SINCOR Market Journal
+
+Append-only, crash-safe storage engine for the swarm TaskMarket:
+- Binary journal: every mutation is one length + CRC32 framed record
+- State records (tasks, assignments, reputation) are upserts; history
+  records (bids, transactions) are immutable
+- Per-task and per-agent offset indexes so lookups read only what they need
+- Periodic snapshots of state + indexes for fast restart
+- Compaction drops superseded state records while keeping all history
+- Recovery replays from the last snapshot and truncates a torn tail
+"""
+
+import json
+import os
+import struct
+import threading
+import uuid
+import zlib
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+RECORD_HEADER = struct.Struct("<II")  # payload length, crc32 of payload
+
+STATE_KINDS = ("task", "assignment", "reputation")
+
+# json.dumps builds a new encoder per call when given separators; reuse one
+_encode_json = json.JSONEncoder(separators=(",", ":")).encode
+
+
+class MarketJournal:
+    """Append-only market journal with in-memory state and offset indexes"""
+
+    def __init__(self, market_dir: str = "market", snapshot_interval: int = 1000,
+                 compaction_threshold: int = 5000, fsync: bool = False):
+        self.market_dir = market_dir
+        self.journal_path = os.path.join(market_dir, "journal.bin")
+        self.snapshot_path = os.path.join(market_dir, "journal_snapshot.json")
+        self.snapshot_interval = snapshot_interval
+        self.compaction_threshold = compaction_threshold
+        self.fsync = fsync
+
+        os.makedirs(market_dir, exist_ok=True)
+        self._lock = threading.RLock()
+        self._reset()
+        self._recover()
+        self._file = open(self.journal_path, "ab")
+        if self._end == 0:
+            self._append_record({"t": "header", "k": self.journal_id})
+
+    def _reset(self):
+        self.journal_id = uuid.uuid4().hex
+        self.state: Dict[str, Dict[str, Any]] = {kind: {} for kind in STATE_KINDS}
+        self.bids_by_task: Dict[str, List[int]] = defaultdict(list)
+        self.bids_by_agent: Dict[str, List[int]] = defaultdict(list)
+        self.agent_bid_stats: Dict[str, List[float]] = {}  # agent -> [bid_count, confidence_sum]
+        self.transaction_times: List[str] = []
+        self.transaction_offsets: List[int] = []
+        self.history_records = 0
+        self.superseded_records = 0
+        self.records_since_snapshot = 0
+        self._end = 0
+
+    # RECORD I/O
+
+    @staticmethod
+    def _encode(record: Dict[str, Any]) -> bytes:
+        payload = _encode_json(record).encode()
+        return RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+    def _scan(self, f, start: int) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        """Yield (offset, next_offset, record) until EOF or the first torn/corrupt record."""
+        f.seek(start)
+        offset = start
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return
+            length, crc = RECORD_HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                return
+            next_offset = offset + RECORD_HEADER.size + length
+            yield offset, next_offset, json.loads(payload)
+            offset = next_offset
+
+    def _append_record(self, record: Dict[str, Any]) -> int:
+        return self._append_records([record])[0]
+
+    def _append_records(self, records: List[Dict[str, Any]]) -> List[int]:
+        """Write records with one write and flush; returns their offsets."""
+        offsets = []
+        chunks = []
+        end = self._end
+        for record in records:
+            data = self._encode(record)
+            offsets.append(end)
+            chunks.append(data)
+            end += len(data)
+        self._file.write(b"".join(chunks))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._end = end
+        return offsets
+
+    def read(self, offset: int) -> Dict[str, Any]:
+        """Read the value of the record at offset."""
+        with self._lock, open(self.journal_path, "rb") as f:
+            f.seek(offset)
+            length, _ = RECORD_HEADER.unpack(f.read(RECORD_HEADER.size))
+            return json.loads(f.read(length))["v"]
+
+    def _read_many(self, offsets: List[int]) -> List[Dict[str, Any]]:
+        # Callers hold _lock from reading the offset index until the records are
+        # read: compaction rewrites the file and renumbers every offset
+        if not offsets:
+            return []
+        payloads = []
+        with open(self.journal_path, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                length, _ = RECORD_HEADER.unpack(f.read(RECORD_HEADER.size))
+                payloads.append(f.read(length))
+        # One decode call for the whole batch is much cheaper than one per record
+        return [record["v"] for record in json.loads(b"[" + b",".join(payloads) + b"]")]
+
+    # STATE
+
+    def _apply(self, record: Dict[str, Any], offset: int):
+        kind = record["t"]
+
+        if kind == "header":
+            self.journal_id = record["k"]
+        elif kind in STATE_KINDS:
+            if record["k"] in self.state[kind]:
+                self.superseded_records += 1
+            self.state[kind][record["k"]] = record["v"]
+        elif kind == "bid":
+            self.history_records += 1
+            bid = record["v"]
+            self.bids_by_task[bid["task_id"]].append(offset)
+            self.bids_by_agent[bid["agent_id"]].append(offset)
+            stats = self.agent_bid_stats.setdefault(bid["agent_id"], [0, 0.0])
+            stats[0] += 1
+            stats[1] += bid.get("confidence", 0)
+        elif kind == "transaction":
+            self.history_records += 1
+            self.transaction_times.append(record["v"]["recorded_at"])
+            self.transaction_offsets.append(offset)
+
+    def append(self, kind: str, key: str, value: Dict[str, Any]):
+        """Journal one mutation and apply it to in-memory state and indexes."""
+        self.append_many([(kind, key, value)])
+
+    def append_many(self, mutations: List[Tuple[str, str, Dict[str, Any]]]):
+        """Journal several mutations with one write and flush, then apply them."""
+        if not mutations:
+            return
+        records = [{"t": kind, "k": key, "v": value} for kind, key, value in mutations]
+        with self._lock:
+            for record, offset in zip(records, self._append_records(records)):
+                self._apply(record, offset)
+            self.records_since_snapshot += len(records)
+
+            # Snapshot and compaction costs grow with state, so space them proportionally
+            live_records = self._live_records()
+            if self.superseded_records >= self.compaction_threshold and \
+                    self.superseded_records >= live_records:
+                self.compact()
+            elif self.records_since_snapshot >= self.snapshot_interval and \
+                    self.records_since_snapshot >= live_records // 2:
+                self.snapshot()
+
+    def _live_records(self) -> int:
+        return sum(len(entries) for entries in self.state.values()) + self.history_records
+
+    def is_empty(self) -> bool:
+        return not any(self.state.values()) and not self.bids_by_task and not self.transaction_offsets
+
+    # QUERIES
+
+    def get_bids_for_task(self, task_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return self._read_many(list(self.bids_by_task.get(task_id, [])))
+
+    def get_bids_for_tasks(self, task_ids: List[str]) -> List[Dict[str, Any]]:
+        """Bids for many tasks in one sequential pass over the journal."""
+        with self._lock:
+            offsets = sorted(offset for task_id in task_ids for offset in self.bids_by_task.get(task_id, []))
+            return self._read_many(offsets)
+
+    def get_bids_for_agent(self, agent_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return self._read_many(list(self.bids_by_agent.get(agent_id, [])))
+
+    def get_agent_bid_stats(self, agent_id: str) -> Tuple[int, float]:
+        """(bid_count, average_confidence) in O(1)"""
+        count, confidence_sum = self.agent_bid_stats.get(agent_id, (0, 0.0))
+        return count, confidence_sum / max(1, count)
+
+    def get_transactions_since(self, cutoff: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            start = bisect_left(self.transaction_times, cutoff)
+            return self._read_many(self.transaction_offsets[start:])
+
+    # SNAPSHOT / COMPACTION / RECOVERY
+
+    def snapshot(self):
+        """Persist state and indexes so restart replays only the journal tail."""
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+            snapshot = {
+                "version": 1,
+                "journal_id": self.journal_id,
+                "offset": self._end,
+                "state": self.state,
+                "bids_by_task": self.bids_by_task,
+                "bids_by_agent": self.bids_by_agent,
+                "agent_bid_stats": self.agent_bid_stats,
+                "transaction_times": self.transaction_times,
+                "transaction_offsets": self.transaction_offsets,
+                "superseded_records": self.superseded_records
+            }
+            tmp_path = f"{self.snapshot_path}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(json.dumps(snapshot, separators=(",", ":")))  # C encoder; json.dump is pure Python
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            self.records_since_snapshot = 0
+
+    def compact(self):
+        """Rewrite the journal with current state plus full history, dropping superseded upserts."""
+        with self._lock:
+            history = [(offset, "bid") for offsets in self.bids_by_task.values() for offset in offsets]
+            history += [(offset, "transaction") for offset in self.transaction_offsets]
+            history.sort()
+            history_values = self._read_many([offset for offset, _ in history])
+
+            tmp_path = f"{self.journal_path}.compact"
+            with open(tmp_path, "wb") as f:
+                f.write(self._encode({"t": "header", "k": uuid.uuid4().hex}))
+                for kind in STATE_KINDS:
+                    for key, value in self.state[kind].items():
+                        f.write(self._encode({"t": kind, "k": key, "v": value}))
+                for (_, kind), value in zip(history, history_values):
+                    key = value.get("bid_id") or value.get("transaction_id")
+                    f.write(self._encode({"t": kind, "k": key, "v": value}))
+                f.flush()
+                os.fsync(f.fileno())
+
+            # The compacted journal is complete on its own; a stale snapshot is
+            # detected by journal_id and ignored, so this swap is crash-safe
+            self._file.close()
+            os.replace(tmp_path, self.journal_path)
+            self._reset()
+            self._replay(0)
+            self._file = open(self.journal_path, "ab")
+            self.snapshot()
+
+    def _replay(self, start: int):
+        with open(self.journal_path, "rb") as f:
+            end = start
+            for offset, end, record in self._scan(f, start):
+                self._apply(record, offset)
+        self._end = end
+
+        # Drop a torn or corrupt tail left by a crash mid-write
+        if os.path.getsize(self.journal_path) > end:
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(end)
+
+    def _load_snapshot(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.snapshot_path, "r") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # The snapshot must belong to this journal file and not point past its end
+        try:
+            with open(self.journal_path, "rb") as f:
+                first = next(self._scan(f, 0), (0, 0, {}))[2]
+            size = os.path.getsize(self.journal_path)
+        except OSError:
+            return None
+        if first.get("k") != snapshot.get("journal_id") or snapshot.get("offset", 0) > size:
+            return None
+        return snapshot
+
+    def _recover(self):
+        if not os.path.exists(self.journal_path):
+            return
+
+        snapshot = self._load_snapshot()
+        if snapshot is None:
+            self._replay(0)
+            return
+
+        self.journal_id = snapshot["journal_id"]
+        self.state = snapshot["state"]
+        self.bids_by_task = defaultdict(list, snapshot["bids_by_task"])
+        self.bids_by_agent = defaultdict(list, snapshot["bids_by_agent"])
+        self.agent_bid_stats = snapshot["agent_bid_stats"]
+        self.transaction_times = snapshot["transaction_times"]
+        self.transaction_offsets = snapshot["transaction_offsets"]
+        self.superseded_records = snapshot["superseded_records"]
+        self.history_records = len(self.transaction_offsets) + sum(stats[0] for stats in self.agent_bid_stats.values())
+        self._replay(snapshot["offset"])
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self.snapshot()
+                self._file.close()
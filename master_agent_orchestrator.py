@@ -18,12 +18,16 @@ import os
 import sys
 import json
 import time
+import heapq
+import itertools
 import logging
 import threading
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Callable
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
 from dataclasses import dataclass
 from enum import Enum
 
@@ -75,25 +79,462 @@ class AgentStatus(Enum):
     ERROR = "error"
     MAINTENANCE = "maintenance"
 
+DEFAULT_AGENT_CONCURRENCY = 4
+
+def run_agent_task(task: AgentTask) -> Dict[str, Any]:
+    """Execute one agent task (module-level so process workers can pickle it)."""
+    # Simulate work (replace with actual agent call)
+    time.sleep(0.1)
+    return {'status': 'completed', 'task_type': task.task_type}
+
+class LatencyHistogram:
+    """Latency histogram with fixed, roughly log-spaced millisecond buckets."""
+    
+    BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500,
+                 1000, 2500, 5000, 10000, 30000, 60000, 300000)
+    
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def record(self, seconds: float):
+        ms = seconds * 1000
+        self.counts[bisect_left(self.BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+    
+    def percentile(self, pct: float) -> float:
+        """Upper bound (ms) of the bucket holding the given percentile."""
+        if not self.count:
+            return 0.0
+        rank = pct / 100 * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return round(min(self.BOUNDS_MS[i], self.max_ms) if i < len(self.BOUNDS_MS) else self.max_ms, 3)
+        return round(self.max_ms, 3)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total_ms / max(1, self.count), 3),
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'max_ms': round(self.max_ms, 3)
+        }
+
+class AgentTaskExecutor:
+    """Priority-aware worker pool for agent tasks.
+    
+    Workers block on a condition variable and take the highest-priority
+    ready task (FIFO within a priority). An agent already running its
+    concurrency limit has further tasks parked in a per-agent heap, which
+    feeds the ready heap as its slots free up, so one busy agent never
+    holds up the others. In "process" mode the worker threads dispatch to
+    a process pool, so the handler must be picklable.
+    """
+    
+    def __init__(self, handler: Callable[[AgentTask], Any] = run_agent_task, max_workers: int = 8,
+                 mode: str = "thread", agent_limits: Optional[Dict[str, int]] = None,
+                 default_agent_limit: int = DEFAULT_AGENT_CONCURRENCY, max_completed: int = 10000,
+                 logger: Optional[logging.Logger] = None,
+                 on_complete: Optional[Callable[[AgentTask, AgentResult], None]] = None):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown worker mode: {mode}")
+        
+        self.handler = handler
+        self.max_workers = max_workers
+        self.mode = mode
+        self.agent_limits = agent_limits or {}
+        self.default_agent_limit = default_agent_limit
+        self.max_completed = max_completed
+        self.logger = logger
+        self.on_complete = on_complete
+        
+        self._cond = threading.Condition()
+        self._ready = []                          # heap of (-priority, seq, submitted, task)
+        self._parked = defaultdict(list)          # agent -> heap of tasks waiting for a slot
+        self._running = defaultdict(int)
+        self._seq = itertools.count()
+        self._pending = 0                         # submitted tasks not yet finished
+        self._queued = 0                          # submitted tasks not yet started
+        self._stopping = False
+        self._threads: List[threading.Thread] = []
+        self._process_pool = None
+        
+        self.active_tasks: Dict[str, AgentTask] = {}
+        self.completed_tasks: "OrderedDict[str, AgentResult]" = OrderedDict()
+        self.total_tasks_processed = 0
+        self.successful_tasks = 0
+        self.failed_tasks = 0
+        self.queue_wait = defaultdict(LatencyHistogram)   # agent -> time from submit to start
+        self.execution = defaultdict(LatencyHistogram)    # agent -> handler run time
+    
+    def start(self):
+        with self._cond:
+            if self._threads:
+                return
+            self._stopping = False
+            if self.mode == "process":
+                self._process_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            self._threads = [
+                threading.Thread(target=self._worker, name=f"sincor-orchestrator-{i}", daemon=True)
+                for i in range(self.max_workers)
+            ]
+        for thread in self._threads:
+            thread.start()
+    
+    def shutdown(self, wait: bool = True):
+        """Stop workers once the queue drains (wait=True) or as soon as possible."""
+        with self._cond:
+            self._stopping = True
+            if not wait:
+                self._ready.clear()
+                self._parked.clear()
+                self._queued = 0
+                self._pending = sum(self._running.values())
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait)
+            self._process_pool = None
+    
+    def limit_for(self, agent_name: str) -> int:
+        return self.agent_limits.get(agent_name, self.default_agent_limit)
+    
+    def submit(self, task: AgentTask):
+        with self._cond:
+            heapq.heappush(self._ready, (-task.priority, next(self._seq), time.perf_counter(), task))
+            self._pending += 1
+            self._queued += 1
+            self._cond.notify()
+    
+    def submit_many(self, tasks: List[AgentTask]):
+        with self._cond:
+            submitted = time.perf_counter()
+            for task in tasks:
+                heapq.heappush(self._ready, (-task.priority, next(self._seq), submitted, task))
+            self._pending += len(tasks)
+            self._queued += len(tasks)
+            self._cond.notify(len(tasks))
+    
+    def _take(self):
+        with self._cond:
+            while True:
+                while self._ready:
+                    entry = heapq.heappop(self._ready)
+                    agent = entry[3].agent_name
+                    if self._running[agent] < self.limit_for(agent):
+                        self._running[agent] += 1
+                        self._queued -= 1
+                        self.active_tasks[entry[3].task_id] = entry[3]
+                        return entry
+                    heapq.heappush(self._parked[agent], entry)
+                if self._stopping:
+                    return None
+                self._cond.wait()
+    
+    def _worker(self):
+        while True:
+            entry = self._take()
+            if entry is None:
+                return
+            _, _, submitted, task = entry
+            self._execute(task, time.perf_counter() - submitted, release_slot=True)
+    
+    def _call_handler(self, task: AgentTask) -> Any:
+        if self._process_pool is not None:
+            return self._process_pool.submit(self.handler, task).result()
+        return self.handler(task)
+    
+    def _execute(self, task: AgentTask, waited: float, release_slot: bool) -> AgentResult:
+        start = time.perf_counter()
+        try:
+            result = AgentResult(task_id=task.task_id, agent_name=task.agent_name, success=True,
+                                 result=self._call_handler(task))
+        except Exception as e:
+            result = AgentResult(task_id=task.task_id, agent_name=task.agent_name, success=False,
+                                 result=None, error=str(e))
+        result.execution_time = time.perf_counter() - start
+        
+        with self._cond:
+            if release_slot:
+                agent = task.agent_name
+                self._running[agent] -= 1
+                self._pending -= 1
+                if self._parked[agent]:
+                    heapq.heappush(self._ready, heapq.heappop(self._parked[agent]))
+                    self._cond.notify()
+                if not self._pending:
+                    self._cond.notify_all()
+            self.active_tasks.pop(task.task_id, None)
+            
+            self.completed_tasks[task.task_id] = result
+            while len(self.completed_tasks) > self.max_completed:
+                self.completed_tasks.popitem(last=False)
+            
+            self.total_tasks_processed += 1
+            if result.success:
+                self.successful_tasks += 1
+            else:
+                self.failed_tasks += 1
+            self.queue_wait[task.agent_name].record(waited)
+            self.execution[task.agent_name].record(result.execution_time)
+        
+        if self.logger:
+            if result.success:
+                self.logger.info(f"Task {task.task_id} completed successfully")
+            else:
+                self.logger.error(f"Task {task.task_id} failed: {result.error}")
+        if self.on_complete:
+            try:
+                self.on_complete(task, result)
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"Completion callback failed for {task.task_id}: {e}")
+        return result
+    
+    def execute(self, task: AgentTask) -> AgentResult:
+        """Run a task in the calling thread, outside the queue and agent limits."""
+        with self._cond:
+            self.active_tasks[task.task_id] = task
+        return self._execute(task, 0.0, release_slot=False)
+    
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until every submitted task has finished."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending == 0, timeout)
+    
+    def get_result(self, task_id: str) -> Optional[AgentResult]:
+        with self._cond:
+            return self.completed_tasks.get(task_id)
+    
+    def queued_count(self) -> int:
+        with self._cond:
+            return self._queued
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            overall_execution, overall_wait = LatencyHistogram(), LatencyHistogram()
+            for source, target in ((self.execution, overall_execution), (self.queue_wait, overall_wait)):
+                for histogram in source.values():
+                    target.count += histogram.count
+                    target.total_ms += histogram.total_ms
+                    target.max_ms = max(target.max_ms, histogram.max_ms)
+                    target.counts = [a + b for a, b in zip(target.counts, histogram.counts)]
+            return {
+                'mode': self.mode,
+                'workers': self.max_workers,
+                'queued': self._queued,
+                'active': len(self.active_tasks),
+                'retained_results': len(self.completed_tasks),
+                'processed': self.total_tasks_processed,
+                'successful': self.successful_tasks,
+                'failed': self.failed_tasks,
+                'execution': overall_execution.to_dict(),
+                'queue_wait': overall_wait.to_dict(),
+                'per_agent': {
+                    agent: {'running': self._running[agent], 'limit': self.limit_for(agent),
+                            'execution': self.execution[agent].to_dict(),
+                            'queue_wait': self.queue_wait[agent].to_dict()}
+                    for agent in self.execution
+                }
+            }
+
+class WorkflowRun:
+    """One running instance of a workflow: a DAG of steps keyed by step name.
+    
+    Steps become ready once all their dependencies succeed; their payload
+    carries upstream outputs. A failed step skips everything downstream.
+    Timings use perf_counter offsets from the start of the run.
+    """
+    
+    TERMINAL = ('succeeded', 'failed', 'skipped')
+    
+    def __init__(self, workflow_id: str, workflow_name: str, steps: List[Dict[str, Any]],
+                 context: Dict[str, Any]):
+        self.workflow_id = workflow_id
+        self.workflow_name = workflow_name
+        self.context = context
+        self.steps = {step['task']: step for step in steps}
+        self.order = self.topological_order(steps)
+        
+        self.dependents = defaultdict(list)
+        self.waiting_on = {}
+        for name, step in self.steps.items():
+            dependencies = set(step.get('dependencies', []))
+            self.waiting_on[name] = len(dependencies)
+            for dependency in dependencies:
+                self.dependents[dependency].append(name)
+        
+        self.step_status = {name: 'pending' for name in self.steps}
+        self.outputs: Dict[str, Any] = {}
+        self.errors: Dict[str, str] = {}
+        self.timings: Dict[str, Dict[str, float]] = {name: {} for name in self.steps}
+        self.task_steps: Dict[str, str] = {}
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+    
+    @staticmethod
+    def topological_order(steps: List[Dict[str, Any]]) -> List[str]:
+        """Kahn's algorithm; raises ValueError on unknown dependencies or cycles."""
+        names = [step['task'] for step in steps]
+        if len(set(names)) != len(names):
+            raise ValueError("Workflow step names must be unique")
+        
+        indegree = {name: 0 for name in names}
+        children = defaultdict(list)
+        for step in steps:
+            for dependency in set(step.get('dependencies', [])):
+                if dependency not in indegree:
+                    raise ValueError(f"Step {step['task']} depends on unknown step {dependency}")
+                indegree[step['task']] += 1
+                children[dependency].append(step['task'])
+        
+        order = []
+        ready = deque(name for name in names if indegree[name] == 0)
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for child in children[name]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+        if len(order) != len(names):
+            raise ValueError("Workflow dependencies contain a cycle")
+        return order
+    
+    @property
+    def status(self) -> str:
+        if self.finished_at is None:
+            return 'running'
+        return 'failed' if self.errors else 'succeeded'
+    
+    def start(self) -> List[str]:
+        return self._mark_ready([name for name in self.order if self.waiting_on[name] == 0])
+    
+    def _mark_ready(self, names: List[str]) -> List[str]:
+        now = time.perf_counter() - self.started_at
+        for name in names:
+            self.step_status[name] = 'ready'
+            self.timings[name]['ready'] = now
+        return names
+    
+    def step_payload(self, name: str) -> Dict[str, Any]:
+        return {
+            'workflow_id': self.workflow_id,
+            'context': self.context,
+            'step': name,
+            'upstream': {dependency: self.outputs[dependency]
+                         for dependency in self.steps[name].get('dependencies', [])}
+        }
+    
+    def complete_step(self, name: str, result: AgentResult) -> List[str]:
+        """Record a finished step; returns steps that just became ready."""
+        timing = self.timings[name]
+        timing['finished'] = time.perf_counter() - self.started_at
+        timing['execution'] = result.execution_time
+        
+        newly_ready = []
+        if result.success:
+            self.step_status[name] = 'succeeded'
+            self.outputs[name] = result.result
+            for child in self.dependents[name]:
+                self.waiting_on[child] -= 1
+                if self.waiting_on[child] == 0 and self.step_status[child] == 'pending':
+                    newly_ready.append(child)
+        else:
+            self.step_status[name] = 'failed'
+            self.errors[name] = result.error
+            self._skip_downstream(name)
+        
+        if all(status in self.TERMINAL for status in self.step_status.values()):
+            self.finished_at = time.perf_counter()
+        return self._mark_ready(newly_ready)
+    
+    def _skip_downstream(self, name: str):
+        pending = list(self.dependents[name])
+        while pending:
+            child = pending.pop()
+            if self.step_status[child] == 'pending':
+                self.step_status[child] = 'skipped'
+                pending.extend(self.dependents[child])
+    
+    def report(self) -> Dict[str, Any]:
+        """Per-step timings plus the critical path through measured execution times."""
+        path_ms, previous = {}, {}
+        for name in self.order:
+            dependencies = self.steps[name].get('dependencies', [])
+            longest = max(dependencies, key=lambda dependency: path_ms[dependency], default=None)
+            previous[name] = longest
+            path_ms[name] = self.timings[name].get('execution', 0.0) * 1000 + (path_ms[longest] if longest else 0.0)
+        
+        critical_path = []
+        node = max(self.order, key=lambda name: path_ms[name]) if self.order else None
+        while node:
+            critical_path.append(node)
+            node = previous[node]
+        critical_path.reverse()
+        
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        wall_ms = (end - self.started_at) * 1000
+        critical_ms = max(path_ms.values(), default=0.0)
+        
+        steps = {}
+        for name in self.order:
+            timing = self.timings[name]
+            execution_ms = timing.get('execution', 0.0) * 1000
+            step_report = {'agent': self.steps[name]['agent'], 'status': self.step_status[name],
+                           'execution_ms': round(execution_ms, 3)}
+            if 'ready' in timing:
+                step_report['ready_at_ms'] = round(timing['ready'] * 1000, 3)
+            if 'finished' in timing:
+                step_report['finished_at_ms'] = round(timing['finished'] * 1000, 3)
+                step_report['queue_wait_ms'] = round((timing['finished'] - timing['ready']) * 1000 - execution_ms, 3)
+            steps[name] = step_report
+        
+        return {
+            'workflow_id': self.workflow_id,
+            'workflow': self.workflow_name,
+            'status': self.status,
+            'wall_ms': round(wall_ms, 3),
+            'critical_path_ms': round(critical_ms, 3),
+            'critical_path': critical_path,
+            'scheduling_overhead_ms': round(wall_ms - critical_ms, 3),
+            'steps': steps,
+            'errors': dict(self.errors)
+        }
+
 class MasterOrchestrator:
     """Master orchestrator for all SINCOR agent systems."""
     
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None, worker_mode: Optional[str] = None,
+                 max_completed: int = 10000, max_workflow_runs: int = 1000):
         self.root_path = Path(__file__).parent
         self.agents = {}
         self.agent_status = {}
-        self.task_queue = deque()
-        self.active_tasks = {}
-        self.completed_tasks = {}
         self.agent_workflows = {}
+        self._task_counter = itertools.count()
+        
+        # Workflow DAG runs (finished runs beyond max_workflow_runs are evicted)
+        self.workflow_runs: "OrderedDict[str, WorkflowRun]" = OrderedDict()
+        self.max_workflow_runs = max_workflow_runs
+        self._workflow_tasks: Dict[str, str] = {}
+        self._workflow_counter = itertools.count()
+        self._workflow_cond = threading.Condition()
         
         # Coordination metrics
         self.coordination_score = 0
-        self.total_tasks_processed = 0
-        self.successful_tasks = 0
-        self.failed_tasks = 0
         
-        # Agent registry with their capabilities
+        # Agent registry with their capabilities; optional 'max_concurrency'
+        # caps parallel tasks per agent (default DEFAULT_AGENT_CONCURRENCY)
         self.agent_registry = {
             # DAE Business Agents
             'board_agent': {'capabilities': ['governance', 'strategy', 'oversight'], 'module': 'dae_agents.board_agent'},
@@ -118,10 +559,10 @@ class MasterOrchestrator:
             'content_gen_agent': {'capabilities': ['content_creation', 'copywriting', 'seo'], 'module': 'agents.marketing.content_gen_agent'},
             'campaign_automation_agent': {'capabilities': ['campaign_automation', 'email_marketing', 'scheduling'], 'module': 'agents.marketing.campaign_automation_agent'},
             'profile_sync_agent': {'capabilities': ['profile_management', 'social_media', 'synchronization'], 'module': 'agents.marketing.profile_sync_agent'},
-            'stem_clip_agent': {'capabilities': ['video_editing', 'content_clipping', 'media_processing'], 'module': 'agents.marketing.stem_clip_agent'},
+            'stem_clip_agent': {'capabilities': ['video_editing', 'content_clipping', 'media_processing'], 'module': 'agents.marketing.stem_clip_agent', 'max_concurrency': 1},
             
             # Intelligence & Business Agents  
-            'business_intel_agent': {'capabilities': ['business_discovery', 'market_research', 'lead_generation'], 'module': 'agents.intelligence.business_intel_agent'},
+            'business_intel_agent': {'capabilities': ['business_discovery', 'market_research', 'lead_generation'], 'module': 'agents.intelligence.business_intel_agent', 'max_concurrency': 8},
             'industry_expansion_agent': {'capabilities': ['market_expansion', 'industry_analysis', 'growth_opportunities'], 'module': 'agents.intelligence.industry_expansion_agent'},
             'template_engine': {'capabilities': ['template_generation', 'content_templates', 'automation'], 'module': 'agents.intelligence.template_engine'},
             
@@ -140,13 +581,46 @@ class MasterOrchestrator:
         # Initialize logging
         self.setup_logging()
         
+        # Priority worker pool for task processing
+        self.executor = AgentTaskExecutor(
+            max_workers=max_workers or int(os.getenv("SINCOR_ORCHESTRATOR_WORKERS", "8")),
+            mode=worker_mode or os.getenv("SINCOR_ORCHESTRATOR_MODE", "thread"),
+            agent_limits={name: config['max_concurrency'] for name, config in self.agent_registry.items()
+                          if 'max_concurrency' in config},
+            max_completed=max_completed,
+            logger=self.logger,
+            on_complete=self._on_task_complete
+        )
+        
         # Agent coordination workflows
         self.setup_workflows()
     
+    # Task state lives in the executor; these views keep the old attribute names
+    
+    @property
+    def active_tasks(self) -> Dict[str, AgentTask]:
+        return self.executor.active_tasks
+    
+    @property
+    def completed_tasks(self) -> Dict[str, AgentResult]:
+        return self.executor.completed_tasks
+    
+    @property
+    def total_tasks_processed(self) -> int:
+        return self.executor.total_tasks_processed
+    
+    @property
+    def successful_tasks(self) -> int:
+        return self.executor.successful_tasks
+    
+    @property
+    def failed_tasks(self) -> int:
+        return self.executor.failed_tasks
+    
     def setup_logging(self):
         """Set up comprehensive logging system."""
         log_dir = self.root_path / "logs" / "orchestrator"
-        log_dir.mkdir(exist_ok=True)
+        log_dir.mkdir(parents=True, exist_ok=True)
         
         logging.basicConfig(
             level=logging.INFO,
@@ -195,6 +669,17 @@ class MasterOrchestrator:
                 ]
             },
             
+            # Market Expansion Workflow (research and entry planning run in parallel)
+            'market_expansion_workflow': {
+                'agents': ['industry_expansion_agent', 'business_intel_agent', 'strategy_agent', 'marketing_agent'],
+                'steps': [
+                    {'agent': 'industry_expansion_agent', 'task': 'analyze_industry', 'dependencies': []},
+                    {'agent': 'business_intel_agent', 'task': 'discover_businesses', 'dependencies': ['analyze_industry']},
+                    {'agent': 'strategy_agent', 'task': 'plan_market_entry', 'dependencies': ['analyze_industry']},
+                    {'agent': 'marketing_agent', 'task': 'launch_campaign', 'dependencies': ['discover_businesses', 'plan_market_entry']}
+                ]
+            },
+            
             # Compliance & Legal Workflow
             'compliance_workflow': {
                 'agents': ['aml_agent', 'kyc_agent', 'legal_agent', 'sec_watchdog'],
@@ -262,10 +747,13 @@ class MasterOrchestrator:
         self.agent_status = available_agents
         return available_agents
     
+    def _new_task_id(self, agent_name: str, task_type: str) -> str:
+        return f"{agent_name}_{task_type}_{int(time.time())}_{next(self._task_counter)}"
+    
     def submit_task(self, agent_name: str, task_type: str, payload: Dict[str, Any], 
                    priority: int = 5, dependencies: List[str] = None) -> str:
         """Submit a task to the orchestration queue."""
-        task_id = f"{agent_name}_{task_type}_{int(time.time())}_{len(self.task_queue)}"
+        task_id = self._new_task_id(agent_name, task_type)
         
         task = AgentTask(
             task_id=task_id,
@@ -276,35 +764,92 @@ class MasterOrchestrator:
             dependencies=dependencies or []
         )
         
-        self.task_queue.append(task)
+        self.executor.submit(task)
         self.logger.info(f"Task submitted: {task_id} for {agent_name}")
         
         return task_id
     
     def execute_workflow(self, workflow_name: str, context: Dict[str, Any] = None) -> str:
-        """Execute a predefined agent workflow."""
+        """Execute a predefined agent workflow as a dependency DAG.
+        
+        Steps without dependencies start immediately; each later step is
+        queued as soon as all of its dependencies succeed, with their outputs
+        in payload['upstream']. Independent branches run in parallel.
+        """
         if workflow_name not in self.agent_workflows:
             raise ValueError(f"Unknown workflow: {workflow_name}")
         
         workflow = self.agent_workflows[workflow_name]
-        workflow_id = f"workflow_{workflow_name}_{int(time.time())}"
-        context = context or {}
+        workflow_id = f"workflow_{workflow_name}_{int(time.time())}_{next(self._workflow_counter)}"
+        run = WorkflowRun(workflow_id, workflow_name, workflow['steps'], context or {})
         
         self.logger.info(f"Starting workflow: {workflow_name} (ID: {workflow_id})")
         
-        # Submit all workflow tasks with proper dependencies
-        task_ids = []
-        for step in workflow['steps']:
-            task_id = self.submit_task(
-                agent_name=step['agent'],
-                task_type=step['task'],
-                payload={'workflow_id': workflow_id, 'context': context},
-                dependencies=step.get('dependencies', [])
-            )
-            task_ids.append(task_id)
+        with self._workflow_cond:
+            self.workflow_runs[workflow_id] = run
+            self._evict_finished_runs()
+            ready = run.start()
+        self._submit_workflow_steps(run, ready)
         
         return workflow_id
     
+    def _submit_workflow_steps(self, run: WorkflowRun, step_names: List[str]):
+        tasks = []
+        with self._workflow_cond:
+            for name in step_names:
+                step = run.steps[name]
+                task = AgentTask(
+                    task_id=self._new_task_id(step['agent'], name),
+                    agent_name=step['agent'],
+                    task_type=name,
+                    payload=run.step_payload(name),
+                    priority=step.get('priority', 5),
+                    dependencies=step.get('dependencies', [])
+                )
+                run.task_steps[task.task_id] = name
+                self._workflow_tasks[task.task_id] = run.workflow_id
+                tasks.append(task)
+        self.executor.submit_many(tasks)
+    
+    def _on_task_complete(self, task: AgentTask, result: AgentResult):
+        """Executor callback: advance the workflow this task belongs to."""
+        with self._workflow_cond:
+            workflow_id = self._workflow_tasks.pop(task.task_id, None)
+            run = self.workflow_runs.get(workflow_id) if workflow_id else None
+            if run is None:
+                return
+            ready = run.complete_step(run.task_steps[task.task_id], result)
+            if run.finished_at is not None:
+                self._workflow_cond.notify_all()
+        
+        if run.finished_at is not None:
+            report = run.report()
+            self.logger.info(f"Workflow {run.workflow_id} {report['status']} in {report['wall_ms']:.0f} ms "
+                             f"(critical path {report['critical_path_ms']:.0f} ms)")
+        elif ready:
+            self._submit_workflow_steps(run, ready)
+    
+    def _evict_finished_runs(self):
+        excess = len(self.workflow_runs) - self.max_workflow_runs
+        for workflow_id in [wid for wid, run in self.workflow_runs.items() if run.finished_at is not None][:max(0, excess)]:
+            del self.workflow_runs[workflow_id]
+    
+    def wait_for_workflow(self, workflow_id: str, timeout: Optional[float] = None) -> bool:
+        """Block until the workflow finishes; False on timeout."""
+        with self._workflow_cond:
+            run = self.workflow_runs.get(workflow_id)
+            if run is None:
+                raise ValueError(f"Unknown workflow run: {workflow_id}")
+            return self._workflow_cond.wait_for(lambda: run.finished_at is not None, timeout)
+    
+    def get_workflow_report(self, workflow_id: str) -> Dict[str, Any]:
+        """Status, per-step timings and critical path of a workflow run."""
+        with self._workflow_cond:
+            run = self.workflow_runs.get(workflow_id)
+            if run is None:
+                raise ValueError(f"Unknown workflow run: {workflow_id}")
+            return run.report()
+    
     def get_system_status(self) -> Dict[str, Any]:
         """Get comprehensive system status."""
         available_agents = list(self.agent_status.keys())
@@ -312,6 +857,7 @@ class MasterOrchestrator:
                         if status.get('status') == AgentStatus.READY]
         
         coordination_score = self.calculate_coordination_score()
+        executor_stats = self.executor.get_stats()
         
         return {
             'timestamp': datetime.now().isoformat(),
@@ -319,9 +865,11 @@ class MasterOrchestrator:
             'active_agents': len(active_agents),
             'available_agents': available_agents,
             'active_agents_list': active_agents,
-            'queued_tasks': len(self.task_queue),
-            'active_tasks': len(self.active_tasks),
-            'completed_tasks': len(self.completed_tasks),
+            'queued_tasks': executor_stats['queued'],
+            'active_tasks': executor_stats['active'],
+            'completed_tasks': executor_stats['processed'],
+            'task_latency': {'execution': executor_stats['execution'], 'queue_wait': executor_stats['queue_wait']},
+            'running_workflows': sum(1 for run in list(self.workflow_runs.values()) if run.finished_at is None),
             'coordination_score': coordination_score,
             'success_rate': (self.successful_tasks / max(1, self.total_tasks_processed)) * 100,
             'agent_capabilities': {name: status.get('capabilities', []) 
@@ -371,9 +919,8 @@ class MasterOrchestrator:
         self.logger.info(f"Available agents: {status['active_agents']} active")
         self.logger.info(f"Coordination score: {status['coordination_score']:.1f}/100")
         
-        # Start background task processor
-        processor_thread = threading.Thread(target=self.task_processor_loop, daemon=True)
-        processor_thread.start()
+        # Start the task worker pool
+        self.executor.start()
         
         # Start monitoring thread  
         monitor_thread = threading.Thread(target=self.monitoring_loop, daemon=True)
@@ -382,72 +929,18 @@ class MasterOrchestrator:
         self.logger.info("Master Orchestrator is now running...")
         return status
     
-    def task_processor_loop(self):
-        """Background task processing loop."""
-        while True:
-            try:
-                if self.task_queue:
-                    task = self.task_queue.popleft()
-                    self.process_task(task)
-                else:
-                    time.sleep(1)  # Sleep when no tasks
-            except Exception as e:
-                self.logger.error(f"Task processor error: {e}")
-                time.sleep(5)
+    def process_task(self, task: AgentTask) -> AgentResult:
+        """Process an individual agent task synchronously, bypassing the queue."""
+        self.logger.info(f"Processing task {task.task_id} for {task.agent_name}")
+        return self.executor.execute(task)
     
-    def process_task(self, task: AgentTask):
-        """Process an individual agent task."""
-        start_time = time.time()
-        
-        try:
-            # Simulate task processing (replace with actual agent execution)
-            self.logger.info(f"Processing task {task.task_id} for {task.agent_name}")
-            
-            # Mark task as active
-            self.active_tasks[task.task_id] = task
-            
-            # Simulate work (replace with actual agent call)
-            time.sleep(0.1)  # Simulate processing time
-            
-            # Create successful result
-            result = AgentResult(
-                task_id=task.task_id,
-                agent_name=task.agent_name,
-                success=True,
-                result={'status': 'completed', 'task_type': task.task_type},
-                execution_time=time.time() - start_time
-            )
-            
-            # Move to completed
-            self.completed_tasks[task.task_id] = result
-            del self.active_tasks[task.task_id]
-            
-            # Update metrics
-            self.total_tasks_processed += 1
-            self.successful_tasks += 1
-            
-            self.logger.info(f"Task {task.task_id} completed successfully")
-            
-        except Exception as e:
-            # Handle task failure
-            result = AgentResult(
-                task_id=task.task_id,
-                agent_name=task.agent_name,
-                success=False,
-                result=None,
-                error=str(e),
-                execution_time=time.time() - start_time
-            )
-            
-            self.completed_tasks[task.task_id] = result
-            if task.task_id in self.active_tasks:
-                del self.active_tasks[task.task_id]
-            
-            # Update metrics
-            self.total_tasks_processed += 1
-            self.failed_tasks += 1
-            
-            self.logger.error(f"Task {task.task_id} failed: {e}")
+    def get_task_result(self, task_id: str) -> Optional[AgentResult]:
+        """Result of a recently completed task (oldest results are evicted)."""
+        return self.executor.get_result(task_id)
+    
+    def stop_orchestration(self, wait: bool = True):
+        """Stop the worker pool, finishing queued tasks first when wait is True."""
+        self.executor.shutdown(wait=wait)
     
     def monitoring_loop(self):
         """Background monitoring and health check loop."""
@@ -503,6 +996,10 @@ def main():
             'location': 'local_market'
         })
         print(f"Workflow started: {workflow_id}")
+        if orchestrator.wait_for_workflow(workflow_id, timeout=30):
+            report = orchestrator.get_workflow_report(workflow_id)
+            print(f"Workflow {report['status']} in {report['wall_ms']:.0f} ms "
+                  f"(critical path {' -> '.join(report['critical_path'])}: {report['critical_path_ms']:.0f} ms)")
         print()
         print("Master Orchestrator is running. Press Ctrl+C to stop.")
         
@@ -9,17 +9,38 @@ Implements personality you can sculpt:
 - Archetype anchoring with constitutional constraints
 - Interaction sculpting through feedback loops
 - Continuity tracking to prevent persona drift
+- Batched feedback sculpting with coalesced persona writes
 """
 
+import atexit
 import json
 import numpy as np
 import os
+import time
+import weakref
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 import yaml
 import math
 
+# Trait order of the persona vector (see PersonaEngine._persona_to_vector)
+TRAIT_FIELDS = (
+    "openness", "conscientiousness", "extraversion", "agreeableness", "neuroticism",
+    "risk_tolerance", "humor_level", "directness",
+    "code_preference", "table_preference", "story_preference"
+)
+TRAIT_INDEX = {trait: i for i, trait in enumerate(TRAIT_FIELDS)}
+
+# Engines holding coalesced writes, flushed at interpreter exit
+_engines_with_pending_writes = weakref.WeakSet()
+
+def _flush_pending_writes():
+    for engine in list(_engines_with_pending_writes):
+        engine.flush()
+
+atexit.register(_flush_pending_writes)
+
 @dataclass
 class PersonaVector:
     """Complete personality vector for an agent"""
@@ -68,7 +89,8 @@ class ConstitutionalRule:
 class PersonaEngine:
     """Manages agent personalities with sculpting and continuity tracking"""
     
-    def __init__(self, agent_id: str, archetype: str, persona_dir: str = "personas"):
+    def __init__(self, agent_id: str, archetype: str, persona_dir: str = "personas",
+                 write_interval: float = 1.0):
         self.agent_id = agent_id
         self.archetype = archetype
         self.persona_dir = persona_dir
@@ -79,6 +101,16 @@ class PersonaEngine:
         self.feedback_log = f"{persona_dir}/{agent_id}_feedback.jsonl"
         self.checkpoint_history = f"{persona_dir}/{agent_id}_checkpoints.json"
         
+        # Write coalescing: persona and feedback are written at most once per interval
+        self.write_interval = write_interval
+        self._pending_feedback: List[str] = []
+        self._persona_dirty = False
+        self._last_write = float("-inf")
+        
+        # In-memory checkpoint history and cached continuity reference vectors
+        self._checkpoints: Optional[List[Dict[str, Any]]] = None
+        self._reference_cache: Dict[int, Tuple[Optional[np.ndarray], Optional[str]]] = {}
+        
         # Load or initialize persona
         self.current_persona = self._load_or_create_persona()
         self.constitution = self._load_constitution()
@@ -234,66 +266,108 @@ class PersonaEngine:
     def record_interaction_feedback(self, feedback: InteractionFeedback):
         """Record feedback from an interaction"""
         
-        # Append to feedback log
-        with open(self.feedback_log, 'a') as f:
-            f.write(json.dumps(asdict(feedback)) + '\n')
+        self.record_feedback_batch([feedback])
+    
+    def record_feedback_batch(self, feedbacks: List[InteractionFeedback]) -> float:
+        """Record many feedback events with one sculpting update; returns the continuity index"""
+        
+        if not feedbacks:
+            return self.calculate_continuity_index()
         
-        # Apply sculpting
-        self._apply_sculpting(feedback)
+        # Buffer feedback log lines (written with the persona on the debounce interval)
+        self._pending_feedback.extend(json.dumps(vars(feedback)) + '\n' for feedback in feedbacks)
+        
+        return self._apply_sculpting_batch(feedbacks)
     
     def _apply_sculpting(self, feedback: InteractionFeedback):
         """Apply feedback to sculpt personality (gradient descent)"""
         
-        # Extract feedback signals
-        is_helpful = "helpful" in feedback.feedback_labels
-        is_harmful = "harmful" in feedback.feedback_labels
-        is_unique = "unique" in feedback.feedback_labels
-        is_derivative = "derivative" in feedback.feedback_labels
-        
-        quality = feedback.quality_score
-        novelty = feedback.novelty_score
+        self._apply_sculpting_batch([feedback])
+    
+    def _feedback_updates(self, feedbacks: List[InteractionFeedback]) -> Dict[str, float]:
+        """Summed trait updates for a batch of feedback events.
+        
+        Per event, later rules override earlier ones for the same trait;
+        np.select lists the overriding rule first.
+        """
+        
+        n = len(feedbacks)
+        quality = np.fromiter((f.quality_score for f in feedbacks), float, n)
+        novelty = np.fromiter((f.novelty_score for f in feedbacks), float, n)
+        labels = [f.feedback_labels for f in feedbacks]
+        is_helpful = np.fromiter(("helpful" in l for l in labels), bool, n)
+        is_harmful = np.fromiter(("harmful" in l for l in labels), bool, n)
+        is_unique = np.fromiter(("unique" in l for l in labels), bool, n)
+        is_derivative = np.fromiter(("derivative" in l for l in labels), bool, n)
+        
+        reinforce = is_helpful & (quality > 0.7)        # Reinforce current traits
+        pull_back = is_harmful | (quality < 0.3)        # Pull back on risk-taking and assertiveness
+        encourage = is_unique & (novelty > 0.7)         # Encourage creativity and openness
+        refresh = is_derivative & (novelty < 0.3)       # Encourage more creativity
+        
+        rules = {
+            "directness": ([pull_back, reinforce], [-0.2, 0.5]),
+            "openness": ([refresh, encourage, reinforce & (novelty > 0.6)], [0.3, 0.4, 0.3]),
+            "risk_tolerance": ([refresh, encourage, pull_back], [0.1, 0.2, -0.4])
+        }
         
-        # Create update vector based on feedback
         updates = {}
+        for trait, (conditions, weights) in rules.items():
+            if np.logical_or.reduce(conditions).any():
+                updates[trait] = float(np.select(conditions, weights, 0.0).sum()) * self.learning_rate
+        return updates
+    
+    def _apply_sculpting_batch(self, feedbacks: List[InteractionFeedback]) -> float:
+        """Apply a batch of feedback as one update over the trait vector"""
+        
+        updates = self._feedback_updates(feedbacks)
         
-        if is_helpful and quality > 0.7:
-            # Reinforce current traits
-            updates["directness"] = self.learning_rate * 0.5
-            if novelty > 0.6:
-                updates["openness"] = self.learning_rate * 0.3
-                
-        if is_harmful or quality < 0.3:
-            # Pull back on risk-taking and assertiveness  
-            updates["risk_tolerance"] = -self.learning_rate * 0.4
-            updates["directness"] = -self.learning_rate * 0.2
-            
-        if is_unique and novelty > 0.7:
-            # Encourage creativity and openness
-            updates["openness"] = self.learning_rate * 0.4
-            updates["risk_tolerance"] = self.learning_rate * 0.2
-            
-        if is_derivative and novelty < 0.3:
-            # Encourage more creativity
-            updates["openness"] = self.learning_rate * 0.3
-            updates["risk_tolerance"] = self.learning_rate * 0.1
-            
         # Apply constitutional constraints (prevent drift from core values)
         constrained_updates = self._apply_constitutional_constraints(updates)
         
-        # Update persona
-        updated_persona = self._update_persona_traits(constrained_updates)
+        delta = np.zeros(len(TRAIT_FIELDS))
+        for trait, value in constrained_updates.items():
+            if trait in TRAIT_INDEX:
+                delta[TRAIT_INDEX[trait]] = value
         
-        # Save updated persona
-        updated_persona.last_updated = datetime.now().isoformat()
-        updated_persona.version += 1
-        self._save_persona(updated_persona)
+        # Clamp to valid range [0.0, 1.0]
+        traits = np.clip(self._persona_to_vector(self.current_persona) + delta, 0.0, 1.0)
         
-        self.current_persona = updated_persona
+        persona = self.current_persona
+        for trait, value in zip(TRAIT_FIELDS, traits.tolist()):
+            setattr(persona, trait, value)
+        persona.last_updated = datetime.now().isoformat()
+        persona.version += len(feedbacks)
+        self._schedule_write()
         
         # Check continuity
         continuity_idx = self.calculate_continuity_index()
         if continuity_idx < self.stability_threshold:
             self._trigger_continuity_recovery(continuity_idx)
+        return continuity_idx
+    
+    def _schedule_write(self):
+        """Mark the persona dirty and write it if the debounce interval has passed"""
+        
+        self._persona_dirty = True
+        _engines_with_pending_writes.add(self)
+        if time.monotonic() - self._last_write >= self.write_interval:
+            self.flush()
+    
+    def flush(self):
+        """Write the coalesced persona and buffered feedback log lines now"""
+        
+        if self._pending_feedback:
+            with open(self.feedback_log, 'a') as f:
+                f.write(''.join(self._pending_feedback))
+            self._pending_feedback.clear()
+        
+        if self._persona_dirty:
+            self._save_persona(self.current_persona)
+            self._persona_dirty = False
+        
+        self._last_write = time.monotonic()
+        _engines_with_pending_writes.discard(self)
     
     def _apply_constitutional_constraints(self, updates: Dict[str, float]) -> Dict[str, float]:
         """Apply constitutional constraints to prevent forbidden personality changes"""
@@ -315,48 +389,51 @@ class PersonaEngine:
         
         return constrained_updates
     
-    def _update_persona_traits(self, updates: Dict[str, float]) -> PersonaVector:
-        """Apply updates to persona traits with bounds checking"""
-        
-        updated = PersonaVector(**asdict(self.current_persona))
-        
-        for trait, delta in updates.items():
-            if hasattr(updated, trait):
-                current_value = getattr(updated, trait)
-                new_value = current_value + delta
-                
-                # Clamp to valid range [0.0, 1.0]
-                new_value = max(0.0, min(1.0, new_value))
-                setattr(updated, trait, new_value)
-        
-        return updated
-    
     def calculate_continuity_index(self, checkpoint_days: int = 7) -> float:
         """Calculate continuity index vs. stable checkpoint (CTP-v1 Acheron)"""
         
-        # Load checkpoint history
-        checkpoints = self._load_checkpoint_history()
-        
-        # Find checkpoint from N days ago
-        cutoff_date = (datetime.now() - timedelta(days=checkpoint_days)).isoformat()
-        
-        reference_persona = None
-        for checkpoint in reversed(checkpoints):
-            if checkpoint["timestamp"] < cutoff_date:
-                reference_persona = PersonaVector(**checkpoint["persona"])
-                break
+        reference_vector = self._reference_vector(checkpoint_days)
         
-        if not reference_persona:
+        if reference_vector is None:
             # No checkpoint found, use current as stable (high continuity)
             return 1.0
         
         # Calculate cosine similarity between persona vectors
         current_vector = self._persona_to_vector(self.current_persona)
-        reference_vector = self._persona_to_vector(reference_persona)
         
         continuity_index = self._cosine_similarity(current_vector, reference_vector)
         return continuity_index
     
+    def _reference_vector(self, checkpoint_days: int) -> Optional[np.ndarray]:
+        """Vector of the latest checkpoint older than N days, cached until that changes"""
+        
+        now = datetime.now()
+        cached = self._reference_cache.get(checkpoint_days)
+        if cached is not None and (cached[1] is None or now.isoformat() < cached[1]):
+            return cached[0]
+        
+        checkpoints = self._load_checkpoint_history()
+        
+        # Find checkpoint from N days ago
+        cutoff_date = (now - timedelta(days=checkpoint_days)).isoformat()
+        
+        reference_vector = None
+        next_index = 0
+        for index in range(len(checkpoints) - 1, -1, -1):
+            if checkpoints[index]["timestamp"] < cutoff_date:
+                reference_vector = self._persona_to_vector(PersonaVector(**checkpoints[index]["persona"]))
+                next_index = index + 1
+                break
+        
+        # The reference moves once the next newer checkpoint ages past the cutoff
+        expires = None
+        if next_index < len(checkpoints):
+            next_timestamp = datetime.fromisoformat(checkpoints[next_index]["timestamp"])
+            expires = (next_timestamp + timedelta(days=checkpoint_days)).isoformat()
+        
+        self._reference_cache[checkpoint_days] = (reference_vector, expires)
+        return reference_vector
+    
     def _persona_to_vector(self, persona: PersonaVector) -> np.ndarray:
         """Convert persona to numerical vector for similarity calculation"""
         
@@ -382,18 +459,29 @@ class PersonaEngine:
         return dot_product / (magnitude1 * magnitude2)
     
     def _load_checkpoint_history(self) -> List[Dict[str, Any]]:
-        """Load persona checkpoint history"""
+        """Load persona checkpoint history (read from disk once, then kept in memory)"""
+        
+        if self._checkpoints is None:
+            if os.path.exists(self.checkpoint_history):
+                with open(self.checkpoint_history, 'r') as f:
+                    self._checkpoints = json.load(f)
+            else:
+                self._checkpoints = []
+        return self._checkpoints
+    
+    def _save_checkpoint_history(self, checkpoints: List[Dict[str, Any]]):
+        """Save checkpoint history and invalidate cached reference vectors"""
         
-        if not os.path.exists(self.checkpoint_history):
-            return []
-            
-        with open(self.checkpoint_history, 'r') as f:
-            return json.load(f)
+        self._checkpoints = checkpoints
+        self._reference_cache.clear()
+        
+        with open(self.checkpoint_history, 'w') as f:
+            json.dump(checkpoints, f, indent=2)
     
     def create_checkpoint(self):
         """Create a stability checkpoint of current persona"""
         
-        checkpoints = self._load_checkpoint_history()
+        checkpoints = list(self._load_checkpoint_history())
         
         checkpoint = {
             "timestamp": datetime.now().isoformat(),
@@ -408,8 +496,7 @@ class PersonaEngine:
         if len(checkpoints) > 30:
             checkpoints = checkpoints[-30:]
             
-        with open(self.checkpoint_history, 'w') as f:
-            json.dump(checkpoints, f, indent=2)
+        self._save_checkpoint_history(checkpoints)
     
     def _trigger_continuity_recovery(self, current_idx: float):
         """Trigger recovery when continuity drops below threshold"""
@@ -417,7 +504,7 @@ class PersonaEngine:
         print(f"CONTINUITY ALERT: {self.agent_id} continuity index: {current_idx:.3f}")
         
         # Create emergency checkpoint
-        checkpoints = self._load_checkpoint_history()
+        checkpoints = list(self._load_checkpoint_history())
         checkpoint = {
             "timestamp": datetime.now().isoformat(),
             "persona": asdict(self.current_persona),
@@ -426,8 +513,7 @@ class PersonaEngine:
         }
         checkpoints.append(checkpoint)
         
-        with open(self.checkpoint_history, 'w') as f:
-            json.dump(checkpoints, f, indent=2)
+        self._save_checkpoint_history(checkpoints)
         
         # Option: Implement recovery strategies here
         # - Revert to last stable checkpoint
@@ -467,6 +553,7 @@ class PersonaEngine:
         
         import random
         
+        feedbacks = []
         for i in range(num_interactions):
             # Simulate realistic feedback
             quality = random.uniform(0.3, 0.9)
@@ -482,7 +569,7 @@ class PersonaEngine:
             if novelty < 0.3:
                 labels.append("derivative")
             
-            feedback = InteractionFeedback(
+            feedbacks.append(InteractionFeedback(
                 timestamp=datetime.now().isoformat(),
                 agent_id=self.agent_id,
                 interaction_type="chat",
@@ -490,12 +577,16 @@ class PersonaEngine:
                 quality_score=quality,
                 novelty_score=novelty,
                 context={"simulation": True, "iteration": i}
-            )
-            
-            self.record_interaction_feedback(feedback)
-            
-            if i % 3 == 0:  # Checkpoint every 3 interactions
-                self.create_checkpoint()
+            ))
+        
+        # Checkpoint every 3 interactions (after interactions 0, 3, 6, ...)
+        start = 0
+        for checkpoint_at in range(0, num_interactions, 3):
+            self.record_feedback_batch(feedbacks[start:checkpoint_at + 1])
+            self.create_checkpoint()
+            start = checkpoint_at + 1
+        self.record_feedback_batch(feedbacks[start:])
+        self.flush()
                 
         print(f"Final continuity index: {self.calculate_continuity_index():.3f}")
 
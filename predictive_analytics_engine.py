@@ -20,10 +20,12 @@ import numpy as np
 import math
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from enum import Enum
 import uuid
-from collections import deque, defaultdict
+import time
+import hashlib
+from collections import deque, defaultdict, OrderedDict
 
 from real_time_intelligence import IntelligenceDataPoint, IntelligenceSource
 
@@ -91,17 +93,137 @@ class TrendAnalysis:
     seasonality_detected: bool
     anomalies: List[Tuple[str, float, str]]  # (timestamp, value, reason)
 
+class PredictionCache:
+    """LRU + TTL cache of predictions with per-entity invalidation"""
+    
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (stored_at, expires_at, PredictionResult)
+        self._entity_index = defaultdict(set)  # target_entity -> cache keys
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    @staticmethod
+    def make_key(prediction_type: PredictionType, target_entity: str,
+                 time_horizon: TimeHorizon, context: Optional[Dict[str, Any]]) -> Tuple[str, str, str, str]:
+        """Build cache key from (type, entity, horizon, context hash)"""
+        
+        context_blob = json.dumps(context or {}, sort_keys=True, default=str)
+        context_hash = hashlib.sha1(context_blob.encode("utf-8")).hexdigest()[:16]
+        return (prediction_type.value, target_entity, time_horizon.value, context_hash)
+    
+    def get(self, key: Tuple[str, str, str, str]) -> Optional[PredictionResult]:
+        """Return cached prediction or None if missing/expired"""
+        
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        _, expires_at, prediction = entry
+        if time.monotonic() >= expires_at:
+            self._remove(key)
+            self.evictions += 1
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return prediction
+    
+    def put(self, key: Tuple[str, str, str, str], prediction: PredictionResult):
+        """Store prediction, evicting least recently used entries when full"""
+        
+        now = time.monotonic()
+        ttl = self.ttl_seconds
+        
+        # Never serve a prediction past its own expiry
+        try:
+            remaining = (datetime.fromisoformat(prediction.expires) - datetime.now()).total_seconds()
+            ttl = min(ttl, max(0.0, remaining))
+        except (TypeError, ValueError):
+            pass
+        
+        if key in self._entries:
+            self._remove(key)
+        
+        self._entries[key] = (now, now + ttl, prediction)
+        self._entity_index[key[1]].add(key)
+        
+        while len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+    
+    def invalidate_for_metrics(self, metric_keys: List[str]) -> int:
+        """Drop cached predictions whose entity reads any of the given metric keys"""
+        
+        # Prediction models select trend analyses with `target_entity in key`,
+        # so the same containment test identifies the dependent entries.
+        stale_entities = [entity for entity in self._entity_index
+                          if any(entity in metric_key for metric_key in metric_keys)]
+        
+        removed = 0
+        for entity in stale_entities:
+            for key in list(self._entity_index.get(entity, ())):
+                self._remove(key)
+                removed += 1
+        
+        self.invalidations += removed
+        return removed
+    
+    def clear(self):
+        """Drop every cached prediction"""
+        
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._entity_index.clear()
+    
+    def _remove(self, key: Tuple[str, str, str, str]):
+        self._entries.pop(key, None)
+        entity_keys = self._entity_index.get(key[1])
+        if entity_keys is not None:
+            entity_keys.discard(key)
+            if not entity_keys:
+                del self._entity_index[key[1]]
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss metrics"""
+        
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
 class PredictiveAnalyticsEngine:
     """Advanced predictive analytics using SINCOR intelligence"""
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 512, cache_ttl_seconds: float = 3600.0,
+                 history_size: int = 1000, accuracy_window: int = 100):
         self.engine_id = f"predict_{uuid.uuid4().hex[:8]}"
         
         # Historical data storage for model training
         self.historical_data = defaultdict(deque)  # entity -> historical points
         self.trend_analyses = {}  # entity -> TrendAnalysis
-        self.prediction_history = []
-        self.model_accuracy_scores = defaultdict(list)
+        
+        # Bounded ring buffers - oldest entries fall off automatically
+        self.prediction_history = deque(maxlen=history_size)
+        self.model_accuracy_scores = defaultdict(lambda: deque(maxlen=accuracy_window))
+        self.total_predictions = 0
         
         # Prediction models (simplified - in production would use ML models)
         self.prediction_models = {}
@@ -110,7 +232,7 @@ class PredictiveAnalyticsEngine:
         # Configuration
         self.min_data_points = 10  # Minimum points needed for prediction
         self.default_confidence_level = 0.90
-        self.prediction_cache = {}
+        self.prediction_cache = PredictionCache(max_entries=cache_size, ttl_seconds=cache_ttl_seconds)
         
         # Initialize prediction models
         self._initialize_prediction_models()
@@ -131,6 +253,8 @@ class PredictiveAnalyticsEngine:
     async def add_intelligence_data(self, data_points: List[IntelligenceDataPoint]):
         """Add real-time intelligence data for predictive modeling"""
         
+        updated_keys = set()
+        
         for data_point in data_points:
             # Extract relevant metrics for prediction
             metrics = self._extract_predictive_metrics(data_point)
@@ -142,13 +266,17 @@ class PredictiveAnalyticsEngine:
                 for metric_name, value in metric_values.items():
                     key = f"{entity}_{metric_name}"
                     self.historical_data[key].append((timestamp, value))
+                    updated_keys.add(key)
                     
                     # Limit historical data size
                     if len(self.historical_data[key]) > 1000:
                         self.historical_data[key].popleft()
         
-        # Update trend analyses
-        await self._update_trend_analyses()
+        # Update trend analyses for the touched metrics only
+        await self._update_trend_analyses(updated_keys)
+        
+        # Drop cached predictions that depend on the new data
+        self.prediction_cache.invalidate_for_metrics(list(updated_keys))
     
     def _extract_predictive_metrics(self, data_point: IntelligenceDataPoint) -> Dict[str, Dict[str, float]]:
         """Extract predictive metrics from intelligence data"""
@@ -202,10 +330,14 @@ class PredictiveAnalyticsEngine:
         
         return metrics
     
-    async def _update_trend_analyses(self):
-        """Update trend analyses for all entities with sufficient data"""
+    async def _update_trend_analyses(self, keys: Optional[set] = None):
+        """Update trend analyses for entities with sufficient data (all, or only `keys`)"""
         
-        for key, data_points in self.historical_data.items():
+        if keys is None:
+            keys = list(self.historical_data.keys())
+        
+        for key in keys:
+            data_points = self.historical_data.get(key, ())
             if len(data_points) >= self.min_data_points:
                 entity_metric = key
                 
@@ -332,13 +464,10 @@ class PredictiveAnalyticsEngine:
         print(f"[PREDICT] Generating {prediction_type.value} for {target_entity} ({time_horizon.value})")
         
         # Check cache first
-        cache_key = f"{prediction_type.value}_{target_entity}_{time_horizon.value}"
-        if cache_key in self.prediction_cache:
-            cached_prediction = self.prediction_cache[cache_key]
-            cache_age = (datetime.now() - datetime.fromisoformat(cached_prediction.created)).total_seconds() / 3600
-            
-            if cache_age < 1:  # Use cache for 1 hour
-                return cached_prediction
+        cache_key = PredictionCache.make_key(prediction_type, target_entity, time_horizon, additional_context)
+        cached_prediction = self.prediction_cache.get(cache_key)
+        if cached_prediction is not None:
+            return cached_prediction
         
         # Get prediction model
         prediction_model = self.prediction_models.get(prediction_type)
@@ -349,10 +478,11 @@ class PredictiveAnalyticsEngine:
         prediction_result = await prediction_model(target_entity, time_horizon, additional_context or {})
         
         # Cache result
-        self.prediction_cache[cache_key] = prediction_result
+        self.prediction_cache.put(cache_key, prediction_result)
         
         # Store in history
         self.prediction_history.append(prediction_result)
+        self.total_predictions += 1
         
         return prediction_result
     
@@ -775,9 +905,10 @@ class PredictiveAnalyticsEngine:
         for pred_type in prediction_types:
             base_pred = base_predictions[pred_type]
             optimistic_pred = await self.generate_prediction(pred_type, target_entity, time_horizon, optimistic_context)
-            # Adjust to upper confidence bound
-            optimistic_pred.point_prediction = base_pred.confidence_interval.upper_bound
-            optimistic_predictions[pred_type] = optimistic_pred
+            # Adjust to upper confidence bound (copy so the cached prediction stays intact)
+            optimistic_predictions[pred_type] = replace(
+                optimistic_pred, point_prediction=base_pred.confidence_interval.upper_bound
+            )
         
         # Create pessimistic scenario (lower confidence bounds)
         pessimistic_context = {"scenario": "pessimistic"}
@@ -785,9 +916,10 @@ class PredictiveAnalyticsEngine:
         for pred_type in prediction_types:
             base_pred = base_predictions[pred_type]
             pessimistic_pred = await self.generate_prediction(pred_type, target_entity, time_horizon, pessimistic_context)
-            # Adjust to lower confidence bound
-            pessimistic_pred.point_prediction = base_pred.confidence_interval.lower_bound
-            pessimistic_predictions[pred_type] = pessimistic_pred
+            # Adjust to lower confidence bound (copy so the cached prediction stays intact)
+            pessimistic_predictions[pred_type] = replace(
+                pessimistic_pred, point_prediction=base_pred.confidence_interval.lower_bound
+            )
         
         # Calculate scenario probabilities
         scenario_probabilities = {
@@ -843,14 +975,9 @@ class PredictiveAnalyticsEngine:
         prediction_error = abs(prediction.point_prediction - actual_outcome)
         accuracy = max(0, 1 - prediction_error)  # Simple accuracy metric
         
-        # Update model accuracy scores
+        # Update model accuracy scores (ring buffer keeps only recent scores)
         self.model_accuracy_scores[prediction.prediction_type].append(accuracy)
         
-        # Keep only recent scores
-        if len(self.model_accuracy_scores[prediction.prediction_type]) > 100:
-            self.model_accuracy_scores[prediction.prediction_type] = \
-                self.model_accuracy_scores[prediction.prediction_type][-100:]
-        
         print(f"[PREDICT] Updated accuracy for {prediction.prediction_type.value}: {accuracy:.3f}")
     
     def get_prediction_dashboard(self) -> Dict[str, Any]:
@@ -867,9 +994,9 @@ class PredictiveAnalyticsEngine:
                 }
         
         # Recent predictions summary
-        recent_predictions = [pred for pred in self.prediction_history[-20:]]  # Last 20
+        recent_predictions = list(self.prediction_history)[-20:]  # Last 20
         prediction_summary = {
-            "total_predictions": len(self.prediction_history),
+            "total_predictions": self.total_predictions,
             "recent_predictions": len(recent_predictions),
             "prediction_types": list(set(pred.prediction_type.value for pred in recent_predictions))
         }
@@ -888,6 +1015,7 @@ class PredictiveAnalyticsEngine:
                 "cache_size": len(self.prediction_cache),
                 "active_models": len(self.prediction_models)
             },
+            "cache_metrics": self.prediction_cache.get_stats(),
             "model_performance": model_accuracies,
             "prediction_summary": prediction_summary,
             "data_coverage": data_coverage,
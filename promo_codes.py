@@ -4,18 +4,35 @@ Allows bypassing paywall for select testers and friends
 """
 
 import sqlite3
+import threading
+import time
 import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
 
+CODE_COLUMNS = ["id", "code", "description", "discount_percent", "free_trial_days",
+                "bypass_payment", "max_uses", "current_uses", "created_at", "expires_at",
+                "created_by", "active"]
+
 class PromoCodeSystem:
     """Manage promo codes for SINCOR prototype testing."""
     
-    def __init__(self):
-        self.db_path = Path(__file__).parent / "data" / "promo_codes.db"
+    def __init__(self, db_path=None, cache_ttl_seconds=60):
+        self.db_path = Path(db_path) if db_path else Path(__file__).parent / "data" / "promo_codes.db"
+        
+        # Read-through cache of active codes for page loads; redemption always hits the database
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self._active_codes = {}
+        self._cache_loaded_at = 0.0
+        self._cache_lock = threading.Lock()
+        
         self.init_db()
         self.create_default_codes()
     
+    def _connect(self):
+        """Open a connection that waits on locks instead of failing under contention."""
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+    
     def init_db(self):
         """Initialize promo codes database."""
         self.db_path.parent.mkdir(exist_ok=True)
@@ -23,6 +40,9 @@ class PromoCodeSystem:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
+        # WAL lets page loads read while a redemption holds the write lock
+        cursor.execute("PRAGMA journal_mode=WAL")
+        
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS promo_codes (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -107,60 +127,91 @@ class PromoCodeSystem:
         conn.commit()
         conn.close()
     
+    def get_active_codes(self, refresh=False):
+        """Active, unexpired codes keyed by code, served from cache within the TTL."""
+        with self._cache_lock:
+            if refresh or time.monotonic() - self._cache_loaded_at > self.cache_ttl_seconds:
+                conn = sqlite3.connect(self.db_path, timeout=30)
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    SELECT {", ".join(CODE_COLUMNS)} FROM promo_codes
+                    WHERE active = TRUE
+                    AND (expires_at IS NULL OR expires_at > CURRENT_TIMESTAMP)
+                """)
+                rows = cursor.fetchall()
+                conn.close()
+                
+                self._active_codes = {row[1]: dict(zip(CODE_COLUMNS, row)) for row in rows}
+                self._cache_loaded_at = time.monotonic()
+            return self._active_codes
+    
+    def invalidate_cache(self):
+        """Force the next lookup to reload active codes."""
+        with self._cache_lock:
+            self._cache_loaded_at = 0.0
+    
     def validate_code(self, code):
-        """Validate and return promo code details."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT * FROM promo_codes 
-            WHERE code = ? AND active = TRUE 
-            AND (expires_at IS NULL OR expires_at > CURRENT_TIMESTAMP)
-        """, (code.upper(),))
+        """Validate and return promo code details (cached; use_code re-checks atomically)."""
+        code_data = self.get_active_codes().get(code.upper())
         
-        result = cursor.fetchone()
-        conn.close()
-        
-        if not result:
+        if not code_data:
             return {"valid": False, "error": "Invalid or expired promo code"}
         
-        # Convert to dict
-        columns = ["id", "code", "description", "discount_percent", "free_trial_days", 
-                  "bypass_payment", "max_uses", "current_uses", "created_at", "expires_at", 
-                  "created_by", "active"]
-        code_data = dict(zip(columns, result))
-        
         # Check usage limits
         if code_data["current_uses"] >= code_data["max_uses"]:
             return {"valid": False, "error": "Promo code usage limit exceeded"}
         
-        return {"valid": True, "data": code_data}
+        return {"valid": True, "data": dict(code_data)}
     
     def use_code(self, code, user_email="", user_name="", business_name="", ip_address=""):
-        """Use a promo code and record usage."""
-        validation = self.validate_code(code)
-        if not validation["valid"]:
-            return validation
+        """Use a promo code and record usage.
         
-        conn = sqlite3.connect(self.db_path)
+        Validation and the usage increment happen in one conditional UPDATE inside a
+        single write transaction, so concurrent redemptions can never exceed max_uses.
+        """
+        code = code.upper()
+        conn = self._connect()
         cursor = conn.cursor()
         
-        # Record usage
-        cursor.execute("""
-            INSERT INTO code_usage (code, user_email, user_name, business_name, ip_address)
-            VALUES (?, ?, ?, ?, ?)
-        """, (code.upper(), user_email, user_name, business_name, ip_address))
-        
-        # Update usage count
-        cursor.execute("""
-            UPDATE promo_codes SET current_uses = current_uses + 1
-            WHERE code = ?
-        """, (code.upper(),))
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute(f"""
+                UPDATE promo_codes SET current_uses = current_uses + 1
+                WHERE code = ? AND active = TRUE
+                AND (expires_at IS NULL OR expires_at > CURRENT_TIMESTAMP)
+                AND current_uses < max_uses
+                RETURNING {", ".join(CODE_COLUMNS)}
+            """, (code,))
+            row = cursor.fetchone()
+            
+            if row is None:
+                cursor.execute("ROLLBACK")
+                # Report why from fresh data; the UPDATE is authoritative if the two disagree
+                self.invalidate_cache()
+                validation = self.validate_code(code)
+                if validation["valid"]:
+                    validation = {"valid": False, "error": "Promo code usage limit exceeded"}
+                return validation
+            
+            # Record usage
+            cursor.execute("""
+                INSERT INTO code_usage (code, user_email, user_name, business_name, ip_address)
+                VALUES (?, ?, ?, ?, ?)
+            """, (code, user_email, user_name, business_name, ip_address))
+            cursor.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                cursor.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
         
-        conn.commit()
-        conn.close()
+        code_data = dict(zip(CODE_COLUMNS, row))
+        with self._cache_lock:
+            if code in self._active_codes:
+                self._active_codes[code] = code_data
         
-        return {"valid": True, "data": validation["data"], "message": "Promo code applied successfully"}
+        return {"valid": True, "data": code_data, "message": "Promo code applied successfully"}
     
     def create_code(self, code, description, discount_percent=0, free_trial_days=0, 
                    bypass_payment=False, max_uses=1, expires_days=None):
@@ -181,6 +232,7 @@ class PromoCodeSystem:
                  bypass_payment, max_uses, expires_at))
             
             conn.commit()
+            self.invalidate_cache()
             return {"success": True, "message": f"Promo code {code} created successfully"}
         except sqlite3.IntegrityError:
             return {"success": False, "error": "Promo code already exists"}
@@ -3,6 +3,11 @@
 Ultra-minimal SINCOR app specifically for Railway deployment
 Guaranteed to work with Railway's infrastructure
 """
+import sys
+if __name__ == "__main__" and "--profile-startup" in sys.argv:
+    from startup_profiler import main as profile_startup
+    sys.exit(profile_startup(sys.argv[1:], entry_module="railway_app"))
+
 from flask import Flask, jsonify
 import os
 from datetime import datetime
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, HTTPException, Response, Query
+from fastapi import FastAPI, HTTPException, Response, Request, Query
 from pydantic import BaseModel
 from datetime import datetime, timedelta
 import asyncpg
@@ -6,12 +6,24 @@ import os
 from typing import Optional
 from prometheus_client import Counter, generate_latest, CONTENT_TYPE_LATEST
 from slots import SlotManager
-from calendar import CalendarManager
+from calendar import CalendarManager, APPOINTMENT_FIELDS, APPOINTMENTS_KEYSET, appointments_query
+from libs.pkg_stream.export import Fields, Keyset, list_rows, wants_ndjson
 
 app = FastAPI()
 DB_DSN = os.getenv("DB_DSN")
 BOOKING_TIMEZONE = os.getenv("BOOKING_TIMEZONE", "America/Chicago")
 BOOKING_BUFFER_MIN = int(os.getenv("BOOKING_BUFFER_MIN", "15"))
+EXPORT_POOL_MAX = int(os.getenv("BOOKING_EXPORT_POOL_MAX", "4"))
+
+RESOURCE_FIELDS = Fields({
+    "id": lambda row: str(row['id']),
+    "tenant_id": lambda row: row['tenant_id'],
+    "name": lambda row: row['name'],
+    "timezone": lambda row: row['timezone'],
+    "buffer_minutes": lambda row: row['buffer_minutes']
+})
+
+RESOURCES_KEYSET = Keyset([("id", "uuid")])
 
 # Metrics
 BOOKINGS = Counter("booking_appointments_total", "Total appointments booked")
@@ -37,6 +49,7 @@ async def startup():
     app.state.db = await asyncpg.connect(DB_DSN)
     app.state.slots = SlotManager(app.state.db)
     app.state.calendar = CalendarManager(app.state.db)
+    app.state.export_pool = await asyncpg.create_pool(DB_DSN, min_size=1, max_size=EXPORT_POOL_MAX)
 
 @app.get("/health")
 async def health():
@@ -59,25 +72,30 @@ async def create_resource(resource: ResourceRequest):
     return {"resource_id": str(resource_id), "name": resource.name}
 
 @app.get("/resources")
-async def list_resources(tenant_id: Optional[str] = None):
+async def list_resources(request: Request,
+                         tenant_id: Optional[str] = None,
+                         fields: Optional[str] = None,
+                         limit: Optional[int] = Query(None, ge=1, le=1000),
+                         cursor: Optional[str] = None,
+                         format: Optional[str] = None):
     """List all resources for a tenant"""
+    query = "SELECT * FROM resources WHERE active = true"
+    params = []
+    
     if tenant_id:
-        rows = await app.state.db.fetch("""
-            SELECT * FROM resources WHERE tenant_id = $1 AND active = true
-        """, tenant_id)
-    else:
-        rows = await app.state.db.fetch("SELECT * FROM resources WHERE active = true")
+        params.append(tenant_id)
+        query += f" AND tenant_id = ${len(params)}"
+    
+    try:
+        listing = await list_rows(app.state.db, app.state.export_pool, query, params, RESOURCES_KEYSET,
+                                  RESOURCE_FIELDS, fields, cursor, limit,
+                                  wants_ndjson(format, request.headers.get("accept")))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return [
-        {
-            "id": str(row['id']),
-            "tenant_id": row['tenant_id'],
-            "name": row['name'],
-            "timezone": row['timezone'],
-            "buffer_minutes": row['buffer_minutes']
-        }
-        for row in rows
-    ]
+    if listing.stream is None and not listing.paged:
+        return listing.items
+    return listing.response("resources")
 
 # Slot Management
 @app.post("/resources/{resource_id}/generate-slots")
@@ -137,12 +155,23 @@ async def cancel_appointment(appointment_id: str):
         raise HTTPException(status_code=404, detail=str(e))
 
 @app.get("/appointments")
-async def get_appointments(resource_id: str = Query(...),
+async def get_appointments(request: Request,
+                          resource_id: str = Query(...),
                           from_date: str = Query(...),
-                          to_date: str = Query(...)):
+                          to_date: str = Query(...),
+                          fields: Optional[str] = None,
+                          limit: Optional[int] = Query(None, ge=1, le=1000),
+                          cursor: Optional[str] = None,
+                          format: Optional[str] = None):
     """Get appointments for a resource"""
     from_dt = datetime.fromisoformat(from_date)
     to_dt = datetime.fromisoformat(to_date)
     
-    appointments = await app.state.calendar.get_appointments(resource_id, from_dt, to_dt)
-    return {"appointments": appointments}
\ No newline at end of file
+    query, params = appointments_query(resource_id, from_dt, to_dt)
+    try:
+        listing = await list_rows(app.state.db, app.state.export_pool, query, params, APPOINTMENTS_KEYSET,
+                                  APPOINTMENT_FIELDS, fields, cursor, limit,
+                                  wants_ndjson(format, request.headers.get("accept")))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return listing.response("appointments")
@@ -1,7 +1,37 @@
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 import asyncpg
 from uuid import uuid4
+from libs.pkg_stream.export import Fields, Keyset
+
+APPOINTMENT_FIELDS = Fields({
+    'id': lambda row: str(row['id']),
+    'resource_id': lambda row: str(row['resource_id']),
+    'lead_id': lambda row: str(row['lead_id']) if row['lead_id'] else None,
+    'contact': lambda row: {
+        'name': row['contact_name'],
+        'email': row['contact_email'],
+        'phone': row['contact_phone']
+    },
+    'start_ts': lambda row: row['start_ts'].isoformat(),
+    'end_ts': lambda row: row['end_ts'].isoformat(),
+    'status': lambda row: row['status'],
+    'notes': lambda row: row['notes']
+})
+
+APPOINTMENTS_KEYSET = Keyset([("start_ts", "timestamptz"), ("id", "uuid")])
+
+def appointments_query(resource_id: str, from_date: datetime, to_date: datetime) -> Tuple[str, List]:
+    """Appointments in a date range; add APPOINTMENTS_KEYSET's cursor and order"""
+    params = [resource_id, from_date, to_date]
+    query = """
+        SELECT * FROM appointments
+        WHERE resource_id = $1
+        AND start_ts >= $2
+        AND end_ts <= $3
+        AND status != 'cancelled'
+    """
+    return query, params
 
 class CalendarManager:
     def __init__(self, db_conn):
@@ -94,29 +124,8 @@ class CalendarManager:
     
     async def get_appointments(self, resource_id: str, from_date: datetime, to_date: datetime) -> list:
         """Get appointments for a resource in date range"""
-        rows = await self.db.fetch("""
-            SELECT * FROM appointments
-            WHERE resource_id = $1
-            AND start_ts >= $2
-            AND end_ts <= $3
-            AND status != 'cancelled'
-            ORDER BY start_ts
-        """, resource_id, from_date, to_date)
+        query, params = appointments_query(resource_id, from_date, to_date)
+        rows = await self.db.fetch(query + APPOINTMENTS_KEYSET.order_by(), *params)
         
-        return [
-            {
-                'id': str(row['id']),
-                'resource_id': str(row['resource_id']),
-                'lead_id': str(row['lead_id']) if row['lead_id'] else None,
-                'contact': {
-                    'name': row['contact_name'],
-                    'email': row['contact_email'],
-                    'phone': row['contact_phone']
-                },
-                'start_ts': row['start_ts'].isoformat(),
-                'end_ts': row['end_ts'].isoformat(),
-                'status': row['status'],
-                'notes': row['notes']
-            }
-            for row in rows
-        ]
\ No newline at end of file
+        serialize = APPOINTMENT_FIELDS.project()
+        return [serialize(row) for row in rows]
\ No newline at end of file
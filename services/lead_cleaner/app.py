@@ -1,8 +1,13 @@
 import os, asyncio, json
 from libs.pkg_bus.bus import redis, consume, xadd, STREAM_IN, STREAM_CLEANED
 from libs.pkg_lead_model.hashing import dedupe_key
+from libs.pkg_trace.trace import inject, traced
+from prometheus_client import start_http_server
 from validators import email_syntax, mx_exists, smtp_ping, phone_basic, is_proxy_ip
 
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
+
+@traced("clean")
 async def handler(msg):
     lead = msg["lead"]
     c = lead.get("contact", {})
@@ -27,7 +32,7 @@ async def handler(msg):
     if c.get("ip") and is_proxy_ip(c["ip"]): reasons.append("proxy_ip")
 
     lead["validation"] = {"ok": len(reasons)==0, "reasons": reasons}
-    await xadd(await app_redis(), STREAM_CLEANED, {"lead": lead})
+    await xadd(await app_redis(), STREAM_CLEANED, inject({"lead": lead}))
 
 _redis = None
 async def app_redis():
@@ -37,6 +42,7 @@ async def app_redis():
     return _redis
 
 async def main():
+    start_http_server(METRICS_PORT)
     r = await app_redis()
     await consume(r, STREAM_IN, "g.cleaner", "cleaner-1", handler)
 
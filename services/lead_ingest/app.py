@@ -6,6 +6,7 @@ import aioredis
 from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
 from libs.pkg_bus.bus import redis, xadd, STREAM_IN
 from libs.pkg_lead_model.models import Lead
+from libs.pkg_trace.trace import inject, stage_span
 
 app = FastAPI()
 
@@ -75,14 +76,16 @@ async def ingest(lead: Lead, request: Request, authorization: None = Depends(aut
     await rate_limit(ip)
     await idempotency_guard(x_idempotency_key)
     
-    # persist raw
-    await app.state.db.execute(
-        "INSERT INTO leads (id, vertical, email, phone, ip, state, payload) VALUES ($1,$2,$3,$4,$5,$6,$7)",
-        lead.lead_id, lead.vertical,
-        lead.contact.email, lead.contact.phone, lead.contact.ip, lead.contact.state,
-        json.dumps(lead.dict())
-    )
-    await xadd(app.state.r, STREAM_IN, {"lead": lead.dict()})
+    # the lead's trace starts here and travels with it through the streams
+    with stage_span("ingest", lead_id=lead.lead_id):
+        # persist raw
+        await app.state.db.execute(
+            "INSERT INTO leads (id, vertical, email, phone, ip, state, payload) VALUES ($1,$2,$3,$4,$5,$6,$7)",
+            lead.lead_id, lead.vertical,
+            lead.contact.email, lead.contact.phone, lead.contact.ip, lead.contact.state,
+            json.dumps(lead.dict())
+        )
+        await xadd(app.state.r, STREAM_IN, inject({"lead": lead.dict()}))
     
     REQS.inc()
     return {"status": "queued", "lead_id": str(lead.lead_id)}
\ No newline at end of file
@@ -1,5 +1,6 @@
 from libs.pkg_bus.bus import xadd, redis, STREAM_ROUTE
+from libs.pkg_trace.trace import inject
 
 async def enqueue_outreach(lead: dict):
-    await xadd(await redis(), "stream.outreach.queued", {"lead": lead})
+    await xadd(await redis(), "stream.outreach.queued", inject({"lead": lead}))
     return {"status": "queued_outreach"}
\ No newline at end of file
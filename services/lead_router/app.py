@@ -1,10 +1,13 @@
 import os, asyncio, json, yaml, random, time
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from prometheus_client import generate_latest, start_http_server, CONTENT_TYPE_LATEST
 import aioredis
 from libs.pkg_bus.bus import redis, consume, xadd, STREAM_SCORED, STREAM_ROUTE, STREAM_DELIVERED, STREAM_DLQ
 from libs.pkg_rules.engine import evaluate_rules
+from libs.pkg_trace.trace import inject, traced
 
 CONFIG_DIR = os.getenv("CONFIG_DIR","/app/config")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
 with open(os.path.join(CONFIG_DIR, "routing/smartlists.yaml")) as f:
     SMART = yaml.safe_load(f)
 with open(os.path.join(CONFIG_DIR, "routing/caps.yaml")) as f:
@@ -78,30 +81,36 @@ async def try_deliver(lead, dest, attempt=1, max_attempts=4):
         await dec_conc(dest)
         if attempt >= max_attempts:
             # DLQ
-            await xadd(await redis(), STREAM_DLQ, {
+            await xadd(await redis(), STREAM_DLQ, inject({
                 "lead_id": lead["lead_id"], "dest": dest,
                 "err": str(e), "attempts": attempt
-            })
+            }))
             return {"status":"failed", "error": str(e)}
         await asyncio.sleep((2 ** attempt) + random.random())
         return await try_deliver(lead, dest, attempt+1, max_attempts)
 
+@traced("route")
 async def handler(msg):
     lead = msg["lead"]
     lists = eligible_lists(lead)
     dest = "OUTREACH" if not lists else lists[0]
     if not await within_caps(dest):
         # Push to DLQ with reason 'caps'
-        await xadd(await redis(), STREAM_DLQ, {"lead_id": lead["lead_id"], "dest": dest, "err": "caps_exceeded"})
+        await xadd(await redis(), STREAM_DLQ, inject({"lead_id": lead["lead_id"], "dest": dest, "err": "caps_exceeded"}))
         return
     res = await try_deliver(lead, dest)
-    await xadd(await redis(), STREAM_DELIVERED, {"lead_id": lead["lead_id"], "destination": dest, "result": res})
+    await xadd(await redis(), STREAM_DELIVERED, inject({"lead_id": lead["lead_id"], "destination": dest, "result": res}))
 
 @app.get("/health")
 async def health(): 
     return {"ok": True, "service": "lead_router"}
 
+@app.get("/metrics")
+async def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 async def main():
+    start_http_server(METRICS_PORT)
     r = await redis()
     await consume(r, STREAM_SCORED, "g.router", "router-1", handler)
 
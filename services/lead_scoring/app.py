@@ -1,13 +1,19 @@
-import asyncio
+import asyncio, os
 from libs.pkg_bus.bus import redis, consume, xadd, STREAM_CLEANED, STREAM_SCORED
+from libs.pkg_trace.trace import inject, traced
+from prometheus_client import start_http_server
 from scorer import score_lead
 
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
+
+@traced("score")
 async def handler(msg):
     lead = msg["lead"]
     lead["score"] = score_lead(lead)
-    await xadd(await redis(), STREAM_SCORED, {"lead": lead})
+    await xadd(await redis(), STREAM_SCORED, inject({"lead": lead}))
 
 async def main():
+    start_http_server(METRICS_PORT)
     r = await redis()
     await consume(r, STREAM_CLEANED, "g.scorer", "scorer-1", handler)
 
@@ -7,15 +7,23 @@ from typing import Optional, List
 from datetime import datetime, timedelta
 from prometheus_client import Counter, generate_latest, CONTENT_TYPE_LATEST
 from storage import MarketplaceStorage
+from libs.pkg_bus.bus import redis
+from libs.pkg_cache.ttl import TTLCache
+from catalog_view import ADD_REVIEW_SQL, BROWSE_COLUMNS, COMPLETE_PURCHASE_SQL, browse_cache_key, build_browse_query, ensure_read_model
 import stripe
 
 app = FastAPI()
 DB_DSN = os.getenv("DB_DSN")
 ADMIN_API_KEY = os.getenv("MARKETPLACE_ADMIN_KEY", "admin-dev-key")
+DB_POOL_MAX = int(os.getenv("MARKETPLACE_DB_POOL_MAX", "10"))
+CATALOG_CACHE_TTL = float(os.getenv("MARKETPLACE_CATALOG_CACHE_TTL", "5"))
 
 # Initialize Stripe
 stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
 
+# Browse responses by filter; counters may lag by up to the TTL
+catalog_cache = TTLCache(ttl=CATALOG_CACHE_TTL, maxsize=2048)
+
 # Metrics
 CATALOG_VIEWS = Counter("marketplace_catalog_views_total", "Catalog page views")
 PURCHASES = Counter("marketplace_purchases_total", "Total purchases", ["category", "type"])
@@ -42,9 +50,14 @@ class ReviewRequest(BaseModel):
 
 @app.on_event("startup")
 async def startup():
-    app.state.db = await asyncpg.connect(DB_DSN)
+    app.state.db = await asyncpg.create_pool(DB_DSN, min_size=1, max_size=DB_POOL_MAX)
+    await ensure_read_model(app.state.db)
     app.state.storage = MarketplaceStorage()
 
+@app.on_event("shutdown")
+async def shutdown():
+    await app.state.db.close()
+
 async def verify_admin(authorization: str = Header(None)):
     """Admin authentication"""
     if authorization != f"Bearer {ADMIN_API_KEY}":
@@ -89,6 +102,7 @@ async def create_catalog_item(
             VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
             RETURNING id
         """, title, description, price_cents, type, category, file_key, tag_list, featured)
+        catalog_cache.invalidate()
         
         return {
             "item_id": str(item_id),
@@ -110,6 +124,7 @@ async def update_catalog_item(item_id: str, updates: CatalogItem):
         WHERE id = $7
     """, updates.title, updates.description, updates.price_cents, updates.category,
         updates.tags, updates.featured, item_id)
+    catalog_cache.invalidate()
     
     return {"item_id": item_id, "status": "updated"}
 
@@ -126,37 +141,12 @@ async def browse_catalog(
     """Browse marketplace catalog (public)"""
     CATALOG_VIEWS.inc()
     
-    query = """
-        SELECT c.*, 
-               (SELECT COUNT(*) FROM purchases p WHERE p.item_id = c.id AND p.status = 'completed') as sales_count,
-               (SELECT COUNT(*) FROM reviews r WHERE r.item_id = c.id) as review_count
-        FROM catalog c 
-        WHERE c.active = true
-    """
-    params = []
-    
-    if category:
-        params.append(category)
-        query += f" AND c.category = ${len(params)}"
-        
-    if type:
-        params.append(type)
-        query += f" AND c.type = ${len(params)}"
-        
-    if featured is not None:
-        params.append(featured)
-        query += f" AND c.featured = ${len(params)}"
-        
-    if search:
-        params.append(f"%{search.lower()}%")
-        query += f" AND (LOWER(c.title) LIKE ${len(params)} OR LOWER(c.description) LIKE ${len(params)})"
-    
-    # Order by featured first, then by rating and sales
-    query += " ORDER BY c.featured DESC, c.rating DESC, c.download_count DESC"
-    
-    params.extend([limit, offset])
-    query += f" LIMIT ${len(params)-1} OFFSET ${len(params)}"
+    cache_key = browse_cache_key(category, type, featured, search, limit, offset)
+    cached = catalog_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
+    query, params = build_browse_query(category, type, featured, search, limit, offset)
     rows = await app.state.db.fetch(query, *params)
     
     items = []
@@ -177,14 +167,15 @@ async def browse_catalog(
             "preview_url": row['preview_url']
         })
     
-    return {"items": items, "count": len(items)}
+    response = {"items": items, "count": len(items)}
+    catalog_cache.set(cache_key, response)
+    return response
 
 @app.get("/catalog/items/{item_id}")
 async def get_catalog_item(item_id: str):
     """Get detailed catalog item info"""
-    row = await app.state.db.fetchrow("""
-        SELECT c.*,
-               (SELECT COUNT(*) FROM purchases p WHERE p.item_id = c.id AND p.status = 'completed') as sales_count
+    row = await app.state.db.fetchrow(f"""
+        SELECT {BROWSE_COLUMNS}
         FROM catalog c 
         WHERE c.id = $1 AND c.active = true
     """, item_id)
@@ -315,22 +306,8 @@ async def add_review(review: ReviewRequest):
     if not purchase:
         raise HTTPException(status_code=400, detail="Must purchase item to review")
     
-    # Add review
-    await app.state.db.execute("""
-        INSERT INTO reviews (item_id, tenant_id, rating, review_text)
-        VALUES ($1, $2, $3, $4)
-    """, review.item_id, None, review.rating, review.review_text)
-    
-    # Update average rating
-    await app.state.db.execute("""
-        UPDATE catalog 
-        SET rating = (
-            SELECT AVG(rating)::decimal(2,1) 
-            FROM reviews 
-            WHERE item_id = $1
-        )
-        WHERE id = $1
-    """, review.item_id)
+    # Add review and update the item's review count and average rating
+    await app.state.db.execute(ADD_REVIEW_SQL, review.item_id, None, review.rating, review.review_text)
     
     return {"status": "review_added", "rating": review.rating}
 
@@ -343,11 +320,20 @@ async def handle_payment_webhook(request: dict):
     if request.get('type') == 'payment_intent.succeeded':
         payment_intent_id = request['data']['object']['id']
         
-        # Mark purchase as completed
-        await app.state.db.execute("""
-            UPDATE purchases 
-            SET status = 'completed' 
-            WHERE payment_ref = $1
-        """, payment_intent_id)
+        # Mark purchase as completed and count the sale
+        completed = await app.state.db.fetch(COMPLETE_PURCHASE_SQL, payment_intent_id)
+        
+        # Tell template consumers (outreach_mediapax) the tenant owns something new.
+        # Pub/sub reaches every replica without a consumer group per instance; a
+        # replica that misses one still expires its cache by TTL.
+        tenant_purchases = [row for row in completed if row['tenant_ids']]
+        if tenant_purchases:
+            r = await redis()
+            for row in tenant_purchases:
+                await r.publish("marketplace.purchase_completed", json.dumps({
+                    "item_id": str(row['id']),
+                    "category": row['category'],
+                    "tenant_ids": list(row['tenant_ids'])
+                }))
         
     return {"received": True}
\ No newline at end of file
@@ -0,0 +1,130 @@
+from typing import Any, Hashable, List, Optional, Tuple
+
+# Catalog read model: sales/review counters live on the catalog row and are
+# bumped by the purchase and review events, so browse never counts purchases.
+# search_vector is maintained by Postgres and GIN-indexed for ranked search.
+READ_MODEL_COLUMNS_SQL = """
+    ALTER TABLE catalog
+        ADD COLUMN IF NOT EXISTS sales_count integer NOT NULL DEFAULT 0,
+        ADD COLUMN IF NOT EXISTS review_count integer NOT NULL DEFAULT 0,
+        ADD COLUMN IF NOT EXISTS rating_total integer NOT NULL DEFAULT 0,
+        ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED
+"""
+
+READ_MODEL_INDEXES_SQL = [
+    "CREATE INDEX IF NOT EXISTS catalog_search_idx ON catalog USING gin (search_vector)",
+    """CREATE INDEX IF NOT EXISTS catalog_browse_idx
+       ON catalog (featured DESC, rating DESC, download_count DESC) WHERE active""",
+    """CREATE INDEX IF NOT EXISTS purchases_item_completed_idx
+       ON purchases (item_id) WHERE status = 'completed'""",
+    "CREATE INDEX IF NOT EXISTS purchases_payment_ref_idx ON purchases (payment_ref)",
+    "CREATE INDEX IF NOT EXISTS reviews_item_created_idx ON reviews (item_id, created_at DESC)",
+]
+
+# One-off rebuild of the counters from purchases/reviews, run when the
+# columns are first added (or by hand if they are ever suspected to drift)
+BACKFILL_COUNTERS_SQL = """
+    UPDATE catalog c
+    SET sales_count = coalesce(s.sales, 0),
+        review_count = coalesce(r.reviews, 0),
+        rating_total = coalesce(r.total, 0)
+    FROM catalog src
+    LEFT JOIN (SELECT item_id, count(*) AS sales FROM purchases
+               WHERE status = 'completed' GROUP BY item_id) s ON s.item_id = src.id
+    LEFT JOIN (SELECT item_id, count(*) AS reviews, sum(rating) AS total FROM reviews
+               GROUP BY item_id) r ON r.item_id = src.id
+    WHERE c.id = src.id
+"""
+
+# Payment succeeded: complete the purchase and count the sale in one statement.
+# Redelivered webhooks match no pending purchase and count nothing. Returns
+# the buying tenants so entitlement caches can be invalidated.
+COMPLETE_PURCHASE_SQL = """
+    WITH completed AS (
+        UPDATE purchases SET status = 'completed'
+        WHERE payment_ref = $1 AND status <> 'completed'
+        RETURNING item_id, tenant_id
+    )
+    UPDATE catalog c SET sales_count = c.sales_count + n.sales
+    FROM (SELECT item_id, count(*) AS sales,
+                 array_remove(array_agg(DISTINCT tenant_id), NULL) AS tenant_ids
+          FROM completed GROUP BY item_id) n
+    WHERE c.id = n.item_id
+    RETURNING c.id, c.category, n.tenant_ids
+"""
+
+# New review: insert it and roll it into the item's counters and average
+ADD_REVIEW_SQL = """
+    WITH review AS (
+        INSERT INTO reviews (item_id, tenant_id, rating, review_text)
+        VALUES ($1, $2, $3, $4)
+        RETURNING item_id, rating
+    )
+    UPDATE catalog c
+    SET review_count = c.review_count + 1,
+        rating_total = c.rating_total + r.rating,
+        rating = ((c.rating_total + r.rating)::numeric / (c.review_count + 1))::decimal(2,1)
+    FROM review r
+    WHERE c.id = r.item_id
+"""
+
+BROWSE_COLUMNS = """c.id, c.title, c.description, c.price_cents, c.type, c.category, c.tags,
+               c.featured, c.rating, c.download_count, c.sales_count, c.review_count, c.preview_url"""
+
+async def ensure_read_model(db):
+    """Add the read-model columns and indexes; backfill counters the first time"""
+    async with db.acquire() as conn:
+        async with conn.transaction():
+            # replicas starting together migrate one at a time
+            await conn.execute("SELECT pg_advisory_xact_lock(hashtext('marketplace_catalog_read_model'))")
+            existed = await conn.fetchval("""
+                SELECT EXISTS (SELECT 1 FROM information_schema.columns
+                               WHERE table_schema = current_schema() AND table_name = 'catalog'
+                                 AND column_name = 'sales_count')
+            """)
+            await conn.execute(READ_MODEL_COLUMNS_SQL)
+            if not existed:
+                await conn.execute(BACKFILL_COUNTERS_SQL)
+        for statement in READ_MODEL_INDEXES_SQL:
+            await conn.execute(statement)
+
+def build_browse_query(category: Optional[str] = None, type: Optional[str] = None,
+                       featured: Optional[bool] = None, search: Optional[str] = None,
+                       limit: int = 20, offset: int = 0) -> Tuple[str, List[Any]]:
+    """Browse query over the read model; searches are ranked by relevance first"""
+    params: List[Any] = []
+    rank = ""
+    query = f"SELECT {BROWSE_COLUMNS} FROM catalog c WHERE c.active = true"
+
+    if category:
+        params.append(category)
+        query += f" AND c.category = ${len(params)}"
+
+    if type:
+        params.append(type)
+        query += f" AND c.type = ${len(params)}"
+
+    if featured is not None:
+        params.append(featured)
+        query += f" AND c.featured = ${len(params)}"
+
+    if search:
+        params.append(search)
+        tsquery = f"websearch_to_tsquery('english', ${len(params)})"
+        query += f" AND c.search_vector @@ {tsquery}"
+        rank = f"ts_rank_cd(c.search_vector, {tsquery}) DESC, "
+
+    query += f" ORDER BY {rank}c.featured DESC, c.rating DESC, c.download_count DESC"
+
+    params.extend([limit, offset])
+    query += f" LIMIT ${len(params)-1} OFFSET ${len(params)}"
+    return query, params
+
+def browse_cache_key(category: Optional[str], type: Optional[str], featured: Optional[bool],
+                     search: Optional[str], limit: int, offset: int) -> Hashable:
+    """Cache key for a browse request; searches differing only in case or spacing share one"""
+    search = " ".join(search.lower().split()) if search else None
+    return (category, type, featured, search, limit, offset)
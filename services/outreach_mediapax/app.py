@@ -1,17 +1,73 @@
-import asyncio, json
-from libs.pkg_bus.bus import redis, consume
-from generator import generate_pack
+import asyncio, json, os, time
+from libs.pkg_bus.bus import redis, consume, xadd, STREAM_DLQ
+from libs.pkg_trace.trace import exporter, record_span
+from prometheus_client import start_http_server
+from generator import entitlements, generate_packs
 from sequencer import send_sequence
+from batcher import LeadBatcher
 
-async def handler(msg):
-    lead = msg["lead"]
-    pack = generate_pack(lead)
-    await send_sequence(lead, pack)
+BATCH_MS = int(os.getenv("OUTREACH_BATCH_MS", "200"))
+BATCH_MAX = int(os.getenv("OUTREACH_BATCH_MAX", "100"))
+# Each consumer holds one unacked lead until its batch is flushed, so this
+# many consumers in the group is what lets a batch fill
+CONSUMERS = int(os.getenv("OUTREACH_CONSUMERS", "32"))
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
+
+async def process_batch(batch):
+    """Generate packs for a batch of leads and send them; failed leads are dead-lettered"""
+    leads = [lead for lead, _ in batch]
+    # a lead's outreach span covers the shared pack generation and its own send;
+    # time spent in the stream and in this buffer is its queue wait
+    started_at = time.time()
+    try:
+        packs = await generate_packs(leads)
+    except Exception as e:
+        for lead, trace in batch:
+            record_span("outreach", trace, started_at, time.time(), "error", lead_id=lead.get("lead_id"))
+        await dead_letter(leads, e)
+        return
+
+    async def send(lead, trace, pack):
+        status = "ok"
+        try:
+            return await send_sequence(lead, pack)
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            record_span("outreach", trace, started_at, time.time(), status, lead_id=lead.get("lead_id"))
+
+    results = await asyncio.gather(*(send(lead, trace, pack) for (lead, trace), pack in zip(batch, packs)),
+                                   return_exceptions=True)
     # could write to delivery_ledger via API or DB later
+    failed = [(lead, res) for lead, res in zip(leads, results) if isinstance(res, Exception)]
+    for lead, err in failed:
+        await dead_letter([lead], err)
+
+async def dead_letter(leads, err):
+    r = await redis()
+    for lead in leads:
+        await xadd(r, STREAM_DLQ, {"lead_id": lead.get("lead_id"), "dest": "OUTREACH", "err": str(err)})
+
+batcher = LeadBatcher(process_batch, BATCH_MS / 1000, min(BATCH_MAX, CONSUMERS))
+
+async def handler(msg):
+    # return (and so ack) only after the lead was sent or dead-lettered
+    await batcher.add(msg["lead"], msg.get("trace"))
 
 async def main():
+    start_http_server(METRICS_PORT)
     r = await redis()
-    await consume(r, "stream.outreach.queued", "g.outreach", "outreach-1", handler)
+    try:
+        await asyncio.gather(
+            batcher.run(),
+            *(consume(r, "stream.outreach.queued", "g.outreach", f"outreach-1-{i}", handler) for i in range(CONSUMERS)),
+            entitlements.follow_purchases(redis),
+        )
+    finally:
+        await batcher.flush()
+        await entitlements.close()
+        await exporter.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
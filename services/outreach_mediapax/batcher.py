@@ -0,0 +1,60 @@
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+Batch = List[Tuple[dict, Optional[dict]]]
+
+class LeadBatcher:
+    """Collects queued leads and hands them to process in batches.
+
+    add() returns a future that resolves once process has handled the lead's
+    batch (sent or dead-lettered it), so the stream handler can hold its
+    message until then: delivery stays at-least-once. Batches only fill when
+    many handlers wait at once, so the service runs one stream consumer per
+    batch slot; a batch is flushed as soon as max_batch leads are waiting,
+    or after flush_interval otherwise.
+    """
+
+    def __init__(self, process: Callable[[Batch], Awaitable[None]], flush_interval: float, max_batch: int):
+        self.process = process
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pending = []
+        self._wakeup = asyncio.Event()
+        self.stats = {"leads": 0, "batches": 0, "failed_batches": 0}
+
+    def add(self, lead: dict, trace: Optional[dict] = None) -> asyncio.Future:
+        done = asyncio.get_running_loop().create_future()
+        self._pending.append((lead, trace, done))
+        self.stats["leads"] += 1
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+        return done
+
+    async def run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                pass  # the batch's handlers see the error and leave their messages unacked
+
+    async def flush(self):
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        self.stats["batches"] += 1
+        try:
+            await self.process([(lead, trace) for lead, trace, _ in batch])
+        except Exception as e:
+            self.stats["failed_batches"] += 1
+            for _, _, done in batch:
+                if not done.done():
+                    done.set_exception(e)
+            raise
+        for _, _, done in batch:
+            if not done.done():
+                done.set_result(None)
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import time
+from typing import Callable, Dict, List, Optional
+
+from libs.pkg_cache.ttl import TTLCache
+
+# Everything a tenant owns, fetched once per tenant and split by category here
+# rather than querying per lead and vertical
+TENANT_TEMPLATES_SQL = """
+    SELECT DISTINCT ON (c.id) c.title, c.type, c.category, c.payload_ref, c.tags
+    FROM catalog c
+    JOIN purchases p ON c.id = p.item_id
+    WHERE p.tenant_id = $1 AND p.status = 'completed' AND c.active = true
+    ORDER BY c.id
+"""
+
+PURCHASE_COMPLETED_CHANNEL = "marketplace.purchase_completed"
+
+class EntitlementCache:
+    """Per-tenant purchased-template cache backed by a connection pool.
+
+    Entries are dropped when marketplace reports a completed purchase for
+    the tenant; the TTL only bounds staleness if such an event is missed.
+    """
+
+    def __init__(self, dsn: Optional[str], ttl: float = 300, pool_max: int = 5, maxsize: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.dsn = dsn
+        self.pool_max = pool_max
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+        self._cache = TTLCache(ttl=ttl, maxsize=maxsize, clock=clock)
+        self.stats = self._cache.stats
+
+    async def pool(self):
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    import asyncpg
+                    self._pool = await asyncpg.create_pool(self.dsn, min_size=1, max_size=self.pool_max)
+        return self._pool
+
+    async def templates(self, tenant_id: Optional[str], vertical: str) -> List[dict]:
+        """Purchased, active templates for the tenant in this vertical"""
+        if not tenant_id or not self.dsn:
+            return []
+        by_category = await self._get(tenant_id)
+        return by_category.get(vertical, [])
+
+    async def _get(self, tenant_id: str) -> Dict[str, List[dict]]:
+        return await self._cache.get_or_load(tenant_id, lambda: self._load(tenant_id))
+
+    async def _load(self, tenant_id: str) -> Dict[str, List[dict]]:
+        pool = await self.pool()
+        rows = await pool.fetch(TENANT_TEMPLATES_SQL, tenant_id)
+        by_category: Dict[str, List[dict]] = {}
+        for row in rows:
+            by_category.setdefault(row["category"], []).append(dict(row))
+        return by_category
+
+    def invalidate(self, tenant_id: Optional[str] = None):
+        """Forget one tenant's entitlements, or everyone's"""
+        if tenant_id is None:
+            self._cache.invalidate()
+        else:
+            self._cache.invalidate(tenant_id)
+
+    async def on_purchase_completed(self, msg: dict):
+        """Handler for marketplace purchase_completed events"""
+        for tenant_id in msg.get("tenant_ids") or []:
+            self.invalidate(tenant_id)
+
+    async def follow_purchases(self, redis_factory: Callable, channel: str = PURCHASE_COMPLETED_CHANNEL,
+                               retry_delay: float = 1.0):
+        """Drop entitlements as marketplace announces purchases.
+
+        Uses pub/sub so every replica hears every purchase without a consumer
+        group of its own. Events published while disconnected are lost, so the
+        whole cache is dropped on every (re)subscribe.
+        """
+        while True:
+            try:
+                r = await redis_factory()
+                pubsub = r.pubsub()
+                await pubsub.subscribe(channel)
+                self.invalidate()
+                try:
+                    async for message in pubsub.listen():
+                        if message.get("type") != "message":
+                            continue
+                        try:
+                            await self.on_purchase_completed(json.loads(message["data"]))
+                        except ValueError:
+                            continue
+                finally:
+                    await pubsub.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                await asyncio.sleep(retry_delay)
+
+    async def close(self):
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
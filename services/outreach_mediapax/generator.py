@@ -1,45 +1,30 @@
-import asyncpg
+import asyncio
 import os
 import json
+from typing import Dict, List, Optional, Tuple
 
-async def generate_pack(lead: dict) -> dict:
-    """Generate MediaPax using purchased templates"""
-    vertical = lead.get("vertical","")
-    state = lead.get("contact",{}).get("state","")
-    tenant_id = lead.get("tenant_id")
-    
-    # Connect to DB to get purchased templates
-    db_conn = None
-    purchased_templates = []
-    
+from entitlements import EntitlementCache
+
+# Shared across leads: one pool, one entitlement lookup per tenant until a purchase invalidates it
+entitlements = EntitlementCache(
+    os.getenv("DB_DSN"),
+    ttl=float(os.getenv("OUTREACH_ENTITLEMENT_TTL", "300")),
+    pool_max=int(os.getenv("OUTREACH_DB_POOL_MAX", "5"))
+)
+
+async def _purchased_templates(tenant_id: Optional[str], vertical: str) -> List[dict]:
     try:
-        if os.getenv("DB_DSN"):
-            db_conn = await asyncpg.connect(os.getenv("DB_DSN"))
-            
-            # Get templates this tenant has purchased
-            if tenant_id:
-                rows = await db_conn.fetch("""
-                    SELECT c.title, c.type, c.category, c.payload_ref, c.tags
-                    FROM catalog c
-                    JOIN purchases p ON c.id = p.item_id
-                    WHERE p.tenant_id = $1 AND p.status = 'completed'
-                    AND c.category = $2 AND c.active = true
-                """, tenant_id, vertical)
-                
-                purchased_templates = [dict(row) for row in rows]
-    
+        return await entitlements.templates(tenant_id, vertical)
     except Exception:
-        pass  # Fall back to default templates
-    finally:
-        if db_conn:
-            await db_conn.close()
-    
+        return []  # Fall back to default templates
+
+def _render_pack(vertical: str, purchased_templates: List[dict]) -> Tuple[str, dict]:
+    """Pack body for a vertical and the headline prefix; the lead's state completes the headline"""
     # Use purchased templates if available, otherwise default
     if purchased_templates:
         # Use first matching purchased template
         template = purchased_templates[0]
-        return {
-            "headline": f"{template['title']} for {state}",
+        return template['title'], {
             "template_source": "purchased",
             "template_id": template['payload_ref'],
             "scripts": [
@@ -53,8 +38,7 @@ async def generate_pack(lead: dict) -> dict:
         }
     else:
         # Default free template
-        return {
-            "headline": f"{vertical.title()} Growth Pack for {state}",
+        return f"{vertical.title()} Growth Pack", {
             "template_source": "default",
             "scripts": [
                 {"hook":"0-3s", "text":"Stop scrolling—instant shine in 3 hours."},
@@ -64,4 +48,35 @@ async def generate_pack(lead: dict) -> dict:
             ],
             "assets": [],
             "upsell_message": f"Upgrade to premium {vertical} templates in marketplace"
-        }
\ No newline at end of file
+        }
+
+def _pack_for_lead(lead: dict, headline: str, body: dict) -> dict:
+    state = lead.get("contact",{}).get("state","")
+    pack = {"headline": f"{headline} for {state}"}
+    pack.update(body)
+    pack["scripts"] = [dict(step) for step in body["scripts"]]
+    pack["assets"] = list(body["assets"])
+    return pack
+
+async def generate_pack(lead: dict) -> dict:
+    """Generate MediaPax using purchased templates"""
+    vertical = lead.get("vertical","")
+    purchased_templates = await _purchased_templates(lead.get("tenant_id"), vertical)
+    headline, body = _render_pack(vertical, purchased_templates)
+    return _pack_for_lead(lead, headline, body)
+
+async def generate_packs(leads: List[dict]) -> List[dict]:
+    """Generate packs for a batch of leads, rendering once per (tenant, vertical)"""
+    groups: Dict[Tuple[Optional[str], str], List[int]] = {}
+    for index, lead in enumerate(leads):
+        groups.setdefault((lead.get("tenant_id"), lead.get("vertical","")), []).append(index)
+
+    keys = list(groups)
+    template_lists = await asyncio.gather(*(_purchased_templates(tenant_id, vertical) for tenant_id, vertical in keys))
+
+    packs: List[Optional[dict]] = [None] * len(leads)
+    for (tenant_id, vertical), purchased_templates in zip(keys, template_lists):
+        headline, body = _render_pack(vertical, purchased_templates)
+        for index in groups[(tenant_id, vertical)]:
+            packs[index] = _pack_for_lead(leads[index], headline, body)
+    return packs
@@ -6,7 +6,10 @@ from datetime import datetime, timedelta
 from typing import Optional, List
 from prometheus_client import Counter, generate_latest, CONTENT_TYPE_LATEST
 from rules import ReferralRules
+from attribution import UPSERT_ATTRIBUTION_SQL, ClickBatcher, ensure_attribution_index
 from libs.pkg_bus.bus import xadd, redis
+from libs.pkg_cache.ttl import TTLCache
+from libs.pkg_stream.export import Fields, Keyset, list_rows, wants_ndjson
 import secrets
 import string
 
@@ -14,15 +17,44 @@ app = FastAPI()
 DB_DSN = os.getenv("DB_DSN")
 REFERRAL_COOKIE_DAYS = int(os.getenv("REFERRAL_COOKIE_DAYS", "30"))
 ADMIN_API_KEY = os.getenv("REFERRAL_ADMIN_KEY", "admin-dev-key")
+DB_POOL_MAX = int(os.getenv("REFERRAL_DB_POOL_MAX", "10"))
+EXPORT_POOL_MAX = int(os.getenv("REFERRAL_EXPORT_POOL_MAX", "4"))
+REF_CODE_CACHE_TTL = int(os.getenv("REFERRAL_CODE_CACHE_TTL", "60"))
+CLICK_BATCHING = os.getenv("REFERRAL_CLICK_BATCHING", "0") == "1"
+CLICK_FLUSH_MS = int(os.getenv("REFERRAL_CLICK_FLUSH_MS", "250"))
+CLICK_BATCH_MAX = int(os.getenv("REFERRAL_CLICK_BATCH_MAX", "500"))
 
 # Initialize rules engine
 referral_rules = ReferralRules(cookie_days=REFERRAL_COOKIE_DAYS)
 
+# Hot-path caches: active ref codes (unknown codes cached briefly) and generated scripts
+active_ref_codes = TTLCache(ttl=REF_CODE_CACHE_TTL, negative_ttl=5)
+tracking_scripts = TTLCache(ttl=REF_CODE_CACHE_TTL)
+
+PIXEL_GIF = b'\x47\x49\x46\x38\x39\x61\x01\x00\x01\x00\x80\x00\x00\xff\xff\xff\x00\x00\x00\x21\xf9\x04\x01\x00\x00\x00\x00\x2c\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02\x04\x01\x00\x3b'
+
 # Metrics
 REFERRAL_CLICKS = Counter("referral_clicks_total", "Total referral link clicks", ["code"])
 REFERRAL_CONVERSIONS = Counter("referral_conversions_total", "Total referral conversions", ["code", "type"])
 REFERRAL_PAYOUTS = Counter("referral_payouts_total", "Total referral payouts in cents", ["code"])
 
+REF_CODE_FIELDS = Fields({
+    "id": lambda row: str(row['id']),
+    "code": lambda row: row['code'],
+    "campaign_name": lambda row: row['campaign_name'],
+    "payout_cents": lambda row: row['payout_cents'],
+    "payout_type": lambda row: row['payout_type'],
+    "active": lambda row: row['active'],
+    "expires_at": lambda row: row['expires_at'].isoformat() if row['expires_at'] else None,
+    "stats": lambda row: {
+        "total_conversions": row['total_conversions'],
+        "total_revenue": row['total_revenue'],
+        "total_payouts": row['total_payouts']
+    }
+})
+
+REF_CODES_KEYSET = Keyset([("rc.created_at", "timestamptz"), ("rc.id", "uuid")], descending=True)
+
 class RefCodeRequest(BaseModel):
     tenant_id: str
     campaign_name: str
@@ -43,7 +75,21 @@ async def verify_admin(authorization: str = Header(None)):
 
 @app.on_event("startup")
 async def startup():
-    app.state.db = await asyncpg.connect(DB_DSN)
+    app.state.db = await asyncpg.create_pool(DB_DSN, min_size=1, max_size=DB_POOL_MAX)
+    app.state.export_pool = await asyncpg.create_pool(DB_DSN, min_size=1, max_size=EXPORT_POOL_MAX)
+    await ensure_attribution_index(app.state.db)
+    
+    app.state.click_batcher = None
+    if CLICK_BATCHING:
+        app.state.click_batcher = ClickBatcher(app.state.db, CLICK_FLUSH_MS / 1000, CLICK_BATCH_MAX)
+        app.state.click_batcher.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    if app.state.click_batcher:
+        await app.state.click_batcher.close()
+    await app.state.export_pool.close()
+    await app.state.db.close()
 
 @app.get("/health")
 async def health():
@@ -77,6 +123,7 @@ async def create_ref_code(ref_request: RefCodeRequest):
         RETURNING id
     """, ref_request.tenant_id, code, ref_request.campaign_name, 
         ref_request.payout_cents, ref_request.payout_type, expires_at)
+    active_ref_codes.invalidate(code)
     
     return {
         "ref_id": str(ref_id),
@@ -88,61 +135,63 @@ async def create_ref_code(ref_request: RefCodeRequest):
     }
 
 @app.get("/ref/codes")
-async def list_ref_codes(tenant_id: Optional[str] = None, active_only: bool = True):
+async def list_ref_codes(request: Request,
+                         tenant_id: Optional[str] = None,
+                         active_only: bool = True,
+                         fields: Optional[str] = None,
+                         limit: Optional[int] = Query(None, ge=1, le=1000),
+                         cursor: Optional[str] = None,
+                         format: Optional[str] = None):
     """List referral codes"""
-    query = "SELECT * FROM ref_codes WHERE 1=1"
+    # Conversion stats come from one lateral aggregate per code instead of a query per row
+    query = """
+        SELECT rc.*, stats.total_conversions, stats.total_revenue, stats.total_payouts
+        FROM ref_codes rc
+        LEFT JOIN LATERAL (
+            SELECT 
+                COUNT(*) as total_conversions,
+                COALESCE(SUM(amount_cents), 0) as total_revenue,
+                COALESCE(SUM(payout_amount_cents), 0) as total_payouts
+            FROM ref_conversions 
+            WHERE code = rc.code
+        ) stats ON true
+        WHERE 1=1
+    """
     params = []
     
     if tenant_id:
         params.append(tenant_id)
-        query += f" AND tenant_id = ${len(params)}"
+        query += f" AND rc.tenant_id = ${len(params)}"
     
     if active_only:
         params.append(True)
-        query += f" AND active = ${len(params)}"
-        query += " AND (expires_at IS NULL OR expires_at > now())"
-    
-    query += " ORDER BY created_at DESC"
+        query += f" AND rc.active = ${len(params)}"
+        query += " AND (rc.expires_at IS NULL OR rc.expires_at > now())"
+    
+    try:
+        listing = await list_rows(app.state.db, app.state.export_pool, query, params, REF_CODES_KEYSET,
+                                  REF_CODE_FIELDS, fields, cursor, limit,
+                                  wants_ndjson(format, request.headers.get("accept")))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return listing.response("codes")
+
+# Referral Tracking
+async def get_active_ref_code(code: str) -> Optional[dict]:
+    """Active ref code row, served from the TTL cache"""
     
-    rows = await app.state.db.fetch(query, *params)
+    async def load():
+        row = await app.state.db.fetchrow("SELECT * FROM ref_codes WHERE code = $1 AND active = true", code)
+        return dict(row) if row else None
     
-    codes = []
-    for row in rows:
-        # Get conversion stats
-        stats = await app.state.db.fetchrow("""
-            SELECT 
-                COUNT(*) as total_conversions,
-                COALESCE(SUM(amount_cents), 0) as total_revenue,
-                COALESCE(SUM(payout_amount_cents), 0) as total_payouts
-            FROM ref_conversions 
-            WHERE code = $1
-        """, row['code'])
-        
-        codes.append({
-            "id": str(row['id']),
-            "code": row['code'],
-            "campaign_name": row['campaign_name'],
-            "payout_cents": row['payout_cents'],
-            "payout_type": row['payout_type'],
-            "active": row['active'],
-            "expires_at": row['expires_at'].isoformat() if row['expires_at'] else None,
-            "stats": {
-                "total_conversions": stats['total_conversions'],
-                "total_revenue": stats['total_revenue'],
-                "total_payouts": stats['total_payouts']
-            }
-        })
-    
-    return {"codes": codes}
+    return await active_ref_codes.get_or_load(code, load)
 
-# Referral Tracking
 @app.get("/ref/{code}.js")
 async def get_tracking_script(code: str, request: Request):
     """Serve embeddable referral tracking script"""
     
     # Verify code exists and is active
-    ref_code = await app.state.db.fetchrow("SELECT * FROM ref_codes WHERE code = $1 AND active = true", code)
-    if not ref_code:
+    if not await get_active_ref_code(code):
         raise HTTPException(status_code=404, detail="Referral code not found")
     
     # Get domain from request
@@ -150,9 +199,13 @@ async def get_tracking_script(code: str, request: Request):
     protocol = "https" if "https" in str(request.url) else "http"
     domain = f"{protocol}://{host}"
     
-    script = referral_rules.generate_tracking_script(code, domain)
+    script = tracking_scripts.get((code, domain))
+    if script is None:
+        script = referral_rules.generate_tracking_script(code, domain)
+        tracking_scripts.set((code, domain), script)
     
-    return Response(content=script, media_type="application/javascript")
+    return Response(content=script, media_type="application/javascript",
+                    headers={"Cache-Control": f"public, max-age={REF_CODE_CACHE_TTL}"})
 
 @app.get("/ref/pixel")
 async def tracking_pixel(code: str = Query(...), 
@@ -165,36 +218,23 @@ async def tracking_pixel(code: str = Query(...),
     user_agent = request.headers.get("user-agent", "")
     referrer = request.headers.get("referer", "")
     
-    # Create or update attribution
-    await track_referral_click(code, fp, ip, user_agent, referrer)
-    
-    REFERRAL_CLICKS.labels(code=code).inc()
+    # Create or update attribution (unknown or inactive codes could never convert)
+    if await get_active_ref_code(code):
+        await track_referral_click(code, fp, ip, user_agent, referrer)
+        REFERRAL_CLICKS.labels(code=code).inc()
     
     # Return 1x1 transparent pixel
-    pixel = b'\x47\x49\x46\x38\x39\x61\x01\x00\x01\x00\x80\x00\x00\xff\xff\xff\x00\x00\x00\x21\xf9\x04\x01\x00\x00\x00\x00\x2c\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02\x04\x01\x00\x3b'
-    return Response(content=pixel, media_type="image/gif")
+    return Response(content=PIXEL_GIF, media_type="image/gif")
 
 async def track_referral_click(code: str, fingerprint: str, ip: str, user_agent: str, referrer: str):
     """Track a referral click and create/update attribution"""
     
-    # Check if attribution already exists
-    existing = await app.state.db.fetchrow("""
-        SELECT * FROM ref_attributions WHERE fingerprint = $1
-    """, fingerprint)
-    
-    if existing:
-        # Update last seen
-        await app.state.db.execute("""
-            UPDATE ref_attributions 
-            SET last_seen = now(), code = $1
-            WHERE fingerprint = $2
-        """, code, fingerprint)
-    else:
-        # Create new attribution
-        await app.state.db.execute("""
-            INSERT INTO ref_attributions (code, fingerprint, ip_address, user_agent, referrer)
-            VALUES ($1, $2, $3, $4, $5)
-        """, code, fingerprint, ip, user_agent, referrer)
+    # Heavy traffic: hand the click to the write-behind batcher
+    if app.state.click_batcher:
+        app.state.click_batcher.add(code, fingerprint, ip, user_agent, referrer)
+        return
+    
+    await app.state.db.execute(UPSERT_ATTRIBUTION_SQL, code, fingerprint, ip, user_agent, referrer)
 
 # Conversion Tracking
 @app.post("/ref/conversions")
@@ -0,0 +1,144 @@
+import asyncio
+from typing import Dict, Optional, Tuple
+
+# One round trip per click; concurrent pixel fires for the same fingerprint
+# cannot race into duplicate rows. Last touch wins the code, the first
+# touch keeps its ip/user agent/referrer.
+UPSERT_ATTRIBUTION_SQL = """
+    INSERT INTO ref_attributions (code, fingerprint, ip_address, user_agent, referrer)
+    VALUES ($1, $2, $3, $4, $5)
+    ON CONFLICT (fingerprint) DO UPDATE
+    SET last_seen = now(), code = EXCLUDED.code
+"""
+
+# ON CONFLICT (fingerprint) needs a unique index to arbitrate on
+ATTRIBUTION_INDEX_SQL = """
+    CREATE UNIQUE INDEX IF NOT EXISTS ref_attributions_fingerprint_key
+    ON ref_attributions (fingerprint)
+"""
+
+# The old SELECT-then-INSERT path could leave several rows per fingerprint,
+# which would fail the index build. Fold each group into its earliest row,
+# matching the upsert: first touch keeps its ip/user agent/referrer, the
+# latest touch's code wins, conversions are summed and repointed to it.
+MERGE_DUPLICATE_ATTRIBUTIONS_SQL = """
+    CREATE TEMP TABLE ref_attribution_dupes ON COMMIT DROP AS
+    SELECT id, keep_id FROM (
+        SELECT id, first_value(id) OVER (PARTITION BY fingerprint ORDER BY first_seen, id) AS keep_id
+        FROM ref_attributions
+        WHERE fingerprint IS NOT NULL
+    ) ranked
+    WHERE id <> keep_id;
+
+    UPDATE ref_attributions keep
+    SET code = merged.code,
+        last_seen = merged.last_seen,
+        converted = merged.converted,
+        conversion_value_cents = merged.conversion_value_cents
+    FROM (
+        SELECT grouped.keep_id,
+               (array_agg(a.code ORDER BY a.last_seen DESC, a.id DESC))[1] AS code,
+               max(a.last_seen) AS last_seen,
+               bool_or(coalesce(a.converted, false)) AS converted,
+               sum(coalesce(a.conversion_value_cents, 0)) AS conversion_value_cents
+        FROM (
+            SELECT id, keep_id FROM ref_attribution_dupes
+            UNION
+            SELECT keep_id, keep_id FROM ref_attribution_dupes
+        ) grouped
+        JOIN ref_attributions a ON a.id = grouped.id
+        GROUP BY grouped.keep_id
+    ) merged
+    WHERE keep.id = merged.keep_id;
+
+    UPDATE ref_conversions c
+    SET attribution_id = d.keep_id
+    FROM ref_attribution_dupes d
+    WHERE c.attribution_id = d.id;
+
+    DELETE FROM ref_attributions a
+    USING ref_attribution_dupes d
+    WHERE a.id = d.id;
+"""
+
+# Serializes the one-off migration across replicas starting together ("refattr1")
+ATTRIBUTION_MIGRATION_LOCK = 0x7265666174747231
+
+async def ensure_attribution_index(db):
+    """Create the fingerprint unique index, merging duplicate rows first if it is missing"""
+    async with db.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute("SELECT pg_advisory_xact_lock($1)", ATTRIBUTION_MIGRATION_LOCK)
+            if await conn.fetchval("SELECT to_regclass('ref_attributions_fingerprint_key') IS NOT NULL"):
+                return
+            await conn.execute(MERGE_DUPLICATE_ATTRIBUTIONS_SQL)
+            await conn.execute(ATTRIBUTION_INDEX_SQL)
+
+class ClickBatcher:
+    """Write-behind buffer for pixel clicks.
+
+    Clicks are coalesced per fingerprint and upserted with one executemany
+    every flush_interval seconds, or sooner once max_batch fingerprints are
+    pending. An attribution becomes visible to conversions after the flush.
+    """
+
+    def __init__(self, db, flush_interval: float = 0.25, max_batch: int = 500):
+        self.db = db
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pending: Dict[str, Tuple[str, str, str, str, str]] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"clicks": 0, "rows_written": 0, "flushes": 0, "failed_flushes": 0}
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def add(self, code: str, fingerprint: str, ip: str, user_agent: str, referrer: str):
+        self.stats["clicks"] += 1
+        first = self._pending.get(fingerprint)
+        if first is None:
+            self._pending[fingerprint] = (code, fingerprint, ip, user_agent, referrer)
+        else:
+            self._pending[fingerprint] = (code,) + first[1:]
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                pass  # rows were re-queued; retry on the next tick
+
+    async def flush(self) -> int:
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, {}
+        try:
+            await self.db.executemany(UPSERT_ATTRIBUTION_SQL, list(batch.values()))
+        except Exception:
+            self.stats["failed_flushes"] += 1
+            # Merge back as add() would: the failed row is the earlier touch
+            for fingerprint, row in batch.items():
+                newer = self._pending.get(fingerprint)
+                self._pending[fingerprint] = row if newer is None else (newer[0],) + row[1:]
+            raise
+        self.stats["flushes"] += 1
+        self.stats["rows_written"] += len(batch)
+        return len(batch)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, HTTPException, Response, Request, Header
+from fastapi import FastAPI, HTTPException, Response, Request, Header, Query
 from pydantic import BaseModel, EmailStr
 import asyncpg
 import os
@@ -8,15 +8,38 @@ from datetime import datetime
 from prometheus_client import Counter, generate_latest, CONTENT_TYPE_LATEST
 from billing import BillingManager
 from webhooks import WEBHOOK_HANDLERS
+from libs.pkg_stream.export import Fields, Keyset, list_rows, wants_ndjson
 
 app = FastAPI()
 DB_DSN = os.getenv("DB_DSN")
+EXPORT_POOL_MAX = int(os.getenv("SUBSCRIPTIONS_EXPORT_POOL_MAX", "4"))
 
 # Metrics
 SUBSCRIPTIONS_CREATED = Counter("subscriptions_created_total", "Total subscriptions created")
 SUBSCRIPTION_CANCELLATIONS = Counter("subscription_cancellations_total", "Total subscription cancellations")
 WEBHOOK_EVENTS = Counter("webhook_events_total", "Webhook events processed", ["event_type"])
 
+def _iso(value):
+    return value.isoformat() if value else None
+
+SUBSCRIPTION_FIELDS = Fields({
+    "id": lambda row: str(row['id']),
+    "tenant_id": lambda row: row['tenant_id'],
+    "customer_ref": lambda row: row['customer_ref'],
+    "plan": lambda row: {
+        "id": str(row['plan_id']),
+        "name": row['plan_name'],
+        "code": row['plan_code']
+    },
+    "status": lambda row: row['status'],
+    "current_period_start": lambda row: _iso(row['current_period_start']),
+    "current_period_end": lambda row: _iso(row['current_period_end']),
+    "trial_end": lambda row: _iso(row['trial_end']),
+    "cancelled_at": lambda row: _iso(row['cancelled_at'])
+})
+
+SUBSCRIPTIONS_KEYSET = Keyset([("s.created_at", "timestamptz"), ("s.id", "uuid")], descending=True)
+
 class PlanRequest(BaseModel):
     tenant_id: str
     code: str
@@ -38,6 +61,7 @@ class SubscribeRequest(BaseModel):
 async def startup():
     app.state.db = await asyncpg.connect(DB_DSN)
     app.state.billing = BillingManager()
+    app.state.export_pool = await asyncpg.create_pool(DB_DSN, min_size=1, max_size=EXPORT_POOL_MAX)
 
 @app.get("/health")
 async def health():
@@ -182,7 +206,13 @@ async def cancel_subscription(subscription_id: str, at_period_end: bool = True):
         raise HTTPException(status_code=400, detail=f"Failed to cancel subscription: {str(e)}")
 
 @app.get("/subscriptions")
-async def list_subscriptions(tenant_id: Optional[str] = None, customer_ref: Optional[str] = None):
+async def list_subscriptions(request: Request,
+                             tenant_id: Optional[str] = None,
+                             customer_ref: Optional[str] = None,
+                             fields: Optional[str] = None,
+                             limit: Optional[int] = Query(None, ge=1, le=1000),
+                             cursor: Optional[str] = None,
+                             format: Optional[str] = None):
     """List subscriptions"""
     query = "SELECT s.*, p.name as plan_name, p.code as plan_code FROM subscriptions s JOIN plans p ON s.plan_id = p.id WHERE 1=1"
     params = []
@@ -194,31 +224,14 @@ async def list_subscriptions(tenant_id: Optional[str] = None, customer_ref: Opti
     if customer_ref:
         query += f" AND s.customer_ref = ${len(params) + 1}"
         params.append(customer_ref)
-        
-    query += " ORDER BY s.created_at DESC"
     
-    rows = await app.state.db.fetch(query, *params)
-    
-    return {
-        "subscriptions": [
-            {
-                "id": str(row['id']),
-                "tenant_id": row['tenant_id'],
-                "customer_ref": row['customer_ref'],
-                "plan": {
-                    "id": str(row['plan_id']),
-                    "name": row['plan_name'],
-                    "code": row['plan_code']
-                },
-                "status": row['status'],
-                "current_period_start": row['current_period_start'].isoformat() if row['current_period_start'] else None,
-                "current_period_end": row['current_period_end'].isoformat() if row['current_period_end'] else None,
-                "trial_end": row['trial_end'].isoformat() if row['trial_end'] else None,
-                "cancelled_at": row['cancelled_at'].isoformat() if row['cancelled_at'] else None
-            }
-            for row in rows
-        ]
-    }
+    try:
+        listing = await list_rows(app.state.db, app.state.export_pool, query, params, SUBSCRIPTIONS_KEYSET,
+                                  SUBSCRIPTION_FIELDS, fields, cursor, limit,
+                                  wants_ndjson(format, request.headers.get("accept")))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return listing.response("subscriptions")
 
 # Webhook Handler
 @app.post("/webhooks/billing")
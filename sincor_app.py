@@ -4,10 +4,18 @@ Standalone SINCOR with promo routes - guaranteed to work
 Replace sincor_app.py with this if Railway deployment fails
 """
 
+import sys
+if __name__ == "__main__" and "--profile-startup" in sys.argv:
+    from startup_profiler import main as profile_startup
+    sys.exit(profile_startup(sys.argv[1:], entry_module="sincor_app"))
+
 from pathlib import Path
-from flask import Flask, request, jsonify, send_from_directory, render_template, session
-import os, csv, datetime, re, smtplib
+from flask import Flask, request, jsonify, send_from_directory, render_template, session, Response, stream_with_context
+import os, csv, datetime, re, smtplib, uuid
 from email.message import EmailMessage
+from job_runner import get_job_runner, public_job, JobQueueFull
+from agent_registry import get_agent_registry
+from lazy_routes import install_lazy_routes
 
 # Load environment variables
 def load_environment():
@@ -66,37 +74,122 @@ if not flask_secret:
 
 app.secret_key = flask_secret
 
+# Shared agent instances - built once, rebuilt when their config changes.
+# Config is read from the environment on each lookup so updated keys take effect.
+def _business_intel_config():
+    return {
+        "google_api_key": os.getenv("GOOGLE_API_KEY","") or os.getenv("GOOGLE_PLACES_API_KEY",""),
+        "search_radius": 50000,
+        "rate_limit_delay": 1
+    }
+
+def _campaign_automation_config():
+    return {
+        "smtp_host": os.getenv("SMTP_HOST","") or os.getenv("smtp_host",""),
+        "smtp_port": int(os.getenv("SMTP_PORT","587") or os.getenv("smtp_port","587")),
+        "smtp_user": os.getenv("SMTP_USER","") or os.getenv("smtp_user",""),
+        "smtp_pass": os.getenv("SMTP_PASS","") or os.getenv("smtp_pass",""),
+        "from_email": os.getenv("EMAIL_FROM","noreply@sincor.local") or os.getenv("email_from","noreply@sincor.local")
+    }
+
+def _build_business_intel(config):
+    from agents.intelligence.business_intel_agent import BusinessIntelAgent
+    return BusinessIntelAgent(config=config)
+
+def _build_campaign_automation(config):
+    from agents.marketing.campaign_automation_agent import CampaignAutomationAgent
+    return CampaignAutomationAgent(config=config)
+
+agent_registry = get_agent_registry()
+agent_registry.register("business_intel", _build_business_intel, _business_intel_config)
+agent_registry.register("campaign_automation", _build_campaign_automation, _campaign_automation_config)
+
+if os.getenv("SINCOR_WARM_AGENTS", "0") == "1":
+    agent_registry.warm_in_background()
+
+# Feature route modules named in SINCOR_ROUTE_PROVIDERS (none by default) are
+# imported on first matching request, not at boot
+route_providers = [name.strip() for name in os.getenv("SINCOR_ROUTE_PROVIDERS", "").split(",") if name.strip()]
+lazy_routes = install_lazy_routes(app, names=route_providers)
+
 log(f"Environment loaded from: {env_source}")
 
 # PROMO CODES - DIRECT IMPLEMENTATION
+# Fallback when the promo database is unavailable; limits mirror promo_codes.py
 PROMO_CODES = {
     "PROTOTYPE2025": {
         "description": "Full free access for prototype testing - friends & select testers",
         "trial_days": 90,
         "bypass_payment": True,
-        "max_uses": 50
+        "max_uses": 10
     },
     "COURTTESTER": {
         "description": "Court's personal testing account",
         "trial_days": 365,
         "bypass_payment": True,
-        "max_uses": 10
+        "max_uses": 5
     },
     "FRIENDSTEST": {
         "description": "Friends and family testing - 3 months free",
         "trial_days": 90,
         "bypass_payment": True,
-        "max_uses": 100
+        "max_uses": 20
     }
 }
 
+def _promo_lookup(promo_code, redeem, **usage):
+    """Validate (or redeem) a promo code. Returns (promo_data, error)."""
+    try:
+        from promo_codes import promo_system
+        if redeem:
+            result = promo_system.use_code(promo_code, ip_address=request.remote_addr or "", **usage)
+        else:
+            result = promo_system.validate_code(promo_code)
+    except Exception as e:
+        # Promo database unavailable - fall back to built-in codes
+        log(f"Promo database error, using built-in codes: {e}")
+        if promo_code not in PROMO_CODES:
+            return None, "Invalid or expired promo code"
+        return PROMO_CODES[promo_code], None
+    
+    if not result["valid"]:
+        return None, result["error"]
+    return {"trial_days": result["data"]["free_trial_days"],
+            "bypass_payment": bool(result["data"]["bypass_payment"])}, None
+
+def _redeem_pending_promo(business_data):
+    """Use the promo code held since /free-trial now that the visitor has signed up."""
+    promo_code = session.pop('promo_pending', None)
+    if not promo_code or session.get('promo_active'):
+        return
+    
+    promo_data, error = _promo_lookup(promo_code, redeem=True,
+                                      user_email=business_data['contact_email'],
+                                      business_name=business_data['company_name'])
+    if promo_data is None:
+        log(f"Promo redemption failed at signup: {promo_code} ({error})")
+        return
+    
+    session['promo_active'] = True
+    session['promo_code'] = promo_code
+    session['promo_trial_days'] = promo_data['trial_days']
+    session['promo_bypass_payment'] = promo_data['bypass_payment']
+    session['promo_activated_at'] = datetime.datetime.now().isoformat()
+    log(f"Promo activated successfully: {promo_code}")
+
 @app.route("/free-trial/<promo_code>")
 def free_trial_activation(promo_code):
     """Direct free trial activation via URL."""
     promo_code = promo_code.upper()
     log(f"Promo activation attempt: {promo_code}")
     
-    if promo_code not in PROMO_CODES:
+    # Only check the code here; a use is counted when the business profile is submitted
+    if session.get('promo_active') and session.get('promo_code') == promo_code:
+        promo_data, error = {"trial_days": session.get('promo_trial_days', 0),
+                             "bypass_payment": session.get('promo_bypass_payment', False)}, None
+    else:
+        promo_data, error = _promo_lookup(promo_code, redeem=False)
+    if promo_data is None:
         return f'''<!DOCTYPE html>
 <html><head>
 <title>Invalid Promo Code</title>
@@ -105,26 +198,13 @@ def free_trial_activation(promo_code):
 </head><body class="bg-gray-900 text-white min-h-screen flex items-center justify-center p-4">
 <div class="bg-red-900 p-6 sm:p-8 rounded-lg w-full max-w-md text-center">
 <h1 class="text-xl sm:text-2xl font-bold mb-4">❌ Invalid Code</h1>
-<p class="text-sm sm:text-base mb-4">The promo code "{promo_code}" is not valid.</p>
-<div class="text-xs sm:text-sm text-gray-300 mb-4">
-<p>Try these codes:</p>
-<div class="font-mono text-green-400 space-y-1">
-<div>FRIENDSTEST</div>
-<div>PROTOTYPE2025</div>
-</div>
-</div>
+<p class="text-sm sm:text-base mb-4">The promo code "{promo_code}" is not valid: {error.lower()}.</p>
 <a href="/" class="inline-block bg-blue-600 hover:bg-blue-500 px-4 py-2 rounded text-sm sm:text-base">← Back to Home</a>
 </div></body></html>'''
     
-    # Set promo session
-    promo_data = PROMO_CODES[promo_code]
-    session['promo_active'] = True
-    session['promo_code'] = promo_code
-    session['promo_trial_days'] = promo_data['trial_days']
-    session['promo_bypass_payment'] = promo_data['bypass_payment']
-    session['promo_activated_at'] = datetime.datetime.now().isoformat()
-    
-    log(f"Promo activated successfully: {promo_code}")
+    if not session.get('promo_active'):
+        session['promo_pending'] = promo_code
+        log(f"Promo validated, pending signup: {promo_code}")
     
     css_styles = """
     @media (max-width: 640px) {
@@ -144,7 +224,7 @@ def free_trial_activation(promo_code):
 </style>
 </head><body class="bg-gray-900 text-white min-h-screen flex items-center justify-center p-4">
 <div class="bg-green-900 mobile-container p-6 sm:p-8 rounded-lg w-full max-w-lg text-center">
-<h1 class="mobile-text text-2xl sm:text-3xl font-bold mb-4 sm:mb-6">🎉 FREE TRIAL ACTIVATED!</h1>
+<h1 class="mobile-text text-2xl sm:text-3xl font-bold mb-4 sm:mb-6">🎉 FREE TRIAL UNLOCKED!</h1>
 <div class="bg-black p-4 sm:p-6 rounded-lg mb-4 sm:mb-6">
 <h2 class="text-lg sm:text-xl font-bold text-green-400 mb-3 sm:mb-4">Your SINCOR Access:</h2>
 <div class="space-y-2 text-left text-sm sm:text-base">
@@ -175,7 +255,7 @@ def free_trial_activation(promo_code):
 </a>
 </div>
 <p class="text-xs sm:text-sm text-gray-300 mt-4 sm:mt-6 leading-relaxed">
-You now have full access to SINCOR's 42-agent AI business automation system. Explore all features - no payment required!
+Set up your business profile to start your free trial of SINCOR's 42-agent AI business automation system - no payment required!
 </p>
 </div></body></html>'''
 
@@ -190,12 +270,6 @@ def promo_status():
 <div class="bg-gray-800 p-8 rounded-lg max-w-md text-center">
 <h1 class="text-2xl font-bold mb-4">No Active Trial</h1>
 <p class="mb-6">You don't have an active free trial.</p>
-<div class="space-y-2 text-sm">
-<p>Available promo codes:</p>
-<div class="font-mono text-green-400">
-PROTOTYPE2025<br>FRIENDSTEST<br>COURTTESTER
-</div>
-</div>
 </div></body></html>'''
     
     promo_code = session.get('promo_code')
@@ -246,6 +320,7 @@ def business_setup():
         
         # Store in session
         session['business_profile'] = business_data
+        _redeem_pending_promo(business_data)
         
         log(f"Business setup completed: {business_data['company_name']} ({business_data['industry']})")
         
@@ -454,9 +529,7 @@ def admin():
     else:
         # Try to get real business metrics
         try:
-            from agents.intelligence.business_intel_agent import BusinessIntelAgent
-            config = {"google_api_key": GOOGLE_API_KEY} if GOOGLE_API_KEY else {}
-            intel_agent = BusinessIntelAgent(config=config)
+            intel_agent = agent_registry.get("business_intel")
             stats = intel_agent.get_database_stats()
             
             if stats.get("total_businesses", 0) > 0:
@@ -613,36 +686,30 @@ function openCortexChat() {{
 
 </div></body></html>'''
 
-@app.route("/generate-leads", methods=["POST"])
-def generate_leads():
-    """Generate leads using real business intelligence engine."""
+def _run_lead_generation(job, business_profile):
+    """Job: generate leads using real business intelligence engine."""
     try:
-        from agents.intelligence.business_intel_agent import BusinessIntelAgent
-        
-        business_profile = session.get('business_profile', {})
-        
-        # Initialize real business intel agent
-        config = {
-            "google_api_key": GOOGLE_API_KEY,
-            "search_radius": 50000,
-            "rate_limit_delay": 1
-        }
-        
-        intel_agent = BusinessIntelAgent(config=config)
+        # Shared business intel agent
+        intel_agent = agent_registry.get("business_intel")
         
         # Get business location and type
         location = business_profile.get('location', 'Local area')
         business_type = business_profile.get('industry', 'auto detailing')
         
         # Search multiple directories for comprehensive leads
-        if GOOGLE_API_KEY:
-            businesses = intel_agent.search_multiple_directories(location, business_type)
+        if intel_agent.google_api_key:
+            job.report(5, f"Searching directories for {business_type} in {location}")
+            businesses = intel_agent.search_multiple_directories(
+                location, business_type,
+                progress_callback=lambda done, total, message: job.report(5 + 75 * done // total, message)
+            )
+            job.report(85, f"Saving {len(businesses)} businesses")
             saved_count = intel_agent.save_businesses(businesses) if businesses else 0
             
             # Get high-value prospects
             prospects = intel_agent.get_high_value_prospects(limit=20, min_score=70)
             
-            return jsonify({
+            return {
                 "success": True,
                 "leads_generated": True,
                 "businesses_found": len(businesses),
@@ -652,57 +719,41 @@ def generate_leads():
                 "location": location,
                 "search_type": business_type,
                 "engine": "Real Business Intelligence"
-            })
+            }
         else:
             # Fallback to setup mode
-            return jsonify({
+            return {
                 "success": False,
                 "setup_required": True,
                 "message": "Google API key required for real lead generation",
                 "setup_url": "/admin",
                 "engine": "Setup Required"
-            })
+            }
             
     except Exception as e:
         # Fallback to demo leads if real engine fails
+        log(f"Lead engine failed, using demo leads: {e}")
         from functional_tools import generate_local_leads
-        
-        business_profile = session.get('business_profile', {})
     
-    try:
-        results = generate_local_leads(business_profile)
-        
+    results = generate_local_leads(business_profile)
+    
+    return {
+        "success": True,
+        "message": f"Generated {results['leads_generated']} new leads worth ${results['total_potential_value']}!",
+        "leads": results['leads'],
+        "next_steps": results['next_steps'],
         # Store leads in session for dashboard display
-        session['generated_leads'] = results['leads']
-        session['last_lead_generation'] = datetime.datetime.now().isoformat()
-        
-        return jsonify({
-            "success": True,
-            "message": f"Generated {results['leads_generated']} new leads worth ${results['total_potential_value']}!",
-            "leads": results['leads'],
-            "next_steps": results['next_steps']
-        })
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)})
+        "session_updates": {
+            "generated_leads": results['leads'],
+            "last_lead_generation": datetime.datetime.now().isoformat()
+        }
+    }
 
-@app.route("/create-campaign", methods=["POST"])  
-def create_campaign():
-    """Create real marketing campaign with automation."""
+def _run_campaign_creation(job, business_profile, campaign_type):
+    """Job: create real marketing campaign with automation."""
     try:
-        from agents.marketing.campaign_automation_agent import CampaignAutomationAgent
-        
-        business_profile = session.get('business_profile', {})
-        
-        # Initialize real campaign automation agent
-        config = {
-            "smtp_host": SMTP_HOST,
-            "smtp_port": SMTP_PORT,
-            "smtp_user": SMTP_USER,
-            "smtp_pass": SMTP_PASS,
-            "from_email": EMAIL_FROM
-        }
-        
-        campaign_agent = CampaignAutomationAgent(config=config)
+        # Shared campaign automation agent
+        campaign_agent = agent_registry.get("campaign_automation")
         
         # Create campaign data
         campaign_data = {
@@ -715,13 +766,15 @@ def create_campaign():
         }
         
         # Start real campaign
+        job.report(20, "Creating campaign")
         campaign_id = campaign_agent.create_campaign(campaign_data)
         
         if campaign_id:
             # Start the campaign
+            job.report(60, "Starting campaign")
             success = campaign_agent.start_campaign(campaign_id)
             
-            return jsonify({
+            return {
                 "success": True,
                 "campaign_created": True,
                 "campaign_id": campaign_id,
@@ -730,59 +783,126 @@ def create_campaign():
                 "target_type": campaign_data["target_audience"],
                 "engine": "Real Campaign Automation",
                 "status": "active" if success else "created"
-            })
+            }
         else:
-            return jsonify({
+            return {
                 "success": False,
                 "setup_required": True,
                 "message": "Email configuration required for campaigns",
                 "setup_url": "/admin",
                 "engine": "Setup Required"
-            })
+            }
             
     except Exception as e:
         # Fallback to demo campaign
+        log(f"Campaign engine failed, using demo campaign: {e}")
         from functional_tools import create_marketing_campaign
-        
-        business_profile = session.get('business_profile', {})
-    campaign_type = request.json.get('type', 'local_seo')
     
-    try:
-        results = create_marketing_campaign(business_profile, campaign_type)
-        
+    results = create_marketing_campaign(business_profile, campaign_type)
+    
+    return {
+        "success": True,
+        "message": f"Campaign '{results['campaign']['name']}' created and ready to launch!",
+        "campaign": results['campaign'],
         # Store campaign in session
-        session['active_campaigns'] = session.get('active_campaigns', [])
-        session['active_campaigns'].append(results['campaign'])
-        
-        return jsonify({
-            "success": True,
-            "message": f"Campaign '{results['campaign']['name']}' created and ready to launch!",
-            "campaign": results['campaign']
-        })
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)})
+        "session_updates": {"append_active_campaigns": results['campaign']}
+    }
 
-@app.route("/analyze-opportunities", methods=["POST"])
-def analyze_opportunities():
-    """Analyze business for growth opportunities.""" 
+def _run_opportunity_analysis(job, business_profile):
+    """Job: analyze business for growth opportunities."""
     from functional_tools import analyze_business_opportunities
     
-    business_profile = session.get('business_profile', {})
+    job.report(10, "Analyzing business profile")
+    results = analyze_business_opportunities(business_profile)
     
-    try:
-        results = analyze_business_opportunities(business_profile)
-        
+    return {
+        "success": True,
+        "message": f"Found {results['opportunities_found']} growth opportunities worth {results['total_potential_monthly']}/month!",
+        "opportunities": results['opportunities'],
         # Store analysis in session
-        session['business_analysis'] = results
-        session['analysis_date'] = datetime.datetime.now().isoformat()
-        
-        return jsonify({
-            "success": True,
-            "message": f"Found {results['opportunities_found']} growth opportunities worth {results['total_potential_monthly']}/month!",
-            "opportunities": results['opportunities']
-        })
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)})
+        "session_updates": {
+            "business_analysis": results,
+            "analysis_date": datetime.datetime.now().isoformat()
+        }
+    }
+
+def _job_owner():
+    """Stable per-browser id used to scope jobs to the session that started them."""
+    if 'job_owner' not in session:
+        session['job_owner'] = uuid.uuid4().hex
+    return session['job_owner']
+
+def _submit_job(kind, func, *args):
+    """Queue a job and return the 202 response clients poll or stream."""
+    try:
+        job_id = get_job_runner().submit(kind, func, *args, owner=_job_owner())
+    except JobQueueFull:
+        return jsonify({"success": False, "error": "Too many jobs in progress, try again shortly"}), 503
+    
+    return jsonify({
+        "success": True,
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/jobs/{job_id}",
+        "events_url": f"/jobs/{job_id}/events"
+    }), 202
+
+def _apply_session_updates(job):
+    """Copy a finished job's session updates into the owner's session once."""
+    result = job.get("result") or {}
+    updates = result.pop("session_updates", None)
+    applied = session.get('applied_jobs', [])
+    if not updates or job["id"] in applied:
+        return
+    
+    for key, value in updates.items():
+        if key.startswith("append_"):
+            key = key[len("append_"):]
+            session[key] = session.get(key, []) + [value]
+        else:
+            session[key] = value
+    session['applied_jobs'] = (applied + [job["id"]])[-20:]
+
+@app.route("/generate-leads", methods=["POST"])
+def generate_leads():
+    """Queue lead generation; returns a job id to poll or stream."""
+    return _submit_job("generate_leads", _run_lead_generation, session.get('business_profile', {}))
+
+@app.route("/create-campaign", methods=["POST"])  
+def create_campaign():
+    """Queue campaign creation; returns a job id to poll or stream."""
+    campaign_type = (request.get_json(silent=True) or {}).get('type', 'local_seo')
+    return _submit_job("create_campaign", _run_campaign_creation, session.get('business_profile', {}), campaign_type)
+
+@app.route("/analyze-opportunities", methods=["POST"])
+def analyze_opportunities():
+    """Queue opportunity analysis; returns a job id to poll or stream."""
+    return _submit_job("analyze_opportunities", _run_opportunity_analysis, session.get('business_profile', {}))
+
+@app.get("/jobs/<job_id>")
+def job_status(job_id):
+    """Poll a background job; includes the result once finished."""
+    job = get_job_runner().get(job_id)
+    if job is None or job["owner"] != session.get('job_owner'):
+        return jsonify({"success": False, "error": "Job not found"}), 404
+    
+    if job["status"] == "succeeded":
+        _apply_session_updates(job)
+    
+    return jsonify(public_job(job))
+
+@app.get("/jobs/<job_id>/events")
+def job_events(job_id):
+    """Stream job progress as Server-Sent Events."""
+    job = get_job_runner().get(job_id)
+    if job is None or job["owner"] != session.get('job_owner'):
+        return jsonify({"success": False, "error": "Job not found"}), 404
+    
+    return Response(
+        stream_with_context(get_job_runner().stream(job_id)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.route("/agent-setup")
 def agent_setup():
@@ -1154,5 +1274,6 @@ if __name__=="__main__":
     port=int(os.environ.get("PORT","5001"))  # Use port 5001 to avoid conflicts
     host="0.0.0.0"
     log(f"Starting SINCOR STANDALONE on {host}:{port}")
+    log(f"Agents warmed: {agent_registry.warm()}")
     log("Promo routes: /free-trial/FRIENDSTEST, /free-trial/PROTOTYPE2025, /free-trial/COURTTESTER")
     app.run(host=host, port=port, debug=False)
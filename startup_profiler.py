@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+SINCOR Startup Profiler
+Per-module import time and memory for a Flask entry point
+
+Used by the entry points' ``--profile-startup`` flag, or directly:
+
+    python startup_profiler.py sincor_app [--top 25] [--json outputs/startup_profile.json]
+
+Each module imported while loading the entry point is timed. ``self`` time
+excludes nested imports; ``cumulative`` includes them. RSS is sampled around
+every module body so large in-module tables show up as memory growth.
+"""
+
+import argparse
+import importlib
+import importlib.abc
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def current_rss_kb() -> int:
+    """Resident set size of this process in KB (0 if unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak
+    return 0
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Wraps a real loader to time and measure module execution."""
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler._enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(module.__name__)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _TimedFinder(importlib.abc.MetaPathFinder):
+    """Meta path hook that hands out timed loaders."""
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self._profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    """Records import timings while active."""
+
+    def __init__(self):
+        self.records: Dict[str, Dict] = {}
+        self._stack: List[Dict] = []
+        self._finder = _TimedFinder(self)
+
+    def _enter(self, name: str):
+        self._stack.append({"name": name, "start": time.perf_counter(),
+                            "rss_start": current_rss_kb(), "children": 0.0})
+
+    def _exit(self, name: str):
+        frame = self._stack.pop()
+        cumulative = time.perf_counter() - frame["start"]
+        if self._stack:
+            self._stack[-1]["children"] += cumulative
+        self.records[name] = {
+            "module": name,
+            "self_ms": round((cumulative - frame["children"]) * 1000, 2),
+            "cumulative_ms": round(cumulative * 1000, 2),
+            "rss_delta_kb": current_rss_kb() - frame["rss_start"],
+            "depth": len(self._stack)
+        }
+
+    def __enter__(self):
+        sys.meta_path.insert(0, self._finder)
+        return self
+
+    def __exit__(self, *exc):
+        sys.meta_path.remove(self._finder)
+        return False
+
+
+def profile_startup(entry_module: str, top: int = 25, json_path: Optional[str] = None,
+                    include_lazy: bool = False) -> int:
+    """Import entry_module under the profiler and print a report. Returns an exit code."""
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    sys.modules.pop(entry_module, None)
+
+    rss_before = current_rss_kb()
+    start = time.perf_counter()
+    profiler = StartupProfiler()
+    with profiler:
+        module = importlib.import_module(entry_module)
+        entry_seconds = time.perf_counter() - start
+        entry_rss = current_rss_kb()
+        startup_records = sorted(profiler.records.values(), key=lambda r: r["cumulative_ms"], reverse=True)
+
+        lazy = {}
+        dispatcher = getattr(module, "app", None) and module.app.extensions.get("lazy_routes")
+        if include_lazy and dispatcher is not None:
+            for name in dispatcher.names:
+                dispatcher.load(name)
+            lazy = dispatcher.get_stats()
+
+    report = {
+        "entry_module": entry_module,
+        "startup_ms": round(entry_seconds * 1000, 2),
+        "rss_start_kb": rss_before,
+        "rss_after_startup_kb": entry_rss,
+        "rss_delta_kb": entry_rss - rss_before,
+        "modules_imported": len(startup_records),
+        "modules": startup_records,
+        "lazy_providers": lazy
+    }
+
+    print(f"Startup profile: {entry_module}")
+    print(f"  import time: {report['startup_ms']:.1f} ms   RSS: {rss_before / 1024:.1f} -> "
+          f"{entry_rss / 1024:.1f} MB   modules: {report['modules_imported']}\n")
+    print(f"  {'module':<48} {'cumulative':>11} {'self':>9} {'RSS +KB':>9}")
+    for record in startup_records[:top]:
+        name = "  " * min(record["depth"], 4) + record["module"]
+        print(f"  {name[:48]:<48} {record['cumulative_ms']:9.1f}ms {record['self_ms']:7.1f}ms "
+              f"{record['rss_delta_kb']:9d}")
+
+    if lazy:
+        print(f"\n  {'deferred provider':<24} {'module':<26} {'load':>9}")
+        for name, stats in lazy.items():
+            status = f"{stats['load_seconds'] * 1000:7.1f}ms" if stats["loaded"] else f"failed: {stats['error']}"
+            print(f"  {name:<24} {stats['module']:<26} {status:>9}")
+
+    if json_path:
+        Path(json_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(json_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {json_path}")
+
+    return 0
+
+
+def main(argv: Optional[List[str]] = None, entry_module: Optional[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Profile import time and RSS of a SINCOR entry point")
+    if entry_module is None:
+        parser.add_argument("entry_module", help="Module to import, e.g. sincor_app")
+    parser.add_argument("--profile-startup", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--top", type=int, default=25, help="Rows to print (default 25)")
+    parser.add_argument("--json", dest="json_path", help="Also write the full report as JSON")
+    parser.add_argument("--include-lazy", action="store_true",
+                        help="Also load the enabled deferred route providers and report their cost")
+    args = parser.parse_args(argv)
+    return profile_startup(entry_module or args.entry_module, args.top, args.json_path, args.include_lazy)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,16 +10,49 @@ Implements lightweight market/contract-net for autonomous work assignment:
 - No central micromanaging - pure distributed coordination
 """
 
+import copy
 import json
 import os
 import uuid
-from typing import Dict, List, Optional, Any, Set
+from typing import Callable, Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from enum import Enum
 import heapq
 from collections import defaultdict
 
+from market_journal import MarketJournal
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:
+    linear_sum_assignment = None
+
+# Multi-criteria bid scoring weights
+BID_SCORE_WEIGHTS = {
+    "confidence": 0.40,
+    "reputation": 0.25,
+    "efficiency": 0.20,
+    "plan_quality": 0.10,
+    "archetype_match": 0.05
+}
+
+ARCHETYPE_SKILL_AFFINITY = {
+    "Scout": ["prospect", "scrape", "monitor", "research", "validate"],
+    "Synthesizer": ["summarize", "dedup", "deconflict", "analyze", "curate"],
+    "Builder": ["develop", "automate", "deploy", "test", "debug"],
+    "Negotiator": ["outreach", "negotiate", "persuade", "present", "close"],
+    "Caretaker": ["clean", "label", "backup", "maintain", "organize"],
+    "Auditor": ["evaluate", "verify", "investigate", "report", "certify"],
+    "Director": ["prioritize", "coordinate", "decide", "allocate", "plan"]
+}
+ARCHETYPE_SKILL_SETS = {archetype: frozenset(skills) for archetype, skills in ARCHETYPE_SKILL_AFFINITY.items()}
+
 class TaskStatus(Enum):
     """Task lifecycle status"""
     BROADCAST = "broadcast"         # Available for bidding
@@ -99,6 +132,60 @@ class MarketTransaction:
     penalties_applied: int        # Penalties for quality/deadline issues
     recorded_at: str
 
+class SkillIndex:
+    """Interned skill vocabulary with per-agent competency bitsets
+    
+    Each skill gets one bit; an agent's competencies and a task's required
+    skills become ints, so eligibility is a single AND. A reverse index maps
+    each skill to the agents holding it for push-style task broadcast.
+    """
+    
+    def __init__(self):
+        self.skill_bits: Dict[str, int] = {}
+        self.agent_masks: Dict[str, int] = {}
+        self.agents_by_skill: Dict[str, Set[str]] = defaultdict(set)
+    
+    def mask(self, skills: List[str]) -> int:
+        """Bitset for a list of skills, interning unseen ones"""
+        
+        mask = 0
+        for skill in skills:
+            bit = self.skill_bits.get(skill)
+            if bit is None:
+                bit = self.skill_bits[skill] = 1 << len(self.skill_bits)
+            mask |= bit
+        return mask
+    
+    def set_competencies(self, agent_id: str, competencies: List[str]):
+        """Replace an agent's competency bitset and reverse-index entries"""
+        
+        for skill in self.skills_for(self.agent_masks.get(agent_id, 0)):
+            self.agents_by_skill[skill].discard(agent_id)
+        self.agent_masks[agent_id] = self.mask(competencies)
+        for skill in competencies:
+            self.agents_by_skill[skill].add(agent_id)
+    
+    def remove_agent(self, agent_id: str):
+        for skill in self.skills_for(self.agent_masks.pop(agent_id, 0)):
+            self.agents_by_skill[skill].discard(agent_id)
+    
+    def is_eligible(self, agent_id: str, required_mask: int) -> bool:
+        return self.agent_masks.get(agent_id, 0) & required_mask == required_mask
+    
+    def skills_for(self, mask: int) -> List[str]:
+        return [skill for skill, bit in self.skill_bits.items() if mask & bit]
+    
+    def missing_skills(self, agent_id: str, required_mask: int) -> List[str]:
+        return self.skills_for(required_mask & ~self.agent_masks.get(agent_id, 0))
+    
+    def eligible_agents(self, skills: List[str]) -> Set[str]:
+        """Agents holding every skill, intersecting the smallest skill sets first"""
+        
+        if not skills:
+            return set(self.agent_masks)
+        holders = sorted((self.agents_by_skill.get(skill, set()) for skill in set(skills)), key=len)
+        return holders[0].intersection(*holders[1:])
+
 class TaskMarket:
     """Distributed task market with contract-net protocol"""
     
@@ -107,18 +194,29 @@ class TaskMarket:
         
         os.makedirs(market_dir, exist_ok=True)
         
-        # Market state files
+        # Legacy JSON state files (imported into the journal once)
         self.active_tasks_file = f"{market_dir}/active_tasks.json"
         self.bids_file = f"{market_dir}/bids.jsonl" 
         self.assignments_file = f"{market_dir}/assignments.json"
         self.transactions_file = f"{market_dir}/transactions.jsonl"
         self.reputation_file = f"{market_dir}/agent_reputation.json"
         
+        # Append-only journal with per-task / per-agent indexes
+        self.journal = MarketJournal(market_dir)
+        if self.journal.is_empty():
+            self._import_legacy_files()
+        
         # Load current state
         self.active_tasks = self._load_active_tasks()
         self.active_assignments = self._load_assignments()
         self.agent_reputation = self._load_reputation()
         
+        # Competency bitsets for eligibility checks and targeted broadcast
+        self.skill_index = SkillIndex()
+        self._task_skill_masks: Dict[str, int] = {}
+        self.bidders: Dict[str, Callable[[TaskContract], Optional[AgentBid]]] = {}
+        self._reindex_skills()
+        
         # Market metrics
         self.market_stats = {
             "total_tasks_posted": 0,
@@ -128,48 +226,69 @@ class TaskMarket:
             "market_efficiency": 0.0  # Time from post to assignment
         }
     
+    def _import_legacy_files(self):
+        """Seed an empty journal from the pre-journal JSON/JSONL files"""
+        
+        for kind, path in [("task", self.active_tasks_file), ("assignment", self.assignments_file),
+                           ("reputation", self.reputation_file)]:
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    for key, value in json.load(f).items():
+                        self.journal.append(kind, key, value)
+        
+        for kind, path, id_field in [("bid", self.bids_file, "bid_id"),
+                                     ("transaction", self.transactions_file, "transaction_id")]:
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    for line in f:
+                        if line.strip():
+                            data = json.loads(line)
+                            self.journal.append(kind, data[id_field], data)
+        
+        self.journal.snapshot()
+    
+    # Flat journal records; the journal encodes them immediately, so a
+    # shallow copy is enough and avoids dataclasses.asdict's deep recursion
+    
+    @staticmethod
+    def _task_record(task: TaskContract) -> Dict[str, Any]:
+        return {**vars(task), 'status': task.status.value}
+    
+    @staticmethod
+    def _bid_record(bid: AgentBid) -> Dict[str, Any]:
+        return {**vars(bid), 'status': bid.status.value}
+    
+    @classmethod
+    def _assignment_record(cls, assignment: TaskAssignment) -> Dict[str, Any]:
+        return {**vars(assignment), 'bid_accepted': cls._bid_record(assignment.bid_accepted)}
+    
     def _load_active_tasks(self) -> Dict[str, TaskContract]:
         """Load currently active tasks"""
         
-        if not os.path.exists(self.active_tasks_file):
-            return {}
-            
-        with open(self.active_tasks_file, 'r') as f:
-            data = json.load(f)
-            
         tasks = {}
-        for task_id, task_data in data.items():
+        for task_id, task_data in self.journal.state["task"].items():
+            task_data = dict(task_data)
             # Convert status string to enum
             task_data['status'] = TaskStatus(task_data['status'])
             tasks[task_id] = TaskContract(**task_data)
             
         return tasks
     
-    def _save_active_tasks(self):
-        """Save active tasks to storage"""
+    def _save_active_tasks(self, task_id: Optional[str] = None):
+        """Journal one task (or all active tasks)"""
         
-        data = {}
-        for task_id, task in self.active_tasks.items():
-            task_dict = asdict(task)
-            task_dict['status'] = task.status.value
-            data[task_id] = task_dict
-            
-        with open(self.active_tasks_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        task_ids = [task_id] if task_id else list(self.active_tasks)
+        for tid in task_ids:
+            self.journal.append("task", tid, self._task_record(self.active_tasks[tid]))
     
     def _load_assignments(self) -> Dict[str, TaskAssignment]:
         """Load active task assignments"""
         
-        if not os.path.exists(self.assignments_file):
-            return {}
-            
-        with open(self.assignments_file, 'r') as f:
-            data = json.load(f)
-            
         assignments = {}
-        for assignment_id, assignment_data in data.items():
+        for assignment_id, assignment_data in self.journal.state["assignment"].items():
+            assignment_data = dict(assignment_data)
             # Reconstruct bid object
-            bid_data = assignment_data['bid_accepted']
+            bid_data = dict(assignment_data['bid_accepted'])
             bid_data['status'] = BidStatus(bid_data['status'])
             assignment_data['bid_accepted'] = AgentBid(**bid_data)
             
@@ -177,32 +296,43 @@ class TaskMarket:
             
         return assignments
     
-    def _save_assignments(self):
-        """Save assignments to storage"""
+    def _save_assignments(self, assignment_id: Optional[str] = None):
+        """Journal one assignment (or all assignments)"""
         
-        data = {}
-        for assignment_id, assignment in self.active_assignments.items():
-            assignment_dict = asdict(assignment)
-            assignment_dict['bid_accepted']['status'] = assignment.bid_accepted.status.value
-            data[assignment_id] = assignment_dict
-            
-        with open(self.assignments_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        assignment_ids = [assignment_id] if assignment_id else list(self.active_assignments)
+        for aid in assignment_ids:
+            self.journal.append("assignment", aid, self._assignment_record(self.active_assignments[aid]))
     
     def _load_reputation(self) -> Dict[str, Dict[str, Any]]:
         """Load agent reputation scores"""
         
-        if not os.path.exists(self.reputation_file):
-            return {}
-            
-        with open(self.reputation_file, 'r') as f:
-            return json.load(f)
+        return copy.deepcopy(self.journal.state["reputation"])
+    
+    def _save_reputation(self, agent_id: Optional[str] = None):
+        """Journal one agent's reputation (or all agents)"""
+        
+        agent_ids = [agent_id] if agent_id else list(self.agent_reputation)
+        for aid in agent_ids:
+            self.journal.append("reputation", aid, copy.deepcopy(self.agent_reputation[aid]))
+        
+        if agent_id:
+            self.skill_index.set_competencies(agent_id, self.agent_reputation[agent_id].get("competencies", []))
+        else:
+            self._reindex_skills()
     
-    def _save_reputation(self):
-        """Save reputation scores"""
+    def _reindex_skills(self):
+        """Rebuild competency bitsets from agent_reputation"""
         
-        with open(self.reputation_file, 'w') as f:
-            json.dump(self.agent_reputation, f, indent=2)
+        for agent_id in set(self.skill_index.agent_masks) - set(self.agent_reputation):
+            self.skill_index.remove_agent(agent_id)
+        for agent_id, rep in self.agent_reputation.items():
+            self.skill_index.set_competencies(agent_id, rep.get("competencies", []))
+    
+    def _task_skill_mask(self, task: TaskContract) -> int:
+        mask = self._task_skill_masks.get(task.task_id)
+        if mask is None:
+            mask = self._task_skill_masks[task.task_id] = self.skill_index.mask(task.skills_required)
+        return mask
     
     # TASK MARKET OPERATIONS
     
@@ -222,7 +352,7 @@ class TaskMarket:
         
         # Add to active tasks
         self.active_tasks[task.task_id] = task
-        self._save_active_tasks()
+        self._save_active_tasks(task.task_id)
         
         # Update market stats
         self.market_stats["total_tasks_posted"] += 1
@@ -232,8 +362,40 @@ class TaskMarket:
         print(f"   Reward: {task.reward} merit points")
         print(f"   Deadline: {task.deadline}")
         
+        self._broadcast_task(task)
+        
         return task.task_id
     
+    def register_bidder(self, agent_id: str, bid_callback: Callable[[TaskContract], Optional[AgentBid]]):
+        """Have post_task offer matching tasks to this agent; the callback returns a bid or None"""
+        
+        self.bidders[agent_id] = bid_callback
+    
+    def unregister_bidder(self, agent_id: str):
+        self.bidders.pop(agent_id, None)
+    
+    def get_eligible_agents(self, task_id: str) -> Set[str]:
+        """Agents whose competencies cover the task's required skills"""
+        
+        task = self.active_tasks.get(task_id)
+        if task is None:
+            return set()
+        return self.skill_index.eligible_agents(task.skills_required)
+    
+    def _broadcast_task(self, task: TaskContract):
+        """Offer the task only to registered bidders that qualify for it"""
+        
+        if not self.bidders:
+            return
+        
+        recipients = sorted(self.skill_index.eligible_agents(task.skills_required).intersection(self.bidders))
+        
+        print(f"   Broadcast to {len(recipients)}/{len(self.bidders)} eligible bidders")
+        for agent_id in recipients:
+            bid = self.bidders[agent_id](task)
+            if bid is not None:
+                self.submit_bid(bid)
+    
     def submit_bid(self, bid: AgentBid) -> bool:
         """Submit a bid for a task"""
         
@@ -247,11 +409,9 @@ class TaskMarket:
             return False
         
         # Check agent has required skills
-        agent_rep = self.agent_reputation.get(bid.agent_id, {})
-        agent_skills = agent_rep.get("competencies", [])
-        
-        missing_skills = set(task.skills_required) - set(agent_skills)
-        if missing_skills:
+        required_mask = self._task_skill_mask(task)
+        if not self.skill_index.is_eligible(bid.agent_id, required_mask):
+            missing_skills = set(self.skill_index.missing_skills(bid.agent_id, required_mask))
             print(f"[ERROR] Agent {bid.agent_id} missing skills: {missing_skills}")
             return False
         
@@ -263,10 +423,7 @@ class TaskMarket:
         bid.status = BidStatus.SUBMITTED
         
         # Log bid
-        with open(self.bids_file, 'a') as f:
-            bid_dict = asdict(bid)
-            bid_dict['status'] = bid.status.value
-            f.write(json.dumps(bid_dict) + '\n')
+        self.journal.append("bid", bid.bid_id, self._bid_record(bid))
         
         # Update market stats
         self.market_stats["total_bids_received"] += 1
@@ -284,21 +441,14 @@ class TaskMarket:
     def get_task_bids(self, task_id: str) -> List[AgentBid]:
         """Get all bids for a specific task"""
         
-        if not os.path.exists(self.bids_file):
-            return []
-            
         bids = []
-        with open(self.bids_file, 'r') as f:
-            for line in f:
-                if line.strip():
-                    data = json.loads(line)
-                    if data.get('task_id') == task_id:
-                        data['status'] = BidStatus(data['status'])
-                        bids.append(AgentBid(**data))
+        for data in self.journal.get_bids_for_task(task_id):
+            data['status'] = BidStatus(data['status'])
+            bids.append(AgentBid(**data))
         
         return bids
     
-    def evaluate_and_award_task(self, task_id: str) -> Optional[str]:
+    def evaluate_and_award_task(self, task_id: str, verbose: bool = True) -> Optional[str]:
         """Evaluate bids and award task to best agent"""
         
         if task_id not in self.active_tasks:
@@ -308,7 +458,8 @@ class TaskMarket:
         bids = self.get_task_bids(task_id)
         
         if not bids:
-            print(f"[WARN] No bids received for task {task_id}")
+            if verbose:
+                print(f"[WARN] No bids received for task {task_id}")
             return None
         
         # Score bids using multi-criteria evaluation
@@ -318,21 +469,33 @@ class TaskMarket:
             if bid.status != BidStatus.SUBMITTED:
                 continue
                 
-            score = self._score_bid(bid, task)
+            score = self._score_bid(bid, task, verbose=verbose)
             scored_bids.append((score, bid))
         
         if not scored_bids:
             return None
             
         # Award to highest scoring bid
-        scored_bids.sort(reverse=True)
+        scored_bids.sort(key=lambda scored: scored[0], reverse=True)
         winning_score, winning_bid = scored_bids[0]
         
+        return self._award_bid(task, winning_bid, winning_score,
+                               [bid for _, bid in scored_bids[1:]], verbose=verbose)
+    
+    def _award_bid(self, task: TaskContract, winning_bid: AgentBid, winning_score: float,
+                   losing_bids: List[AgentBid], verbose: bool = True,
+                   journal_batch: Optional[List[Tuple[str, str, Dict[str, Any]]]] = None) -> str:
+        """Create the assignment for a winning bid and update task/bid state
+        
+        With journal_batch the assignment and task records are added to it
+        for the caller to journal, instead of being journaled here.
+        """
+        
         # Create assignment
         assignment_id = f"A-{uuid.uuid4().hex[:8]}"
         assignment = TaskAssignment(
             assignment_id=assignment_id,
-            task_id=task_id,
+            task_id=task.task_id,
             agent_id=winning_bid.agent_id,
             assigned_at=datetime.now().isoformat(),
             bid_accepted=winning_bid,
@@ -345,77 +508,73 @@ class TaskMarket:
         winning_bid.status = BidStatus.ACCEPTED
         
         # Reject other bids
-        for _, bid in scored_bids[1:]:
+        for bid in losing_bids:
             bid.status = BidStatus.REJECTED
         
         # Store assignment
         self.active_assignments[assignment_id] = assignment
-        self._save_assignments()
-        self._save_active_tasks()
+        if journal_batch is None:
+            self._save_assignments(assignment_id)
+            self._save_active_tasks(task.task_id)
+        else:
+            journal_batch.append(("assignment", assignment_id, self._assignment_record(assignment)))
+            journal_batch.append(("task", task.task_id, self._task_record(task)))
         
         # Update market efficiency metric
         time_to_award = (datetime.now() - datetime.fromisoformat(task.created_at)).total_seconds() / 60
         current_efficiency = self.market_stats.get("market_efficiency", 0)
         self.market_stats["market_efficiency"] = (current_efficiency + time_to_award) / 2
         
-        print(f"[AWARD] Task {task_id} awarded to {winning_bid.agent_id}")
-        print(f"   Winning score: {winning_score:.3f}")
-        print(f"   Time to award: {time_to_award:.1f} minutes")
+        if verbose:
+            print(f"[AWARD] Task {task.task_id} awarded to {winning_bid.agent_id}")
+            print(f"   Winning score: {winning_score:.3f}")
+            print(f"   Time to award: {time_to_award:.1f} minutes")
         
         return assignment_id
     
-    def _score_bid(self, bid: AgentBid, task: TaskContract) -> float:
+    def _score_bid(self, bid: AgentBid, task: TaskContract, verbose: bool = True) -> float:
         """Score a bid using multiple criteria"""
         
         score_components = {}
         
         # Confidence weight (40%)
-        score_components["confidence"] = bid.confidence * 0.40
+        score_components["confidence"] = bid.confidence * BID_SCORE_WEIGHTS["confidence"]
         
         # Agent reputation weight (25%)
         agent_rep = self.agent_reputation.get(bid.agent_id, {})
         success_rate = agent_rep.get("success_rate", 0.5)
-        score_components["reputation"] = success_rate * 0.25
+        score_components["reputation"] = success_rate * BID_SCORE_WEIGHTS["reputation"]
         
         # Cost efficiency weight (20%)
         if task.budget_tokens > 0 and task.budget_tool_calls > 0:
             token_efficiency = 1.0 - (bid.estimated_cost_tokens / task.budget_tokens)
             call_efficiency = 1.0 - (bid.estimated_cost_calls / task.budget_tool_calls)
-            score_components["efficiency"] = max(0, (token_efficiency + call_efficiency) / 2) * 0.20
+            score_components["efficiency"] = max(0, (token_efficiency + call_efficiency) / 2) * BID_SCORE_WEIGHTS["efficiency"]
         else:
             score_components["efficiency"] = 0.10  # Default moderate score
         
         # Plan quality weight (10%)
         plan_quality = min(1.0, len(bid.plan) / 5.0)  # More detailed plans score higher
-        score_components["plan_quality"] = plan_quality * 0.10
+        score_components["plan_quality"] = plan_quality * BID_SCORE_WEIGHTS["plan_quality"]
         
         # Archetype match weight (5%)
         archetype_bonus = self._get_archetype_task_match(bid.archetype, task.skills_required)
-        score_components["archetype_match"] = archetype_bonus * 0.05
+        score_components["archetype_match"] = archetype_bonus * BID_SCORE_WEIGHTS["archetype_match"]
         
         total_score = sum(score_components.values())
         
-        print(f"   Bid {bid.bid_id} score: {total_score:.3f} " + 
-              f"(conf:{score_components['confidence']:.2f}, " +
-              f"rep:{score_components['reputation']:.2f}, " +
-              f"eff:{score_components['efficiency']:.2f})")
+        if verbose:
+            print(f"   Bid {bid.bid_id} score: {total_score:.3f} " + 
+                  f"(conf:{score_components['confidence']:.2f}, " +
+                  f"rep:{score_components['reputation']:.2f}, " +
+                  f"eff:{score_components['efficiency']:.2f})")
         
         return total_score
     
     def _get_archetype_task_match(self, archetype: str, required_skills: List[str]) -> float:
         """Get bonus score for archetype-skill alignment"""
         
-        archetype_skill_affinity = {
-            "Scout": ["prospect", "scrape", "monitor", "research", "validate"],
-            "Synthesizer": ["summarize", "dedup", "deconflict", "analyze", "curate"],
-            "Builder": ["develop", "automate", "deploy", "test", "debug"],
-            "Negotiator": ["outreach", "negotiate", "persuade", "present", "close"],
-            "Caretaker": ["clean", "label", "backup", "maintain", "organize"],
-            "Auditor": ["evaluate", "verify", "investigate", "report", "certify"],
-            "Director": ["prioritize", "coordinate", "decide", "allocate", "plan"]
-        }
-        
-        archetype_skills = set(archetype_skill_affinity.get(archetype, []))
+        archetype_skills = ARCHETYPE_SKILL_SETS.get(archetype, frozenset())
         required_skills_set = set(required_skills)
         
         overlap = len(archetype_skills.intersection(required_skills_set))
@@ -423,6 +582,182 @@ class TaskMarket:
         
         return overlap / max(1, total_required)
     
+    # BATCH MARKET CLEARING
+    
+    def score_bids_batch(self, tasks: List[TaskContract], bids: List[AgentBid]) -> "np.ndarray":
+        """Score many bids in one vectorized pass; bids[i].task_id must be in tasks.
+        
+        Produces the same scores as _score_bid, as a float array aligned with bids.
+        """
+        
+        if np is None:
+            raise RuntimeError("numpy is required for batch bid scoring")
+        if not bids:
+            return np.zeros(0)
+        
+        task_index = {task.task_id: i for i, task in enumerate(tasks)}
+        
+        # Per-task columns
+        budget_tokens = np.array([task.budget_tokens for task in tasks], dtype=float)
+        budget_calls = np.array([task.budget_tool_calls for task in tasks], dtype=float)
+        has_budget = (budget_tokens > 0) & (budget_calls > 0)
+        
+        # Archetype match = |affinity ∩ required| / |required| via a skill incidence matrix
+        skill_index: Dict[str, int] = {}
+        task_skills = [set(task.skills_required) for task in tasks]
+        for skills in task_skills:
+            for skill in skills:
+                skill_index.setdefault(skill, len(skill_index))
+        archetypes = list(ARCHETYPE_SKILL_SETS)
+        archetype_index = {archetype: i + 1 for i, archetype in enumerate(archetypes)}  # 0 = unknown
+        
+        task_matrix = np.zeros((len(tasks), len(skill_index)), dtype=float)
+        for row, skills in enumerate(task_skills):
+            task_matrix[row, [skill_index[skill] for skill in skills]] = 1.0
+        affinity_matrix = np.zeros((len(archetypes) + 1, len(skill_index)), dtype=float)
+        for archetype, row in archetype_index.items():
+            columns = [skill_index[skill] for skill in ARCHETYPE_SKILL_SETS[archetype] if skill in skill_index]
+            affinity_matrix[row, columns] = 1.0
+        overlap = affinity_matrix @ task_matrix.T
+        required_counts = np.maximum(1.0, task_matrix.sum(axis=1))
+        
+        # Per-bid columns, extracted in a single pass over the bid objects
+        agent_index: Dict[str, int] = {}
+        columns = np.array([
+            (task_index[bid.task_id], agent_index.setdefault(bid.agent_id, len(agent_index)),
+             archetype_index.get(bid.archetype, 0), bid.confidence,
+             bid.estimated_cost_tokens, bid.estimated_cost_calls, len(bid.plan))
+            for bid in bids
+        ], dtype=float).T
+        bid_task, bid_agent, bid_archetype = columns[:3].astype(np.intp)
+        confidence, cost_tokens, cost_calls, plan_length = columns[3:]
+        agent_success = np.array([self.agent_reputation.get(agent, {}).get("success_rate", 0.5)
+                                  for agent in agent_index], dtype=float)
+        reputation = agent_success[bid_agent]
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            token_efficiency = 1.0 - cost_tokens / budget_tokens[bid_task]
+            call_efficiency = 1.0 - cost_calls / budget_calls[bid_task]
+        efficiency = np.where(
+            has_budget[bid_task],
+            np.maximum(0.0, (token_efficiency + call_efficiency) / 2) * BID_SCORE_WEIGHTS["efficiency"],
+            0.10
+        )
+        archetype_match = overlap[bid_archetype, bid_task] / required_counts[bid_task]
+        
+        return (confidence * BID_SCORE_WEIGHTS["confidence"]
+                + reputation * BID_SCORE_WEIGHTS["reputation"]
+                + efficiency
+                + np.minimum(1.0, plan_length / 5.0) * BID_SCORE_WEIGHTS["plan_quality"]
+                + archetype_match * BID_SCORE_WEIGHTS["archetype_match"])
+    
+    def award_open_tasks(self, agent_capacity: int = 1, capacity_overrides: Optional[Dict[str, int]] = None,
+                         method: str = "greedy", verbose: bool = False) -> Dict[str, str]:
+        """Clear the market: award every open task with bids in one batch.
+        
+        Each agent can hold at most ``agent_capacity`` (or its override) awarded
+        or in-progress tasks, counting ones it already holds. ``method`` is
+        "greedy" (highest score first) or "hungarian" (maximum total score,
+        needs scipy). Returns {task_id: assignment_id} for the awards made.
+        """
+        
+        if method not in ("greedy", "hungarian"):
+            raise ValueError(f"Unknown award method: {method}")
+        if method == "hungarian" and linear_sum_assignment is None:
+            raise RuntimeError("scipy is required for hungarian assignment")
+        
+        open_tasks = [task for task in self.active_tasks.values()
+                      if task.status in (TaskStatus.BROADCAST, TaskStatus.BIDDING)]
+        bids = []
+        for data in self.journal.get_bids_for_tasks([task.task_id for task in open_tasks]):
+            if data['status'] == BidStatus.SUBMITTED.value:
+                data['status'] = BidStatus.SUBMITTED
+                bids.append(AgentBid(**data))
+        if not bids:
+            return {}
+        
+        bid_task_ids = {bid.task_id for bid in bids}
+        bidded_tasks = [task for task in open_tasks if task.task_id in bid_task_ids]
+        scores = self.score_bids_batch(bidded_tasks, bids)
+        
+        # Remaining capacity per agent after tasks it already holds
+        capacity_overrides = capacity_overrides or {}
+        held = defaultdict(int)
+        for assignment in self.active_assignments.values():
+            task = self.active_tasks.get(assignment.task_id)
+            if task and task.status in (TaskStatus.AWARDED, TaskStatus.IN_PROGRESS):
+                held[assignment.agent_id] += 1
+        agents = sorted({bid.agent_id for bid in bids})
+        remaining = {agent: max(0, capacity_overrides.get(agent, agent_capacity) - held[agent]) for agent in agents}
+        
+        if method == "greedy":
+            winners = self._assign_greedy(bids, scores, remaining)
+        else:
+            winners = self._assign_hungarian(bidded_tasks, bids, scores, agents, remaining)
+        
+        bids_by_task = defaultdict(list)
+        for bid in bids:
+            bids_by_task[bid.task_id].append(bid)
+        
+        # One journal write and flush for the whole clearing
+        awards = {}
+        journal_batch = []
+        for task_id, winner in winners.items():
+            losing_bids = [bid for bid in bids_by_task[task_id] if bid is not bids[winner]]
+            awards[task_id] = self._award_bid(self.active_tasks[task_id], bids[winner], float(scores[winner]),
+                                              losing_bids, verbose=verbose, journal_batch=journal_batch)
+        self.journal.append_many(journal_batch)
+        
+        if verbose:
+            print(f"[CLEAR] Awarded {len(awards)}/{len(open_tasks)} open tasks from {len(bids)} bids ({method})")
+        
+        return awards
+    
+    @staticmethod
+    def _assign_greedy(bids: List[AgentBid], scores: "np.ndarray", remaining: Dict[str, int]) -> Dict[str, int]:
+        """Highest-scoring bids first, skipping awarded tasks and full agents. Returns {task_id: bid index}."""
+        
+        winners = {}
+        for i in np.argsort(-scores, kind="stable"):
+            bid = bids[i]
+            if bid.task_id in winners or remaining[bid.agent_id] <= 0:
+                continue
+            winners[bid.task_id] = int(i)
+            remaining[bid.agent_id] -= 1
+        return winners
+    
+    @staticmethod
+    def _assign_hungarian(tasks: List[TaskContract], bids: List[AgentBid], scores: "np.ndarray",
+                          agents: List[str], remaining: Dict[str, int]) -> Dict[str, int]:
+        """Maximum-total-score assignment with one column per agent capacity slot."""
+        
+        task_index = {task.task_id: i for i, task in enumerate(tasks)}
+        agent_index = {agent: i for i, agent in enumerate(agents)}
+        
+        # Best bid per (task, agent); -1 marks "no bid"
+        best = np.full((len(tasks), len(agents)), -1, dtype=np.intp)
+        weight = np.full((len(tasks), len(agents)), -np.inf)
+        for i, bid in enumerate(bids):
+            row, col = task_index[bid.task_id], agent_index[bid.agent_id]
+            if scores[i] > weight[row, col]:
+                weight[row, col], best[row, col] = scores[i], i
+        
+        slots = np.repeat(np.arange(len(agents)), [remaining[agent] for agent in agents])
+        if slots.size == 0:
+            return {}
+        
+        # No-bid pairs cost nothing, so they only fill rows no real bid can take
+        slot_weight = weight[:, slots]
+        cost = np.where(np.isfinite(slot_weight), -slot_weight, 0.0)
+        rows, cols = linear_sum_assignment(cost)
+        
+        winners = {}
+        for row, col in zip(rows, cols):
+            bid_index = best[row, slots[col]]
+            if bid_index >= 0:
+                winners[tasks[row].task_id] = int(bid_index)
+        return winners
+    
     # TASK EXECUTION MANAGEMENT
     
     def start_task_execution(self, assignment_id: str) -> bool:
@@ -444,8 +779,8 @@ class TaskMarket:
         }
         assignment.progress_milestones.append(milestone)
         
-        self._save_active_tasks()
-        self._save_assignments()
+        self._save_active_tasks(assignment.task_id)
+        self._save_assignments(assignment_id)
         
         print(f"[START] Task execution started: {assignment.task_id} by {assignment.agent_id}")
         return True
@@ -465,7 +800,7 @@ class TaskMarket:
         }
         assignment.status_updates.append(update)
         
-        self._save_assignments()
+        self._save_assignments(assignment_id)
         
         print(f"[PROGRESS] Progress update for {assignment.task_id}: {progress_update.get('status', 'update')}")
         return True
@@ -517,8 +852,7 @@ class TaskMarket:
         )
         
         # Log transaction
-        with open(self.transactions_file, 'a') as f:
-            f.write(json.dumps(asdict(transaction)) + '\n')
+        self.journal.append("transaction", transaction.transaction_id, asdict(transaction))
         
         # Update agent reputation
         self._update_agent_reputation(assignment.agent_id, task, completion_quality, actual_duration)
@@ -527,8 +861,8 @@ class TaskMarket:
         self.market_stats["successful_completions"] += 1
         
         # Clean up completed assignment
-        self._save_active_tasks()
-        self._save_assignments()
+        self._save_active_tasks(task.task_id)
+        self._save_assignments(assignment_id)
         
         print(f"[COMPLETE] Task {task.task_id} completed by {assignment.agent_id}")
         print(f"   Quality: {completion_quality:.2f}")
@@ -580,7 +914,7 @@ class TaskMarket:
             spec["avg_quality"] = (spec["avg_quality"] * spec["count"] + quality) / (spec["count"] + 1)
             spec["count"] += 1
         
-        self._save_reputation()
+        self._save_reputation(agent_id)
     
     # MARKET ANALYTICS
     
@@ -631,20 +965,9 @@ class TaskMarket:
     def _get_recent_transactions(self, days: int = 7) -> List[MarketTransaction]:
         """Get recent transactions for analysis"""
         
-        if not os.path.exists(self.transactions_file):
-            return []
-            
         cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-        transactions = []
         
-        with open(self.transactions_file, 'r') as f:
-            for line in f:
-                if line.strip():
-                    data = json.loads(line)
-                    if data["recorded_at"] >= cutoff:
-                        transactions.append(MarketTransaction(**data))
-                        
-        return transactions
+        return [MarketTransaction(**data) for data in self.journal.get_transactions_since(cutoff)]
     
     def get_agent_profile(self, agent_id: str) -> Dict[str, Any]:
         """Get detailed agent profile and performance"""
@@ -654,15 +977,8 @@ class TaskMarket:
             
         rep = self.agent_reputation[agent_id]
         
-        # Get agent's recent bids and assignments
-        recent_bids = []
-        if os.path.exists(self.bids_file):
-            with open(self.bids_file, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        data = json.loads(line)
-                        if data.get("agent_id") == agent_id:
-                            recent_bids.append(data)
+        # Bid activity comes from running counters, not a log scan
+        bid_count, avg_bid_confidence = self.journal.get_agent_bid_stats(agent_id)
         
         profile = {
             "agent_id": agent_id,
@@ -673,8 +989,8 @@ class TaskMarket:
             "specializations": rep.get("specializations", {}),
             "total_merit_earned": rep.get("total_merit_earned", 0),
             "recent_activity": {
-                "bids_submitted": len(recent_bids),
-                "avg_bid_confidence": sum(b.get("confidence", 0) for b in recent_bids) / max(1, len(recent_bids))
+                "bids_submitted": bid_count,
+                "avg_bid_confidence": avg_bid_confidence
             }
         }
         
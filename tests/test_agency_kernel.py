@@ -0,0 +1,127 @@
+import threading
+import time
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from agency_kernel import AgencyKernel, ExecutionPlan, PlanStep
+
+class RecordingMemory:
+    """Memory system double that records episodes in a list."""
+
+    def __init__(self):
+        self.episodes = []
+
+    def record_episode(self, event_type, content, context=None, confidence=0.5):
+        self.episodes.append((event_type, content))
+
+    def query_episodes(self, limit=20):
+        return []
+
+class LimitedLifecycle:
+    """Lifecycle double that grants a fixed number of tool calls."""
+
+    def __init__(self, tool_calls):
+        self.tool_calls = tool_calls
+
+    def consume_budget(self, tokens=0, tool_calls=0):
+        if tool_calls > self.tool_calls:
+            return False
+        self.tool_calls -= tool_calls
+        return True
+
+def step(step_id, dependencies=(), tools=("search",)):
+    return PlanStep(step_id, "analysis", step_id, {}, [], list(dependencies), list(tools), 0.8)
+
+def add_plan(kernel, plan_id, steps):
+    kernel.active_plans[plan_id] = ExecutionPlan(plan_id, "goal_1", steps, 1.0, {}, "", "")
+    kernel._save_plans()
+
+class ConcurrencyProbe:
+    """Tool that sleeps and tracks how many calls overlap."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, plan_step):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return plan_step.step_id
+
+@pytest.fixture
+def kernel(tmp_path):
+    return AgencyKernel("E-test", "Scout", RecordingMemory(), None, kernel_dir=str(tmp_path))
+
+class TestPlanScheduler:
+    """Test parallel plan-step execution."""
+
+    def test_independent_steps_overlap_and_respect_dependencies(self, kernel):
+        probe = ConcurrencyProbe()
+        add_plan(kernel, "plan_a", [step("a"), step("b"), step("c"), step("d", ["a", "b", "c"])])
+
+        start = time.perf_counter()
+        results = kernel.executor_run_plan("plan_a", {"search": probe}, max_parallel=4, invoke_tools=True)
+
+        assert probe.peak == 3
+        assert time.perf_counter() - start < 4 * probe.delay
+        assert all(result.status == "success" for result in results.values())
+        assert results["d"].outputs["search"] == "d"
+
+    def test_tool_limits_serialize_shared_tools(self, kernel):
+        probe = ConcurrencyProbe(delay=0.01)
+        add_plan(kernel, "plan_a", [step(f"s{i}") for i in range(4)])
+
+        results = kernel.executor_run_plan("plan_a", {"search": probe}, tool_limits={"search": 1},
+                                           invoke_tools=True)
+
+        assert probe.peak == 1
+        assert len(results) == 4
+
+    def test_callable_tools_only_run_when_opted_in(self, kernel):
+        probe = ConcurrencyProbe(delay=0)
+        add_plan(kernel, "plan_a", [step("a")])
+
+        result = kernel.executor_run_step("plan_a", "a", {"search": probe})
+
+        assert result.status == "success" and "search" not in result.outputs
+        assert probe.peak == 0
+        assert kernel.executor_run_step("plan_a", "a", {"search": probe}, invoke_tools=True).outputs["search"] == "a"
+
+    def test_failures_and_budget_stop_downstream_steps(self, kernel):
+        add_plan(kernel, "plan_a", [step("a", tools=["missing"]), step("b", ["a"]), step("c")])
+        add_plan(kernel, "plan_b", [step("x", tools=["search", "search"]), step("y"), step("z")])
+
+        failed = kernel.executor_run_plan("plan_a", {"search": True})
+        budgeted = kernel.executor_run_plan("plan_b", {"search": True}, lifecycle=LimitedLifecycle(tool_calls=3))
+
+        assert failed["a"].status == "failed" and "b" not in failed and failed["c"].status == "success"
+        assert sorted(budgeted) == ["x", "y"]
+        assert kernel.memory_system.episodes[-1][1]["budget_exhausted"] is True
+
+class TestPlanRecordIndex:
+    """Test per-plan result and evaluation stores."""
+
+    def test_consolidation_reads_only_plan_records(self, kernel, tmp_path):
+        add_plan(kernel, "plan_a", [step("a")])
+        add_plan(kernel, "plan_b", [step("b")])
+        for plan_id, step_id in [("plan_a", "a"), ("plan_b", "b"), ("plan_a", "a")]:
+            kernel.critic_evaluate_result(kernel.executor_run_step(plan_id, step_id, {"search": True}))
+
+        with open(kernel.results_file, "a") as f:
+            f.write('{"plan_id": "plan_b", "step_')
+
+        reopened = AgencyKernel("E-test", "Scout", RecordingMemory(), None, kernel_dir=str(tmp_path))
+        reopened.executor_run_step("plan_b", "b", {"search": True})
+
+        assert [r.step_id for r in reopened._load_plan_results("plan_a")] == ["a", "a"]
+        assert [r.step_id for r in reopened._load_plan_results("plan_b")] == ["b", "b"]
+        assert {e.plan_id for e in reopened._load_plan_evaluations("plan_a")} == {"plan_a"}
+        assert len(reopened._load_plan_evaluations("plan_a")) == 2
@@ -0,0 +1,45 @@
+import threading
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from agent_registry import AgentRegistry
+
+class TestAgentRegistry:
+    """Test shared agent instances."""
+    
+    def test_builds_once_and_reuses(self):
+        registry = AgentRegistry()
+        registry.register("agent", lambda config: object())
+        assert registry.get("agent") is registry.get("agent")
+        assert registry.get_stats()["agent"]["builds"] == 1
+    
+    def test_rebuilds_when_config_changes(self):
+        config = {"api_key": "a"}
+        registry = AgentRegistry()
+        registry.register("agent", lambda cfg: dict(cfg), lambda: dict(config))
+        
+        assert registry.get("agent")["api_key"] == "a"
+        config["api_key"] = "b"
+        assert registry.get("agent")["api_key"] == "b"
+        assert registry.get_stats()["agent"]["builds"] == 2
+    
+    def test_concurrent_first_use_builds_once(self):
+        built = []
+        def factory(config):
+            built.append(1)
+            return object()
+        
+        registry = AgentRegistry()
+        registry.register("agent", factory)
+        threads = [threading.Thread(target=registry.get, args=("agent",)) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(built) == 1
+    
+    def test_unknown_agent_raises(self):
+        with pytest.raises(KeyError):
+            AgentRegistry().get("missing")
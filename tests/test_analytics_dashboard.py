@@ -0,0 +1,83 @@
+import sqlite3
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from analytics_dashboard import LeadsCsvAggregate, SystemMetricsStore
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / "outputs").mkdir()
+    (tmp_path / "data").mkdir()
+    return tmp_path
+
+def append(path, text):
+    with open(path, "a", newline="") as f:
+        f.write(text)
+
+class TestSystemMetricsStore:
+    """Test incremental lead aggregation and cached table counts."""
+
+    def test_leads_are_folded_in_incrementally(self, root):
+        leads = root / "outputs" / "leads.csv"
+        append(leads, "name,service\nAnn,SEO\nBob,Ads\n")
+        store = SystemMetricsStore(root)
+        assert store.get_snapshot()["leads_count"] == 2
+
+        append(leads, "Cy,SEO\n")
+        assert store.get_snapshot()["leads_count"] == 2  # still within the TTL
+        store.invalidate()
+        snapshot = store.get_snapshot()
+        assert snapshot["leads_count"] == 3
+        assert snapshot["service_counts"] == {"SEO": 2, "Ads": 1}
+
+    def test_quoted_multiline_record_waits_until_complete(self, root):
+        leads = root / "outputs" / "leads.csv"
+        append(leads, 'name,service,notes\nAnn,SEO,"first line\n')
+        aggregate = LeadsCsvAggregate(leads)
+        aggregate.refresh()
+        assert aggregate.leads_count == 0
+
+        append(leads, 'second line"\nBob,Ads,\n')
+        aggregate.refresh()
+        assert aggregate.leads_count == 2
+        assert aggregate.service_counts == {"SEO": 1, "Ads": 1}
+        assert aggregate.offset == leads.stat().st_size
+
+    def test_partial_row_is_not_counted(self, root):
+        leads = root / "outputs" / "leads.csv"
+        append(leads, "name,service\nAnn,SE")
+        aggregate = LeadsCsvAggregate(leads)
+        aggregate.refresh()
+        assert aggregate.leads_count == 0
+
+        append(leads, "O\n")
+        aggregate.refresh()
+        assert aggregate.service_counts == {"SEO": 1}
+
+    def test_rewritten_file_starts_over(self, root):
+        leads = root / "outputs" / "leads.csv"
+        append(leads, "name,service\nAnn,SEO\nBob,Ads\n")
+        aggregate = LeadsCsvAggregate(leads)
+        aggregate.refresh()
+
+        leads.unlink()
+        append(leads, "name,service\nCy,Web\n")
+        aggregate.refresh()
+        assert aggregate.leads_count == 1 and aggregate.service_counts == {"Web": 1}
+
+    def test_table_counts_follow_database_writes(self, root):
+        conn = sqlite3.connect(root / "data" / "business_intelligence.db")
+        conn.execute("CREATE TABLE businesses (id INTEGER)")
+        conn.execute("CREATE TABLE campaigns (id INTEGER)")
+        conn.execute("INSERT INTO businesses VALUES (1)")
+        conn.commit()
+        store = SystemMetricsStore(root, ttl_seconds=0)
+        snapshot = store.get_snapshot()
+        assert snapshot["businesses_count"] == 1 and snapshot["campaigns_count"] == 0
+
+        conn.executemany("INSERT INTO businesses VALUES (?)", [(2,), (3,)])
+        conn.commit()
+        conn.close()
+        assert store.get_snapshot()["businesses_count"] == 3
@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from identity_system import IdentitySystem
+
+AGENT_YAML = """id: E-test-01
+name: Test Agent
+constitution_refs: [{delta}]
+sbt_role:
+  family: Analyst
+  grade: 2
+  competencies: [research, {competency}]
+"""
+
+def cold_hash(document):
+    return hashlib.sha256(json.dumps(document, sort_keys=True).encode()).hexdigest()
+
+@pytest.fixture
+def workspace(tmp_path):
+    (tmp_path / "global.md").write_text("Global constitution", encoding="utf-8")
+    (tmp_path / "delta.md").write_text("Analyst delta", encoding="utf-8")
+    (tmp_path / "agents").mkdir()
+    (tmp_path / "agents" / "E-test-01.yaml").write_text(
+        AGENT_YAML.format(delta=tmp_path / "delta.md", competency="writing"), encoding="utf-8")
+    return tmp_path
+
+def identity_system(workspace):
+    return IdentitySystem(constitution_path=str(workspace / "global.md"),
+                          ledger_cache_path=str(workspace / "data" / "ledger.json"))
+
+class TestLedgerCache:
+    """Test that cached hashes match the uncached json.dumps(sort_keys=True) path."""
+
+    def test_signature_hashes_match_cold_path(self, workspace):
+        system = identity_system(workspace)
+        system.load_all_agents(str(workspace / "agents"))
+        actions = [{"b": 1, "a": [3, {"z": None, "y": 2.5}]}, {"text": "café ✓", "n": -0.0}, {}]
+
+        signed = system.sign_actions("E-test-01", actions)
+
+        assert [s["signature"]["hash"] for s in signed] == [cold_hash(action) for action in actions]
+        assert system.sign_action("E-test-01", actions[0])["signature"]["hash"] == cold_hash(actions[0])
+
+    def test_constitution_hash_matches_cold_path(self, workspace):
+        system = identity_system(workspace)
+        refs = [str(workspace / "delta.md")]
+        expected = cold_hash({"global": "Global constitution", "deltas": ["Analyst delta"], "version": "1.0"})
+
+        assert system.get_constitution_hash(refs) == expected
+        assert system.get_constitution_hash(refs) == expected  # served from the cache
+
+        (workspace / "delta.md").write_text("Analyst delta, amended", encoding="utf-8")
+        assert system.get_constitution_hash(refs) == cold_hash(
+            {"global": "Global constitution", "deltas": ["Analyst delta, amended"], "version": "1.0"})
+
+    def test_warm_ledger_reuses_identities_with_cold_hashes(self, workspace):
+        agents_dir = str(workspace / "agents")
+        cold = identity_system(workspace)
+        cold.load_all_agents(agents_dir)
+        warm = identity_system(workspace)
+        warm.load_all_agents(agents_dir)
+
+        cold_record = cold.export_identity_record("E-test-01")
+        warm_record = warm.export_identity_record("E-test-01")
+        assert warm_record == cold_record
+        assert warm_record["constitution_sha256"] == cold.compute_constitution_hash(
+            "Global constitution", ["Analyst delta"])
+        assert warm.verify_authority("E-test-01", "writing")
+
+    def test_changed_config_is_reparsed(self, workspace):
+        agents_dir = str(workspace / "agents")
+        identity_system(workspace).load_all_agents(agents_dir)
+        agent_file = workspace / "agents" / "E-test-01.yaml"
+        agent_file.write_text(AGENT_YAML.format(delta=workspace / "delta.md", competency="sales"), encoding="utf-8")
+        stat = agent_file.stat()
+        os.utime(agent_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        reloaded = identity_system(workspace)
+        reloaded.load_all_agents(agents_dir)
+        assert reloaded.verify_authority("E-test-01", "sales")
+        assert not reloaded.verify_authority("E-test-01", "writing")
@@ -0,0 +1,132 @@
+import json
+import threading
+import time
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from job_runner import JobRunner, JobQueueFull
+from sincor_app import app
+
+@pytest.fixture
+def job_runner(tmp_path):
+    runner = JobRunner(db_path=tmp_path / "jobs.db", max_workers=2, max_pending=2)
+    yield runner
+    runner.shutdown()
+
+@pytest.fixture
+def client(job_runner):
+    app.config['TESTING'] = True
+    with patch('sincor_app.get_job_runner', return_value=job_runner), app.test_client() as client:
+        yield client
+
+class TestJobRunner:
+    """Test job execution and persisted state."""
+    
+    def test_job_reports_progress_and_result(self, job_runner):
+        def work(job, value):
+            job.report(50, "Halfway")
+            return {"value": value}
+        
+        job_id = job_runner.submit("test", work, 7)
+        job = job_runner.wait(job_id, timeout=10)
+        assert job["status"] == "succeeded"
+        assert job["progress"] == 100
+        assert job["result"] == {"value": 7}
+    
+    def test_failed_job_records_error(self, job_runner):
+        def work(job):
+            raise ValueError("boom")
+        
+        job = job_runner.wait(job_runner.submit("test", work), timeout=10)
+        assert job["status"] == "failed"
+        assert job["error"] == "boom"
+    
+    def test_full_queue_rejects_submission(self, job_runner):
+        release = threading.Event()
+        for _ in range(job_runner.max_pending):
+            job_runner.submit("block", lambda job: release.wait(10))
+        
+        with pytest.raises(JobQueueFull):
+            job_runner.submit("block", lambda job: None)
+        release.set()
+    
+    def test_stream_ends_with_done_event(self, job_runner):
+        job_id = job_runner.submit("test", lambda job: {"ok": True})
+        events = list(job_runner.stream(job_id, heartbeat_seconds=0.1))
+        assert events[-1].startswith("event: done")
+    
+    def test_stream_sees_update_between_read_and_wait(self, job_runner):
+        release = threading.Event()
+        job_id = job_runner.submit("block", lambda job: release.wait(60))
+        deadline = time.monotonic() + 10
+        while job_runner.get(job_id)["status"] != "running" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        
+        get = job_runner.get
+        def get_then_finish(job_id):
+            job = get(job_id)
+            if job["status"] == "running":
+                # the job finishes (and notifies) before stream() starts waiting
+                job_runner._update(job_id, status="succeeded", progress=100, message="Completed")
+            return job
+        
+        started = time.monotonic()
+        with patch.object(job_runner, "get", side_effect=get_then_finish):
+            events = list(job_runner.stream(job_id, heartbeat_seconds=30))
+        release.set()
+        assert time.monotonic() - started < 5
+        assert events[-1].startswith("event: done")
+        assert ": keep-alive\n\n" not in events
+    
+    def test_stream_sends_public_fields_only(self, job_runner):
+        job_id = job_runner.submit("test", lambda job: {"ok": True, "session_updates": {"plan": "pro"}},
+                                   owner="browser-1")
+        events = list(job_runner.stream(job_id, heartbeat_seconds=0.1))
+        done = json.loads(events[-1].split("data: ", 1)[1])
+        assert "owner" not in done
+        assert done["result"] == {"ok": True}
+    
+    def test_restart_marks_unfinished_jobs_failed(self, job_runner):
+        release = threading.Event()
+        job_id = job_runner.submit("block", lambda job: release.wait(10))
+        restarted = JobRunner(db_path=job_runner.db_path, max_workers=1)
+        release.set()
+        assert restarted.get(job_id)["error"] == "Interrupted by restart"
+        restarted.shutdown()
+
+class TestJobRoutes:
+    """Test long operations submitted through the web routes."""
+    
+    def test_analyze_opportunities_runs_as_job(self, client, job_runner):
+        response = client.post('/analyze-opportunities', json={})
+        assert response.status_code == 202
+        submitted = response.get_json()
+        assert submitted['status_url'] == f"/jobs/{submitted['job_id']}"
+        
+        job_runner.wait(submitted['job_id'], timeout=10)
+        job = client.get(submitted['status_url']).get_json()
+        assert job['status'] == 'succeeded'
+        assert job['result']['success'] is True
+        assert 'session_updates' not in job['result']
+        
+        with client.session_transaction() as sess:
+            assert sess['business_analysis']['opportunities'] == job['result']['opportunities']
+    
+    def test_job_not_visible_to_other_sessions(self, client, job_runner):
+        submitted = client.post('/analyze-opportunities', json={}).get_json()
+        job_runner.wait(submitted['job_id'], timeout=10)
+        
+        with app.test_client() as other:
+            assert other.get(submitted['status_url']).status_code == 404
+    
+    def test_full_queue_returns_503(self, client, job_runner):
+        release = threading.Event()
+        for _ in range(job_runner.max_pending):
+            job_runner.submit("block", lambda job: release.wait(10))
+        
+        response = client.post('/analyze-opportunities', json={})
+        release.set()
+        assert response.status_code == 503
@@ -0,0 +1,69 @@
+import importlib
+import pytest
+from pathlib import Path
+from flask import Flask
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lazy_routes import ROUTE_PROVIDERS, install_lazy_routes
+
+ROOT = Path(__file__).parent.parent
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    app = Flask(__name__, root_path=str(ROOT), static_folder=str(ROOT), static_url_path="")
+    app.config['TESTING'] = True
+    app.secret_key = "test"
+    
+    @app.route("/admin")
+    def admin():
+        return "main admin"
+    
+    return app
+
+class TestLazyRoutes:
+    """Test deferred route provider loading."""
+    
+    @pytest.mark.parametrize("name", sorted(ROUTE_PROVIDERS))
+    def test_declared_rules_match_provider(self, name, tmp_path, monkeypatch):
+        """Declared rules must stay in sync with what add_*_routes registers."""
+        monkeypatch.chdir(tmp_path)
+        provider = ROUTE_PROVIDERS[name]
+        try:
+            module = importlib.import_module(provider.module)
+        except ImportError as e:
+            pytest.skip(f"{provider.module} dependencies not installed: {e}")
+        
+        probe = Flask(provider.module, static_folder=None)
+        getattr(module, provider.function)(probe)
+        assert {rule.rule for rule in probe.url_map.iter_rules()} == set(provider.rules)
+    
+    def test_provider_loads_on_first_hit(self, app):
+        dispatcher = install_lazy_routes(app, names=["seo"])
+        assert dispatcher.get_stats()["seo"]["loaded"] is False
+        
+        response = app.test_client().get("/robots.txt")
+        assert response.status_code == 200
+        assert b"Sitemap" in response.data
+        assert dispatcher.get_stats()["seo"]["loaded"] is True
+    
+    def test_main_app_routes_take_precedence(self, app):
+        dispatcher = install_lazy_routes(app, names=["admin"])
+        response = app.test_client().get("/admin")
+        assert response.data == b"main admin"
+        assert dispatcher.get_stats()["admin"]["loaded"] is False
+    
+    def test_unmatched_paths_fall_through(self, app):
+        install_lazy_routes(app, names=["seo"])
+        assert app.test_client().get("/no-such-page").status_code == 404
+    
+    def test_no_providers_enabled_by_default(self, app):
+        dispatcher = install_lazy_routes(app)
+        assert dispatcher.get_stats() == {}
+        assert app.test_client().get("/robots.txt").status_code == 404
+        assert app.test_client().get("/admin/login").status_code == 404
+    
+    def test_unknown_provider_is_rejected(self, app):
+        with pytest.raises(ValueError):
+            install_lazy_routes(app, names=["seo", "no-such-provider"])
@@ -0,0 +1,112 @@
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import legal_guardrails
+from legal_guardrails import LegalGuardrailEngine
+
+COMPLIANT_FOOTER = "SINCOR, 123 Main Street, Clinton IA. Click unsubscribe to opt out."
+
+
+class TestComplianceScanner:
+    """Test the compiled email compliance scanner."""
+    
+    @pytest.fixture(params=["automaton", "fallback"])
+    def engine(self, request, monkeypatch):
+        """Engine built with and without the optional pyahocorasick backend."""
+        if request.param == "automaton":
+            pytest.importorskip("ahocorasick")
+        else:
+            monkeypatch.setattr(legal_guardrails, "ahocorasick", None)
+        return LegalGuardrailEngine()
+    
+    def test_compliant_email(self, engine):
+        """Test a clean email passes."""
+        result = engine.validate_email_content({
+            "subject": "Quick question about your bookings",
+            "body": "Hi, we help detailers fill their calendar. " + COMPLIANT_FOOTER
+        })
+        
+        assert result["compliant"] is True
+        assert result["violations"] == []
+        assert result["risk_score"] == 0
+    
+    def test_prohibited_terms_in_category_order(self, engine):
+        """Test terms in subject and body are reported once, in category order."""
+        result = engine.validate_email_content({
+            "subject": "Act now for guaranteed results",
+            "body": "Stock tips inside. Act now! " + COMPLIANT_FOOTER
+        })
+        
+        terms = [(v["category"], v["term"]) for v in result["violations"]]
+        assert terms == [
+            ("earnings_violations", "guaranteed results"),
+            ("financial_advice", "stock tips"),
+            ("spam_indicators", "act now"),
+        ]
+        assert result["risk_score"] == 60
+        assert result["violations"][0] == {
+            "type": "prohibited_term",
+            "category": "earnings_violations",
+            "term": "guaranteed results",
+            "severity": "high",
+            "description": "Use of prohibited term 'guaranteed results' may violate advertising regulations"
+        }
+    
+    def test_overlapping_terms_all_reported(self, engine):
+        """Test overlapping prohibited terms are each detected."""
+        result = engine.validate_email_content({
+            "subject": "",
+            "body": "passive income guaranteed territory. " + COMPLIANT_FOOTER
+        })
+        
+        terms = {v["term"] for v in result["violations"]}
+        assert {"passive income guaranteed", "guaranteed territory"} <= terms
+    
+    def test_can_spam_and_earnings_checks(self, engine):
+        """Test CAN-SPAM and earnings violations match the helper checks."""
+        email = {"subject": "Hello", "body": "You could earn $5,000 per month with us."}
+        result = engine.validate_email_content(email)
+        
+        types = [v["type"] for v in result["violations"]]
+        assert types == [
+            "missing_sender_id",
+            "missing_physical_address",
+            "missing_unsubscribe",
+            "unsubstantiated_earnings_claim",
+        ]
+        assert types[:3] == [v["type"] for v in engine._check_can_spam_compliance(email)]
+        assert result["risk_level"] == "critical"
+    
+    @pytest.mark.parametrize("body", ["make $, per month guaranteed", "earn ,% roi"])
+    def test_earnings_claim_without_digits(self, engine, body):
+        """Test the prefilter keeps claims the earnings pattern matches with commas only."""
+        result = engine.validate_email_content({"subject": "Hi", "body": body})
+
+        types = [v["type"] for v in result["violations"] if v["type"] == "unsubstantiated_earnings_claim"]
+        assert types == ["unsubstantiated_earnings_claim"]
+        assert types == [v["type"] for v in engine._check_earnings_claims(body)]
+
+    def test_earnings_claim_with_disclaimer(self, engine):
+        """Test disclaimers clear earnings claims."""
+        result = engine.validate_email_content({
+            "subject": "Case study",
+            "body": "Clients saw a 3x ROI. Results may vary. " + COMPLIANT_FOOTER
+        })
+        
+        assert result["compliant"] is True
+    
+    def test_validate_campaign(self, engine):
+        """Test batch validation keeps order and summarizes violations."""
+        emails = [
+            {"subject": "Hi", "body": "Welcome aboard. " + COMPLIANT_FOOTER},
+            {"subject": "Limited time", "body": "Hello there."},
+        ]
+        
+        summary = engine.validate_campaign(emails)
+        
+        assert summary["emails_checked"] == 2
+        assert summary["non_compliant_emails"] == [1]
+        assert summary["violation_counts"]["prohibited_term"] == 1
+        assert summary["results"] == engine.validate_email_batch(emails)
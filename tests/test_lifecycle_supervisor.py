@@ -0,0 +1,78 @@
+import json
+import os
+import pytest
+from datetime import datetime
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lifecycle_supervisor import LifecycleSupervisor
+from lifecycle_system import LifecycleState
+
+AGENTS_DIR = Path(__file__).parent.parent / "agents"
+
+@pytest.fixture
+def supervisor(tmp_path):
+    start = datetime(2026, 3, 2, 5, 0).timestamp()  # a Monday, before the first work block
+    supervisor = LifecycleSupervisor(str(tmp_path), clock=lambda: start, flush_interval=3600)
+    supervisor.start = start
+    yield supervisor
+    supervisor.close()
+
+class TestLifecycleSupervisor:
+    """Test the single-process lifecycle supervisor."""
+
+    def test_timers_drive_work_blocks_and_batch_persistence(self, supervisor):
+        scout = supervisor.add_agent("E-scout", "Scout")
+        supervisor.add_agent("E-builder", "Builder")
+        assert not os.path.exists(scout.journal.journal_path)  # buffered until the supervisor flushes
+
+        supervisor.run_pending(supervisor.start + 3600 + 60)   # Scout's 06:00 block has started
+        assert scout.current_state == LifecycleState.SHIFT
+        assert supervisor.managers["E-builder"].current_state == LifecycleState.ONBOARD
+        assert os.path.exists(scout.journal.journal_path)
+
+        supervisor.run_until(supervisor.start + 24 * 3600)
+        transitions = [json.loads(line) for line in Path(scout.journal.transitions_path).read_text().splitlines()]
+        reasons = [t["reason"] for t in transitions]
+        assert reasons.count("work_block_ended") == 4
+        assert supervisor.get_fleet_health()["summary"]["states"] == {"off_duty": 2}
+
+    def test_removed_agents_timers_are_dropped(self, supervisor):
+        supervisor.add_agent("E-scout", "Scout")
+        supervisor.remove_agent("E-scout")
+
+        assert supervisor.run_until(supervisor.start + 24 * 3600) == 0
+
+    def test_loads_full_roster(self, supervisor):
+        pytest.importorskip("yaml")
+
+        assert supervisor.load_roster(str(AGENTS_DIR)) == 43
+        health = supervisor.get_fleet_health()
+        assert health["summary"]["agents"] == 43
+        assert health["agents"]["E-achernar-16"]["budget_remaining"]["tokens"] == 20000
+
+    def test_roster_budgets_survive_new_day(self, supervisor):
+        scout = supervisor.add_agent("E-scout", "Scout", {"daily_tokens": 5000, "tool_calls": 40})
+        assert scout.current_budget.daily_tokens == 5000
+
+        supervisor.run_pending(supervisor.start + 3600 + 60)
+        assert scout.consume_budget(tokens=4000)
+        supervisor.run_until(supervisor.start + 24 * 3600)
+
+        budget = scout.current_budget
+        assert budget.budget_date == "2026-03-03" and budget.tokens_used == 0
+        assert (budget.daily_tokens, budget.daily_tool_calls, budget.daily_play_time_mins) == (5000, 40, 30)
+
+    def test_budgets_reset_on_simulated_days(self, supervisor):
+        scout = supervisor.add_agent("E-scout", "Scout")
+        assert scout.current_budget.budget_date == "2026-03-02"
+
+        for day in range(2):
+            supervisor.run_until(supervisor.start + day * 24 * 3600 + 3600 + 60)  # into the 06:00 block
+            assert scout.consume_budget(tokens=100, tool_calls=1)
+            assert scout.current_budget.tokens_used == 100
+
+        supervisor.run_until(supervisor.start + 2 * 24 * 3600)
+        assert scout.current_budget.budget_date == "2026-03-04"
+        assert scout.current_budget.tokens_used == 0 and scout.current_budget.tool_calls_used == 0
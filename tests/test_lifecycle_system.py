@@ -0,0 +1,66 @@
+import json
+import shutil
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lifecycle_system import LifecycleManager, LifecycleState
+
+def crash(manager):
+    """Drop the journal's open files without the snapshot close() takes"""
+    for handle in manager.journal._handles.values():
+        handle.close()
+
+def on_shift(lifecycle_dir, **kwargs):
+    manager = LifecycleManager("E-test", "Scout", str(lifecycle_dir), **kwargs)
+    if manager.current_state == LifecycleState.HATCH:
+        manager.transition_state(LifecycleState.ONBOARD, "test")
+    manager.start_shift()
+    return manager
+
+class TestLifecycleJournal:
+    """Test journaled lifecycle persistence."""
+
+    def test_budget_survives_restart_without_snapshot(self, tmp_path):
+        manager = on_shift(tmp_path)
+        for _ in range(10):
+            assert manager.consume_budget(tokens=100, tool_calls=2)
+        crash(manager)
+
+        restarted = LifecycleManager("E-test", "Scout", str(tmp_path))
+
+        assert restarted.current_state == LifecycleState.SHIFT
+        assert restarted.current_budget.tokens_used == 1000
+        assert restarted.current_budget.tool_calls_used == 20
+
+    def test_snapshot_crash_before_truncate_does_not_double_count(self, tmp_path):
+        manager = on_shift(tmp_path, snapshot_interval=10_000)
+        for _ in range(5):
+            manager.consume_budget(tokens=100)
+        journal_copy = tmp_path / "journal.copy"
+        shutil.copy(manager.journal.journal_path, journal_copy)
+        manager.journal.snapshot()
+        manager.consume_budget(tokens=100)
+        crash(manager)
+
+        # Journal as it was before truncation, plus the record written after the snapshot
+        tail = Path(manager.journal.journal_path).read_bytes()
+        Path(manager.journal.journal_path).write_bytes(journal_copy.read_bytes() + tail + b'{"t":"cons')
+
+        assert LifecycleManager("E-test", "Scout", str(tmp_path)).current_budget.tokens_used == 600
+
+    def test_transitions_are_capped_and_rolled_into_history(self, tmp_path):
+        manager = on_shift(tmp_path, snapshot_interval=3, max_transitions=4)
+        for _ in range(5):
+            manager.enter_dream_mode(10)
+            manager.start_shift()
+        manager.close()
+
+        restarted = LifecycleManager("E-test", "Scout", str(tmp_path), max_transitions=4)
+        history = [json.loads(line) for line in Path(restarted.journal.transitions_path).read_text().splitlines()]
+
+        assert len(restarted.get_transitions()) == 4
+        assert len(history) == 12
+        assert restarted.get_transitions() == history[-4:]
+        assert [a.activity_type for a in restarted._get_recent_activities(1)].count("dream_session") == 5
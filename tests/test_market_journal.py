@@ -0,0 +1,103 @@
+import os
+import threading
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from market_journal import MarketJournal
+
+def bid(bid_id, task_id, agent_id, confidence=0.8):
+    return {"bid_id": bid_id, "task_id": task_id, "agent_id": agent_id, "confidence": confidence}
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = MarketJournal(str(tmp_path), snapshot_interval=10_000, compaction_threshold=10_000)
+    yield journal
+    journal.close()
+
+class TestMarketJournal:
+    """Test the append-only market journal."""
+
+    def test_indexes_return_only_matching_bids(self, journal):
+        for i in range(50):
+            journal.append("bid", f"B-{i}", bid(f"B-{i}", f"T-{i % 5}", f"E-{i % 3}", confidence=0.5))
+
+        assert [b["bid_id"] for b in journal.get_bids_for_task("T-2")] == [f"B-{i}" for i in range(2, 50, 5)]
+        assert journal.get_agent_bid_stats("E-1") == (17, 0.5)
+        assert journal.get_agent_bid_stats("E-unknown") == (0, 0.0)
+
+    def test_recovery_truncates_torn_tail(self, tmp_path, journal):
+        journal.append("task", "T-1", {"status": "broadcast"})
+        journal.snapshot()
+        journal.append("task", "T-1", {"status": "awarded"})
+        journal.append("bid", "B-1", bid("B-1", "T-1", "E-1"))
+        journal._file.close()
+
+        with open(journal.journal_path, "ab") as f:
+            f.write(b"\x40\x00\x00\x00garbage")
+        size_with_tail = os.path.getsize(journal.journal_path)
+
+        recovered = MarketJournal(str(tmp_path))
+        assert recovered.state["task"]["T-1"] == {"status": "awarded"}
+        assert len(recovered.get_bids_for_task("T-1")) == 1
+        assert os.path.getsize(recovered.journal_path) < size_with_tail
+
+        recovered.append("bid", "B-2", bid("B-2", "T-1", "E-2"))
+        assert [b["bid_id"] for b in MarketJournal(str(tmp_path)).get_bids_for_task("T-1")] == ["B-1", "B-2"]
+
+    def test_compaction_drops_superseded_state_and_keeps_history(self, tmp_path, journal):
+        for i in range(200):
+            journal.append("task", "T-1", {"status": "in_progress", "step": i})
+            journal.append("transaction", f"TX-{i}", {"transaction_id": f"TX-{i}", "recorded_at": f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}"})
+        journal.append("bid", "B-1", bid("B-1", "T-1", "E-1"))
+        size_before = os.path.getsize(journal.journal_path)
+
+        journal.compact()
+
+        assert os.path.getsize(journal.journal_path) < size_before
+        assert journal.superseded_records == 0
+        assert journal.state["task"]["T-1"]["step"] == 199
+        assert len(journal.get_transactions_since("2026-01-01T00:03:00")) == 20
+        assert journal.get_bids_for_task("T-1")[0]["bid_id"] == "B-1"
+
+    def test_stale_snapshot_is_ignored(self, tmp_path, journal):
+        journal.append("reputation", "E-1", {"success_rate": 0.5})
+        journal.snapshot()
+        stale = Path(journal.snapshot_path).read_bytes()
+        journal.append("reputation", "E-1", {"success_rate": 0.9})
+        journal.compact()
+        journal._file.close()
+
+        # Crash between swapping the compacted journal and writing its snapshot
+        Path(journal.snapshot_path).write_bytes(stale)
+
+        assert MarketJournal(str(tmp_path)).state["reputation"]["E-1"] == {"success_rate": 0.9}
+
+    def test_reads_are_consistent_during_compaction(self, tmp_path):
+        journal = MarketJournal(str(tmp_path), snapshot_interval=10_000, compaction_threshold=20)
+        for i in range(20):
+            journal.append("bid", f"B-{i}", bid(f"B-{i}", "T-1", "E-1"))
+        errors = []
+        done = threading.Event()
+
+        def read_bids():
+            while not done.is_set():
+                try:
+                    bids = journal.get_bids_for_task("T-1")
+                    assert [b["bid_id"] for b in bids[:20]] == [f"B-{i}" for i in range(20)]
+                except Exception as e:
+                    errors.append(e)
+                    return
+
+        reader = threading.Thread(target=read_bids)
+        reader.start()
+        try:
+            for i in range(2000):  # compacts every 20 upserts
+                journal.append("task", "T-1", {"status": "in_progress", "step": i})
+        finally:
+            done.set()
+            reader.join()
+            journal.close()
+
+        assert errors == []
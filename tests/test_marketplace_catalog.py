@@ -0,0 +1,57 @@
+import re
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from services.marketplace.catalog_view import browse_cache_key, build_browse_query
+
+def placeholders(query):
+    return [int(n) for n in re.findall(r"\$(\d+)", query)]
+
+class TestBrowseQuery:
+    """Test the catalog browse query builder and its cache key."""
+
+    def test_no_filters(self):
+        query, params = build_browse_query()
+
+        assert params == [20, 0]
+        assert query.endswith(" ORDER BY c.featured DESC, c.rating DESC, c.download_count DESC LIMIT $1 OFFSET $2")
+        assert "search_vector" not in query
+
+    def test_every_filter_is_numbered_in_order(self):
+        query, params = build_browse_query(category="auto", type="template", featured=False,
+                                           search="ceramic coating", limit=50, offset=100)
+
+        assert params == ["auto", "template", False, "ceramic coating", 50, 100]
+        assert placeholders(query) == [1, 2, 3, 4, 4, 5, 6]
+        assert "c.category = $1" in query and "c.type = $2" in query and "c.featured = $3" in query
+        assert "LIMIT $5 OFFSET $6" in query
+
+    def test_search_ranks_by_relevance_first(self):
+        query, params = build_browse_query(category="auto", search="wax")
+
+        assert "c.search_vector @@ websearch_to_tsquery('english', $2)" in query
+        order_by = query.split(" ORDER BY ", 1)[1]
+        assert order_by.startswith("ts_rank_cd(c.search_vector, websearch_to_tsquery('english', $2)) DESC, "
+                                   "c.featured DESC")
+        assert params == ["auto", "wax", 20, 0]
+
+    def test_skipped_filters_shift_numbering(self):
+        query, params = build_browse_query(featured=True, limit=5)
+
+        assert params == [True, 5, 0]
+        assert "c.featured = $1" in query and "LIMIT $2 OFFSET $3" in query
+
+    @pytest.mark.parametrize("search", ["Ceramic  Coating", " ceramic coating ", "CERAMIC\tcoating"])
+    def test_cache_key_normalises_search(self, search):
+        assert browse_cache_key("auto", None, None, search, 20, 0) == \
+            browse_cache_key("auto", None, None, "ceramic coating", 20, 0)
+
+    def test_cache_key_keeps_other_filters_apart(self):
+        base = browse_cache_key("auto", None, None, None, 20, 0)
+
+        assert base == ("auto", None, None, None, 20, 0)
+        assert browse_cache_key("auto", None, False, None, 20, 0) != base
+        assert browse_cache_key("auto", None, None, None, 20, 20) != base
+        assert browse_cache_key("Auto", None, None, None, 20, 0) != base  # category matches exactly
@@ -0,0 +1,143 @@
+import logging
+import threading
+import time
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from master_agent_orchestrator import (AgentTask, AgentTaskExecutor, LatencyHistogram,
+                                       MasterOrchestrator, WorkflowRun)
+
+def make_task(task_id, agent="agent_a", priority=5):
+    return AgentTask(task_id=task_id, agent_name=agent, task_type="test", payload={}, priority=priority)
+
+class TestAgentTaskExecutor:
+    """Test the orchestrator worker pool."""
+
+    def test_higher_priority_runs_first(self):
+        order = []
+        executor = AgentTaskExecutor(handler=lambda task: order.append(task.task_id), max_workers=1)
+        executor.submit_many([make_task("low", priority=1), make_task("high", priority=9), make_task("mid")])
+        executor.start()
+        assert executor.wait_idle(timeout=5)
+        executor.shutdown()
+
+        assert order == ["high", "mid", "low"]
+
+    def test_agent_limit_caps_concurrency_without_blocking_others(self):
+        lock = threading.Lock()
+        running, peak = {"slow": 0, "fast": 0}, {"slow": 0, "fast": 0}
+
+        def handler(task):
+            with lock:
+                running[task.agent_name] += 1
+                peak[task.agent_name] = max(peak[task.agent_name], running[task.agent_name])
+            time.sleep(0.01)
+            with lock:
+                running[task.agent_name] -= 1
+
+        executor = AgentTaskExecutor(handler=handler, max_workers=8, agent_limits={"slow": 1}, default_agent_limit=4)
+        executor.start()
+        executor.submit_many([make_task(f"s{i}", "slow") for i in range(6)] +
+                             [make_task(f"f{i}", "fast") for i in range(12)])
+        assert executor.wait_idle(timeout=5)
+        executor.shutdown()
+
+        assert peak == {"slow": 1, "fast": 4}
+        assert executor.get_stats()["per_agent"]["slow"]["execution"]["count"] == 6
+
+    def test_results_are_bounded_and_failures_counted(self):
+        def handler(task):
+            if task.task_id.endswith("7"):
+                raise RuntimeError("boom")
+            return task.task_id
+
+        executor = AgentTaskExecutor(handler=handler, max_workers=4, max_completed=5)
+        executor.start()
+        executor.submit_many([make_task(f"t{i}") for i in range(20)])
+        assert executor.wait_idle(timeout=5)
+        executor.shutdown()
+
+        assert len(executor.completed_tasks) == 5
+        assert (executor.total_tasks_processed, executor.failed_tasks) == (20, 2)
+
+    def test_queued_count_ignores_synchronous_tasks(self):
+        seen = []
+        executor = AgentTaskExecutor(handler=lambda task: seen.append(executor.get_stats()), max_workers=1)
+        executor.submit_many([make_task("q1"), make_task("q2")])
+        assert executor.queued_count() == 2
+
+        executor.execute(make_task("sync"))
+        assert seen[-1]["queued"] == 2 and seen[-1]["active"] == 1
+        executor.start()
+        assert executor.wait_idle(timeout=5)
+        executor.shutdown()
+
+        assert [stats["queued"] for stats in seen[1:]] == [1, 0]
+        assert executor.queued_count() == 0
+
+    def test_histogram_percentiles_use_bucket_bounds(self):
+        histogram = LatencyHistogram()
+        for ms in [0.3] * 90 + [40] * 9 + [700]:
+            histogram.record(ms / 1000)
+
+        assert (histogram.percentile(50), histogram.percentile(95), histogram.percentile(100)) == (0.5, 50, 700)
+
+@pytest.fixture
+def orchestrator(monkeypatch):
+    monkeypatch.setattr(MasterOrchestrator, "setup_logging",
+                        lambda self: setattr(self, "logger", logging.getLogger("test-orchestrator")))
+    orchestrator = MasterOrchestrator(max_workers=8)
+    orchestrator.agent_workflows = {"diamond": {"steps": [
+        {"agent": "a", "task": "start", "dependencies": []},
+        {"agent": "b", "task": "left", "dependencies": ["start"]},
+        {"agent": "c", "task": "right", "dependencies": ["start"]},
+        {"agent": "d", "task": "join", "dependencies": ["left", "right"]},
+    ]}}
+    yield orchestrator
+    orchestrator.stop_orchestration()
+
+class TestWorkflowDag:
+    """Test dependency-aware workflow execution."""
+
+    def test_branches_run_in_parallel_and_receive_upstream_outputs(self, orchestrator):
+        seen = {}
+
+        def handler(task):
+            seen[task.task_type] = sorted(task.payload["upstream"])
+            time.sleep(0.05)
+            return f"{task.task_type}-output"
+
+        orchestrator.executor.handler = handler
+        orchestrator.executor.start()
+        workflow_id = orchestrator.execute_workflow("diamond", {"industry": "hvac"})
+        assert orchestrator.wait_for_workflow(workflow_id, timeout=5)
+        report = orchestrator.get_workflow_report(workflow_id)
+
+        assert seen == {"start": [], "left": ["start"], "right": ["start"], "join": ["left", "right"]}
+        assert orchestrator.workflow_runs[workflow_id].outputs["join"] == "join-output"
+        assert report["status"] == "succeeded"
+        assert len(report["critical_path"]) == 3 and report["critical_path"][0] == "start"
+        assert report["wall_ms"] < 4 * 50
+
+    def test_failed_step_skips_downstream(self, orchestrator):
+        def handler(task):
+            if task.task_type == "left":
+                raise RuntimeError("upstream unavailable")
+
+        orchestrator.executor.handler = handler
+        orchestrator.executor.start()
+        workflow_id = orchestrator.execute_workflow("diamond")
+        assert orchestrator.wait_for_workflow(workflow_id, timeout=5)
+        report = orchestrator.get_workflow_report(workflow_id)
+
+        assert report["status"] == "failed"
+        assert report["steps"]["join"]["status"] == "skipped"
+        assert report["errors"] == {"left": "upstream unavailable"}
+
+    def test_cycles_and_unknown_dependencies_are_rejected(self):
+        with pytest.raises(ValueError, match="cycle"):
+            WorkflowRun.topological_order([{"task": "a", "dependencies": ["b"]}, {"task": "b", "dependencies": ["a"]}])
+        with pytest.raises(ValueError, match="unknown step"):
+            WorkflowRun.topological_order([{"task": "a", "dependencies": ["missing"]}])
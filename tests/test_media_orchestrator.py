@@ -0,0 +1,78 @@
+import json
+import threading
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from agents.media.media_orchestrator import MediaOrchestratorAgent
+
+@pytest.fixture
+def orchestrator(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return MediaOrchestratorAgent()
+
+def stub_stages(orchestrator, order, video=None, voiceover=None):
+    def stage(name, extra=None):
+        def run(workflow):
+            order.append(name)
+            return extra(workflow) if extra else None
+        return run
+    orchestrator._stage_generate_script = stage("generate_script")
+    orchestrator._stage_generate_video = stage("generate_video", video)
+    orchestrator._stage_generate_voiceover = stage("generate_voiceover", voiceover)
+    orchestrator._stage_synchronize_media = stage("synchronize_media")
+    orchestrator._stage_create_deliverables = stage("create_deliverables")
+
+class TestMediaPipeline:
+    """Test the concurrent media DAG and the workflow event log."""
+
+    def test_video_and_voiceover_run_concurrently(self, orchestrator):
+        both_running = threading.Barrier(2, timeout=5)
+        order = []
+        
+        def meet(workflow):
+            both_running.wait()  # times out unless the other branch is running too
+        
+        stub_stages(orchestrator, order, video=meet, voiceover=meet)
+
+        workflow = orchestrator.create_complete_onboarding({"company": "Acme"})
+
+        assert workflow["status"] == "completed" and workflow["current_step"] == 5
+        assert order[0] == "generate_script"
+        assert set(order[1:3]) == {"generate_video", "generate_voiceover"}
+        assert order[3:] == ["synchronize_media", "create_deliverables"]
+
+    def test_failed_stage_stops_dependents(self, orchestrator):
+        order = []
+        stub_stages(orchestrator, order, voiceover=lambda w: "Voiceover generation failed: tts down")
+
+        workflow = orchestrator.create_complete_onboarding({"company": "Acme"})
+
+        assert workflow["status"] == "failed" and workflow["success"] is False
+        assert workflow["error"] == "Voiceover generation failed: tts down"
+        assert "synchronize_media" not in order
+
+    def test_catalog_is_rebuilt_from_event_log(self, orchestrator, tmp_path):
+        stub_stages(orchestrator, [])
+        done = orchestrator.create_complete_onboarding({"company": "Acme"})
+        with open(orchestrator.event_log_path, "a") as f:
+            f.write('{"id": "torn"')  # crash mid-append
+
+        reopened = MediaOrchestratorAgent()
+        [summary] = reopened.list_workflows()
+        assert summary["workflow_id"] == done["workflow_id"]
+        assert summary["status"] == "completed" and summary["success"] is True
+        events = [json.loads(line) for line in orchestrator.event_log_path.read_text().splitlines()[:-1]]
+        assert [e["event"] for e in events][0] == "created" and events[-1]["event"] == "finished"
+
+    def test_active_workflow_status_is_a_copy(self, orchestrator):
+        workflow = orchestrator._initialize_workflow("wf-live", {"company": "Acme"})
+        orchestrator._record_event(workflow, "created")
+
+        status = orchestrator.get_workflow_status("wf-live")
+        status["status"] = "tampered"
+        status["user_data"]["company"] = "Other"
+
+        assert workflow["status"] == "initialized"
+        assert workflow["user_data"]["company"] == "Acme"
@@ -0,0 +1,240 @@
+import asyncio
+import json
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "services" / "outreach_mediapax"))
+import generator
+from batcher import LeadBatcher
+from entitlements import TENANT_TEMPLATES_SQL, EntitlementCache
+
+TEMPLATE = {"title": "Premium Detail", "type": "template", "category": "auto", "payload_ref": "tpl-1", "tags": []}
+
+class FakePool:
+    def __init__(self, rows_by_tenant):
+        self.rows_by_tenant = rows_by_tenant
+        self.fetches = []
+        self.gate = None
+
+    async def fetch(self, query, tenant_id):
+        assert query == TENANT_TEMPLATES_SQL
+        self.fetches.append(tenant_id)
+        rows = [dict(row) for row in self.rows_by_tenant.get(tenant_id, [])]
+        if self.gate is not None:
+            await self.gate.wait()  # rows were read before the gate opened
+        return rows
+
+def cache_with(pool, **kwargs):
+    cache = EntitlementCache("postgres://test", **kwargs)
+    cache._pool = pool
+    return cache
+
+async def consume(messages, handler, acked):
+    """Stream consumer as the bus runs it: ack each message once its handler returns"""
+    for message_id, msg in messages:
+        await handler(msg)
+        acked.append(message_id)
+
+class TestLeadBatcher:
+    """Test batching across concurrent stream consumers."""
+
+    def test_concurrent_consumers_fill_one_batch_and_ack_after_it(self):
+        batches, acked = [], []
+
+        async def process(batch):
+            batches.append([lead["lead_id"] for lead, _ in batch])
+            assert acked == []  # nothing is acked before its batch is processed
+
+        async def run():
+            batcher = LeadBatcher(process, flush_interval=60, max_batch=4)
+            runner = asyncio.ensure_future(batcher.run())
+
+            async def handler(msg):
+                await batcher.add(msg["lead"], msg.get("trace"))
+
+            streams = [[(f"{i}-0", {"lead": {"lead_id": f"L{i}"}})] for i in range(4)]
+            await asyncio.wait_for(asyncio.gather(*(consume(messages, handler, acked) for messages in streams)), 5)
+            runner.cancel()
+            return batcher
+
+        batcher = asyncio.run(run())  # the full batch flushes without waiting out flush_interval
+        assert batches == [["L0", "L1", "L2", "L3"]]
+        assert sorted(acked) == ["0-0", "1-0", "2-0", "3-0"]
+        assert batcher.stats == {"leads": 4, "batches": 1, "failed_batches": 0}
+
+    def test_partial_batch_flushes_after_interval(self):
+        batches = []
+
+        async def process(batch):
+            batches.append(len(batch))
+
+        async def run():
+            batcher = LeadBatcher(process, flush_interval=0.01, max_batch=100)
+            runner = asyncio.ensure_future(batcher.run())
+            await asyncio.wait_for(batcher.add({"lead_id": "L1"}), 5)
+            runner.cancel()
+
+        asyncio.run(run())
+        assert batches == [1]
+
+    def test_failed_batch_leaves_messages_unacked_and_keeps_running(self):
+        acked, calls = [], []
+
+        async def process(batch):
+            calls.append(len(batch))
+            if len(calls) == 1:
+                raise ConnectionError("dead letter queue down")
+
+        async def run():
+            batcher = LeadBatcher(process, flush_interval=0.01, max_batch=2)
+            runner = asyncio.ensure_future(batcher.run())
+
+            async def handler(msg):
+                await batcher.add(msg["lead"])
+
+            results = await asyncio.gather(
+                consume([("1-0", {"lead": {"lead_id": "L1"}})], handler, acked),
+                consume([("2-0", {"lead": {"lead_id": "L2"}})], handler, acked),
+                return_exceptions=True)
+            assert all(isinstance(result, ConnectionError) for result in results)
+
+            await consume([("1-0", {"lead": {"lead_id": "L1"}})], handler, acked)  # redelivered
+            runner.cancel()
+            return batcher
+
+        batcher = asyncio.run(run())
+        assert acked == ["1-0"] and calls == [2, 1]
+        assert batcher.stats["failed_batches"] == 1
+
+class TestEntitlementCache:
+    """Test tenant entitlement caching and purchase invalidation."""
+
+    def test_templates_are_loaded_once_per_tenant(self):
+        pool = FakePool({"t1": [TEMPLATE]})
+        cache = cache_with(pool)
+
+        async def run():
+            return await asyncio.gather(cache.templates("t1", "auto"), cache.templates("t1", "auto"),
+                                        cache.templates("t1", "boats"))
+
+        auto, again, boats = asyncio.run(run())
+        assert auto == again == [TEMPLATE] and boats == []
+        assert pool.fetches == ["t1"]
+        assert asyncio.run(cache.templates(None, "auto")) == []
+        assert asyncio.run(EntitlementCache(None).templates("t1", "auto")) == []
+
+    def test_purchase_during_load_is_not_cached_over(self):
+        pool = FakePool({"t1": []})
+        cache = cache_with(pool)
+
+        async def run():
+            pool.gate = asyncio.Event()
+            loading = asyncio.ensure_future(cache.templates("t1", "auto"))
+            await asyncio.sleep(0)
+            # the purchase commits after the load's query read the rows
+            pool.rows_by_tenant["t1"] = [TEMPLATE]
+            await cache.on_purchase_completed({"tenant_ids": ["t1"]})
+            pool.gate.set()
+            stale = await loading
+            return stale, await cache.templates("t1", "auto")
+
+        stale, fresh = asyncio.run(run())
+        assert stale == [] and fresh == [TEMPLATE]
+        assert pool.fetches == ["t1", "t1"]
+
+    def test_entries_expire_after_ttl(self):
+        now = [0.0]
+        pool = FakePool({"t1": [TEMPLATE]})
+        cache = cache_with(pool, ttl=60, clock=lambda: now[0])
+
+        asyncio.run(cache.templates("t1", "auto"))
+        now[0] += 61
+        asyncio.run(cache.templates("t1", "auto"))
+        assert pool.fetches == ["t1", "t1"]
+
+    def test_follow_purchases_invalidates_on_subscribe_and_events(self):
+        pool = FakePool({"t1": [TEMPLATE], "t2": [TEMPLATE]})
+        cache = cache_with(pool)
+        subscribed = []
+
+        class FakePubSub:
+            def __init__(self, messages):
+                self.messages = messages
+
+            async def subscribe(self, channel):
+                subscribed.append(channel)
+
+            async def listen(self):
+                for message in self.messages:
+                    yield message
+                if len(subscribed) == 1:
+                    raise ConnectionError("connection reset")  # resubscribe
+                await asyncio.Event().wait()
+
+            async def close(self):
+                pass
+
+        class FakeRedis:
+            def pubsub(self):
+                return FakePubSub([{"type": "subscribe", "data": 1},
+                                   {"type": "message", "data": "not json"},
+                                   {"type": "message", "data": json.dumps({"tenant_ids": ["t1"]})}])
+
+        async def redis_factory():
+            return FakeRedis()
+
+        async def run():
+            await cache.templates("t1", "auto")
+            await cache.templates("t2", "auto")
+            follower = asyncio.ensure_future(cache.follow_purchases(redis_factory, retry_delay=0))
+            for _ in range(20):
+                await asyncio.sleep(0)
+            follower.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await follower
+
+        asyncio.run(run())
+        assert subscribed == ["marketplace.purchase_completed"] * 2
+        assert cache.stats["invalidations"] == 4  # two subscribes, two t1 events
+        assert len(cache._cache) == 0
+
+class TestGeneratePacks:
+    """Test batched pack generation."""
+
+    @pytest.fixture
+    def pool(self, monkeypatch):
+        pool = FakePool({"t1": [TEMPLATE]})
+        monkeypatch.setattr(generator, "entitlements", cache_with(pool))
+        return pool
+
+    def test_one_lookup_per_tenant_and_packs_per_lead(self, pool):
+        leads = [{"tenant_id": "t1", "vertical": "auto", "contact": {"state": "IA"}},
+                 {"tenant_id": "t1", "vertical": "auto", "contact": {"state": "NE"}},
+                 {"tenant_id": "t1", "vertical": "boats", "contact": {"state": "IA"}},
+                 {"vertical": "auto", "contact": {"state": "MO"}}]
+
+        packs = asyncio.run(generator.generate_packs(leads))
+
+        assert pool.fetches == ["t1"]
+        assert [pack["headline"] for pack in packs] == ["Premium Detail for IA", "Premium Detail for NE",
+                                                        "Boats Growth Pack for IA", "Auto Growth Pack for MO"]
+        assert [pack["template_source"] for pack in packs] == ["purchased", "purchased", "default", "default"]
+        packs[0]["scripts"][0]["text"] = "edited"
+        assert packs[1]["scripts"][0]["text"] != "edited"  # packs share no mutable state
+
+    def test_batch_matches_single_lead_generation(self, pool):
+        leads = [{"tenant_id": "t1", "vertical": vertical, "contact": {"state": "IA"}} for vertical in ("auto", "boats")]
+
+        assert asyncio.run(generator.generate_packs(leads)) == \
+            [asyncio.run(generator.generate_pack(lead)) for lead in leads]
+
+    def test_entitlement_failure_falls_back_to_default_templates(self, monkeypatch):
+        class BrokenPool:
+            async def fetch(self, query, tenant_id):
+                raise ConnectionError("db down")
+
+        monkeypatch.setattr(generator, "entitlements", cache_with(BrokenPool()))
+        [pack] = asyncio.run(generator.generate_packs([{"tenant_id": "t1", "vertical": "auto"}]))
+        assert pack["template_source"] == "default"
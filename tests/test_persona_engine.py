@@ -0,0 +1,72 @@
+import json
+import pytest
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+np = pytest.importorskip("numpy")
+pytest.importorskip("yaml")
+from persona_engine import InteractionFeedback, PersonaEngine
+
+def feedback(labels, quality, novelty):
+    return InteractionFeedback(timestamp="", agent_id="E-test", interaction_type="chat",
+                               feedback_labels=labels, quality_score=quality, novelty_score=novelty, context={})
+
+EVENTS = [
+    feedback(["helpful", "unique"], 0.9, 0.8),
+    feedback(["harmful"], 0.35, 0.5),
+    feedback(["derivative"], 0.5, 0.2),
+    feedback(["helpful"], 0.8, 0.65),
+    feedback([], 0.2, 0.5),
+]
+
+class TestBatchedSculpting:
+    """Test batched feedback sculpting and coalesced writes."""
+
+    def test_rule_precedence_and_batch_matches_sequential(self, tmp_path):
+        single = PersonaEngine("E-single", "Scout", str(tmp_path))
+        single.record_interaction_feedback(EVENTS[0])
+        # unique overrides helpful for openness; risk only from unique
+        assert single.current_persona.openness == pytest.approx(0.85 + 0.02 * 0.4)
+        assert single.current_persona.directness == pytest.approx(0.75 + 0.02 * 0.5)
+        assert single.current_persona.risk_tolerance == pytest.approx(0.60 + 0.02 * 0.2)
+
+        sequential = PersonaEngine("E-seq", "Scout", str(tmp_path))
+        batched = PersonaEngine("E-batch", "Scout", str(tmp_path))
+        for event in EVENTS * 20:
+            sequential.record_interaction_feedback(event)
+        batched.record_feedback_batch(EVENTS * 20)
+
+        assert np.allclose(sequential._persona_to_vector(sequential.current_persona),
+                           batched._persona_to_vector(batched.current_persona))
+        assert batched.current_persona.version == sequential.current_persona.version == 101
+
+    def test_persona_writes_are_coalesced(self, tmp_path):
+        engine = PersonaEngine("E-test", "Scout", str(tmp_path), write_interval=60)
+        engine.record_interaction_feedback(EVENTS[0])
+        for event in EVENTS * 20:
+            engine.record_interaction_feedback(event)
+
+        assert json.loads(Path(engine.persona_file).read_text())["version"] == 2
+        assert len(Path(engine.feedback_log).read_text().splitlines()) == 1
+
+        engine.flush()
+        assert json.loads(Path(engine.persona_file).read_text())["version"] == 102
+        assert len(Path(engine.feedback_log).read_text().splitlines()) == 101
+
+    def test_continuity_reference_is_cached_in_memory(self, tmp_path):
+        engine = PersonaEngine("E-test", "Scout", str(tmp_path))
+        reference = asdict(engine.current_persona)
+        reference["openness"] = 0.1
+        old = (datetime.now() - timedelta(days=8)).isoformat()
+        Path(engine.checkpoint_history).write_text(json.dumps([{"timestamp": old, "persona": reference}]))
+
+        continuity = engine.calculate_continuity_index()
+        Path(engine.checkpoint_history).unlink()
+
+        assert continuity < 0.99
+        assert engine.calculate_continuity_index() == continuity
+        engine.create_checkpoint()
+        assert engine.calculate_continuity_index() == continuity  # new checkpoint is not 7 days old yet
@@ -0,0 +1,116 @@
+import asyncio
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from libs.pkg_cache.ttl import TTLCache
+
+@pytest.fixture
+def clock():
+    return [100.0]
+
+class TestTTLCache:
+    """Test expiry, eviction and single-flight loads."""
+
+    def test_entries_expire_and_misses_use_negative_ttl(self, clock):
+        cache = TTLCache(ttl=60, negative_ttl=5, clock=lambda: clock[0])
+        cache.set("known", {"code": "ABC"})
+        cache.set("unknown", None)
+
+        clock[0] += 10
+        assert cache.get("unknown", "miss") == "miss"
+        assert cache.get("known") == {"code": "ABC"}
+        clock[0] += 51
+        assert cache.get("known", "miss") == "miss"
+
+    def test_least_recently_used_entry_is_evicted(self, clock):
+        cache = TTLCache(ttl=60, maxsize=2, clock=lambda: clock[0])
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert (cache.get("a"), cache.get("c")) == (1, 3)
+        cache.invalidate("a")
+        assert cache.get("a") is None
+        cache.invalidate()
+        assert cache.get("c") is None
+
+    def test_concurrent_misses_load_once(self, clock):
+        cache = TTLCache(ttl=60, clock=lambda: clock[0])
+        calls = []
+
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        async def run():
+            return await asyncio.gather(*(cache.get_or_load("key", load) for _ in range(10)))
+
+        assert asyncio.run(run()) == ["value"] * 10
+        assert len(calls) == 1
+        assert asyncio.run(cache.get_or_load("key", load)) == "value" and len(calls) == 1
+
+    def test_failed_load_reaches_every_waiter_and_is_not_cached(self, clock):
+        cache = TTLCache(ttl=60, clock=lambda: clock[0])
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ConnectionError("db down")
+
+        async def run():
+            return await asyncio.gather(*(cache.get_or_load("key", fail) for _ in range(3)),
+                                        return_exceptions=True)
+
+        assert all(isinstance(result, ConnectionError) for result in asyncio.run(run()))
+        assert cache.get("key", "miss") == "miss"
+
+    def test_invalidation_during_load_is_not_overwritten(self, clock):
+        cache = TTLCache(ttl=60, clock=lambda: clock[0])
+        loads = []
+
+        async def load():
+            loads.append(1)
+            await asyncio.sleep(0.01)
+            return len(loads)
+
+        async def run():
+            first = asyncio.ensure_future(cache.get_or_load("tenant", load))
+            await asyncio.sleep(0)
+            cache.invalidate("tenant")  # e.g. a purchase committed after the load's query
+            assert await first == 1
+            return await cache.get_or_load("tenant", load)
+
+        assert asyncio.run(run()) == 2
+        assert cache.get("tenant") == 2
+
+    def test_full_invalidation_during_load(self, clock):
+        cache = TTLCache(ttl=60, clock=lambda: clock[0])
+
+        async def load():
+            await asyncio.sleep(0.01)
+            return "old"
+
+        async def run():
+            pending = asyncio.ensure_future(cache.get_or_load("a", load))
+            await asyncio.sleep(0)
+            cache.invalidate()
+            return await pending
+
+        assert asyncio.run(run()) == "old"
+        assert cache.get("a", "miss") == "miss" and len(cache) == 0
+
+    def test_zero_ttl_disables_caching_and_stats_count(self, clock):
+        cache = TTLCache(ttl=0, clock=lambda: clock[0])
+        cache.set("a", 1)
+        assert cache.get("a") is None and len(cache) == 0
+
+        cache = TTLCache(ttl=60, clock=lambda: clock[0])
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("b")
+        cache.invalidate("a")
+        assert cache.stats == {"hits": 1, "misses": 1, "loads": 0, "invalidations": 1}
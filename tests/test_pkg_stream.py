@@ -0,0 +1,198 @@
+import asyncio
+import json
+import pytest
+from datetime import datetime
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from libs.pkg_stream.export import Fields, Keyset, fetch_page, list_rows, stream_ndjson, wants_ndjson
+
+FIELDS = Fields({
+    "id": lambda row: row["id"],
+    "email": lambda row: row["email"],
+    "created_at": lambda row: row["created_at"].isoformat()
+})
+
+def rows(count):
+    return [{"id": i, "email": f"lead{i}@example.com", "created_at": datetime(2026, 1, 1, 0, 0, i % 60)}
+            for i in range(count)]
+
+class FakeDb:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    async def fetch(self, query, *params):
+        self.queries.append((query, params))
+        if "LIMIT" not in query:
+            return self.rows
+        limit = int(query.rsplit("LIMIT", 1)[1])
+        return self.rows[:limit]
+
+class FakeContext:
+    def __init__(self, value=None):
+        self.value = value
+
+    async def __aenter__(self):
+        return self.value
+
+    async def __aexit__(self, *exc):
+        return False
+
+class FakeConn:
+    def __init__(self, rows):
+        self.rows = rows
+        self.cursor_args = None
+        self.readonly = None
+
+    def transaction(self, readonly=False):
+        self.readonly = readonly
+        return FakeContext()
+
+    async def cursor(self, query, *params, prefetch=None):
+        self.cursor_args = (query, params, prefetch)
+        for row in self.rows:
+            yield row
+
+class FakePool:
+    def __init__(self, rows):
+        self.conn = FakeConn(rows)
+
+    def acquire(self):
+        return FakeContext(self.conn)
+
+async def collect(stream):
+    return [chunk async for chunk in stream]
+
+class TestProjection:
+    """Test format negotiation and field projection."""
+
+    def test_wants_ndjson(self):
+        assert wants_ndjson("ndjson", None) is True
+        assert wants_ndjson("json", "application/x-ndjson") is False  # explicit format wins
+        assert wants_ndjson(None, "application/x-ndjson, */*") is True
+        assert wants_ndjson(None, None) is False
+
+    def test_projection_builds_only_requested_fields(self):
+        row = rows(1)[0]
+        assert FIELDS.project("email, id")(row) == {"email": "lead0@example.com", "id": 0}
+        assert set(FIELDS.project(None)(row)) == {"id", "email", "created_at"}
+
+    def test_unknown_field_is_rejected(self):
+        with pytest.raises(ValueError, match="Unknown fields: phone"):
+            FIELDS.project("id,phone")
+
+class TestKeyset:
+    """Test cursor tokens and the keyset WHERE fragment."""
+
+    def test_token_round_trip(self):
+        keyset = Keyset([("l.created_at", "timestamptz"), ("l.id", "bigint")], descending=True)
+        row = {"created_at": datetime(2026, 1, 2, 3, 4, 5), "id": 42}
+
+        token = keyset.token(row)
+        assert "=" not in token
+        assert keyset.decode(token) == ["2026-01-02T03:04:05", "42"]
+
+        params = ["tenant"]
+        clause = keyset.after(token, params)
+        assert clause == " AND (l.created_at, l.id) < ($2::text::timestamptz, $3::text::bigint)"
+        assert params == ["tenant", "2026-01-02T03:04:05", "42"]
+        assert keyset.order_by() == " ORDER BY l.created_at DESC, l.id DESC"
+
+    def test_no_token_adds_nothing(self):
+        params = []
+        assert Keyset([("id", "bigint")]).after(None, params) == "" and params == []
+
+    @pytest.mark.parametrize("token", [
+        "not base64 at all!",
+        "bm90IGpzb24",  # "not json"
+        "eyJpZCI6IDF9",  # {"id": 1}: not a list
+        "WyIxIl0",  # ["1"]: wrong arity
+        "WzEsIDJd",  # [1, 2]: not strings
+    ])
+    def test_bad_cursor_is_rejected(self, token):
+        keyset = Keyset([("created_at", "timestamptz"), ("id", "bigint")])
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            keyset.after(token, [])
+
+    def test_fetch_page_returns_next_token_only_when_more_rows(self):
+        keyset = Keyset([("id", "bigint")])
+        db = FakeDb(rows(5))
+
+        page, next_token = asyncio.run(fetch_page(db, "SELECT * FROM leads", [], keyset, 3, FIELDS.project("id")))
+        assert page == [{"id": 0}, {"id": 1}, {"id": 2}]
+        assert keyset.decode(next_token) == ["2"]
+        assert db.queries[0][0].endswith("LIMIT 4")
+
+        page, next_token = asyncio.run(fetch_page(db, "SELECT * FROM leads", [], keyset, 5, FIELDS.project("id")))
+        assert len(page) == 5 and next_token is None
+
+class TestNdjsonStream:
+    """Test NDJSON streaming through a server-side cursor."""
+
+    def test_lines_are_chunked(self):
+        pool = FakePool(rows(5))
+        chunks = asyncio.run(collect(stream_ndjson(pool, "SELECT * FROM leads", ["t"], FIELDS.project("id,email"),
+                                                   prefetch=50, lines_per_chunk=2)))
+
+        assert [chunk.count(b"\n") for chunk in chunks] == [2, 2, 1]
+        assert all(chunk.endswith(b"\n") for chunk in chunks)
+        lines = b"".join(chunks).decode().splitlines()
+        assert [json.loads(line) for line in lines] == [{"id": i, "email": f"lead{i}@example.com"} for i in range(5)]
+        assert lines[0] == '{"id":0,"email":"lead0@example.com"}'
+        assert pool.conn.cursor_args == ("SELECT * FROM leads", ("t",), 50)
+        assert pool.conn.readonly is True
+
+    def test_empty_result_yields_nothing(self):
+        assert asyncio.run(collect(stream_ndjson(FakePool([]), "SELECT 1", [], FIELDS.project("id")))) == []
+
+    def test_unserializable_values_fall_back_to_str(self):
+        pool = FakePool(rows(1))
+        [chunk] = asyncio.run(collect(stream_ndjson(pool, "SELECT 1", [], lambda row: {"at": row["created_at"]})))
+        assert json.loads(chunk) == {"at": "2026-01-01 00:00:00"}
+
+class TestListRows:
+    """Test the shared list endpoint flow: projection, cursor, then stream, page or all rows."""
+
+    KEYSET = Keyset([("id", "bigint")])
+
+    def test_all_rows(self):
+        db = FakeDb(rows(3))
+        listing = asyncio.run(list_rows(db, None, "SELECT * FROM leads WHERE tenant_id = $1", ["t"],
+                                        self.KEYSET, FIELDS, "id"))
+
+        assert listing.response("leads") == {"leads": [{"id": 0}, {"id": 1}, {"id": 2}]}
+        assert db.queries == [("SELECT * FROM leads WHERE tenant_id = $1 ORDER BY id", ("t",))]
+
+    def test_page_after_cursor(self):
+        db = FakeDb(rows(5))
+        params = ["t"]
+        listing = asyncio.run(list_rows(db, None, "SELECT * FROM leads WHERE tenant_id = $1", params,
+                                        self.KEYSET, FIELDS, "id", cursor=self.KEYSET.token({"id": 9}), limit=2))
+
+        assert listing.paged and listing.response("leads") == {"leads": [{"id": 0}, {"id": 1}],
+                                                               "next_cursor": self.KEYSET.token({"id": 1})}
+        assert db.queries == [("SELECT * FROM leads WHERE tenant_id = $1 AND (id) > ($2::text::bigint)"
+                               " ORDER BY id LIMIT 3", ("t", "9"))]
+        assert params == ["t"]  # the caller's params are left alone
+
+    def test_ndjson_streams_from_the_export_pool(self):
+        db, pool = FakeDb(rows(2)), FakePool(rows(2))
+
+        async def run():
+            listing = await list_rows(db, pool, "SELECT * FROM leads", [], self.KEYSET, FIELDS, "id",
+                                      limit=2, ndjson=True)
+            return await collect(listing.stream)
+
+        assert b"".join(asyncio.run(run())) == b'{"id":0}\n{"id":1}\n'
+        assert pool.conn.cursor_args[0] == "SELECT * FROM leads ORDER BY id LIMIT 2"
+        assert db.queries == []
+
+    @pytest.mark.parametrize("fields, cursor", [("phone", None), (None, "not base64 at all!")])
+    def test_bad_request_touches_neither_pool(self, fields, cursor):
+        db, pool = FakeDb(rows(1)), FakePool(rows(1))
+        with pytest.raises(ValueError):
+            asyncio.run(list_rows(db, pool, "SELECT * FROM leads", [], self.KEYSET, FIELDS, fields, cursor,
+                                  ndjson=True))
+        assert db.queries == [] and pool.conn.cursor_args is None
@@ -0,0 +1,215 @@
+import asyncio
+import json
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from libs.pkg_trace import cli, trace
+from libs.pkg_trace.trace import SpanExporter, inject, record_span, stage_span
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def rpush(self, key, value):
+        self.commands.append(("rpush", key, value))
+
+    def expire(self, key, ttl):
+        self.commands.append(("expire", key, ttl))
+
+    async def execute(self):
+        if self.redis.down:
+            raise ConnectionError("redis down")
+        self.redis.executed.extend(self.commands)
+
+class FakeRedis:
+    def __init__(self):
+        self.down = False
+        self.executed = []
+
+    def pipeline(self, transaction=True):
+        assert transaction is False
+        return FakePipeline(self)
+
+@pytest.fixture
+def exporter(monkeypatch):
+    spans = SpanExporter(flush_interval=60, buffer_max=100)
+    monkeypatch.setattr(trace, "exporter", spans)
+    return spans
+
+def span(stage, span_id, parent_id, sent_at, started_at, ended_at, trace_id="t1", lead_id="L1"):
+    return {"trace_id": trace_id, "lead_id": lead_id, "span_id": span_id, "parent_id": parent_id,
+            "stage": stage, "sent_at": sent_at, "started_at": started_at, "ended_at": ended_at,
+            "queue_wait": started_at - sent_at if sent_at else 0.0, "processing": ended_at - started_at,
+            "status": "ok"}
+
+class TestTraceContext:
+    """Test span parenting and the sampling decision."""
+
+    def test_downstream_span_is_child_of_upstream(self, exporter):
+        with stage_span("ingest", lead_id="L1") as ctx:
+            message = inject({"lead": {"lead_id": "L1"}})
+        assert trace.current_trace() is None  # context is reset after the block
+        with stage_span("enrich", message["trace"]):
+            pass
+
+        ingest, enrich = exporter._buffer
+        assert ingest["parent_id"] is None and ingest["span_id"] == ctx["parent_id"]
+        assert enrich["parent_id"] == ingest["span_id"]
+        assert enrich["trace_id"] == ingest["trace_id"] and enrich["lead_id"] == "L1"
+        assert enrich["sent_at"] == message["trace"]["sent_at"]
+        assert enrich["queue_wait"] >= 0.0
+
+    def test_record_span_returns_child_context(self, exporter):
+        upstream = {"trace_id": "t1", "lead_id": "L1", "parent_id": "p0", "started_at": 10.0,
+                    "sent_at": 11.0, "sampled": True}
+        child = record_span("outreach", upstream, 12.0, 12.5, span_id="s1")
+
+        [recorded] = exporter._buffer
+        assert recorded["parent_id"] == "p0" and recorded["queue_wait"] == 1.0 and recorded["processing"] == 0.5
+        assert child == {"trace_id": "t1", "lead_id": "L1", "parent_id": "s1", "started_at": 10.0, "sampled": True}
+
+    def test_failed_stage_records_error(self, exporter):
+        with pytest.raises(RuntimeError):
+            with stage_span("score", lead_id="L1"):
+                raise RuntimeError("boom")
+        assert exporter._buffer[0]["status"] == "error"
+
+    def test_unsampled_traces_export_nothing(self, exporter, monkeypatch):
+        monkeypatch.setattr(trace, "SAMPLE_RATE", 0.25)
+        monkeypatch.setattr(trace.random, "random", lambda: 0.5)
+        with stage_span("ingest", lead_id="L1") as ctx:
+            message = inject({})
+        with stage_span("enrich", message["trace"]):
+            pass
+
+        assert ctx["sampled"] is False and message["trace"]["sampled"] is False
+        assert len(exporter._buffer) == 0
+
+        monkeypatch.setattr(trace.random, "random", lambda: 0.1)
+        with stage_span("ingest", lead_id="L2"):
+            pass
+        assert len(exporter._buffer) == 1
+
+    def test_traced_handler_uses_message_trace(self, exporter):
+        @trace.traced("enrich")
+        async def handler(msg):
+            return inject({})["trace"]
+
+        upstream = {"trace_id": "t1", "lead_id": "L1", "parent_id": "p0", "started_at": 1.0,
+                    "sent_at": 2.0, "sampled": True}
+        downstream = asyncio.run(handler({"lead": {"lead_id": "L1"}, "trace": upstream}))
+
+        [recorded] = exporter._buffer
+        assert recorded["parent_id"] == "p0" and downstream["parent_id"] == recorded["span_id"]
+
+class TestSpanExporter:
+    """Test the buffered span exporter."""
+
+    def test_overflow_is_dropped_and_counted(self):
+        spans = SpanExporter(buffer_max=2)
+        for i in range(5):
+            spans.record({"lead_id": "L1", "n": i})
+
+        assert [s["n"] for s in spans._buffer] == [0, 1]
+        assert spans.stats == {"recorded": 2, "exported": 0, "dropped": 3}
+
+    def test_flush_pipelines_spans_per_lead(self):
+        redis = FakeRedis()
+
+        async def factory():
+            return redis
+
+        spans = SpanExporter(ttl=120, redis_factory=factory)
+        spans.record({"lead_id": "L1", "n": 0})
+        spans.record({"lead_id": "L2", "n": 1})
+
+        assert asyncio.run(spans.flush()) == 2
+        assert redis.executed == [("rpush", "trace:lead:L1", '{"lead_id":"L1","n":0}'),
+                                  ("expire", "trace:lead:L1", 120),
+                                  ("rpush", "trace:lead:L2", '{"lead_id":"L2","n":1}'),
+                                  ("expire", "trace:lead:L2", 120)]
+        assert spans.stats["exported"] == 2 and len(spans._buffer) == 0
+
+    def test_failed_flush_drops_the_batch(self):
+        redis = FakeRedis()
+        redis.down = True
+
+        async def factory():
+            return redis
+
+        spans = SpanExporter(redis_factory=factory)
+        spans.record({"lead_id": "L1"})
+
+        assert asyncio.run(spans.flush()) == 0
+        assert spans.stats["dropped"] == 1 and len(spans._buffer) == 0
+
+    def test_close_stops_flusher_and_flushes(self):
+        redis = FakeRedis()
+
+        async def factory():
+            return redis
+
+        async def run():
+            spans = SpanExporter(flush_interval=60, redis_factory=factory)
+            spans.record({"lead_id": "L1"})
+            assert spans._task is not None and not spans._task.done()
+            await spans.close()
+            return spans
+
+        spans = asyncio.run(run())
+        assert spans._task is None and spans.stats["exported"] == 1
+
+class TestTraceCli:
+    """Test critical path reconstruction and its summary."""
+
+    SPANS = [
+        span("ingest", "a", None, None, 0.0, 0.1),
+        span("enrich", "b", "a", 0.1, 0.3, 1.2),
+        span("score", "c", "a", 0.1, 0.2, 0.4),  # branch that finished early
+        span("outreach", "d", "b", 1.2, 1.5, 2.0),
+    ]
+
+    def test_critical_path_follows_last_span_to_root(self):
+        assert [s["stage"] for s in cli.critical_path(self.SPANS)] == ["ingest", "enrich", "outreach"]
+        assert cli.critical_path([]) == []
+
+    def test_summarize(self):
+        summary = cli.summarize(self.SPANS)
+
+        assert summary["total"] == pytest.approx(2.0)
+        assert [s["stage"] for s in summary["stages"]] == ["ingest", "enrich", "outreach"]
+        assert summary["bottleneck"] == "enrich"
+        enrich = summary["stages"][1]
+        assert enrich["queue_wait"] == pytest.approx(0.2) and enrich["processing"] == pytest.approx(0.9)
+        assert enrich["share"] == pytest.approx(0.55) and enrich["ended_at_offset"] == pytest.approx(1.2)
+        assert summary["complete"] is True
+        assert summary["spans"] == 4 and summary["traces"] == 1
+
+    def test_missing_root_marks_path_incomplete(self):
+        summary = cli.summarize(self.SPANS[1:])
+        assert summary["complete"] is False
+        assert "Path is incomplete" in cli.format_summary("L1", summary)
+
+    def test_empty_summary(self):
+        summary = cli.summarize([])
+        assert summary == {"stages": [], "total": 0.0, "spans": 0, "traces": 0}
+        assert cli.format_summary("L1", summary) == "No spans for lead L1"
+
+    def test_main_reads_spans_from_file(self, tmp_path, capsys):
+        path = tmp_path / "spans.jsonl"
+        other = span("ingest", "x", None, None, 0.0, 9.0, trace_id="t2", lead_id="L2")
+        path.write_text("\n".join(json.dumps(s) for s in self.SPANS + [other]) + "\n\n")
+
+        assert cli.main(["L1", "--file", str(path), "--json"]) == 0
+        summary = json.loads(capsys.readouterr().out)
+        assert summary["spans"] == 4 and summary["bottleneck"] == "enrich"
+
+        assert cli.main(["L1", "--file", str(path)]) == 0
+        out = capsys.readouterr().out
+        assert out.startswith("Lead L1: 2000.0 ms end to end (4 spans, 1 trace(s))")
+        assert "Bottleneck: enrich" in out
+
+        assert cli.main(["L3", "--file", str(path)]) == 1
@@ -0,0 +1,66 @@
+import pytest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+pytest.importorskip("numpy")
+import predictive_analytics_engine
+from predictive_analytics_engine import (ConfidenceInterval, PredictionCache, PredictionResult,
+                                         PredictionType, TimeHorizon)
+
+def prediction(entity, expires_in=timedelta(days=1)):
+    return PredictionResult(prediction_id=f"P-{entity}", prediction_type=PredictionType.MARKET_TREND,
+                            time_horizon=TimeHorizon.SHORT_TERM, target_entity=entity, point_prediction=1.0,
+                            confidence_interval=ConfidenceInterval(0.5, 1.5, 0.95, 1.0),
+                            probability_distribution={}, key_assumptions=[], risk_factors=[],
+                            data_sources_used=[], model_accuracy=0.8, created=datetime.now().isoformat(),
+                            expires=(datetime.now() + expires_in).isoformat())
+
+def key(entity, context=None):
+    return PredictionCache.make_key(PredictionType.MARKET_TREND, entity, TimeHorizon.SHORT_TERM, context)
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(predictive_analytics_engine.time, "monotonic", lambda: now[0])
+    return now
+
+class TestPredictionCache:
+    """Test LRU/TTL eviction and per-entity invalidation."""
+
+    def test_lru_eviction_keeps_recently_used(self, clock):
+        cache = PredictionCache(max_entries=2)
+        cache.put(key("a"), prediction("a"))
+        cache.put(key("b"), prediction("b"))
+        assert cache.get(key("a")) is not None  # a is now most recent
+        cache.put(key("c"), prediction("c"))
+
+        assert cache.get(key("b")) is None
+        assert cache.get(key("a")).target_entity == "a"
+        assert cache.get(key("c")).target_entity == "c"
+        assert cache.evictions == 1 and len(cache) == 2
+
+    def test_ttl_and_prediction_expiry(self, clock):
+        cache = PredictionCache(ttl_seconds=60)
+        cache.put(key("a"), prediction("a"))
+        cache.put(key("short"), prediction("short", expires_in=timedelta(seconds=10)))
+
+        clock[0] += 30
+        assert cache.get(key("short")) is None  # its own expiry is earlier than the TTL
+        assert cache.get(key("a")) is not None
+        clock[0] += 31
+        assert cache.get(key("a")) is None
+        assert len(cache) == 0
+
+    def test_invalidation_by_entity(self, clock):
+        cache = PredictionCache()
+        cache.put(key("saas", {"region": "us"}), prediction("saas"))
+        cache.put(key("saas", {"region": "eu"}), prediction("saas"))
+        cache.put(key("retail"), prediction("retail"))
+        assert key("saas", {"region": "us"}) != key("saas", {"region": "eu"})
+
+        assert cache.invalidate_for_metrics(["market_trend_saas_growth"]) == 2
+        assert cache.get(key("saas", {"region": "us"})) is None
+        assert cache.get(key("retail")) is not None
+        assert cache.invalidate_for_metrics(["unrelated_metric"]) == 0
@@ -0,0 +1,93 @@
+import sqlite3
+import threading
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from promo_codes import PromoCodeSystem
+
+@pytest.fixture
+def promo(tmp_path):
+    return PromoCodeSystem(db_path=tmp_path / "promo_codes.db")
+
+class TestPromoRedemption:
+    """Test atomic promo code redemption."""
+    
+    def test_concurrent_redemptions_never_exceed_max_uses(self, promo):
+        promo.create_code("LAUNCH", "Launch day", bypass_payment=True, max_uses=25)
+        results = []
+        start = threading.Barrier(40)
+        
+        def hammer():
+            start.wait()
+            for _ in range(5):
+                results.append(promo.use_code("LAUNCH", user_email="t@example.com")["valid"])
+        
+        threads = [threading.Thread(target=hammer) for _ in range(40)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert results.count(True) == 25
+        conn = sqlite3.connect(promo.db_path)
+        assert conn.execute("SELECT current_uses FROM promo_codes WHERE code = 'LAUNCH'").fetchone()[0] == 25
+        assert conn.execute("SELECT COUNT(*) FROM code_usage WHERE code = 'LAUNCH'").fetchone()[0] == 25
+        conn.close()
+    
+    def test_exhausted_code_reports_limit(self, promo):
+        promo.create_code("ONCE", "Single use", max_uses=1)
+        assert promo.use_code("once")["valid"] is True
+        result = promo.use_code("ONCE")
+        assert result == {"valid": False, "error": "Promo code usage limit exceeded"}
+        assert promo.validate_code("ONCE")["valid"] is False
+    
+    def test_unknown_code_is_rejected(self, promo):
+        assert promo.use_code("NOPE")["error"] == "Invalid or expired promo code"
+    
+    def test_validate_is_served_from_cache(self, promo):
+        promo.validate_code("FRIENDSTEST")
+        promo.db_path = promo.db_path.parent / "missing" / "promo.db"
+        assert promo.validate_code("FRIENDSTEST")["valid"] is True
+    
+    def test_create_code_invalidates_cache(self, promo):
+        assert promo.validate_code("NEWCODE")["valid"] is False
+        promo.create_code("NEWCODE", "Fresh", max_uses=3)
+        assert promo.validate_code("NEWCODE")["data"]["max_uses"] == 3
+
+class TestFreeTrialRoute:
+    """Test that a promo link only validates and signup redeems."""
+    
+    @pytest.fixture
+    def client(self, promo, monkeypatch):
+        import promo_codes
+        from sincor_app import app
+        monkeypatch.setattr(promo_codes, "promo_system", promo)
+        app.config['TESTING'] = True
+        with app.test_client() as client:
+            yield client
+    
+    def uses(self, promo, code):
+        return {c["code"]: c["current_uses"] for c in promo.list_codes()}[code]
+    
+    def test_visiting_the_link_does_not_use_the_code(self, client, promo):
+        for _ in range(3):
+            assert client.get('/free-trial/friendstest').status_code == 200
+        assert self.uses(promo, "FRIENDSTEST") == 0
+    
+    def test_signup_redeems_the_pending_code_once(self, client, promo):
+        client.get('/free-trial/FRIENDSTEST')
+        form = {"company_name": "Acme", "contact_email": "a@example.com"}
+        client.post('/business-setup', data=form)
+        client.post('/business-setup', data=form)
+        
+        assert self.uses(promo, "FRIENDSTEST") == 1
+        with client.session_transaction() as sess:
+            assert sess['promo_active'] is True and sess['promo_trial_days'] == 90
+            assert 'promo_pending' not in sess
+    
+    def test_invalid_code_page_lists_no_codes(self, client):
+        response = client.get('/free-trial/NOPE')
+        assert b"not valid" in response.data
+        assert b"PROTOTYPE2025" not in response.data and b"FRIENDSTEST" not in response.data
@@ -0,0 +1,79 @@
+import asyncio
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from services.referrals.attribution import UPSERT_ATTRIBUTION_SQL, ClickBatcher
+
+class FakePool:
+    def __init__(self):
+        self.batches = []
+        self.fail = False
+        self.started = None
+        self.release = None
+
+    async def executemany(self, query, rows):
+        assert query == UPSERT_ATTRIBUTION_SQL
+        if self.started is not None:
+            self.started.set()
+            await self.release.wait()
+        if self.fail:
+            raise ConnectionError("db down")
+        self.batches.append(list(rows))
+
+class TestClickBatcher:
+    """Test click coalescing and re-queueing after a failed flush."""
+
+    def test_clicks_coalesce_per_fingerprint(self):
+        pool = FakePool()
+        batcher = ClickBatcher(pool)
+        batcher.add("OLD", "fp-1", "1.1.1.1", "ua-1", "ref-1")
+        batcher.add("NEW", "fp-1", "2.2.2.2", "ua-2", "ref-2")
+        batcher.add("X", "fp-2", "3.3.3.3", "ua-3", "ref-3")
+
+        assert asyncio.run(batcher.flush()) == 2
+        assert pool.batches == [[("NEW", "fp-1", "1.1.1.1", "ua-1", "ref-1"),
+                                 ("X", "fp-2", "3.3.3.3", "ua-3", "ref-3")]]
+        assert batcher.stats["clicks"] == 3 and batcher.stats["rows_written"] == 2
+
+    def test_max_batch_wakes_the_flusher(self):
+        batcher = ClickBatcher(FakePool(), max_batch=2)
+        batcher.add("A", "fp-1", "", "", "")
+        assert not batcher._wakeup.is_set()
+        batcher.add("B", "fp-2", "", "", "")
+        assert batcher._wakeup.is_set()
+
+    def test_failed_flush_keeps_first_touch_metadata(self):
+        pool = FakePool()
+        batcher = ClickBatcher(pool)
+        batcher.add("FIRST", "fp-1", "1.1.1.1", "ua-1", "ref-1")
+
+        async def run():
+            pool.fail = True
+            pool.started, pool.release = asyncio.Event(), asyncio.Event()
+            flush = asyncio.ensure_future(batcher.flush())
+            await pool.started.wait()
+            batcher.add("SECOND", "fp-1", "2.2.2.2", "ua-2", "ref-2")  # arrives mid-flush
+            pool.release.set()
+            with pytest.raises(ConnectionError):
+                await flush
+            pool.fail, pool.started = False, None
+            return await batcher.flush()
+
+        assert asyncio.run(run()) == 1
+        assert pool.batches == [[("SECOND", "fp-1", "1.1.1.1", "ua-1", "ref-1")]]
+        assert batcher.stats["failed_flushes"] == 1
+
+    def test_close_stops_the_loop_and_flushes(self):
+        pool = FakePool()
+
+        async def run():
+            batcher = ClickBatcher(pool, flush_interval=60)
+            batcher.start()
+            batcher.add("A", "fp-1", "", "", "")
+            await batcher.close()
+            return batcher
+
+        assert asyncio.run(run())._task is None
+        assert pool.batches == [[("A", "fp-1", "", "", "")]]
@@ -0,0 +1,113 @@
+import contextlib
+import io
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from swarm_coordination import AgentBid, BidStatus, TaskContract, TaskMarket, TaskStatus
+
+np = pytest.importorskip("numpy")
+
+SKILLS = ["prospect", "research", "summarize"]
+
+def make_task(budget_tokens=8000, skills=SKILLS):
+    return TaskContract(task_id="", goal="Test task", description="", skills_required=list(skills),
+                        priority=0.5, reward=100, deadline="", budget_tokens=budget_tokens,
+                        budget_tool_calls=25, created_by="test", created_at="",
+                        status=TaskStatus.BROADCAST, success_criteria=[], context={})
+
+def make_bid(task_id, agent_id, confidence, archetype="Scout", plan_steps=3):
+    return AgentBid(bid_id="", task_id=task_id, agent_id=agent_id, archetype=archetype,
+                    confidence=confidence, estimated_cost_tokens=4000, estimated_cost_calls=10,
+                    estimated_duration=60, plan=["step"] * plan_steps, unique_value="",
+                    agent_track_record={}, submitted_at="", status=BidStatus.SUBMITTED)
+
+@pytest.fixture
+def market(tmp_path):
+    market = TaskMarket(str(tmp_path / "market"))
+    for agent, success_rate in [("E-a", 0.9), ("E-b", 0.6), ("E-c", 0.3)]:
+        market.agent_reputation[agent] = {"tasks_completed": 1, "success_rate": success_rate,
+                                          "average_quality": 0.8, "competencies": SKILLS + ["deploy"]}
+    market._save_reputation()
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield market
+    market.journal.close()
+
+class TestBatchClearing:
+    """Test vectorized bid scoring and batch awards."""
+
+    def test_batch_scores_match_single_bid_scoring(self, market):
+        market.post_task(make_task())
+        market.post_task(make_task(budget_tokens=0, skills=["deploy", "research"]))
+        for i, task_id in enumerate(market.active_tasks):
+            market.submit_bid(make_bid(task_id, "E-a", 0.7, plan_steps=7))
+            market.submit_bid(make_bid(task_id, "E-b", 0.9, archetype="Builder"))
+            market.submit_bid(make_bid(task_id, "E-c", 0.5, archetype="Unknown", plan_steps=i))
+
+        tasks = list(market.active_tasks.values())
+        bids = [bid for task in tasks for bid in market.get_task_bids(task.task_id)]
+        expected = [market._score_bid(bid, market.active_tasks[bid.task_id], verbose=False) for bid in bids]
+
+        assert np.allclose(market.score_bids_batch(tasks, bids), expected)
+
+    def test_greedy_respects_agent_capacity(self, market):
+        task_ids = [market.post_task(make_task()) for _ in range(4)]
+        for task_id in task_ids:
+            market.submit_bid(make_bid(task_id, "E-a", 0.95))
+            market.submit_bid(make_bid(task_id, "E-b", 0.5))
+
+        awards = market.award_open_tasks(agent_capacity=1, capacity_overrides={"E-b": 2})
+
+        winners = [market.active_assignments[assignment_id].agent_id for assignment_id in awards.values()]
+        assert sorted(winners) == ["E-a", "E-b", "E-b"]
+        assert all(market.active_tasks[task_id].status == TaskStatus.AWARDED for task_id in awards)
+        assert market.award_open_tasks(agent_capacity=1, capacity_overrides={"E-b": 2}) == {}
+
+    def test_awards_are_journaled_in_one_write(self, market, tmp_path, monkeypatch):
+        task_ids = [market.post_task(make_task()) for _ in range(5)]
+        for task_id in task_ids:
+            market.submit_bid(make_bid(task_id, "E-a", 0.9))
+        writes = []
+        write_records = market.journal._append_records
+        monkeypatch.setattr(market.journal, "_append_records",
+                            lambda records: writes.append(len(records)) or write_records(records))
+
+        awards = market.award_open_tasks(agent_capacity=5)
+
+        assert writes == [10]  # an assignment and a task record per award
+        market.journal.close()
+        reopened = TaskMarket(str(tmp_path / "market"))
+        assert set(reopened.active_assignments) == set(awards.values())
+        assert all(reopened.active_tasks[task_id].status == TaskStatus.AWARDED for task_id in task_ids)
+        reopened.journal.close()
+
+    def test_hungarian_maximizes_total_score(self, market):
+        pytest.importorskip("scipy")
+        contested = market.post_task(make_task())
+        exclusive = market.post_task(make_task())
+        market.submit_bid(make_bid(contested, "E-a", 0.95))
+        market.submit_bid(make_bid(contested, "E-b", 0.9))
+        market.submit_bid(make_bid(exclusive, "E-a", 0.9))
+
+        awards = market.award_open_tasks(method="hungarian")
+
+        assert market.active_assignments[awards[contested]].agent_id == "E-b"
+        assert market.active_assignments[awards[exclusive]].agent_id == "E-a"
+
+class TestSkillIndex:
+    """Test competency bitsets and targeted broadcast."""
+
+    def test_post_task_offers_only_to_eligible_bidders(self, market):
+        offered = []
+        for agent in ("E-a", "E-b", "E-c"):
+            market.register_bidder(agent, lambda task, agent=agent: offered.append(agent) or make_bid(task.task_id, agent, 0.8))
+        market.agent_reputation["E-c"]["competencies"] = ["prospect"]
+        market._save_reputation("E-c")
+
+        task_id = market.post_task(make_task(skills=["research", "deploy"]))
+
+        assert sorted(offered) == ["E-a", "E-b"]
+        assert {bid.agent_id for bid in market.get_task_bids(task_id)} == {"E-a", "E-b"}
+        assert not market.submit_bid(make_bid(task_id, "E-c", 0.9))
+        assert market.skill_index.missing_skills("E-c", market.skill_index.mask(["research", "deploy"])) == ["research", "deploy"]
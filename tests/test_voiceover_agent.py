@@ -0,0 +1,56 @@
+import wave
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from agents.media.voiceover_agent import PAUSE_SECONDS, VoiceoverAgent
+
+SCRIPT = {"scenes": [{"id": 1, "text": "Welcome"}, {"id": 3, "text": "Dashboard"}]}
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("ELEVENLABS_API_KEY", raising=False)
+    agent = VoiceoverAgent({"tts_backend": "fake"})
+    yield agent
+    agent._segment_pool.shutdown(wait=True)
+
+class TestSegmentedVoiceover:
+    """Test segmented synthesis with the fake TTS backend."""
+
+    def test_wav_output_includes_pauses(self, agent):
+        result = agent.create_onboarding_voiceover(SCRIPT, {"company": "Acme"})
+
+        assert result["success"] is True
+        with wave.open(result["audio_path"], "rb") as wav:
+            audio_seconds = wav.getnframes() / wav.getframerate()
+        scenes = result["timing_data"]["scenes"]
+        spoken = sum(scene["duration"] for scene in scenes)
+        assert audio_seconds == pytest.approx(spoken, abs=0.01)
+        # two [PAUSE] markers plus the [LONG_PAUSE] between scenes
+        assert audio_seconds > 2 * PAUSE_SECONDS["[PAUSE]"] + PAUSE_SECONDS["[LONG_PAUSE]"]
+
+    def test_shared_segments_are_synthesized_once(self, agent):
+        agent.create_onboarding_voiceover(SCRIPT, {"company": "Acme"})
+        first_calls = agent.tts_backend.calls
+
+        agent.create_onboarding_voiceover(SCRIPT, {"company": "Other"})
+
+        # only the greeting names the company; every other sentence is a cache hit
+        assert agent.tts_backend.calls == first_calls + 1
+        assert agent.segment_cache_hits >= first_calls - 1
+
+    def test_backend_failure_falls_back_to_text_script(self, agent):
+        def fail(text):
+            raise RuntimeError("tts down")
+        agent.tts_backend.synthesize = fail
+
+        result = agent.create_onboarding_voiceover(SCRIPT, {"company": "Acme"})
+
+        assert result["success"] is True
+        audio_path = Path(result["audio_path"])
+        assert audio_path.read_text().startswith("# Audio placeholder")
+        assert "Welcome to SINCOR, Acme!" in audio_path.with_suffix(".txt").read_text()
+        assert result["duration_seconds"] > 0  # estimated from word count
+        assert not list(agent.segment_dir.glob("*.wav"))
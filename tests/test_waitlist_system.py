@@ -0,0 +1,80 @@
+import random
+import sqlite3
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from waitlist_system import WaitlistManager, WaitlistRankIndex
+
+def sql_position(conn, priority_score, signup_date):
+    """The original COUNT(*) ranking query, kept as the reference."""
+    return conn.execute('''
+        SELECT COUNT(*) FROM waitlist
+        WHERE (priority_score > ? OR (priority_score = ? AND signup_date < ?))
+        AND is_verified = TRUE
+    ''', (priority_score, priority_score, signup_date)).fetchone()[0] + 1
+
+@pytest.fixture
+def manager(tmp_path):
+    return WaitlistManager(db_path=str(tmp_path / "waitlist.db"))
+
+def seed(manager, count, seed=7):
+    rng = random.Random(seed)
+    with sqlite3.connect(manager.db_path) as conn:
+        for i in range(count):
+            conn.execute('''
+                INSERT INTO waitlist (email_hash, encrypted_email, product_interest, priority_score,
+                                      signup_date, is_verified, verification_token)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (f"h{i}", f"e{i}", rng.choice(["Growth Engine", "Ops Core"]), rng.choice([20, 45, 80, 125, 300]),
+                  f"2025-01-{rng.randint(1, 28):02d} 10:{rng.randint(0, 59):02d}:00", rng.random() < 0.7, f"t{i}"))
+
+class TestWaitlistRanking:
+    """Test the in-memory rank index against the SQL ranking."""
+    
+    def test_positions_match_sql_count(self, manager):
+        seed(manager, 500)
+        manager.rebuild_rank_index()
+        with sqlite3.connect(manager.db_path) as conn:
+            for i in range(0, 500, 7):
+                score, date = conn.execute(
+                    'SELECT priority_score, signup_date FROM waitlist WHERE email_hash = ?', (f"h{i}",)).fetchone()
+                assert manager.get_waitlist_position(f"h{i}") == sql_position(conn, score, date)
+    
+    def test_verification_enters_the_queue(self, manager):
+        seed(manager, 50)
+        manager.rebuild_rank_index()
+        with sqlite3.connect(manager.db_path) as conn:
+            conn.execute("UPDATE waitlist SET is_verified = FALSE WHERE email_hash = 'h0'")
+        manager.rebuild_rank_index()
+        before = len(manager.rank_index)
+        
+        assert manager.verify_signup("t0")["success"] is True
+        assert len(manager.rank_index) == before + 1
+        assert manager.verify_signup("t0")["success"] is False
+    
+    def test_index_grows_past_initial_score_range(self):
+        index = WaitlistRankIndex(max_score=4)
+        index.add(2, "2025-01-01")
+        index.add(1000, "2025-01-02")
+        assert index.rank(2, "2025-01-01") == 2
+        assert index.rank(1000, "2025-01-02") == 1
+
+class TestLaunchNotifications:
+    """Test launch batch selection."""
+    
+    def test_notify_launch_marks_top_batch_in_queue_order(self, manager):
+        seed(manager, 200)
+        with sqlite3.connect(manager.db_path) as conn:
+            expected = [row[0] for row in conn.execute('''
+                SELECT id FROM waitlist
+                WHERE product_interest = 'Ops Core' AND is_verified = TRUE
+                ORDER BY priority_score DESC, signup_date ASC LIMIT 10
+            ''')]
+        
+        assert manager.notify_launch("Ops Core", batch_size=10) == 10
+        with sqlite3.connect(manager.db_path) as conn:
+            notified = [row[0] for row in conn.execute(
+                'SELECT id FROM waitlist WHERE notification_sent = TRUE')]
+        assert sorted(notified) == sorted(expected)
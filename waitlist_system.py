@@ -8,16 +8,86 @@ import hashlib
 import secrets
 import smtplib
 import os
+import threading
+from bisect import bisect_left, insort
 from datetime import datetime, timedelta
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from flask import request, jsonify
 import re
 
+class WaitlistRankIndex:
+    """In-memory order-statistic index over verified (priority_score, signup_date) entries.
+
+    A Fenwick tree over priority scores counts everyone in a higher band, and a
+    sorted list of signup dates per score breaks ties, so rank lookups are O(log n).
+    """
+    
+    def __init__(self, max_score=128):
+        self._size = max_score
+        self._tree = [0] * (self._size + 1)
+        self._dates = {}
+        self._total = 0
+        self._lock = threading.Lock()
+    
+    def _grow(self, score):
+        size = self._size
+        while size <= score:
+            size *= 2
+        self._size = size
+        self._tree = [0] * (size + 1)
+        for bucket_score, dates in self._dates.items():
+            self._tree_add(bucket_score, len(dates))
+    
+    def _tree_add(self, score, delta):
+        i = score + 1
+        while i <= self._size:
+            self._tree[i] += delta
+            i += i & -i
+    
+    def _count_at_most(self, score):
+        i = min(score + 1, self._size)
+        count = 0
+        while i > 0:
+            count += self._tree[i]
+            i -= i & -i
+        return count
+    
+    def add(self, priority_score, signup_date):
+        score = max(int(priority_score or 0), 0)
+        with self._lock:
+            if score >= self._size:
+                self._grow(score)
+            insort(self._dates.setdefault(score, []), signup_date)
+            self._tree_add(score, 1)
+            self._total += 1
+    
+    def remove(self, priority_score, signup_date):
+        score = max(int(priority_score or 0), 0)
+        with self._lock:
+            dates = self._dates.get(score, [])
+            i = bisect_left(dates, signup_date)
+            if i < len(dates) and dates[i] == signup_date:
+                dates.pop(i)
+                self._tree_add(score, -1)
+                self._total -= 1
+    
+    def rank(self, priority_score, signup_date):
+        """1-based position: everyone with a higher score, or equal score and earlier signup, is ahead."""
+        score = max(int(priority_score or 0), 0)
+        with self._lock:
+            ahead = self._total - self._count_at_most(score)
+            ahead += bisect_left(self._dates.get(score, []), signup_date)
+            return ahead + 1
+    
+    def __len__(self):
+        return self._total
+
 class WaitlistManager:
     def __init__(self, db_path="data/waitlist.db"):
         self.db_path = db_path
         self.init_database()
+        self.rebuild_rank_index()
     
     def init_database(self):
         """Initialize waitlist database with security measures"""
@@ -49,6 +119,13 @@ class WaitlistManager:
                 )
             ''')
             
+            # Launch batches walk this in queue order instead of sorting the table
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_waitlist_launch_queue
+                ON waitlist (product_interest, priority_score DESC, signup_date)
+                WHERE notification_sent = FALSE AND is_verified = TRUE
+            ''')
+            
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS product_analytics (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -68,6 +145,16 @@ class WaitlistManager:
             
             conn.commit()
     
+    def rebuild_rank_index(self):
+        """Load verified entries from SQLite into the in-memory rank index."""
+        index = WaitlistRankIndex()
+        with sqlite3.connect(self.db_path) as conn:
+            for priority_score, signup_date in conn.execute(
+                'SELECT priority_score, signup_date FROM waitlist WHERE is_verified = TRUE'
+            ):
+                index.add(priority_score, signup_date)
+        self.rank_index = index
+    
     def hash_email(self, email):
         """Create secure hash of email for deduplication"""
         return hashlib.sha256(email.lower().encode()).hexdigest()
@@ -134,6 +221,8 @@ class WaitlistManager:
             encrypted_email = self.encrypt_email(email)
             verification_token = secrets.token_urlsafe(32)
             priority_score = self.calculate_priority_score(signup_data)
+            # Same format as SQLite's CURRENT_TIMESTAMP so ranking compares consistently
+            signup_date = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
             
             # Get request metadata
             ip_address = request.remote_addr if request else 'unknown'
@@ -154,15 +243,15 @@ class WaitlistManager:
                     INSERT INTO waitlist (
                         email_hash, encrypted_email, product_interest, company_name,
                         industry, team_size, monthly_revenue, pain_points,
-                        ip_address, user_agent, verification_token, priority_score,
+                        ip_address, user_agent, verification_token, priority_score, signup_date,
                         referral_code, utm_source, utm_medium, utm_campaign
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ''', (
                     email_hash, encrypted_email, signup_data.get('product_interest'),
                     signup_data.get('company_name'), signup_data.get('industry'),
                     signup_data.get('team_size'), signup_data.get('monthly_revenue'),
                     signup_data.get('pain_points'), ip_address, user_agent,
-                    verification_token, priority_score, signup_data.get('referral_code'),
+                    verification_token, priority_score, signup_date, signup_data.get('referral_code'),
                     signup_data.get('utm_source'), signup_data.get('utm_medium'),
                     signup_data.get('utm_campaign')
                 ))
@@ -182,7 +271,7 @@ class WaitlistManager:
                 return {
                     'success': True, 
                     'message': 'Successfully added to waitlist',
-                    'position': self.get_waitlist_position(email_hash),
+                    'position': self.rank_index.rank(priority_score, signup_date),
                     'priority_score': priority_score
                 }
                 
@@ -197,20 +286,31 @@ class WaitlistManager:
                 'SELECT signup_date, priority_score FROM waitlist WHERE email_hash = ?',
                 (email_hash,)
             ).fetchone()
-            
-            if not user_data:
-                return None
-            
-            signup_date, priority_score = user_data
-            
-            # Count users ahead in queue (higher priority or earlier signup)
-            position = conn.execute('''
-                SELECT COUNT(*) FROM waitlist 
-                WHERE (priority_score > ? OR (priority_score = ? AND signup_date < ?))
-                AND is_verified = TRUE
-            ''', (priority_score, priority_score, signup_date)).fetchone()[0]
-            
-            return position + 1
+        
+        if not user_data:
+            return None
+        
+        signup_date, priority_score = user_data
+        
+        # Verified users ahead in queue (higher priority or earlier signup)
+        return self.rank_index.rank(priority_score, signup_date)
+    
+    def verify_signup(self, verification_token):
+        """Mark a signup verified, entering it into the ranked queue"""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute('''
+                UPDATE waitlist SET is_verified = TRUE
+                WHERE verification_token = ? AND is_verified = FALSE
+                RETURNING email_hash, priority_score, signup_date
+            ''', (verification_token,)).fetchone()
+            conn.commit()
+        
+        if not row:
+            return {'success': False, 'error': 'Invalid or already used verification token'}
+        
+        email_hash, priority_score, signup_date = row
+        self.rank_index.add(priority_score, signup_date)
+        return {'success': True, 'position': self.rank_index.rank(priority_score, signup_date)}
     
     def get_analytics(self):
         """Get waitlist analytics"""
@@ -249,21 +349,23 @@ class WaitlistManager:
     def notify_launch(self, product_name, batch_size=100):
         """Notify waitlist users about product launch"""
         with sqlite3.connect(self.db_path) as conn:
-            # Get top priority users who haven't been notified
+            # Top priority users who haven't been notified, read in order from
+            # idx_waitlist_launch_queue so only the batch is visited (no sort)
             users = conn.execute('''
-                SELECT encrypted_email, priority_score FROM waitlist
+                SELECT id, encrypted_email, priority_score FROM waitlist
+                INDEXED BY idx_waitlist_launch_queue
                 WHERE product_interest = ? AND notification_sent = FALSE AND is_verified = TRUE
                 ORDER BY priority_score DESC, signup_date ASC
                 LIMIT ?
             ''', (product_name, batch_size)).fetchall()
             
             # Mark as notified
-            email_hashes = [self.hash_email(user[0]) for user in users]
-            placeholders = ','.join('?' * len(email_hashes))
+            ids = [user[0] for user in users]
+            placeholders = ','.join('?' * len(ids))
             conn.execute(f'''
                 UPDATE waitlist SET notification_sent = TRUE 
-                WHERE email_hash IN ({placeholders})
-            ''', email_hashes)
+                WHERE id IN ({placeholders})
+            ''', ids)
             
             conn.commit()
             